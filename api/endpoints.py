@@ -25,10 +25,13 @@ from PIL import Image
 
 # Firebase ve AI imports
 try:
-    from data.database import FirestoreManager
+    from data.database import FirestoreManager, encode_page_token, decode_page_token
     from data.storage import StorageManager
+    from data.event_export import EXPORT_FORMATS, iter_user_events, iter_ndjson, iter_csv
+    from data.media_cache import evict_cached_media
     from core.fall_detection import FallDetector
-    from core.camera import Camera
+    from core.camera_inventory import get_camera_inventory
+    from core.camera_supervisor import get_camera_supervisor
     from core.notification import NotificationManager
     from config.settings import FRAME_WIDTH, FRAME_HEIGHT
 except ImportError as e:
@@ -87,6 +90,28 @@ class FallEvent(BaseModel):
             }
         }
 
+class FallEventPage(BaseModel):
+    events: List[FallEvent] = Field(default_factory=list, description="Events on this page (newest first)")
+    next_page_token: Optional[str] = Field(None, description="Opaque token for the next page (null on the last page)")
+
+class EventStats(BaseModel):
+    total_events: int = Field(0, description="Total number of events")
+    high_confidence: int = Field(0, description="Events with confidence >= 0.8")
+    today_events: int = Field(0, description="Events today (server local time)")
+    this_week: int = Field(0, description="Events since Monday")
+    avg_confidence: float = Field(0.0, description="Average confidence over all events")
+    per_camera: Dict[str, int] = Field(default_factory=dict, description="Event count per camera")
+    today_by_hour: Dict[str, int] = Field(default_factory=dict, description="Today's events per hour (HH)")
+    last_event_at: Optional[float] = Field(None, description="Unix time of the latest saved event")
+
+class BulkDeleteRequest(BaseModel):
+    event_ids: List[str] = Field(..., min_length=1, max_length=5000, description="Event IDs to delete")
+    delete_images: bool = Field(True, description="Also delete the event screenshots")
+
+class BulkDeleteResult(BaseModel):
+    deleted: List[str] = Field(default_factory=list, description="Deleted event IDs")
+    images_deleted: int = Field(0, description="Deleted screenshots")
+
 class UserSettings(BaseModel):
     user_id: str = Field(..., description="User ID")
     email_notification: bool = Field(True, description="Enable email notifications")
@@ -208,40 +233,114 @@ async def health_check(db: FirestoreManager = Depends(get_firestore_manager)):
         raise HTTPException(status_code=503, detail="Health check failed")
 
 # Event Endpoints
-@router.get("/events/{user_id}", response_model=List[FallEvent])
+@router.get("/events/{user_id}", response_model=FallEventPage)
 async def get_events(
     user_id: str,
-    limit: int = Query(50, le=100, description="Maximum number of events to return"),
-    offset: int = Query(0, ge=0, description="Number of events to skip"),
+    limit: int = Query(50, ge=1, le=100, description="Maximum number of events to return"),
+    page_token: Optional[str] = Query(None, description="next_page_token from the previous page"),
     event_type: Optional[EventType] = Query(None, description="Filter by event type"),
+    camera_id: Optional[str] = Query(None, description="Filter by camera"),
+    min_confidence: Optional[float] = Query(None, ge=0.0, le=1.0, description="Minimum confidence"),
     start_date: Optional[datetime] = Query(None, description="Start date filter"),
     end_date: Optional[datetime] = Query(None, description="End date filter"),
     db: FirestoreManager = Depends(get_firestore_manager)
 ):
-    """Kullanıcının düşme olaylarını getirir."""
+    """Kullanıcının düşme olaylarını cursor tabanlı sayfalar halinde getirir."""
     try:
-        # Firestore'dan olayları getir
-        filters = {"user_id": user_id}
-        if event_type:
-            filters["event_type"] = event_type.value
-        if start_date:
-            filters["timestamp_gte"] = start_date
-        if end_date:
-            filters["timestamp_lte"] = end_date
-        
-        events = db.get_fall_events(
-            user_id=user_id,
-            limit=limit,
-            offset=offset,
-            filters=filters
+        cursor = decode_page_token(page_token)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid page token")
+    
+    try:
+        # Filtreler sorguda uygulanır - sayfa maliyeti geçmiş boyutundan bağımsız
+        events, next_cursor = await asyncio.to_thread(
+            db.get_fall_events_page,
+            user_id,
+            page_size=limit,
+            cursor=cursor,
+            start_time=start_date.timestamp() if start_date else None,
+            end_time=end_date.timestamp() if end_date else None,
+            min_confidence=min_confidence,
+            camera_id=camera_id,
+            event_type=event_type.value if event_type else None
         )
         
-        return [FallEvent(**event) for event in events]
+        return FallEventPage(
+            events=[FallEvent(**event) for event in events],
+            next_page_token=encode_page_token(next_cursor)
+        )
         
     except Exception as e:
         logging.error(f"Events getirme hatası: {e}")
         raise HTTPException(status_code=500, detail="Failed to retrieve events")
 
+@router.get("/events/{user_id}/export")
+async def export_events(
+    user_id: str,
+    format: str = Query("ndjson", description="Export format: ndjson or csv"),
+    event_type: Optional[EventType] = Query(None, description="Filter by event type"),
+    camera_id: Optional[str] = Query(None, description="Filter by camera"),
+    min_confidence: Optional[float] = Query(None, ge=0.0, le=1.0, description="Minimum confidence"),
+    start_date: Optional[datetime] = Query(None, description="Start date filter"),
+    end_date: Optional[datetime] = Query(None, description="End date filter"),
+    db: FirestoreManager = Depends(get_firestore_manager)
+):
+    """Kullanıcının olaylarını NDJSON / CSV olarak akışla dışa aktarır (sayfa sayfa okunur)."""
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format (use one of: {', '.join(EXPORT_FORMATS)})")
+    
+    events = iter_user_events(
+        db, user_id,
+        start_time=start_date.timestamp() if start_date else None,
+        end_time=end_date.timestamp() if end_date else None,
+        min_confidence=min_confidence,
+        camera_id=camera_id,
+        event_type=event_type.value if event_type else None
+    )
+    lines = iter_csv(events) if format == "csv" else iter_ndjson(events)
+    # Senkron üreteç - Starlette her parçayı thread havuzunda üretir, event loop bloklanmaz
+    return StreamingResponse(
+        lines,
+        media_type="text/csv" if format == "csv" else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="fall_events_{user_id}.{format}"'}
+    )
+
+@router.post("/events/{user_id}/bulk-delete", response_model=BulkDeleteResult)
+async def bulk_delete_events(
+    user_id: str,
+    request: BulkDeleteRequest,
+    db: FirestoreManager = Depends(get_firestore_manager),
+    storage_manager: StorageManager = Depends(get_storage_manager)
+):
+    """Birden fazla olayı toplu siler (≤500 yazmalık batch'ler + paralel görüntü silme)."""
+    try:
+        deleted = await asyncio.to_thread(db.delete_fall_events, user_id, request.event_ids)
+        images_deleted = 0
+        if request.delete_images and deleted:
+            images_deleted = await asyncio.to_thread(storage_manager.delete_screenshots, user_id, deleted)
+        await asyncio.to_thread(evict_cached_media, deleted)
+        
+        logging.info(f"Toplu silme: {user_id} - {len(deleted)} olay, {images_deleted} görüntü")
+        return BulkDeleteResult(deleted=deleted, images_deleted=images_deleted)
+        
+    except Exception as e:
+        logging.error(f"Toplu silme hatası: {e}")
+        raise HTTPException(status_code=500, detail="Failed to delete events")
+
+@router.get("/events/{user_id}/stats", response_model=EventStats)
+async def get_event_stats(
+    user_id: str,
+    db: FirestoreManager = Depends(get_firestore_manager)
+):
+    """Kullanıcının olay istatistikleri (önceden hesaplanmış özetlerden)."""
+    try:
+        stats = await asyncio.to_thread(db.get_event_stats, user_id)
+        return EventStats(**stats)
+        
+    except Exception as e:
+        logging.error(f"Event istatistikleri hatası: {e}")
+        raise HTTPException(status_code=500, detail="Failed to retrieve event stats")
+
 @router.post("/events/", response_model=FallEvent)
 async def create_event(
     event: FallEvent,
@@ -303,6 +402,7 @@ async def delete_event(
         result = db.delete_fall_event(user_id, event_id)
         if not result:
             raise HTTPException(status_code=404, detail="Event not found")
+        await asyncio.to_thread(evict_cached_media, [event_id])
         
         return {"message": "Event deleted successfully"}
         
@@ -399,25 +499,29 @@ async def get_detection_stats(detector: FallDetector = Depends(get_fall_detector
         logging.error(f"Detection stats hatası: {e}")
         raise HTTPException(status_code=500, detail="Failed to retrieve detection stats")
 
+def _camera_info_from_inventory(entry: Dict[str, Any]) -> CameraInfo:
+    """Envanter kaydını CameraInfo modeline çevirir."""
+    last_frame_time = entry.get('last_frame_time')
+    # Supervisor izliyorsa canlı sağlık durumu (healthy/degraded/down/...) önceliklidir
+    supervisor = get_camera_supervisor()
+    status = (supervisor.get_state(entry['camera_id'])
+              if supervisor.is_registered(entry['camera_id']) else entry.get('status', 'unknown'))
+    return CameraInfo(
+        camera_id=entry['camera_id'],
+        name=entry.get('name') or entry['camera_id'],
+        status=status,
+        fps=entry.get('fps', 0.0) or 0.0,
+        resolution=entry.get('resolution') or f"{FRAME_WIDTH}x{FRAME_HEIGHT}",
+        backend=entry.get('backend_name') or "unknown",
+        last_frame_time=datetime.utcfromtimestamp(last_frame_time) if last_frame_time else None
+    )
+
 @router.get("/cameras/", response_model=List[CameraInfo])
 async def get_cameras():
-    """Aktif kameraların listesini getirir."""
+    """Kameraların listesini getirir (envanter önbelleğinden - donanım probe edilmez)."""
     try:
-        available_cameras = Camera.get_available_cameras()
-        
-        camera_list = []
-        for cam_info in available_cameras:
-            camera_list.append(CameraInfo(
-                camera_id=f"camera_{cam_info['index']}",
-                name=cam_info['name'],
-                status="active" if cam_info['working'] else "inactive",
-                fps=cam_info.get('fps', 0),
-                resolution=cam_info['resolution'],
-                backend=cam_info['backend_name'],
-                last_frame_time=datetime.utcnow()
-            ))
-        
-        return camera_list
+        entries = get_camera_inventory().get_all()
+        return [_camera_info_from_inventory(entry) for entry in entries.values()]
         
     except Exception as e:
         logging.error(f"Camera listesi hatası: {e}")
@@ -425,28 +529,17 @@ async def get_cameras():
 
 @router.get("/cameras/{camera_id}/status", response_model=CameraInfo)
 async def get_camera_status(camera_id: str):
-    """Belirli bir kameranın durumunu getirir."""
+    """Belirli bir kameranın durumunu getirir (envanter önbelleğinden)."""
     try:
-        # Camera ID'den index çıkar
-        camera_index = int(camera_id.split("_")[-1])
-        
-        # Kamera durumunu kontrol et
-        camera = Camera(camera_index)
-        status = camera.get_camera_status()
-        
-        return CameraInfo(
-            camera_id=camera_id,
-            name=f"Camera {camera_index}",
-            status=status["connection"],
-            fps=status["fps"],
-            resolution=f"{FRAME_WIDTH}x{FRAME_HEIGHT}",
-            backend=status["backend_name"],
-            last_frame_time=datetime.fromtimestamp(status["last_frame_time"]) if status["last_frame_time"] > 0 else None
-        )
-        
+        entry = get_camera_inventory().get(camera_id)
     except Exception as e:
         logging.error(f"Camera status hatası: {e}")
         raise HTTPException(status_code=500, detail="Failed to retrieve camera status")
+    
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Camera not found: {camera_id}")
+    
+    return _camera_info_from_inventory(entry)
 
 # Real-time Endpoints
 @router.get("/stream/events")
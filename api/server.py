@@ -12,6 +12,8 @@ import socket
 import cv2  # Canlı yayın için OpenCV kullanıyoruz
 from http.server import HTTPServer, BaseHTTPRequestHandler
 
+from utils.jpeg_encoder import get_jpeg_encoder
+
 
 class GuardAPIHandler(BaseHTTPRequestHandler):
     """
@@ -76,16 +78,20 @@ class GuardAPIHandler(BaseHTTPRequestHandler):
         self.end_headers()
 
         cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
+        encoder = get_jpeg_encoder()
 
         try:
             while True:
                 ret, frame = cap.read()
                 if not ret:
                     break
-                _, jpeg = cv2.imencode('.jpg', frame)
+                # Thread buffer'ı üzerinde görünüm - kopyalamadan socket'e yazılır
+                jpeg = encoder.encode_view(frame)
+                if jpeg is None:
+                    continue
                 self.wfile.write(b"--frame\r\n")
                 self.wfile.write(b"Content-Type: image/jpeg\r\n\r\n")
-                self.wfile.write(jpeg.tobytes())
+                self.wfile.write(jpeg)
                 self.wfile.write(b"\r\n")
                 time.sleep(0.03)  # Yaklaşık 30 FPS
         except BrokenPipeError:
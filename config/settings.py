@@ -37,6 +37,46 @@ CAMERA_CONFIGS = [
     {"index": 2, "backend": cv2.CAP_DSHOW, "name": "Harici Kamera 2 (Ultra Stabil)"},
 ]
 
+# Dosya / ağ akışı kamera kaynakları (webcam olmayan headless sunucularda benchmark ve yük testi)
+# Ortam değişkeni: GUARD_VIDEO_SOURCES="/data/fall.mp4;rtsp://10.0.0.5/stream1"
+# Elle örnek: {"index": "file_0", "source": "/data/fall.mp4", "name": "Kayıt 0", "replay_rate": 1.0, "loop": True}
+#   replay_rate: 1.0 = gerçek zamanlı, 4.0 = 4x hız, "asap" = olabildiğince hızlı
+VIDEO_SOURCE_DEFAULTS = {
+    "replay_rate": 1.0,                   # Varsayılan oynatma hızı
+    "loop": True,                         # Dosya sonunda başa sar / akış bitince yeniden bağlan
+    "reconnect_delay": 2.0,               # Ağ akışı yeniden bağlanma beklemesi (s)
+}
+# Glass-to-alert latency tracing (frame yakalama -> kullanıcıya uyarı)
+LATENCY_TRACING_CONFIG = {
+    "enabled": True,
+    "max_spans_per_stage": 1000,          # Aşama başına ring buffer kapasitesi
+    "percentiles": (50, 90, 99),          # Özet yüzdelikleri
+    "slow_alert_threshold": 10.0,         # Bu süreyi aşan uyarılar loglanır (s)
+}
+
+# Kamera supervisor - sağlık durumları ve backoff ile yeniden başlatma
+CAMERA_SUPERVISOR_CONFIG = {
+    "check_interval": 0.5,                # Sağlık kontrol aralığı (s)
+    "degraded_frame_age": 1.0,            # Bu süre yeni frame gelmezse DEGRADED (s)
+    "down_frame_age": 5.0,                # Bu süre yeni frame gelmezse DOWN (s)
+    "backoff_base": 0.5,                  # İlk yeniden başlatma beklemesi (s)
+    "backoff_max": 30.0,                  # Maksimum bekleme (s)
+    "backoff_jitter": 0.3,                # ± oransal jitter (0.3 = %30)
+}
+
+# Kamera envanteri - paralel probe + önbellek (API istekleri donanımı probe etmez)
+CAMERA_INVENTORY_CONFIG = {
+    "probe_timeout": 3.0,                 # Tüm kameraların paralel probe süresi üst sınırı (s)
+    "refresh_interval": 60.0,             # Arka plan yenileme aralığı (s)
+    "frame_attempts": 3,                  # Probe sırasında denenecek frame sayısı
+    "max_cache_age": 300.0,               # Bu yaştan eski kayıtlar kamera doğrulamada kullanılmaz (s)
+}
+
+VIDEO_SOURCE_CONFIGS = [
+    {"index": f"source_{i}", "source": src.strip(), "name": f"Video Kaynağı {i}"}
+    for i, src in enumerate(os.environ.get("GUARD_VIDEO_SOURCES", "").split(";")) if src.strip()
+]
+
 # ULTRA OPTIMIZE: YOLOv11 optimize frame ayarları - 640x640 kare format
 FRAME_WIDTH = 640
 FRAME_HEIGHT = 640  # YOLOv11 için kare format
@@ -593,6 +633,10 @@ CAMERA_BUFFER_CONFIG = {
     "frame_skip_ai": 2,                   # 3 -> 2 (daha sık AI)
     "double_buffering": True,
     "direct_display": True,
+    "capture_mode": "grab_retrieve",      # "read" (her frame decode) | "grab_retrieve" (sadece talep edilen frame decode)
+    "preferred_fourcc": "MJPG",           # USB bant genişliği için MJPG (desteklenmezse varsayılan codec)
+    "retrieve_wait_timeout": 0.05,        # Bayat frame varsa yeni decode için max bekleme (s)
+    "stale_frame_age": 0.1,               # Bu yaştan eski frame bayat sayılır (s)
 }
 
 # TEST MODU - Geliştiriciler için
@@ -618,6 +662,144 @@ MOBILE_API_CONFIG = {
     }
 }
 
+# Asyncio (ASGI) stream sunucusu - istemci başına thread yerine tek event loop
+ASYNC_STREAM_CONFIG = {
+    "enabled": False,                    # True: Flask sunucusuyla birlikte ASGI MJPEG sunucusu da başlar (ayrı port)
+    "host": "0.0.0.0",
+    "port": 5001,
+    "max_streams": 200,                  # ASGI yolunun genel stream limiti (Flask: max_concurrent_streams)
+    "max_mobile_clients": 150,           # ASGI yolunun mobil stream limiti (Flask: MOBILE_API_CONFIG['max_clients'])
+    "mailbox_timeout": 1.0,              # Yeni frame bekleme süresi (s)
+    "status_frame_interval": 0.5,        # Kamera down iken durum frame'i aralığı (s)
+}
+
+# İstemci başına adaptif stream kalitesi (gönderim tıkanıklığına göre profil basamakları)
+ADAPTIVE_QUALITY_CONFIG = {
+    "enabled": True,
+    "desktop_ladder": ("low", "medium", "high", "ultra"),
+    "mobile_ladder": ("mobile_low", "mobile_medium", "mobile_high"),
+    "window": 2.0,                       # Ölçüm penceresi (s)
+    "min_samples": 5,                    # Karar için minimum frame sayısı
+    "congested_send_ratio": 0.6,         # Sürenin bu oranı send() içinde geçiyorsa tıkanık
+    "min_fps_ratio": 0.7,                # Teslim FPS / hedef FPS bunun altındaysa tıkanık
+    "headroom_send_ratio": 0.2,          # Bunun altı: bir üst profile çıkmaya uygun
+    "down_after": 1.0,                   # Bu kadar süre tıkanıklık → bir basamak düş (s)
+    "up_after": 8.0,                     # Bu kadar süre rahat → bir basamak çık (s)
+    "cooldown": 3.0,                     # İki değişiklik arası minimum süre (s)
+}
+
+# Pose metadata stream (JPEG yerine kompakt keypoint paketleri)
+POSE_STREAM_CONFIG = {
+    "fps": 15,                           # Metadata paket hızı (yalnız metadata aboneleri varken)
+    "default_format": "binary",          # binary | msgpack
+    "keyframe_interval": 2.0,            # Keyframe isteyen istemciler için JPEG aralığı (s)
+    "keyframe_width": 320,               # Keyframe genişliği (px)
+    "keyframe_quality": 50,              # Keyframe JPEG kalitesi
+}
+
+# Snapshot endpoint (/api/cameras/<id>/snapshot) - paylaşılan encoder cache'inden
+SNAPSHOT_CONFIG = {
+    "default_mode": "raw",               # raw | pose | detection
+    "cold_timeout": 2.0,                 # Soğuk cache'te ilk frame bekleme süresi (s)
+}
+
+# Stream sunucusu bellek cache'i (encode edilmiş frame'ler + API yanıtları)
+STREAM_CACHE_CONFIG = {
+    "max_bytes": 64 * 1024 * 1024,       # Toplam byte bütçesi (shard'lara eşit bölünür)
+    "shards": 8,                         # Kilit çekişmesini azaltmak için shard sayısı
+    "default_ttl": 300,                  # Varsayılan yaşam süresi (s)
+    "sweep_interval": 5.0,               # Süresi dolan kayıt tarama aralığı (s)
+}
+
+# Metrik kaydı (/metrics Prometheus exposition)
+METRICS_CONFIG = {
+    "merge_interval": 1.0,               # Thread akümülatörlerinin birleştirme aralığı (s)
+    "rate_smoothing": 0.5,               # Oran EWMA katsayısı (1.0 = sadece son aralık)
+}
+
+# JPEG encoder (stream, bildirim ekleri, API MJPEG, screenshot yükleme)
+JPEG_ENCODER_CONFIG = {
+    "backend": "auto",                   # auto | turbojpeg | opencv
+    "subsampling": "420",                # 444 | 422 | 420 | gray (chroma örnekleme)
+    "fast_dct": True,                    # TurboJPEG hızlı (daha az hassas) DCT
+    "default_quality": 85,               # Kalite belirtilmediğinde JPEG kalitesi
+    "screenshot_quality": 75,            # Storage'a yüklenen screenshot kalitesi
+    "initial_buffer_size": 512 * 1024,   # Thread başına çıktı buffer'ı başlangıç boyutu
+    "library_path": None,                # libturbojpeg yolu (None = otomatik bul)
+}
+
+# H.264 segment stream (mobil, PyAV / libx264 - yüklü değilse devre dışı)
+H264_STREAM_CONFIG = {
+    "enabled": True,                     # PyAV yüklüyse /mobile/stream?format=h264 ve HLS route'ları
+    "codec": "libx264",                  # ffmpeg yazılım encoder'ı
+    "preset": "ultrafast",               # x264 hız/sıkıştırma dengesi
+    "segment_duration": 1.0,             # Segment (GOP) süresi (s) - gecikme alt sınırı
+    "ring_segments": 8,                  # Bellekte tutulan segment sayısı (HLS penceresi)
+    "default_quality": "mobile_medium",  # ?quality verilmezse kullanılan profil
+    "bits_per_pixel": 0.08,              # Listede olmayan profiller için bit hızı katsayısı
+    "bitrates": {                        # Profil başına hedef bit hızı (bit/s)
+        "mobile_low": 250_000,
+        "mobile_medium": 600_000,
+        "mobile_high": 1_000_000,
+        "low": 300_000,
+        "medium": 800_000,
+        "high": 2_000_000,
+        "ultra": 4_000_000,
+    },
+    "init_timeout": 5.0,                 # İlk init segmenti bekleme süresi (s)
+    "hls_linger": 15.0,                  # Son HLS isteğinden sonra encoder'ın açık kalma süresi (s)
+    "hls_block_timeout": 3.0,            # _HLS_msn bloklayan playlist isteği üst sınırı (s)
+}
+
+# Süreç içi düşme uyarısı bus'ı (Socket.IO / SSE / dashboard / bildirim aboneleri)
+ALERT_BUS_CONFIG = {
+    "episode_gap": 10.0,                 # Bu süre algı gelmezse kameradaki düşme olayı kapanır (s)
+    "queue_size": 32,                    # Abone başına kuyruk sınırı (dolunca en eski düşer)
+    "history_size": 100,                 # /api/mobile/alerts/recent için tutulan son uyarılar
+    "sse_keepalive": 15.0,               # SSE akışında keepalive yorum aralığı (s)
+}
+
+# Dashboard çoklu kamera ızgarası (thumbnail'lar algılama thread'lerinde üretilir)
+DASHBOARD_GRID_CONFIG = {
+    "tile_fps": 5,                       # Odakta olmayan tile'ların güncelleme sınırı (frame/s)
+    "fall_highlight_hold": 5.0,          # Son düşme algısından sonra tile'ın kırmızı kalma süresi (s)
+    "max_columns": 3,                    # Izgaradaki en fazla sütun sayısı
+    "initial_tile_size": (320, 240),     # İlk yerleşimden önce kullanılan thumbnail boyutu
+}
+
+# Geçmiş ekranı sanal kart listesi (sadece görünür kartlar çizilir, kaydırırken geri dönüştürülür)
+HISTORY_VIEW_CONFIG = {
+    "max_columns": 3,                    # Kart görünümündeki en fazla sütun sayısı
+    "overscan_rows": 1,                  # Görünür alanın üstünde/altında önceden bağlanan satırlar
+    "thumbnail_workers": 2,              # Thumbnail indirme/decode thread sayısı
+    "thumbnail_cache_size": 300,         # Bellekte tutulan kart thumbnail'ı (PhotoImage) sayısı
+    "gradient_cache_size": 16,           # Önceden çizilmiş gradient görüntüsü sayısı
+    "page_size": 60,                     # Sayfa başına yüklenen olay sayısı (cursor sayfalama)
+    "load_more_rows": 2,                 # Listenin sonuna bu kadar satır kala sonraki sayfa istenir
+    "filter_debounce_ms": 300,           # Güven kaydırıcısı bırakılmadan sorgu atılmaz (ms)
+    "search_debounce_ms": 150,           # Arama kutusunda yazma durunca indeks sorgulanır (ms)
+}
+
+# Geçmiş ekranı görüntü önbelleği (bellek LRU + disk LRU + havuzlu HTTP oturumu)
+HISTORY_MEDIA_CACHE_CONFIG = {
+    "disk_max_mb": 512,                  # Disk önbelleği üst sınırı (aşılınca en eski dosyalar silinir)
+    "memory_max_mb": 128,                # Decode edilmiş görüntüler için bellek bütçesi
+    "pool_size": 8,                      # HTTP bağlantı havuzu boyutu (keep-alive)
+    "retries": 2,                        # Bağlantı hatalarında yeniden deneme sayısı
+    "request_timeout": 10.0,             # İndirme zaman aşımı (s)
+    "thumbnail_quality": 80,             # Diske yazılan kart thumbnail'larının JPEG kalitesi
+    "prefetch_neighbors": 3,             # Seçilen olayın önünde/arkasında ön yüklenen olay sayısı
+    "prefetch_workers": 2,               # Ön yükleme thread sayısı
+    "prefetch_queue_size": 64,           # Bekleyen ön yükleme isteği sınırı (en eskiler düşer)
+}
+
+# Geçmiş ekranı toplu silme / dışa aktarma
+BULK_OPERATIONS_CONFIG = {
+    "storage_delete_workers": 8,         # Paralel ekran görüntüsü silme isteği sayısı
+    "export_page_size": 200,             # Dışa aktarmada veritabanından sayfa başına okunan olay
+    "export_image_workers": 4,           # Zip'e eklenecek görüntüleri paralel indiren thread sayısı
+}
+
 # Ek yardımcı fonksiyonlar için sabitler
 CONSTANTS = {
     "PI": 3.14159265359,
@@ -0,0 +1,187 @@
+# =======================================================================================
+# === PROGRAM AÇIKLAMASI ===
+# Dosya Adı: adaptive_quality.py (İSTEMCİ BAŞINA ADAPTİF STREAM KALİTESİ)
+# Konum: pc/core/adaptive_quality.py
+# Açıklama:
+# Her stream istemcisinin gönderim tıkanıklığını (send() içinde geçen süre = socket
+# buffer backlog'u) ve teslim hızını izler; çözünürlük / JPEG kalitesi / FPS'i
+# profil basamakları arasında aşağı veya yukarı taşır. Kötü Wi-Fi'deki istemci,
+# gecikmeli eski frame'ler yerine düşük kalitede taze frame almaya devam eder.
+
+# === KARAR KURALLARI ===
+# - Tıkanık : send oranı > congested_send_ratio veya teslim FPS < hedef * min_fps_ratio
+# - Rahat   : send oranı < headroom_send_ratio ve teslim FPS hedefe yakın
+# - down_after süre tıkanık → bir basamak aşağı, up_after süre rahat → bir basamak yukarı
+# - Yukarı çıkış istemcinin istediği profil (tavan) ile sınırlı; 'auto' tavansızdır
+# =======================================================================================
+
+import threading
+import time
+from collections import deque
+
+from config.settings import ADAPTIVE_QUALITY_CONFIG
+
+AUTO_QUALITY = "auto"
+
+# Masaüstü profil adının mobil karşılığı
+MOBILE_EQUIVALENTS = {
+    "low": "mobile_low",
+    "medium": "mobile_medium",
+    "high": "mobile_high",
+    "ultra": "mobile_high",
+}
+
+
+def select_ladder(quality, mobile, profiles):
+    """
+    İstemci için profil basamakları ve başlangıç/tavan profilini belirler.
+
+    Returns:
+        tuple: (ladder, start_quality, ceiling_quality)
+    """
+    ladder_key = "mobile_ladder" if mobile else "desktop_ladder"
+    ladder = [name for name in ADAPTIVE_QUALITY_CONFIG.get(ladder_key, ()) if name in profiles]
+    if not ladder:
+        ladder = [name for name in ("low", "medium", "high", "ultra") if name in profiles]
+
+    if mobile and quality in MOBILE_EQUIVALENTS and quality not in ladder:
+        quality = MOBILE_EQUIVALENTS[quality]
+
+    if quality == AUTO_QUALITY:
+        # auto: ortadan başla, tavan yok
+        return ladder, ladder[len(ladder) // 2], ladder[-1]
+
+    if quality not in ladder:
+        # Basamak dışı profil - sabit kalır
+        quality = quality if quality in profiles else "medium"
+        return [quality], quality, quality
+
+    return ladder, quality, quality
+
+
+class AdaptiveQualityController:
+    """Tek istemcinin profil seçimini ölçümlere göre günceller."""
+
+    def __init__(self, client_id, camera_id, quality, profiles, mobile=False, enabled=None):
+        self.client_id = client_id
+        self.camera_id = camera_id
+        self.mobile = mobile
+        self.profiles = profiles
+        self.enabled = ADAPTIVE_QUALITY_CONFIG.get('enabled', True) if enabled is None else enabled
+        self.requested_quality = quality
+
+        self.ladder, self.quality, self.ceiling = select_ladder(quality, mobile, profiles)
+        if not self.enabled:
+            self.ladder = [self.quality]
+
+        cfg = ADAPTIVE_QUALITY_CONFIG
+        self.window = cfg.get('window', 2.0)
+        self.min_samples = cfg.get('min_samples', 5)
+        self.congested_send_ratio = cfg.get('congested_send_ratio', 0.6)
+        self.min_fps_ratio = cfg.get('min_fps_ratio', 0.7)
+        self.headroom_send_ratio = cfg.get('headroom_send_ratio', 0.2)
+        self.down_after = cfg.get('down_after', 1.0)
+        self.up_after = cfg.get('up_after', 8.0)
+        self.cooldown = cfg.get('cooldown', 3.0)
+
+        self._samples = deque()          # (t, nbytes, send_time)
+        self._congested_since = None
+        self._headroom_since = None
+        self._last_switch = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.connected_at = time.time()
+        self.total_frames = 0
+        self.total_bytes = 0
+        self.switches = 0
+        self.last_metrics = {'delivered_fps': 0.0, 'throughput_kbps': 0.0, 'send_ratio': 0.0}
+
+    @property
+    def profile(self):
+        return self.profiles[self.quality]
+
+    def record_frame(self, nbytes, send_time, source_fps=None):
+        """
+        Teslim edilen frame'i kaydeder; profil değişirse yeni profil adını döndürür.
+
+        Args:
+            nbytes: Gönderilen chunk boyutu
+            send_time: yield/send içinde geçen süre (socket backlog göstergesi)
+            source_fps: Producer'ın gerçek FPS'i (kamera yavaşsa istemci suçlanmaz)
+        """
+        now = time.monotonic()
+        with self._lock:
+            self.total_frames += 1
+            self.total_bytes += nbytes
+            self._samples.append((now, nbytes, send_time))
+            while self._samples and now - self._samples[0][0] > self.window:
+                self._samples.popleft()
+
+            if len(self._samples) < self.min_samples:
+                return None
+
+            span = max(now - self._samples[0][0], 1e-3)
+            delivered_fps = (len(self._samples) - 1) / span
+            send_ratio = min(1.0, sum(s[2] for s in self._samples) / span)
+            throughput = sum(s[1] for s in self._samples) * 8 / 1000.0 / span
+            self.last_metrics = {
+                'delivered_fps': round(delivered_fps, 1),
+                'throughput_kbps': round(throughput, 1),
+                'send_ratio': round(send_ratio, 2),
+            }
+
+            if len(self.ladder) < 2:
+                return None
+
+            target_fps = self.profile['fps']
+            if source_fps:
+                target_fps = min(target_fps, source_fps)
+
+            congested = (send_ratio > self.congested_send_ratio or
+                         delivered_fps < target_fps * self.min_fps_ratio)
+            headroom = (send_ratio < self.headroom_send_ratio and
+                        delivered_fps >= target_fps * 0.9)
+
+            self._congested_since = (self._congested_since or now) if congested else None
+            self._headroom_since = (self._headroom_since or now) if headroom else None
+
+            if now - self._last_switch < self.cooldown:
+                return None
+
+            index = self.ladder.index(self.quality)
+            if self._congested_since and now - self._congested_since >= self.down_after and index > 0:
+                return self._switch(self.ladder[index - 1], now)
+
+            ceiling_index = self.ladder.index(self.ceiling) if self.ceiling in self.ladder else len(self.ladder) - 1
+            if self._headroom_since and now - self._headroom_since >= self.up_after and index < ceiling_index:
+                return self._switch(self.ladder[index + 1], now)
+
+        return None
+
+    def _switch(self, quality, now):
+        self.quality = quality
+        self.switches += 1
+        self._last_switch = now
+        self._congested_since = None
+        self._headroom_since = None
+        self._samples.clear()
+        return quality
+
+    def get_stats(self):
+        with self._lock:
+            profile = self.profile
+            return {
+                'camera_id': self.camera_id,
+                'mobile': self.mobile,
+                'adaptive': self.enabled and len(self.ladder) > 1,
+                'requested_quality': self.requested_quality,
+                'quality': self.quality,
+                'resolution': f"{profile['width']}x{profile['height']}",
+                'fps': profile['fps'],
+                'jpeg_quality': profile['quality'],
+                'switches': self.switches,
+                'total_frames': self.total_frames,
+                'total_bytes': self.total_bytes,
+                'connected_for': round(time.time() - self.connected_at, 1),
+                **self.last_metrics,
+            }
@@ -0,0 +1,294 @@
+# =======================================================================================
+# === PROGRAM AÇIKLAMASI ===
+# Dosya Adı: alert_bus.py (SÜREÇ İÇİ DÜŞME UYARISI YAYIN/ABONE SİSTEMİ)
+# Konum: pc/core/alert_bus.py
+# Açıklama:
+# Düşme uyarıları tek noktadan yayınlanır. Algılama tarafı (stream broadcaster, masaüstü
+# algılama döngüsü) her pozitif frame'de publish() çağırabilir; bus kamera başına düşme
+# olayını (episode) takip eder ve olay başına yalnızca BİR uyarı dağıtır. Socket.IO,
+# SSE, Tk dashboard ve bildirim/kayıt tüketicileri kendi sınırlı kuyruklarından okur;
+# yavaş bir abone yayıncıyı veya diğer aboneleri bloklamaz.
+
+# === OLAY (EPISODE) MANTIĞI ===
+# - Kameradaki ilk düşme algısı yeni olay açar ve uyarı yayınlanır
+# - episode_gap saniye içinde gelen sonraki algılar aynı olaya sayılır (bastırılır)
+# - Olay içinde en yüksek güven ve algı sayısı tutulur (istatistik için)
+
+# === ABONELER ===
+# - subscribe(name)                 : çekme (pull) - get(timeout) ile okunur (SSE)
+# - subscribe(name, handler=fn)     : itme (push) - abone başına worker thread fn(alert) çağırır
+# - Kuyruk dolarsa en eski uyarı düşer ve 'dropped' sayacı artar
+# - Teslim gecikmesi (publish → abonenin alması) abone adı etiketiyle histograma yazılır
+# =======================================================================================
+
+import threading
+import logging
+import time
+import uuid
+from collections import deque
+
+from config.settings import ALERT_BUS_CONFIG
+from utils.latency_tracer import get_latency_tracer
+from utils.metrics import get_metrics_registry
+
+DELIVERY_METRIC = 'guard_alert_delivery_seconds'
+ALERTS_METRIC = 'guard_alerts_total'
+DROPPED_METRIC = 'guard_alert_dropped_total'
+
+
+class Alert:
+    """Tek düşme olayının uyarısı - tüm abonelere aynı nesne dağıtılır (salt okunur)."""
+
+    __slots__ = ('id', 'camera_id', 'confidence', 'track_id', 'source', 'detected_at',
+                 'published_at', 'frame', 'trace', 'context', 'extra')
+
+    def __init__(self, camera_id, confidence, track_id, source, detected_at, frame=None,
+                 trace=None, context=None, extra=None):
+        self.id = str(uuid.uuid4())
+        self.camera_id = camera_id
+        self.confidence = float(confidence)
+        self.track_id = track_id
+        self.source = source
+        self.detected_at = detected_at
+        self.published_at = time.time()
+        self.frame = frame
+        self.trace = trace
+        self.context = context or {}     # Süreç içi aboneler için (JSON'a yazılmaz)
+        self.extra = extra or {}         # to_dict()'e eklenen JSON uyumlu alanlar
+
+    def to_dict(self):
+        """JSON uyumlu gösterim (frame, trace ve context hariç)."""
+        return {
+            'event_id': self.id,
+            'camera_id': self.camera_id,
+            'confidence': self.confidence,
+            'track_id': self.track_id,
+            'source': self.source,
+            'timestamp': self.published_at,
+            'detected_at': self.detected_at,
+            **self.extra,
+        }
+
+
+class AlertSubscription:
+    """Tek abonenin sınırlı kuyruğu (ve handler verilmişse worker thread'i)."""
+
+    def __init__(self, bus, name, maxsize, handler=None):
+        self.bus = bus
+        self.name = name
+        self.handler = handler
+        self.condition = threading.Condition()
+        self.queue = deque(maxlen=maxsize)
+        self.closed = False
+
+        self.delivered = 0
+        self.dropped = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+        self._thread = None
+        if handler is not None:
+            self._thread = threading.Thread(target=self._run, name=f"alert-{name}", daemon=True)
+            self._thread.start()
+
+    def _offer(self, alert):
+        """Yayıncı tarafından çağrılır - asla bloklamaz."""
+        with self.condition:
+            if self.closed:
+                return
+            if len(self.queue) == self.queue.maxlen:
+                self.dropped += 1
+                self.bus.registry.inc(DROPPED_METRIC, (('subscriber', self.name),))
+            self.queue.append(alert)
+            self.condition.notify()
+
+    def get(self, timeout=None):
+        """
+        Sıradaki uyarıyı al.
+
+        Returns:
+            Alert: Uyarı veya zaman aşımında/kapanışta None
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        with self.condition:
+            while not self.queue and not self.closed:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self.condition.wait(remaining)
+            if not self.queue:
+                return None
+            alert = self.queue.popleft()
+
+        latency = time.time() - alert.published_at
+        self.delivered += 1
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+        self.bus.registry.observe(DELIVERY_METRIC, latency, (('subscriber', self.name),))
+        get_latency_tracer().record_span(alert.trace, f'alert_bus.{self.name}', alert.published_at)
+        return alert
+
+    def _run(self):
+        while not self.closed:
+            alert = self.get(timeout=1.0)
+            if alert is None:
+                continue
+            try:
+                self.handler(alert)
+            except Exception as e:
+                logging.error(f"Alert abonesi '{self.name}' hatası: {e}")
+
+    def close(self):
+        self.bus.unsubscribe(self)
+        with self.condition:
+            self.closed = True
+            self.queue.clear()
+            self.condition.notify_all()
+
+    def get_stats(self):
+        with self.condition:
+            pending = len(self.queue)
+        return {
+            'pending': pending,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'avg_latency_ms': round(self.latency_total / self.delivered * 1000, 2) if self.delivered else 0.0,
+            'max_latency_ms': round(self.latency_max * 1000, 2),
+        }
+
+
+class AlertBus:
+    """Kamera başına olay tekilleştirmeli, sınırlı kuyruklu süreç içi uyarı yayını."""
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, episode_gap=None, queue_size=None, history_size=None):
+        self.episode_gap = episode_gap or ALERT_BUS_CONFIG.get('episode_gap', 10.0)
+        self.queue_size = queue_size or ALERT_BUS_CONFIG.get('queue_size', 32)
+        self.history_size = history_size or ALERT_BUS_CONFIG.get('history_size', 100)
+        self._lock = threading.Lock()
+        self._subscriptions = []
+        self._episodes = {}      # camera_id -> {'alert', 'last_seen', 'detections', 'peak_confidence'}
+        self._recent = deque(maxlen=self.history_size)
+        self.published = 0
+        self.suppressed = 0
+
+        self.registry = get_metrics_registry()
+        self.registry.describe(DELIVERY_METRIC, 'histogram', "Uyarının yayınlanmasından aboneye teslimine süre")
+        self.registry.describe(ALERTS_METRIC, 'counter', "Düşme algıları (published / suppressed)")
+        self.registry.describe(DROPPED_METRIC, 'counter', "Kuyruk dolduğu için düşen uyarılar")
+
+    # ----- Abonelik -----
+
+    def subscribe(self, name, handler=None, maxsize=None):
+        """
+        Uyarılara abone ol.
+
+        Args:
+            name (str): Abone adı (metrik etiketi)
+            handler (callable): Verilirse worker thread'de handler(alert) çağrılır
+            maxsize (int): Kuyruk sınırı (varsayılan: queue_size)
+
+        Returns:
+            AlertSubscription: close() ile abonelik sonlandırılır
+        """
+        subscription = AlertSubscription(self, name, maxsize or self.queue_size, handler)
+        with self._lock:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    # ----- Yayın -----
+
+    def publish(self, camera_id, confidence, track_id=None, frame=None, source='', trace=None,
+                detected_at=None, context=None, **extra):
+        """
+        Düşme algısını bildir; yeni olaysa uyarı tüm abonelere dağıtılır.
+
+        Returns:
+            Alert: Yeni olay uyarısı veya aynı olayın tekrarıysa None
+        """
+        now = time.time()
+        with self._lock:
+            episode = self._episodes.get(camera_id)
+            if episode is not None and now - episode['last_seen'] < self.episode_gap:
+                episode['last_seen'] = now
+                episode['detections'] += 1
+                episode['peak_confidence'] = max(episode['peak_confidence'], float(confidence))
+                self.suppressed += 1
+                suppressed = True
+            else:
+                # Frame sadece yeni olayda kopyalanır - yayıncı kendi buffer'ını kullanmaya devam eder
+                alert = Alert(camera_id, confidence, track_id, source, detected_at or now,
+                              frame=frame.copy() if frame is not None else None, trace=trace,
+                              context=context, extra=extra)
+                self._episodes[camera_id] = {'alert': alert, 'last_seen': now, 'detections': 1,
+                                             'peak_confidence': alert.confidence}
+                self._recent.append(alert)
+                self.published += 1
+                subscriptions = list(self._subscriptions)
+                suppressed = False
+
+        self.registry.inc(ALERTS_METRIC, (('camera', camera_id), ('result', 'suppressed' if suppressed else 'published')))
+        if suppressed:
+            return None
+
+        # Kuyruklara kilit dışında eklenir
+        for subscription in subscriptions:
+            subscription._offer(alert)
+        logging.warning(f"🚨 Düşme uyarısı yayınlandı: {camera_id} ({source}), ID: {track_id}, "
+                        f"Güven: {alert.confidence:.3f} → {len(subscriptions)} abone")
+        return alert
+
+    # ----- Sorgu -----
+
+    def recent(self, limit=50, since=None):
+        """Son yayınlanan uyarılar (yeniden eskiye, JSON uyumlu)."""
+        with self._lock:
+            alerts = list(self._recent)
+        if since is not None:
+            alerts = [alert for alert in alerts if alert.published_at >= since]
+        return [alert.to_dict() for alert in reversed(alerts[-limit:])]
+
+    def get_stats(self):
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+            episodes = {camera_id: {'event_id': episode['alert'].id,
+                                    'detections': episode['detections'],
+                                    'peak_confidence': round(episode['peak_confidence'], 3),
+                                    'active': time.time() - episode['last_seen'] < self.episode_gap}
+                        for camera_id, episode in self._episodes.items()}
+        subscribers = {}
+        for subscription in subscriptions:
+            # Aynı adlı aboneler (ör. SSE istemcileri) #n ile ayrılır
+            key = subscription.name
+            index = 2
+            while key in subscribers:
+                key = f"{subscription.name}#{index}"
+                index += 1
+            subscribers[key] = subscription.get_stats()
+        return {
+            'published': self.published,
+            'suppressed': self.suppressed,
+            'episode_gap': self.episode_gap,
+            'episodes': episodes,
+            'subscribers': subscribers,
+        }
+
+
+def get_alert_bus():
+    """Global uyarı bus'ı."""
+    return AlertBus.get_instance()
@@ -0,0 +1,354 @@
+# =======================================================================================
+# === PROGRAM AÇIKLAMASI ===
+# Dosya Adı: async_stream_server.py (ASYNCIO / ASGI STREAM SUNUCUSU)
+# Konum: pc/core/async_stream_server.py
+# Açıklama:
+# /video_feed/* ve /mobile/stream/* MJPEG route'larının asyncio tabanlı sürümü.
+# Flask sunucusu her istemci için bir thread ayırır ve time.sleep ile tempo tutar;
+# burada tüm istemciler tek event loop'ta çalışır. Her istemcinin "latest-frame-wins"
+# posta kutusu vardır: yavaş istemci frame biriktirmez, eski frame'in üzerine yenisi
+# yazılır ve istemci sadece en güncel frame'i alır.
+
+# === ÖZELLİKLER ===
+# - Kamera başına paylaşılan CameraBroadcaster (tek inference + tek encode)
+# - Producer thread → event loop push (call_soon_threadsafe)
+# - Eşzamanlı stream limitleri: ASYNC_STREAM_CONFIG['max_streams'] / ['max_mobile_clients']
+#   (thread'li Flask yolunun küçük limitleri burada kullanılmaz - yüzlerce izleyici hedeflenir)
+# - ASYNC_STREAM_CONFIG['enabled'] ise run_stream_server bu sunucuyu aynı EnhancedStreamServer
+#   üzerinde ayrı portta başlatır (start_async_stream_server_thread); Flask route'ları kalır
+# - Limit aşımında 503 + Retry-After
+# - Limit kontrolüyle aynı adımda yer ayrılır (rezervasyon); aynı anda gelen bağlantılar
+#   kamera başlatma beklenirken limiti aşamaz. Generator başlayınca rezervasyon istemciye döner.
+# =======================================================================================
+
+import asyncio
+import itertools
+import logging
+import threading
+import time
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from config.settings import ASYNC_STREAM_CONFIG
+from core.adaptive_quality import AdaptiveQualityController, AUTO_QUALITY
+from core.stream_server import CameraBroadcaster, get_stream_server
+
+MJPEG_MEDIA_TYPE = "multipart/x-mixed-replace; boundary=frame"
+NO_CACHE_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Cache-Control': 'no-cache, no-store, must-revalidate',
+    'Pragma': 'no-cache',
+    'Expires': '0',
+}
+RESERVATION_TTL = 30.0   # Generator'ı hiç başlamayan yanıtların ayırdığı yer bu süre sonra bırakılır (s)
+
+
+class LatestFrameMailbox:
+    """
+    Tek slotlu posta kutusu - yeni frame eskisinin üzerine yazılır.
+
+    put_threadsafe producer thread'inden, get event loop'tan çağrılır.
+    """
+
+    def __init__(self, loop):
+        self.loop = loop
+        self._item = None
+        self._event = asyncio.Event()
+        self.delivered = 0
+        self.dropped = 0          # Okunmadan üzerine yazılan frame sayısı
+
+    def put_threadsafe(self, seq, chunk):
+        try:
+            self.loop.call_soon_threadsafe(self._put, seq, chunk)
+        except RuntimeError:
+            pass  # Event loop kapandı
+
+    def _put(self, seq, chunk):
+        if self._item is not None:
+            self.dropped += 1
+        self._item = (seq, chunk)
+        self._event.set()
+
+    async def get(self, timeout):
+        """En güncel (seq, chunk) veya zaman aşımında None."""
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        self._event.clear()
+        item, self._item = self._item, None
+        if item is not None:
+            self.delivered += 1
+        return item
+
+
+class AsyncStreamServer:
+    """EnhancedStreamServer kamera/broadcaster altyapısı üzerinde asyncio MJPEG sunucusu."""
+
+    def __init__(self, stream_server=None, max_streams=None, max_mobile_clients=None):
+        self.server = stream_server or get_stream_server()
+        self.max_streams = max_streams or ASYNC_STREAM_CONFIG.get('max_streams', 200)
+        self.max_mobile_clients = max_mobile_clients or ASYNC_STREAM_CONFIG.get('max_mobile_clients', 150)
+        self.mailbox_timeout = ASYNC_STREAM_CONFIG.get('mailbox_timeout', 1.0)
+        self.status_frame_interval = ASYNC_STREAM_CONFIG.get('status_frame_interval', 0.5)
+
+        self.clients = {}                 # client_id -> istemci kaydı
+        self._client_ids = itertools.count(1)
+        self._reservations = {}           # client_id -> (mobile, bitiş zamanı) - henüz başlamamış stream'ler
+        self._status_frames = {}          # mesaj -> hazır error frame (tekrar encode edilmez)
+
+        self.app = self._create_app()
+
+    # ----- Limitler -----
+
+    def _count_clients(self, mobile):
+        now = time.monotonic()
+        for client_id, (_, expires_at) in list(self._reservations.items()):
+            if expires_at < now:
+                self._reservations.pop(client_id, None)
+        reserved = sum(1 for reserved_mobile, _ in self._reservations.values() if reserved_mobile == mobile)
+        return reserved + sum(1 for c in self.clients.values() if c['mobile'] == mobile)
+
+    def _reserve(self, mobile):
+        """Limit kontrolünden hemen sonra (await olmadan) yer ayırır."""
+        client_id = f"async-{next(self._client_ids)}"
+        self._reservations[client_id] = (mobile, time.monotonic() + RESERVATION_TTL)
+        return client_id
+
+    def _limit_reached(self, mobile):
+        if mobile:
+            return self._count_clients(True) >= self.max_mobile_clients
+        return self._count_clients(False) >= self.max_streams
+
+    def _status_frame(self, message):
+        frame = self._status_frames.get(message)
+        if frame is None:
+            frame = self.server._generate_error_frame(message)
+            self._status_frames[message] = frame
+        return frame
+
+    # ----- Stream -----
+
+    async def _stream(self, camera_id, quality, include_pose, include_detection, mobile):
+        server = self.server
+        loop = asyncio.get_running_loop()
+
+        if camera_id not in server.cameras:
+            return JSONResponse({"error": f"Kamera {camera_id} bulunamadı"}, status_code=404,
+                                headers={'Access-Control-Allow-Origin': '*'})
+
+        if self._limit_reached(mobile):
+            logging.warning(f"Async stream limiti doldu ({'mobil' if mobile else 'genel'}): {camera_id}")
+            return JSONResponse({"error": "Maksimum eşzamanlı stream sayısına ulaşıldı"},
+                                status_code=503, headers={'Retry-After': '5',
+                                                          'Access-Control-Allow-Origin': '*'})
+        client_id = self._reserve(mobile)
+
+        # Kamera start() bloklayabilir - event loop'u tutma
+        try:
+            start_error = await loop.run_in_executor(None, server.ensure_camera_started, camera_id)
+        except BaseException:
+            self._reservations.pop(client_id, None)
+            raise
+        if start_error:
+            self._reservations.pop(client_id, None)
+            return StreamingResponse(iter([self._status_frame(start_error)]),
+                                     media_type=MJPEG_MEDIA_TYPE, headers=NO_CACHE_HEADERS)
+
+        if quality not in server.quality_profiles and quality != AUTO_QUALITY:
+            quality = 'medium'
+
+        mode = CameraBroadcaster.mode_for(include_pose, include_detection)
+        return StreamingResponse(self._client_frames(client_id, camera_id, quality, mode, mobile),
+                                 media_type=MJPEG_MEDIA_TYPE, headers=NO_CACHE_HEADERS)
+
+    async def _client_frames(self, client_id, camera_id, quality, mode, mobile):
+        """İstemci başına async generator - send() geri basıncı yavaş istemciyi yavaşlatır,
+        posta kutusu ise ara frame'leri düşürür."""
+        server = self.server
+        camera_info = server.cameras[camera_id]
+
+        controller = AdaptiveQualityController(client_id, camera_id, quality,
+                                               server.quality_profiles, mobile=mobile)
+        quality = controller.quality
+        frame_interval = 1.0 / controller.profile['fps']
+        server.stream_clients[client_id] = controller
+
+        mailbox = LatestFrameMailbox(asyncio.get_running_loop())
+        self._reservations.pop(client_id, None)  # Rezervasyon istemci kaydına dönüşür (await yok)
+        client = self.clients[client_id] = {
+            'camera_id': camera_id,
+            'quality': quality,
+            'mode': mode,
+            'mobile': mobile,
+            'mailbox': mailbox,
+            'controller': controller,
+            'connected_at': time.time(),
+        }
+
+        broadcaster = server.get_broadcaster(camera_id)
+        token = broadcaster.subscribe(mode, quality, callback=mailbox.put_threadsafe)
+        camera_info['active_streams'] += 1
+        server.analytics.record_event('stream_start', camera_id)
+        logging.info(f"Async stream başlatıldı: {camera_id} (Quality: {quality}, Client: {client_id})")
+
+        try:
+            while server.is_running:
+                loop_start = time.monotonic()
+
+                # Kamera down/recovering - durum frame'i (önbellekten)
+                if not server.supervisor.is_available(camera_id) and \
+                        server.supervisor.is_registered(camera_id):
+                    state = server.supervisor.get_state(camera_id)
+                    yield self._status_frame(f"Kamera {camera_id}: {state}")
+                    await asyncio.sleep(self.status_frame_interval)
+                    continue
+
+                item = await mailbox.get(self.mailbox_timeout)
+                if item is None:
+                    if not broadcaster.running:
+                        # Producer idle timeout ile kapandıysa yeniden abone ol
+                        broadcaster.unsubscribe(token)
+                        token = broadcaster.subscribe(mode, quality, callback=mailbox.put_threadsafe)
+                    continue
+
+                # StreamingResponse send() bitince generator'a döner - transport
+                # yazma tamponu doluysa (yavaş istemci) bu süre uzar
+                send_start = time.perf_counter()
+                yield item[1]
+                send_time = time.perf_counter() - send_start
+
+                camera_info['total_frames'] += 1
+                camera_info['last_access'] = time.time()
+                server.analytics.record_event('frame_served', camera_id)
+                server.analytics.observe('guard_stream_frame_send_seconds', send_time, camera_id)
+
+                new_quality = controller.record_frame(len(item[1]), send_time, broadcaster.fps)
+                if new_quality:
+                    logging.info(f"Async stream kalitesi değişti: {client_id} {quality} → {new_quality}")
+                    quality = new_quality
+                    client['quality'] = quality
+                    broadcaster.update_subscription(token, mode, quality)
+                    frame_interval = 1.0 / controller.profile['fps']
+
+                # Profil FPS'inin üstüne çıkma
+                remaining = frame_interval - (time.monotonic() - loop_start)
+                if remaining > 0:
+                    await asyncio.sleep(remaining)
+
+        finally:
+            # İstemci bağlantıyı kestiğinde de (CancelledError/GeneratorExit) çalışır
+            broadcaster.unsubscribe(token)
+            camera_info['active_streams'] -= 1
+            server.analytics.record_event('stream_end', camera_id)
+            self.clients.pop(client_id, None)
+            server.stream_clients.pop(client_id, None)
+            logging.info(f"Async stream sonlandı: {camera_id} (Client: {client_id}, "
+                         f"teslim: {mailbox.delivered}, düşürülen: {mailbox.dropped})")
+
+    def get_client_stats(self):
+        return {
+            'max_streams': self.max_streams,
+            'max_mobile_clients': self.max_mobile_clients,
+            'clients': {
+                client_id: {
+                    'camera_id': c['camera_id'],
+                    'quality': c['quality'],
+                    'mode': c['mode'],
+                    'mobile': c['mobile'],
+                    'delivered': c['mailbox'].delivered,
+                    'dropped': c['mailbox'].dropped,
+                    'connected_for': round(time.time() - c['connected_at'], 1),
+                    'adaptive': c['controller'].get_stats(),
+                }
+                for client_id, c in list(self.clients.items())
+            }
+        }
+
+    # ----- Route'lar -----
+
+    def _create_app(self):
+        app = FastAPI(title="Guard AI Async Stream Server")
+
+        @app.get('/video_feed/{camera_id}')
+        async def video_feed(camera_id: str, quality: str = 'medium'):
+            return await self._stream(camera_id, quality, False, False, mobile=False)
+
+        @app.get('/video_feed/{camera_id}/pose')
+        async def video_feed_pose(camera_id: str, quality: str = 'medium'):
+            return await self._stream(camera_id, quality, True, False, mobile=False)
+
+        @app.get('/video_feed/{camera_id}/detection')
+        async def video_feed_detection(camera_id: str, quality: str = 'medium'):
+            return await self._stream(camera_id, quality, True, True, mobile=False)
+
+        @app.get('/mobile/stream/{camera_id}')
+        async def mobile_video_feed(camera_id: str, quality: str = 'medium'):
+            return await self._stream(camera_id, quality, False, False, mobile=True)
+
+        @app.get('/mobile/stream/{camera_id}/pose')
+        async def mobile_video_feed_pose(camera_id: str, quality: str = 'medium'):
+            return await self._stream(camera_id, quality, True, False, mobile=True)
+
+        @app.get('/mobile/stream/{camera_id}/detection')
+        async def mobile_video_feed_detection(camera_id: str, quality: str = 'high'):
+            return await self._stream(camera_id, quality, True, True, mobile=True)
+
+        @app.get('/api/stream_clients')
+        async def stream_clients():
+            return self.get_client_stats()
+
+        return app
+
+
+def start_async_stream_server_thread(stream_server, host=None, port=None):
+    """
+    Async stream sunucusunu çalışan EnhancedStreamServer üzerinde daemon thread'de başlatır.
+    Kamera ve broadcaster yaşam döngüsü Flask sunucusunda kalır.
+    """
+    import uvicorn
+
+    host = host or ASYNC_STREAM_CONFIG.get('host', '0.0.0.0')
+    port = port or ASYNC_STREAM_CONFIG.get('port', 5001)
+    async_server = AsyncStreamServer(stream_server=stream_server)
+    server = uvicorn.Server(uvicorn.Config(async_server.app, host=host, port=port, log_level="warning"))
+
+    thread = threading.Thread(target=server.run, daemon=True, name="AsyncStreamServer")
+    thread.start()
+    logging.info(f"⚡ Async Stream Server: http://{host}:{port} "
+                 f"(limit: {async_server.max_streams} genel / {async_server.max_mobile_clients} mobil)")
+    return async_server, server
+
+
+def run_async_stream_server(host=None, port=None, max_streams=None, max_mobile_clients=None):
+    """Async stream sunucusunu uvicorn ile çalıştır (bloklar)."""
+    import uvicorn
+
+    host = host or ASYNC_STREAM_CONFIG.get('host', '0.0.0.0')
+    port = port or ASYNC_STREAM_CONFIG.get('port', 5001)
+
+    async_server = AsyncStreamServer(max_streams=max_streams, max_mobile_clients=max_mobile_clients)
+    async_server.server.is_running = True
+
+    logging.info(f"⚡ Async Stream Server: http://{host}:{port} "
+                 f"(limit: {async_server.max_streams} genel / {async_server.max_mobile_clients} mobil)")
+    try:
+        uvicorn.run(async_server.app, host=host, port=port, log_level="warning")
+    finally:
+        async_server.server.is_running = False
+        for broadcaster in async_server.server.broadcasters.values():
+            broadcaster.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+    parser = argparse.ArgumentParser(description="Guard AI async MJPEG stream sunucusu")
+    parser.add_argument('--host', default=None)
+    parser.add_argument('--port', type=int, default=None)
+    parser.add_argument('--max-streams', type=int, default=None)
+    parser.add_argument('--max-mobile-clients', type=int, default=None)
+    args = parser.parse_args()
+    run_async_stream_server(args.host, args.port, args.max_streams, args.max_mobile_clients)
@@ -23,6 +23,8 @@
 # - Otomatik reconnect sistemi
 # - Performance monitoring
 # - Zero-copy frame işleme
+# - Grab/retrieve ayrımı: sensör hızında grab, sadece kullanılacak frame decode edilir
+# - MJPG FOURCC müzakeresi (USB bant genişliği azaltma)
 # =======================================================================================
 
 import cv2
@@ -33,14 +35,57 @@ import time
 import platform
 from collections import deque
 import queue
-from config.settings import CAMERA_CONFIGS, FRAME_WIDTH, FRAME_HEIGHT, FRAME_RATE
+from config.settings import CAMERA_CONFIGS, FRAME_WIDTH, FRAME_HEIGHT, FRAME_RATE, CAMERA_BUFFER_CONFIG
+from core.camera_inventory import get_camera_inventory
+
+# Capture modları
+CAPTURE_MODE_READ = "read"                    # Her frame cap.read() ile decode edilir
+CAPTURE_MODE_GRAB_RETRIEVE = "grab_retrieve"  # cap.grab() sensör hızında, retrieve() sadece talep edilince
+
+
+def resize_to_yolo_format(frame, size=640):
+    """YOLOv11 için kare (varsayılan 640x640) letterbox resize - tüm kamera kaynakları ortak kullanır."""
+    try:
+        h, w = frame.shape[:2]
+        
+        # ULTRA OPTIMIZE: Square padding ile aspect ratio koruma
+        if h != w:
+            # En büyük boyut size olacak şekilde scale
+            scale = size / max(h, w)
+            new_h = int(h * scale)
+            new_w = int(w * scale)
+            
+            resized = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+            
+            # size x size'a pad
+            delta_w = size - new_w
+            delta_h = size - new_h
+            top, bottom = delta_h // 2, delta_h - (delta_h // 2)
+            left, right = delta_w // 2, delta_w - (delta_w // 2)
+            
+            # Black padding
+            return cv2.copyMakeBorder(resized, top, bottom, left, right,
+                                      cv2.BORDER_CONSTANT, value=[0, 0, 0])
+        
+        # Zaten kare ise sadece resize et
+        return cv2.resize(frame, (size, size), interpolation=cv2.INTER_LINEAR)
+        
+    except Exception as e:
+        logging.error(f"YOLOv11 resize hatası: {e}")
+        # Fallback: basit resize
+        return cv2.resize(frame, (size, size), interpolation=cv2.INTER_LINEAR)
 
 class UltraStableCamera:
     """Ultra stabil kamera sınıfı - tüm sorunlar çözülmüş."""
     
-    def __init__(self, camera_index, name="UltraStableCamera"):
+    def __init__(self, camera_index, name="UltraStableCamera", capture_mode=None):
         """
         FIXED: RENK SORUNU ÇÖZÜMÜ - Backend ve ayar optimizasyonu
+        
+        Args:
+            camera_index: Kamera indeksi
+            name: Kamera adı
+            capture_mode: "read" veya "grab_retrieve" (None ise CAMERA_BUFFER_CONFIG)
         """
         self.camera_index = camera_index
         self.name = name
@@ -56,6 +101,20 @@ class UltraStableCamera:
         self.frame_buffer = deque(maxlen=2)  # 2 frame buffer - stabil akış
         self.frame_lock = threading.RLock()
         self.last_frame_time = 0
+        self.last_grab_time = 0  # Son başarılı grab (decode edilmemiş olabilir) - sağlık izleme için
+        self.last_capture_time = None  # Buffer'daki son frame'in yakalanma zamanı (time.time) - latency tracing
+        
+        # ULTRA OPTIMIZE: Grab/retrieve ayrımı - geride kalınca decode maliyeti ödenmez
+        self.capture_mode = capture_mode or CAMERA_BUFFER_CONFIG.get('capture_mode', CAPTURE_MODE_READ)
+        if self.capture_mode not in (CAPTURE_MODE_READ, CAPTURE_MODE_GRAB_RETRIEVE):
+            logging.warning(f"Kamera {camera_index}: Bilinmeyen capture modu '{self.capture_mode}', 'read' kullanılıyor")
+            self.capture_mode = CAPTURE_MODE_READ
+        self.preferred_fourcc = CAMERA_BUFFER_CONFIG.get('preferred_fourcc', 'MJPG')
+        self.negotiated_fourcc = None
+        self.retrieve_wait_timeout = CAMERA_BUFFER_CONFIG.get('retrieve_wait_timeout', 0.05)
+        self.stale_frame_age = CAMERA_BUFFER_CONFIG.get('stale_frame_age', 0.1)
+        self._decode_requested = threading.Event()  # Tüketici yeni frame istedi
+        self._frame_ready = threading.Condition(self.frame_lock)  # Yeni decode edilmiş frame sinyali
         
         # FIXED: Sabit FPS kontrolü - YÜKSEK FPS
         self.target_fps = 30
@@ -81,6 +140,8 @@ class UltraStableCamera:
         self.performance_stats = {
             'total_frames': 0,
             'dropped_frames': 0,
+            'grabbed_frames': 0,    # Sensörden alınan (grab) frame sayısı
+            'decoded_frames': 0,    # Decode edilen (retrieve/read) frame sayısı
             'avg_processing_time': 0.0,
             'last_frame_shape': None
         }
@@ -113,6 +174,22 @@ class UltraStableCamera:
         if self.camera_validated:
             return True
         
+        # ULTRA OPTIMIZE: Önce envanter önbelleği - paralel probe sonucu varsa cihaz tekrar açılmaz
+        try:
+            entry = get_camera_inventory().get_fresh_entry(f"camera_{self.camera_index}")
+            if entry is not None:
+                if entry.get('available') and entry.get('backend') is not None:
+                    self.backend = entry['backend']
+                    self.camera_validated = True
+                    logging.info(f"Kamera {self.camera_index}: envanterden doğrulandı "
+                                 f"({entry.get('backend_name')}, {entry.get('resolution')})")
+                    return True
+                if entry.get('status') == 'unavailable':
+                    logging.warning(f"Kamera {self.camera_index}: envantere göre kullanılamıyor ({entry.get('error')})")
+                    return False
+        except Exception as e:
+            logging.debug(f"Kamera {self.camera_index} envanter okuma hatası: {e}")
+        
         logging.info(f"UltraStableCamera {self.camera_index} doğrulanıyor...")
         
         # Önce belirtilen backend'i dene
@@ -177,6 +254,15 @@ class UltraStableCamera:
             logging.warning(f"Kamera {self.camera_index} zaten çalışıyor")
             return True
         
+        inventory = get_camera_inventory()
+        inventory.begin_start(self)
+        try:
+            return self._start_capture()
+        finally:
+            inventory.end_start(self)
+    
+    def _start_capture(self):
+        """Doğrulama + cihazı açma; start() envanter probe muafiyeti içinde çağırır."""
         # Doğrulama
         if not self._validate_camera_with_fallback():
             logging.error(f"Kamera {self.camera_index} doğrulanamadı")
@@ -205,6 +291,7 @@ class UltraStableCamera:
             self.thread.start()
             
             self.connection_stable = True
+            get_camera_inventory().register_active_camera(self)
             logging.info(f"UltraStableCamera {self.camera_index} BAŞLATILDI - Ultra stabil mod")
             return True
             
@@ -224,6 +311,9 @@ class UltraStableCamera:
             # ✅ DÜZELTME: Gerçekçi FPS ayarı - stabil performans
             self.cap.set(cv2.CAP_PROP_FPS, 30)  # 30 FPS - gerçekçi hedef
             
+            # ULTRA OPTIMIZE: FOURCC müzakeresi - çözünürlükten ÖNCE (DirectShow sırası önemli)
+            self._negotiate_fourcc()
+            
             # ✅ DÜZELTİLDİ: Kamera-spesifik çözünürlük ayarı
             if self.camera_index == 0:  # Bilgisayar kamerası için
                 # Native çözünürlüğü koruyarak en iyi kaliteyi al
@@ -233,15 +323,6 @@ class UltraStableCamera:
                 self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
                 self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 640)
             
-            # FIXED: Codec ayarı - kalite için
-            try:
-                self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
-            except:
-                try:
-                    self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'YUYV'))
-                except:
-                    pass  # Varsayılan codec kullan
-            
             # ✅ DÜZELTİLDİ: Kamera-spesifik renk ayarları
             if self.camera_index == 0:  # Bilgisayar kamerası için özel ayar
                 # Kamera 0 için tam otomatik
@@ -259,6 +340,8 @@ class UltraStableCamera:
             logging.info(f"Kamera {self.camera_index} ULTRA HIZLI ayarlar:")
             logging.info(f"   📐 Çözünürlük: {actual_width}x{actual_height}")
             logging.info(f"   🎬 FPS: {actual_fps}")
+            logging.info(f"   🎞️ FOURCC: {self.negotiated_fourcc or 'varsayılan'}")
+            logging.info(f"   🧲 Capture modu: {self.capture_mode}")
             logging.info(f"   ⚡ Ultra hız modu aktif")
             
         except Exception as e:
@@ -271,6 +354,41 @@ class UltraStableCamera:
             except:
                 logging.info(f"Kamera {self.camera_index} varsayılan ayarlarla devam ediyor")
 
+    @staticmethod
+    def _decode_fourcc(value):
+        """CAP_PROP_FOURCC değerini 4 karakterlik koda çevirir."""
+        try:
+            code = int(value)
+            if code <= 0:
+                return None
+            return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4))
+        except Exception:
+            return None
+
+    def _negotiate_fourcc(self):
+        """
+        ULTRA OPTIMIZE: MJPG FOURCC müzakeresi - USB bant genişliğini azaltır.
+        set() çoğu backend'de hata vermeden yok sayıldığı için sonuç geri okunarak doğrulanır.
+        """
+        self.negotiated_fourcc = None
+        if not self.preferred_fourcc:
+            return None
+        
+        try:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.preferred_fourcc))
+            actual = self._decode_fourcc(self.cap.get(cv2.CAP_PROP_FOURCC))
+            
+            if actual and actual.upper() == self.preferred_fourcc.upper():
+                logging.info(f"Kamera {self.camera_index}: {self.preferred_fourcc} FOURCC kabul edildi")
+            else:
+                logging.info(f"Kamera {self.camera_index}: {self.preferred_fourcc} desteklenmiyor, "
+                             f"kamera codec'i kullanılıyor ({actual or 'bilinmiyor'})")
+            self.negotiated_fourcc = actual
+        except Exception as e:
+            logging.debug(f"Kamera {self.camera_index} FOURCC müzakere hatası: {e}")
+        
+        return self.negotiated_fourcc
+
     def _test_initial_frame(self):
         """FIXED: İlk frame testi - hızlı."""
         try:
@@ -280,6 +398,10 @@ class UltraStableCamera:
                     # FIXED: Frame'i buffer'a ekle
                     with self.frame_lock:
                         self.frame_buffer.append(frame.copy())
+                        self.last_frame_time = time.perf_counter()
+                        self.last_capture_time = time.time()
+                    self.performance_stats['grabbed_frames'] += 1
+                    self.performance_stats['decoded_frames'] += 1
                     
                     logging.debug(f"Kamera {self.camera_index} ilk frame OK: {frame.shape}")
                     return True
@@ -295,6 +417,9 @@ class UltraStableCamera:
         """
         ULTRA OPTIMIZE: MAXIMUM FPS için ultra optimize capture loop
         """
+        if self.capture_mode == CAPTURE_MODE_GRAB_RETRIEVE:
+            return self._grab_retrieve_capture_loop()
+        
         consecutive_failures = 0
         max_failures = 10
         
@@ -332,20 +457,25 @@ class UltraStableCamera:
                 
                 # ULTRA OPTIMIZE: Frame capture - minimum latency
                 ret, frame = self.cap.read()
+                capture_time = time.time()
                 
                 if ret and frame is not None and frame.size > 0:
                     consecutive_failures = 0
                     last_successful_time = time.perf_counter()
                     
                     # ULTRA OPTIMIZE: Zero-copy frame buffer update
-                    with self.frame_lock:
+                    with self._frame_ready:
                         self.frame_buffer.append(frame)  # Direct append, no copy
                         self.last_frame_time = last_successful_time
+                        self.last_capture_time = capture_time
+                        self._frame_ready.notify_all()
                     
                     # Performance tracking - minimal overhead
                     fps_counter += 1
                     self.frame_count += 1
                     self.performance_stats['total_frames'] += 1
+                    self.performance_stats['grabbed_frames'] += 1
+                    self.performance_stats['decoded_frames'] += 1
                     
                     # ULTRA OPTIMIZE: Dynamic FPS adaptation
                     current_time = time.perf_counter()
@@ -398,6 +528,87 @@ class UltraStableCamera:
         
         logging.info(f"Kamera {self.camera_index} ULTRA OPTIMIZE capture loop SONLANDI (final FPS: {self.actual_fps:.1f})")
 
+    def _grab_retrieve_capture_loop(self):
+        """
+        ULTRA OPTIMIZE: Grab/retrieve ayrımlı capture loop.
+        
+        cap.grab() sensör hızında çağrılır (driver kuyruğu boşaltılır, bayat frame birikmez);
+        pahalı decode (retrieve) sadece bir tüketici get_frame() ile frame istediğinde yapılır.
+        Geride kalındığında atlanan frame'ler decode edilmeden düşer.
+        """
+        consecutive_failures = 0
+        max_failures = 10
+        
+        fps_counter = 0
+        fps_start_time = time.perf_counter()
+        
+        logging.info(f"Kamera {self.camera_index} GRAB/RETRIEVE capture loop başlatıldı")
+        
+        while self.is_running:
+            try:
+                if not self.cap or not self.cap.isOpened():
+                    if not self._fast_reconnect():
+                        consecutive_failures += 1
+                        if consecutive_failures >= max_failures:
+                            logging.error(f"❌ Kamera {self.camera_index} maksimum hata sayısına ulaştı")
+                            break
+                        time.sleep(0.05)
+                        continue
+                
+                # Sensör hızında grab - driver yeni frame gelene kadar bloklar
+                grab_start = time.perf_counter()
+                if not self.cap.grab():
+                    consecutive_failures += 1
+                    if consecutive_failures % 10 == 0:
+                        logging.debug(f"❌ Kamera {self.camera_index} grab hatası: {consecutive_failures}")
+                    time.sleep(0.033)
+                    continue
+                
+                consecutive_failures = 0
+                self.last_grab_time = time.perf_counter()
+                capture_time = time.time()  # Glass zamanı: decode değil grab anı
+                self.performance_stats['grabbed_frames'] += 1
+                fps_counter += 1
+                self.frame_count += 1
+                
+                # Sadece talep varsa (veya buffer boşsa) decode et
+                if self._decode_requested.is_set() or not self.frame_buffer:
+                    self._decode_requested.clear()
+                    ret, frame = self.cap.retrieve()
+                    
+                    if ret and frame is not None and frame.size > 0:
+                        with self._frame_ready:
+                            self.frame_buffer.append(frame)
+                            self.last_frame_time = time.perf_counter()
+                            self.last_capture_time = capture_time
+                            self._frame_ready.notify_all()
+                        
+                        self.performance_stats['decoded_frames'] += 1
+                        self.performance_stats['total_frames'] += 1
+                        self.performance_stats['last_frame_shape'] = frame.shape
+                else:
+                    # Decode edilmeden atlanan frame - ucuz drop
+                    self.performance_stats['dropped_frames'] += 1
+                
+                # Grab bloklamayan backend'lerde CPU'yu yakmamak için güvenlik beklemesi
+                if (time.perf_counter() - grab_start) < 0.002:
+                    time.sleep(0.005)
+                
+            except Exception as e:
+                consecutive_failures += 1
+                if consecutive_failures % 25 == 0:
+                    logging.debug(f"❌ Kamera {self.camera_index} exception: {e}")
+                time.sleep(0.001)
+            
+            current_time = time.perf_counter()
+            if (current_time - fps_start_time) >= 5.0:
+                if fps_counter > 0:
+                    self.actual_fps = fps_counter / (current_time - fps_start_time)
+                fps_counter = 0
+                fps_start_time = current_time
+        
+        logging.info(f"Kamera {self.camera_index} GRAB/RETRIEVE capture loop SONLANDI (final FPS: {self.actual_fps:.1f})")
+
     def _fast_reconnect(self):
         """FIXED: Hızlı yeniden bağlantı."""
         self.reconnect_attempts += 1
@@ -442,59 +653,48 @@ class UltraStableCamera:
         """
         ULTRA OPTIMIZE: Thread-safe frame alma + YOLOv11 640x640 format
         """
+        return self.get_frame_with_timestamp()[0]
+    
+    def get_frame_with_timestamp(self):
+        """
+        Frame ve yakalanma zamanını (time.time, glass-to-alert tracing için) birlikte döndürür.
+        Placeholder frame için zaman None'dır.
+        
+        Returns:
+            tuple: (frame, capture_time)
+        """
         try:
-            with self.frame_lock:
+            # ULTRA OPTIMIZE: Grab/retrieve modunda bir sonraki grab'in decode edilmesini iste
+            if self.capture_mode == CAPTURE_MODE_GRAB_RETRIEVE and self.is_running:
+                self._decode_requested.set()
+            
+            with self._frame_ready:
+                # Buffer'daki frame bayatsa kısa süre taze decode bekle
+                if (self.capture_mode == CAPTURE_MODE_GRAB_RETRIEVE and self.is_running and
+                        (time.perf_counter() - self.last_frame_time) > self.stale_frame_age):
+                    self._frame_ready.wait(self.retrieve_wait_timeout)
+                
                 if len(self.frame_buffer) > 0:
                     # ULTRA OPTIMIZE: En son frame'i al
                     frame = self.frame_buffer[-1].copy()
+                    capture_time = self.last_capture_time
                     
                     # ULTRA OPTIMIZE: YOLOv11 için 640x640 resize
                     if frame.shape[:2] != (640, 640):
                         frame = self._resize_to_yolo_format(frame)
                     
-                    return frame
+                    return frame, capture_time
                 else:
                     # ULTRA OPTIMIZE: Placeholder frame - sistem çökmez
-                    return self._create_ultra_stable_placeholder_frame()
+                    return self._create_ultra_stable_placeholder_frame(), None
                     
         except Exception as e:
             logging.debug(f"get_frame hatası: {e}")
-            return self._create_ultra_stable_placeholder_frame()
+            return self._create_ultra_stable_placeholder_frame(), None
     
     def _resize_to_yolo_format(self, frame):
         """YOLOv11 için 640x640 format'a resize"""
-        try:
-            h, w = frame.shape[:2]
-            
-            # ULTRA OPTIMIZE: Square padding ile aspect ratio koruma
-            if h != w:
-                # En büyük boyut 640 olacak şekilde scale
-                max_dim = max(h, w)
-                scale = 640 / max_dim
-                new_h = int(h * scale)
-                new_w = int(w * scale)
-                
-                # Resize
-                resized = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
-                
-                # 640x640'a pad
-                delta_w = 640 - new_w
-                delta_h = 640 - new_h
-                top, bottom = delta_h // 2, delta_h - (delta_h // 2)
-                left, right = delta_w // 2, delta_w - (delta_w // 2)
-                
-                # Black padding
-                padded = cv2.copyMakeBorder(resized, top, bottom, left, right, 
-                                          cv2.BORDER_CONSTANT, value=[0, 0, 0])
-                return padded
-            else:
-                # Zaten kare ise sadece 640x640'a resize et
-                return cv2.resize(frame, (640, 640), interpolation=cv2.INTER_LINEAR)
-                
-        except Exception as e:
-            logging.error(f"YOLOv11 resize hatası: {e}")
-            # Fallback: basit resize
-            return cv2.resize(frame, (640, 640), interpolation=cv2.INTER_LINEAR)
+        return resize_to_yolo_format(frame)
     
     def _create_ultra_stable_placeholder_frame(self):
         """FIXED: Ultra stabil placeholder frame - sistem çökmez."""
@@ -648,6 +848,8 @@ class UltraStableCamera:
 
     def get_performance_stats(self):
         """FIXED: Performans istatistiklerini döndür."""
+        grabbed = self.performance_stats['grabbed_frames']
+        decoded = self.performance_stats['decoded_frames']
         return {
             'actual_fps': self.actual_fps,
             'target_fps': self.target_fps,
@@ -655,6 +857,11 @@ class UltraStableCamera:
             'buffer_size': len(self.frame_buffer),
             'total_frames': self.performance_stats['total_frames'],
             'dropped_frames': self.performance_stats['dropped_frames'],
+            'grabbed_frames': grabbed,
+            'decoded_frames': decoded,
+            'decode_ratio': (decoded / grabbed) if grabbed > 0 else 0.0,
+            'capture_mode': self.capture_mode,
+            'fourcc': self.negotiated_fourcc,
             'last_frame_shape': self.performance_stats['last_frame_shape'],
             'ultra_stable_mode': True,
             'brightness': self.brightness_adjustment,
@@ -665,11 +872,16 @@ class UltraStableCamera:
     def stop(self):
         """FIXED: Kamerayı durdur."""
         self.is_running = False
+        self._decode_requested.clear()
         
-        if self.thread and self.thread.is_alive():
+        if getattr(self, 'thread', None) and self.thread.is_alive():
             self.thread.join(timeout=2.0)
         
         self._cleanup()
+        try:
+            get_camera_inventory().unregister_active_camera(self)
+        except Exception as e:
+            logging.debug(f"Kamera {self.camera_index} envanter kaydı silme hatası: {e}")
         logging.info(f"UltraStableCamera {self.camera_index} DURDURULDU")
     
     def _cleanup(self):
@@ -760,6 +972,8 @@ def test_ultra_stable_camera(camera_index=0):
         logging.info(f"   📊 Actual FPS: {stats.get('actual_fps', 'N/A'):.1f}")
         logging.info(f"   🎬 Total frames: {stats.get('total_frames', 'N/A')}")
         logging.info(f"   🗂️ Buffer size: {stats.get('buffer_size', 'N/A')}")
+        logging.info(f"   🧲 Grabbed/Decoded: {stats.get('grabbed_frames', 0)}/{stats.get('decoded_frames', 0)} "
+                     f"(mod: {stats.get('capture_mode')}, fourcc: {stats.get('fourcc')})")
         logging.info(f"   ⚡ Ultra optimize mode: Active")
         
     finally:
@@ -0,0 +1,357 @@
+# =======================================================================================
+# === PROGRAM AÇIKLAMASI ===
+# Dosya Adı: camera_inventory.py (PARALEL KAMERA PROBE + ÖNBELLEKLİ ENVANTER)
+# Konum: pc/core/camera_inventory.py
+# Açıklama:
+# Tüm kameraları paralel ve zaman aşımlı olarak probe eder; çalışan backend, çözünürlük
+# ve FPS bilgisini önbellekte tutar ve arka planda periyodik olarak yeniler.
+# Uygulama açılışı, kamera doğrulama ve API endpoint'leri donanımı probe etmek yerine
+# bu önbellekten okur.
+
+# === ÇÖZÜLEN SORUNLAR ===
+# 1. Açılışta kameralar tek tek (sleep + backend fallback) doğrulanıyordu → paralel probe
+# 2. API her istekte yeni Camera() oluşturuyordu → önbellekten okuma
+# 3. Kullanımdaki kamera tekrar açılmaya çalışılıyordu → aktif kameralar istatistikten okunur
+# =======================================================================================
+
+import cv2
+import threading
+import logging
+import platform
+import time
+
+from config.settings import CAMERA_CONFIGS, VIDEO_SOURCE_CONFIGS, CAMERA_INVENTORY_CONFIG
+
+BACKEND_NAMES = {
+    cv2.CAP_ANY: "AUTO",
+    cv2.CAP_DSHOW: "DirectShow",
+    cv2.CAP_MSMF: "MediaFoundation",
+    cv2.CAP_V4L2: "Video4Linux2",
+    cv2.CAP_GSTREAMER: "GStreamer",
+    cv2.CAP_AVFOUNDATION: "AVFoundation",
+    cv2.CAP_FFMPEG: "FFMPEG",
+}
+
+
+def backend_name(backend):
+    """Backend adını döndürür."""
+    return BACKEND_NAMES.get(backend, f"Backend_{backend}")
+
+
+def platform_backends():
+    """Platform için öncelikli backend sırası."""
+    system = platform.system()
+    if system == "Windows":
+        return [cv2.CAP_DSHOW, cv2.CAP_MSMF, cv2.CAP_ANY]
+    if system == "Linux":
+        return [cv2.CAP_V4L2, cv2.CAP_ANY]
+    if system == "Darwin":
+        return [cv2.CAP_AVFOUNDATION, cv2.CAP_ANY]
+    return [cv2.CAP_ANY]
+
+
+class CameraInventory:
+    """Paralel probe edilen, önbellekli ve arka planda yenilenen kamera envanteri."""
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        """Singleton envanter."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, configs=None, probe_timeout=None, refresh_interval=None):
+        self.configs = list(configs) if configs is not None else list(CAMERA_CONFIGS) + list(VIDEO_SOURCE_CONFIGS)
+        self.probe_timeout = probe_timeout or CAMERA_INVENTORY_CONFIG.get('probe_timeout', 3.0)
+        self.refresh_interval = refresh_interval or CAMERA_INVENTORY_CONFIG.get('refresh_interval', 60.0)
+        self.frame_attempts = CAMERA_INVENTORY_CONFIG.get('frame_attempts', 3)
+        self.max_cache_age = CAMERA_INVENTORY_CONFIG.get('max_cache_age', 300.0)
+
+        self._lock = threading.Lock()
+        self._entries = {}            # camera_id -> envanter kaydı
+        self._active_cameras = {}     # camera_id -> çalışan kamera nesnesi (tekrar açılmaz)
+        self._probing = set()         # Hâlâ devam eden (zaman aşımına uğramış) probe'lar
+        self._starting = set()        # start() içinde cihazı açmakta olan kameralar (probe edilmez)
+        self.last_probe_time = 0
+
+        self._refresh_thread = None
+        self._refresh_stop = threading.Event()
+
+    # ----- Probe -----
+
+    @staticmethod
+    def camera_id_for(config):
+        return f"camera_{config['index']}"
+
+    def _probe_config(self, config):
+        """Tek bir kamerayı/kaynağı probe eder ve envanter kaydı döndürür."""
+        camera_id = self.camera_id_for(config)
+        source = config.get('source')
+        started = time.perf_counter()
+
+        entry = {
+            'camera_id': camera_id,
+            'index': config['index'],
+            'name': config.get('name', camera_id),
+            'source': source,
+            'available': False,
+            'status': 'unavailable',
+            'backend': None,
+            'backend_name': None,
+            'width': 0,
+            'height': 0,
+            'resolution': "0x0",
+            'fps': 0.0,
+            'last_probe': time.time(),
+            'last_frame_time': None,
+            'probe_ms': 0.0,
+            'error': None,
+        }
+
+        if source is not None:
+            candidates = [(source, cv2.CAP_FFMPEG if '://' in str(source) else cv2.CAP_ANY)]
+        else:
+            backends = platform_backends()
+            preferred = config.get('backend')
+            if preferred is not None and preferred in backends:
+                backends.remove(preferred)
+                backends.insert(0, preferred)
+            candidates = [(config['index'], backend) for backend in backends]
+
+        for target, backend in candidates:
+            cap = None
+            try:
+                cap = cv2.VideoCapture(target, backend)
+                if not cap.isOpened():
+                    continue
+
+                for _ in range(self.frame_attempts):
+                    ret, frame = cap.read()
+                    if ret and frame is not None and frame.size > 0:
+                        height, width = frame.shape[:2]
+                        entry.update({
+                            'available': True,
+                            'status': 'available',
+                            'backend': backend,
+                            'backend_name': backend_name(backend),
+                            'width': width,
+                            'height': height,
+                            'resolution': f"{width}x{height}",
+                            'fps': float(cap.get(cv2.CAP_PROP_FPS) or 0.0),
+                            'last_frame_time': time.time(),
+                        })
+                        break
+                if entry['available']:
+                    break
+            except Exception as e:
+                entry['error'] = str(e)
+                logging.debug(f"Envanter probe hatası {camera_id} ({backend_name(backend)}): {e}")
+            finally:
+                if cap is not None:
+                    try:
+                        cap.release()
+                    except Exception:
+                        pass
+
+        if not entry['available'] and entry['error'] is None:
+            entry['error'] = "Kamera açılamadı veya frame alınamadı"
+
+        entry['probe_ms'] = (time.perf_counter() - started) * 1000
+        return entry
+
+    def _entry_from_active_camera(self, camera_id, camera, config):
+        """Çalışan kamerayı tekrar açmadan istatistiklerinden kayıt üretir."""
+        previous = self._entries.get(camera_id, {})
+        try:
+            stats = camera.get_performance_stats()
+        except Exception:
+            stats = {}
+
+        shape = stats.get('last_frame_shape') or (previous.get('height', 0), previous.get('width', 0))
+        height, width = int(shape[0]), int(shape[1])
+        backend = getattr(camera, 'backend', previous.get('backend'))
+        running = bool(getattr(camera, 'is_running', False))
+
+        return {
+            **previous,
+            'camera_id': camera_id,
+            'index': config['index'] if config else previous.get('index'),
+            'name': getattr(camera, 'name', previous.get('name', camera_id)),
+            'available': running or previous.get('available', False),
+            'status': 'active' if running else 'inactive',
+            'backend': backend,
+            'backend_name': backend_name(backend) if backend is not None else None,
+            'width': width,
+            'height': height,
+            'resolution': f"{width}x{height}",
+            'fps': float(stats.get('actual_fps', 0.0) or 0.0),
+            'last_probe': time.time(),
+            'last_frame_time': time.time() if stats.get('connection_stable') else previous.get('last_frame_time'),
+            'error': None,
+        }
+
+    def probe_all(self, timeout=None):
+        """
+        Tüm kameraları paralel probe eder.
+        Zaman aşımına uğrayan probe'lar daemon thread'de bırakılır; tamamlandıklarında önbelleği günceller.
+
+        Returns:
+            dict: camera_id -> envanter kaydı
+        """
+        timeout = timeout or self.probe_timeout
+        deadline = time.perf_counter() + timeout
+        threads = {}
+
+        for config in self.configs:
+            camera_id = self.camera_id_for(config)
+
+            with self._lock:
+                active = self._active_cameras.get(camera_id)
+                if active is not None:
+                    self._entries[camera_id] = self._entry_from_active_camera(camera_id, active, config)
+                    continue
+                if camera_id in self._starting:
+                    continue  # Kamera şu an başlatılıyor - özel (DSHOW) cihazı ikinci kez açma
+                if camera_id in self._probing:
+                    continue  # Önceki probe hâlâ asılı - üst üste açma
+                self._probing.add(camera_id)
+
+            thread = threading.Thread(target=self._probe_worker, args=(config,), daemon=True,
+                                      name=f"CameraProbe-{camera_id}")
+            thread.start()
+            threads[camera_id] = thread
+
+        for camera_id, thread in threads.items():
+            thread.join(timeout=max(0.0, deadline - time.perf_counter()))
+            if thread.is_alive():
+                logging.warning(f"⚠️ Kamera {camera_id} probe zaman aşımı ({timeout:.1f}s)")
+                with self._lock:
+                    previous = self._entries.get(camera_id, {})
+                    if not previous.get('available'):
+                        self._entries[camera_id] = {
+                            **previous,
+                            'camera_id': camera_id,
+                            'available': False,
+                            'status': 'timeout',
+                            'last_probe': time.time(),
+                            'error': f"Probe zaman aşımı ({timeout:.1f}s)",
+                        }
+
+        self.last_probe_time = time.time()
+        return self.get_all()
+
+    def _probe_worker(self, config):
+        camera_id = self.camera_id_for(config)
+        try:
+            entry = self._probe_config(config)
+            with self._lock:
+                # Probe sırasında kamera başlatıldıysa aktif kayıt korunur
+                if camera_id not in self._active_cameras and camera_id not in self._starting:
+                    self._entries[camera_id] = entry
+            status = "✅" if entry['available'] else "❌"
+            logging.info(f"{status} Envanter: {camera_id} {entry['backend_name'] or '-'} "
+                         f"{entry['resolution']} @ {entry['fps']:.0f} FPS ({entry['probe_ms']:.0f}ms)")
+        except Exception as e:
+            logging.error(f"Envanter probe worker hatası {camera_id}: {e}")
+        finally:
+            with self._lock:
+                self._probing.discard(camera_id)
+
+    # ----- Aktif kamera kaydı -----
+
+    def begin_start(self, camera):
+        """
+        Kamera başlatılırken çağrılır: arka plan probe'u cihazı açmaz ve
+        önbellekteki 'unavailable'/'timeout' kaydı düşürülür (kullanıcı yeniden deniyor).
+        """
+        camera_id = f"camera_{camera.camera_index}"
+        with self._lock:
+            self._starting.add(camera_id)
+        self.invalidate(camera_id)
+
+    def end_start(self, camera):
+        """Başlatma bitti (başarılı ya da değil) - probe muafiyetini kaldırır."""
+        with self._lock:
+            self._starting.discard(f"camera_{camera.camera_index}")
+
+    def invalidate(self, camera_id):
+        """Kullanılamaz önbellek kaydını siler; çalışan kameraların kaydına dokunmaz."""
+        with self._lock:
+            entry = self._entries.get(camera_id)
+            if entry and not entry.get('available') and camera_id not in self._active_cameras:
+                del self._entries[camera_id]
+
+    def register_active_camera(self, camera):
+        """Çalışan kamerayı kaydeder - yenilemede cihaz tekrar açılmaz."""
+        camera_id = f"camera_{camera.camera_index}"
+        with self._lock:
+            self._active_cameras[camera_id] = camera
+            config = next((c for c in self.configs if self.camera_id_for(c) == camera_id), None)
+            self._entries[camera_id] = self._entry_from_active_camera(camera_id, camera, config)
+
+    def unregister_active_camera(self, camera):
+        camera_id = f"camera_{camera.camera_index}"
+        with self._lock:
+            self._active_cameras.pop(camera_id, None)
+            if camera_id in self._entries:
+                self._entries[camera_id]['status'] = 'available' if self._entries[camera_id].get('available') else 'unavailable'
+
+    # ----- Okuma -----
+
+    def get(self, camera_id):
+        """Önbellekteki kaydı döndürür (aktif kameralar için anlık istatistikle)."""
+        with self._lock:
+            active = self._active_cameras.get(camera_id)
+            if active is not None:
+                config = next((c for c in self.configs if self.camera_id_for(c) == camera_id), None)
+                self._entries[camera_id] = self._entry_from_active_camera(camera_id, active, config)
+            entry = self._entries.get(camera_id)
+            return dict(entry) if entry else None
+
+    def get_all(self):
+        with self._lock:
+            return {camera_id: dict(entry) for camera_id, entry in self._entries.items()}
+
+    def get_fresh_entry(self, camera_id):
+        """max_cache_age içinde probe edilmiş kaydı döndürür, yoksa None."""
+        entry = self.get(camera_id)
+        if entry and (time.time() - entry.get('last_probe', 0)) <= self.max_cache_age:
+            return entry
+        return None
+
+    def get_available_configs(self):
+        """Çalışan kameraların konfigürasyonları."""
+        entries = self.get_all()
+        return [c for c in self.configs if entries.get(self.camera_id_for(c), {}).get('available')]
+
+    # ----- Arka plan yenileme -----
+
+    def start_background_refresh(self):
+        """Envanteri periyodik olarak arka planda yeniler."""
+        if self._refresh_thread and self._refresh_thread.is_alive():
+            return
+        self._refresh_stop.clear()
+        self._refresh_thread = threading.Thread(target=self._refresh_loop, daemon=True,
+                                                name="CameraInventoryRefresh")
+        self._refresh_thread.start()
+        logging.info(f"🔄 Kamera envanteri arka plan yenileme başladı ({self.refresh_interval:.0f}s)")
+
+    def stop_background_refresh(self):
+        self._refresh_stop.set()
+
+    def _refresh_loop(self):
+        while not self._refresh_stop.wait(self.refresh_interval):
+            try:
+                self.probe_all()
+            except Exception as e:
+                logging.error(f"Kamera envanteri yenileme hatası: {e}")
+
+
+def get_camera_inventory():
+    """Global kamera envanteri."""
+    return CameraInventory.get_instance()
@@ -0,0 +1,371 @@
+# =======================================================================================
+# === PROGRAM AÇIKLAMASI ===
+# Dosya Adı: camera_supervisor.py (MERKEZİ KAMERA SUPERVISOR)
+# Konum: pc/core/camera_supervisor.py
+# Açıklama:
+# Tüm kameraların sağlık durumunu merkezi olarak izler. Çöken capture thread'lerini
+# exponential backoff + jitter ile yeniden başlatır, kapalı kameralar için downstream
+# AI işlemeyi durdurur (placeholder frame'lere CPU harcanmaz) ve durum değişikliklerini
+# UI ve API abonelerine yayınlar.
+
+# === SAĞLIK DURUMLARI ===
+# - starting   : Kamera başlatıldı, henüz frame akışı doğrulanmadı
+# - healthy    : Taze frame akıyor
+# - degraded   : Frame akışı yavaşladı / gecikmeli (AI devam eder)
+# - down       : Capture thread durdu veya uzun süredir frame yok (AI durur)
+# - recovering : Backoff sonrası yeniden başlatma deneniyor
+# - stopped    : Kullanıcı tarafından durduruldu
+# =======================================================================================
+
+import threading
+import logging
+import random
+import time
+
+from config.settings import CAMERA_SUPERVISOR_CONFIG
+
+STATE_STARTING = "starting"
+STATE_HEALTHY = "healthy"
+STATE_DEGRADED = "degraded"
+STATE_DOWN = "down"
+STATE_RECOVERING = "recovering"
+STATE_STOPPED = "stopped"
+
+# AI işlemenin devam ettiği durumlar
+AVAILABLE_STATES = (STATE_HEALTHY, STATE_DEGRADED)
+
+
+class CameraSupervisor:
+    """Kamera sağlık durumu izleme ve backoff ile yeniden başlatma."""
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self.check_interval = CAMERA_SUPERVISOR_CONFIG.get('check_interval', 0.5)
+        self.degraded_frame_age = CAMERA_SUPERVISOR_CONFIG.get('degraded_frame_age', 1.0)
+        self.down_frame_age = CAMERA_SUPERVISOR_CONFIG.get('down_frame_age', 5.0)
+        self.backoff_base = CAMERA_SUPERVISOR_CONFIG.get('backoff_base', 0.5)
+        self.backoff_max = CAMERA_SUPERVISOR_CONFIG.get('backoff_max', 30.0)
+        self.backoff_jitter = CAMERA_SUPERVISOR_CONFIG.get('backoff_jitter', 0.3)
+
+        self._lock = threading.RLock()
+        self._cameras = {}       # camera_id -> izleme kaydı
+        self._listeners = []     # callback(camera_id, old_state, new_state, info)
+
+        self._monitor_thread = None
+        self._stop_event = threading.Event()
+
+    # ----- Kayıt -----
+
+    @staticmethod
+    def camera_id_for(camera):
+        return f"camera_{camera.camera_index}"
+
+    def register(self, camera):
+        """Çalışan kamerayı izlemeye alır."""
+        camera_id = self.camera_id_for(camera)
+        with self._lock:
+            record = self._cameras.get(camera_id)
+            if record is None:
+                record = {
+                    'camera': camera,
+                    'state': STATE_STOPPED,
+                    'state_since': time.time(),
+                    'restart_attempts': 0,
+                    'total_restarts': 0,
+                    'next_restart_at': None,
+                    'restarting': False,
+                    'last_error': None,
+                    'available_event': threading.Event(),
+                }
+                self._cameras[camera_id] = record
+            else:
+                record['camera'] = camera
+
+        self._set_state(camera_id, STATE_STARTING)
+        self._ensure_monitor()
+        return camera_id
+
+    def unregister(self, camera):
+        """Kullanıcı durdurması - yeniden başlatma yapılmaz."""
+        camera_id = self.camera_id_for(camera)
+        with self._lock:
+            if camera_id not in self._cameras:
+                return
+        self._set_state(camera_id, STATE_STOPPED)
+        with self._lock:
+            self._cameras.pop(camera_id, None)
+
+    # ----- Abonelik -----
+
+    def subscribe(self, callback):
+        """Durum değişikliklerine abone olur. Abonelikten çıkış fonksiyonu döndürür."""
+        with self._lock:
+            self._listeners.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._listeners:
+                    self._listeners.remove(callback)
+        return unsubscribe
+
+    def _set_state(self, camera_id, new_state, error=None):
+        with self._lock:
+            record = self._cameras.get(camera_id)
+            if record is None:
+                return
+            old_state = record['state']
+            if error is not None:
+                record['last_error'] = error
+            if old_state == new_state:
+                return
+            record['state'] = new_state
+            record['state_since'] = time.time()
+
+            if new_state in AVAILABLE_STATES:
+                record['available_event'].set()
+            else:
+                record['available_event'].clear()
+
+            info = self._snapshot(camera_id, record)
+            listeners = list(self._listeners)
+
+        log = logging.warning if new_state == STATE_DOWN else logging.info
+        log(f"📷 {camera_id}: {old_state} → {new_state}"
+            + (f" ({record['last_error']})" if new_state == STATE_DOWN and record['last_error'] else ""))
+
+        # Callback'ler kilit dışında çağrılır
+        for callback in listeners:
+            try:
+                callback(camera_id, old_state, new_state, info)
+            except Exception as e:
+                logging.debug(f"Camera supervisor listener hatası: {e}")
+
+    # ----- Sorgu -----
+
+    def is_registered(self, camera_id):
+        with self._lock:
+            return camera_id in self._cameras
+
+    def get_state(self, camera_id):
+        with self._lock:
+            record = self._cameras.get(camera_id)
+            return record['state'] if record else STATE_STOPPED
+
+    def is_available(self, camera_id):
+        """AI işleme için kamera uygun mu (healthy/degraded)."""
+        return self.get_state(camera_id) in AVAILABLE_STATES
+
+    def wait_until_available(self, camera_id, timeout=0.5):
+        """Kamera uygun olana kadar bekler - kapalı kameralarda detection loop CPU harcamaz."""
+        with self._lock:
+            record = self._cameras.get(camera_id)
+        if record is None:
+            # Supervisor'a kayıtlı olmayan kamera - davranışı değiştirme
+            return True
+        return record['available_event'].wait(timeout)
+
+    def _snapshot(self, camera_id, record):
+        next_restart = record['next_restart_at']
+        return {
+            'camera_id': camera_id,
+            'state': record['state'],
+            'state_since': record['state_since'],
+            'restart_attempts': record['restart_attempts'],
+            'total_restarts': record['total_restarts'],
+            'next_restart_in': max(0.0, next_restart - time.time()) if next_restart else None,
+            'last_error': record['last_error'],
+        }
+
+    def get_states(self):
+        """Tüm kameraların sağlık durumu (API/UI için)."""
+        with self._lock:
+            return {camera_id: self._snapshot(camera_id, record)
+                    for camera_id, record in self._cameras.items()}
+
+    # ----- İzleme -----
+
+    def _ensure_monitor(self):
+        if self._monitor_thread and self._monitor_thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True,
+                                                name="CameraSupervisor")
+        self._monitor_thread.start()
+
+    def shutdown(self):
+        self._stop_event.set()
+
+    def _monitor_loop(self):
+        logging.info("🩺 Camera supervisor başlatıldı")
+        while not self._stop_event.wait(self.check_interval):
+            with self._lock:
+                camera_ids = list(self._cameras.keys())
+            for camera_id in camera_ids:
+                try:
+                    self._check_camera(camera_id)
+                except Exception as e:
+                    logging.debug(f"Camera supervisor kontrol hatası {camera_id}: {e}")
+
+    def _frame_age(self, camera):
+        """Son grab/frame'den bu yana geçen süre (perf_counter tabanlı)."""
+        last = max(getattr(camera, 'last_frame_time', 0) or 0,
+                   getattr(camera, 'last_grab_time', 0) or 0)
+        if last <= 0:
+            return None
+        return time.perf_counter() - last
+
+    def _evaluate(self, camera):
+        """Kamera nesnesine bakarak sağlık durumu ve hata nedeni döndürür."""
+        if not getattr(camera, 'is_running', False):
+            if getattr(camera, 'finished', False):
+                return STATE_STOPPED, None  # Loop kapalı video dosyası bitti
+            return STATE_DOWN, "Capture durdu"
+
+        thread = getattr(camera, 'thread', None)
+        if thread is not None and not thread.is_alive():
+            return STATE_DOWN, "Capture thread sonlandı"
+
+        age = self._frame_age(camera)
+        if age is None:
+            return STATE_STARTING, None
+        if age >= self.down_frame_age:
+            return STATE_DOWN, f"{age:.1f}s frame yok"
+        if age >= self.degraded_frame_age or not getattr(camera, 'connection_stable', True):
+            return STATE_DEGRADED, None
+        return STATE_HEALTHY, None
+
+    def _check_camera(self, camera_id):
+        with self._lock:
+            record = self._cameras.get(camera_id)
+            if record is None or record['restarting']:
+                return
+            camera = record['camera']
+            state = record['state']
+
+        if state == STATE_DOWN:
+            # Kaynak kendi kendine toparlandıysa (ör. akış yeniden bağlandı) restart gerekmez
+            recovered_state, _ = self._evaluate(camera)
+            if recovered_state in AVAILABLE_STATES:
+                with self._lock:
+                    record['next_restart_at'] = None
+                self._set_state(camera_id, recovered_state)
+                return
+            with self._lock:
+                due = record['next_restart_at'] is not None and time.time() >= record['next_restart_at']
+            if due:
+                self._start_restart(camera_id)
+            return
+
+        new_state, error = self._evaluate(camera)
+
+        if new_state == STATE_STARTING and state == STATE_STARTING:
+            # Başlangıçta uzun süre frame gelmezse down say
+            with self._lock:
+                stuck = (time.time() - record['state_since']) >= self.down_frame_age
+            if stuck:
+                new_state, error = STATE_DOWN, "Başlangıçta frame alınamadı"
+
+        if new_state == STATE_HEALTHY:
+            with self._lock:
+                record['restart_attempts'] = 0
+
+        if new_state == STATE_DOWN:
+            self._schedule_restart(camera_id)
+
+        self._set_state(camera_id, new_state, error)
+
+    def _backoff_delay(self, attempt):
+        """Exponential backoff + oransal jitter."""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        jitter = delay * self.backoff_jitter
+        return max(0.0, delay + random.uniform(-jitter, jitter))
+
+    def _schedule_restart(self, camera_id):
+        with self._lock:
+            record = self._cameras.get(camera_id)
+            if record is None:
+                return
+            delay = self._backoff_delay(record['restart_attempts'])
+            record['next_restart_at'] = time.time() + delay
+        logging.info(f"⏳ {camera_id} yeniden başlatma {delay:.1f}s sonra (deneme {record['restart_attempts'] + 1})")
+
+    def _start_restart(self, camera_id):
+        with self._lock:
+            record = self._cameras.get(camera_id)
+            if record is None or record['restarting']:
+                return
+            record['restarting'] = True
+            record['next_restart_at'] = None
+            record['restart_attempts'] += 1
+            record['total_restarts'] += 1
+
+        self._set_state(camera_id, STATE_RECOVERING)
+        threading.Thread(target=self._restart_worker, args=(camera_id,), daemon=True,
+                         name=f"CameraRestart-{camera_id}").start()
+
+    def _is_supervised(self, camera_id, camera):
+        with self._lock:
+            record = self._cameras.get(camera_id)
+            return record is not None and record['camera'] is camera
+
+    def _restart_worker(self, camera_id):
+        with self._lock:
+            record = self._cameras.get(camera_id)
+            if record is None:
+                return
+            camera = record['camera']
+
+        success = False
+        error = None
+        try:
+            try:
+                camera.stop()
+            except Exception as e:
+                logging.debug(f"{camera_id} restart öncesi stop hatası: {e}")
+
+            if hasattr(camera, 'reconnect_attempts'):
+                camera.reconnect_attempts = 0
+
+            if not self._is_supervised(camera_id, camera):
+                return  # Stop sırasında kullanıcı kaydı sildi - yeniden açma
+            success = bool(camera.start())
+            if not success:
+                error = "Yeniden başlatma başarısız"
+        except Exception as e:
+            error = str(e)
+
+        with self._lock:
+            record = self._cameras.get(camera_id)
+            supervised = record is not None and record['camera'] is camera
+            if supervised:
+                record['restarting'] = False
+        if not supervised:
+            # start() sürerken kayıt silindi: denetlenmeyen açık kamera bırakma
+            if success:
+                try:
+                    camera.stop()
+                except Exception as e:
+                    logging.debug(f"{camera_id} kayıt dışı kamera stop hatası: {e}")
+            return
+
+        if success:
+            logging.info(f"🔁 {camera_id} yeniden başlatıldı")
+            self._set_state(camera_id, STATE_STARTING)
+        else:
+            self._schedule_restart(camera_id)
+            self._set_state(camera_id, STATE_DOWN, error)
+
+
+def get_camera_supervisor():
+    """Global kamera supervisor."""
+    return CameraSupervisor.get_instance()
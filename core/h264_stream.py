@@ -0,0 +1,319 @@
+# =======================================================================================
+# === PROGRAM AÇIKLAMASI ===
+# Dosya Adı: h264_stream.py (H.264 fMP4 / HLS SEGMENT STREAM)
+# Konum: pc/core/h264_stream.py
+# Açıklama:
+# Mobil istemciler için MJPEG yerine H.264. Kamera + (mod, profil) başına tek yazılım
+# encoder'ı (PyAV / ffmpeg libx264) çalışır; çıktı fragmented MP4 olarak üretilir ve
+# bellek içi segment halkasında (SegmentRing) tutulur. Aynı segmentler hem
+# progressive fMP4 akışı (MSE / ExoPlayer) hem de kısa segmentli HLS playlist'i
+# (EXT-X-MAP + .m4s, _HLS_msn ile bloklayan playlist yenileme) olarak sunulur.
+
+# === SEGMENT YAPISI ===
+# - init segment : ftyp + moov (codec parametreleri, örnek yok)
+# - media segment: moof + mdat; her segment keyframe ile başlar (GOP = segment süresi)
+# - movflags     : frag_keyframe+empty_moov+default_base_moof (seek gerektirmez)
+# PyAV yüklü değilse AV_AVAILABLE = False; route'lar 501 döndürür, MJPEG etkilenmez.
+# =======================================================================================
+
+import threading
+import logging
+import time
+from collections import deque
+from fractions import Fraction
+
+try:
+    import av
+    AV_AVAILABLE = True
+except ImportError:
+    AV_AVAILABLE = False
+
+from config.settings import H264_STREAM_CONFIG
+
+FMP4_MIMETYPE = 'video/mp4'
+HLS_MIMETYPE = 'application/vnd.apple.mpegurl'
+SEGMENT_MIMETYPE = 'video/iso.segment'
+
+_INIT_BOXES = (b'ftyp', b'moov')
+
+
+def bitrate_for(quality, profile):
+    """Profil için hedef bit hızı (konfigürasyonda yoksa piksel/saniye başına bit)."""
+    bitrate = H264_STREAM_CONFIG.get('bitrates', {}).get(quality)
+    if bitrate:
+        return int(bitrate)
+    bits_per_pixel = H264_STREAM_CONFIG.get('bits_per_pixel', 0.08)
+    return int(profile['width'] * profile['height'] * profile['fps'] * bits_per_pixel)
+
+
+class SegmentRing:
+    """
+    Bellek içi segment halkası - tek yazar (encoder), çok okuyucu (HTTP istemcileri).
+
+    Segmentler artan seq ile saklanır; kapasite dolunca en eski segment düşer.
+    Encoder yeniden başladığında (yeni init) yeni halka önceki halkanın seq'inden devam
+    eder (start_seq); böylece EXT-X-MEDIA-SEQUENCE geri gitmez ve seg<N>.m4s adı farklı
+    içerikle tekrar kullanılmaz (önbellekteki eski segment yeni segment sanılmaz).
+    """
+
+    def __init__(self, capacity=None, start_seq=0, discontinuity_sequence=0):
+        """
+        Args:
+            capacity (int): Halkada tutulan segment sayısı
+            start_seq (int): İlk segmentin seq'i (önceki halkanın next_seq'i)
+            discontinuity_sequence (int): Bu halkaya kadarki init değişimi sayısı; 0'dan
+                büyükse ilk segmentten önce EXT-X-DISCONTINUITY yazılır
+        """
+        self.capacity = capacity or H264_STREAM_CONFIG.get('ring_segments', 8)
+        self.condition = threading.Condition()
+        self.init_segment = None
+        self.segments = deque(maxlen=self.capacity)   # (seq, duration, data)
+        self.start_seq = start_seq
+        self.next_seq = start_seq
+        self.discontinuity_sequence = discontinuity_sequence
+        self.closed = False
+        self.total_bytes = 0       # Şimdiye kadar eklenen tüm segmentler
+        self.held_bytes = 0        # Halkada şu an tutulan segmentler
+
+    def set_init(self, data):
+        with self.condition:
+            self.init_segment = data
+            self.condition.notify_all()
+
+    def append(self, data, duration):
+        with self.condition:
+            if len(self.segments) == self.segments.maxlen:
+                self.held_bytes -= len(self.segments[0][2])   # Düşecek en eski segment
+            self.segments.append((self.next_seq, duration, data))
+            self.next_seq += 1
+            self.total_bytes += len(data)
+            self.held_bytes += len(data)
+            self.condition.notify_all()
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def get(self, seq):
+        with self.condition:
+            for entry in self.segments:
+                if entry[0] == seq:
+                    return entry
+        return None
+
+    def wait_for_init(self, timeout):
+        deadline = time.time() + timeout
+        with self.condition:
+            while self.init_segment is None and not self.closed:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+            return self.init_segment
+
+    def wait_for(self, seq, timeout):
+        """
+        seq numaralı (veya halkadan düştüyse en eski mevcut) segmenti bekler.
+
+        Returns:
+            tuple: (seq, duration, data) veya zaman aşımında/kapanışta None
+        """
+        deadline = time.time() + timeout
+        with self.condition:
+            while not self.closed:
+                if self.segments:
+                    oldest = self.segments[0][0]
+                    if seq < oldest:
+                        return self.segments[0]
+                    if seq < self.next_seq:
+                        return self.segments[seq - oldest]
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return None
+                self.condition.wait(remaining)
+        return None
+
+    def playlist_entries(self):
+        with self.condition:
+            return [(seq, duration) for seq, duration, _ in self.segments]
+
+    def render_playlist(self, target_duration):
+        """
+        HLS media playlist (EXT-X-MAP ile fMP4 segmentleri).
+
+        Init değiştiyse (discontinuity_sequence > 0) halkanın ilk segmenti playlist'te
+        durduğu sürece önüne EXT-X-DISCONTINUITY yazılır; segment düşünce etiket
+        EXT-X-DISCONTINUITY-SEQUENCE'a sayılır. Init URI'si ?v= ile sürümlenir.
+        """
+        entries = self.playlist_entries()
+        longest = max([duration for _, duration in entries] + [target_duration])
+        # İlk segment henüz düşmediyse (veya gelmediyse) etiket hâlâ playlist'te sayılır
+        discontinuity_pending = (self.discontinuity_sequence > 0
+                                 and (not entries or entries[0][0] == self.start_seq))
+        lines = [
+            "#EXTM3U",
+            "#EXT-X-VERSION:7",
+            f"#EXT-X-TARGETDURATION:{int(longest + 0.999)}",
+            f"#EXT-X-MEDIA-SEQUENCE:{entries[0][0] if entries else self.next_seq}",
+            f"#EXT-X-DISCONTINUITY-SEQUENCE:{self.discontinuity_sequence - discontinuity_pending}",
+            "#EXT-X-INDEPENDENT-SEGMENTS",
+            f'#EXT-X-MAP:URI="init.mp4?v={self.discontinuity_sequence}"',
+        ]
+        for seq, duration in entries:
+            if discontinuity_pending and seq == self.start_seq:
+                lines.append("#EXT-X-DISCONTINUITY")
+            lines.append(f"#EXTINF:{duration:.3f},")
+            lines.append(f"seg{seq}.m4s")
+        return "\n".join(lines) + "\n"
+
+
+class _BoxSplitter:
+    """
+    Muxer'ın yazdığı byte akışını üst seviye MP4 kutularına ayırır (PyAV için
+    seek'siz yazılabilir dosya nesnesi).
+    """
+
+    def __init__(self, on_init, on_fragment):
+        self._buffer = bytearray()
+        self._init_parts = []
+        self._moof = None
+        self._on_init = on_init
+        self._on_fragment = on_fragment
+
+    def write(self, data):
+        self._buffer += data
+        while len(self._buffer) >= 8:
+            size = int.from_bytes(self._buffer[0:4], 'big')
+            box_type = bytes(self._buffer[4:8])
+            if size == 1:
+                if len(self._buffer) < 16:
+                    break
+                size = int.from_bytes(self._buffer[8:16], 'big')
+            if size < 8 or len(self._buffer) < size:
+                break
+            box = bytes(self._buffer[:size])
+            del self._buffer[:size]
+            self._handle_box(box_type, box)
+        return len(data)
+
+    def _handle_box(self, box_type, box):
+        if box_type in _INIT_BOXES:
+            self._init_parts.append(box)
+            if box_type == b'moov':
+                self._on_init(b"".join(self._init_parts))
+                self._init_parts = []
+        elif box_type == b'moof':
+            self._moof = box
+        elif box_type == b'mdat' and self._moof is not None:
+            self._on_fragment(self._moof + box)
+            self._moof = None
+        # styp / sidx / mfra gibi kutular canlı akışta gerekmez
+
+    def flush(self):
+        pass
+
+
+class H264SegmentEncoder:
+    """Tek (kamera, mod, profil) varyantı için H.264 → fMP4 segment üreticisi."""
+
+    def __init__(self, width, height, fps, bitrate, ring, segment_duration=None, preset=None):
+        if not AV_AVAILABLE:
+            raise RuntimeError("PyAV yüklü değil - H.264 stream kullanılamaz")
+
+        self.width = width
+        self.height = height
+        self.fps = max(1, int(round(fps)))
+        self.bitrate = bitrate
+        self.ring = ring
+        self.segment_duration = segment_duration or H264_STREAM_CONFIG.get('segment_duration', 1.0)
+        gop = max(1, int(round(self.fps * self.segment_duration)))
+
+        self._time_base = Fraction(1, self.fps)
+        self._start_time = None
+        self._last_pts = -1
+        self._gop_start = None
+        self._pending_duration = self.segment_duration
+
+        self.frames = 0
+        self.segments = 0
+        self.encode_time = 0.0
+
+        self._sink = _BoxSplitter(ring.set_init, self._on_fragment)
+        self._container = av.open(self._sink, mode='w', format='mp4',
+                                  options={'movflags': 'frag_keyframe+empty_moov+default_base_moof'})
+        self._stream = self._container.add_stream(
+            H264_STREAM_CONFIG.get('codec', 'libx264'), rate=self.fps,
+            options={
+                'preset': preset or H264_STREAM_CONFIG.get('preset', 'ultrafast'),
+                'tune': 'zerolatency',
+                'profile': 'baseline',
+                'g': str(gop),
+                'keyint_min': str(gop),
+                'sc_threshold': '0',
+                'bf': '0',
+            })
+        self._stream.width = width
+        self._stream.height = height
+        self._stream.pix_fmt = 'yuv420p'
+        self._stream.bit_rate = bitrate
+        self._stream.codec_context.time_base = self._time_base
+
+    def _on_fragment(self, data):
+        self.ring.append(data, self._pending_duration)
+        self.segments += 1
+
+    def _mux(self, packets):
+        for packet in packets:
+            if packet.is_keyframe and packet.pts is not None:
+                # Önceki GOP'un fragment'ı bu keyframe mux edilirken yazılır
+                packet_time = float(packet.pts * packet.time_base)
+                if self._gop_start is not None:
+                    self._pending_duration = max(packet_time - self._gop_start, 1.0 / self.fps)
+                self._gop_start = packet_time
+            self._container.mux(packet)
+
+    def encode(self, frame, timestamp=None):
+        """BGR frame'i encode eder; tamamlanan segmentler halkaya eklenir."""
+        encode_start = time.perf_counter()
+        timestamp = timestamp or time.time()
+        if self._start_time is None:
+            self._start_time = timestamp
+
+        # Duvar saatine göre PTS - producer FPS'i dalgalansa da süre doğru kalır
+        pts = max(int(round((timestamp - self._start_time) * self.fps)), self._last_pts + 1)
+        self._last_pts = pts
+
+        video_frame = av.VideoFrame.from_ndarray(frame, format='bgr24')
+        video_frame.pts = pts
+        video_frame.time_base = self._time_base
+        self._mux(self._stream.encode(video_frame))
+
+        self.frames += 1
+        elapsed = time.perf_counter() - encode_start
+        self.encode_time += elapsed
+        return elapsed
+
+    def close(self):
+        """Kalan paketleri boşalt ve son segmenti yaz."""
+        try:
+            if self._gop_start is not None and self._last_pts >= 0:
+                self._pending_duration = max(self._last_pts / self.fps - self._gop_start, 1.0 / self.fps)
+            self._mux(self._stream.encode(None))
+            self._container.close()
+        except Exception as e:
+            logging.debug(f"H.264 encoder kapatma hatası: {e}")
+        finally:
+            self.ring.close()
+
+    def get_stats(self):
+        return {
+            'resolution': f"{self.width}x{self.height}",
+            'fps': self.fps,
+            'bitrate_kbps': self.bitrate // 1000,
+            'frames': self.frames,
+            'segments': self.segments,
+            'ring_bytes': self.ring.held_bytes,
+            'output_bytes': self.ring.total_bytes,
+            'avg_encode_ms': round(self.encode_time / self.frames * 1000, 2) if self.frames else 0.0,
+        }
@@ -89,6 +89,9 @@ import telepot
 from dotenv import load_dotenv
 from queue import Queue, Empty
 from firebase_admin import messaging   # FCM için şart
+from utils.latency_tracer import get_latency_tracer
+from utils.metrics import get_metrics_registry
+from utils.jpeg_encoder import get_jpeg_encoder
 
 # Ortam değişkenlerini yükle
 load_dotenv()
@@ -422,6 +425,16 @@ class NotificationManager:
             processing_time = time.time() - start_time
             status = "✅ success" if success else "❌ failed"
             
+            # Glass-to-alert: kanal bazlı span (event_data['_trace'] pipeline boyunca taşınır)
+            get_latency_tracer().record_span(event_data.get('_trace'), f"notification.{channel}",
+                                             start_time, success=success)
+            
+            # Prometheus sayaçları (thread yerel - kilitsiz)
+            metrics = get_metrics_registry()
+            metrics.inc('guard_notifications_total',
+                        (('channel', channel), ('result', 'success' if success else 'failed')))
+            metrics.observe('guard_notification_seconds', processing_time, (('channel', channel),))
+            
             logging.info(f"{status} {channel} notification: {event_id} ({processing_time:.2f}s)")
             
         except Exception as e:
@@ -606,9 +619,7 @@ class NotificationManager:
             # Ekran görüntüsü varsa ekle
             if screenshot is not None:
                 try:
-                    import cv2
-                    _, img_encoded = cv2.imencode('.jpg', screenshot)
-                    img_bytes = img_encoded.tobytes()
+                    img_bytes = get_jpeg_encoder().encode(screenshot)
                     
                     img_attachment = MIMEImage(img_bytes)
                     img_attachment.add_header('Content-Disposition', 'attachment', filename='fall_detected.jpg')
@@ -754,8 +765,7 @@ class NotificationManager:
                         cv2.LINE_AA
                     )
                     
-                    _, img_encoded = cv2.imencode('.jpg', img_with_timestamp)
-                    img_bytes = io.BytesIO(img_encoded.tobytes())
+                    img_bytes = io.BytesIO(get_jpeg_encoder().encode(img_with_timestamp))
                     img_bytes.name = 'fall_detected.jpg'
                     
                     self.telegram_bot.sendPhoto(chat_id, img_bytes)
@@ -0,0 +1,231 @@
+# =======================================================================================
+# === PROGRAM AÇIKLAMASI ===
+# Dosya Adı: pose_stream.py (POSE METADATA STREAM)
+# Konum: pc/core/pose_stream.py
+# Açıklama:
+# Mobil/izleme istemcileri için annotated JPEG yerine frame başına kompakt pose
+# metadata'sı üretir: track id, kutu, 17 keypoint (int16 quantize), güven skorları ve
+# düşme bayrakları. İstemci overlay'i kendisi çizer; bant genişliği ve sunucu encode
+# CPU'su bir mertebe düşer. Opsiyonel düşük frekanslı JPEG keyframe'ler eklenebilir.
+
+# === PAKET FORMATI (binary, little-endian) ===
+# Header : magic 'GP' | version u8 | flags u8 | seq u32 | capture_time f64 |
+#          width u16 | height u16 | track_count u8                      (21 byte)
+#          flags: bit0 = düşme var, bit1 = keyframe eklendi
+# Track  : track_id u32 | box 4×i16 | box_conf u8 | fall_conf u8 | flags u8 |
+#          keypoints 34×i16 (x,y) | keypoint_conf 17×u8                 (100 byte)
+#          flags: bit0 = düşüyor, bit1 = keypoint var
+# Keyframe (flags bit1): jpeg_len u32 | jpeg bytes
+# Koordinatlar [0, 32767] aralığına normalize edilir (x / width * 32767).
+# Güvenler [0, 255] aralığına ölçeklenir.
+# =======================================================================================
+
+import struct
+import logging
+
+import cv2
+import numpy as np
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+from config.settings import POSE_STREAM_CONFIG
+from utils.jpeg_encoder import get_jpeg_encoder
+
+FORMAT_BINARY = "binary"
+FORMAT_MSGPACK = "msgpack"
+
+PACKET_MAGIC = b"GP"
+PACKET_VERSION = 1
+QUANT_MAX = 32767
+NUM_KEYPOINTS = 17
+
+FLAG_FALL = 0x01
+FLAG_KEYFRAME = 0x02
+TRACK_FLAG_FALLING = 0x01
+TRACK_FLAG_KEYPOINTS = 0x02
+
+_HEADER = struct.Struct("<2sBBIdHHB")
+_TRACK = struct.Struct(f"<I4hBBB{NUM_KEYPOINTS * 2}h{NUM_KEYPOINTS}B")
+
+
+def available_formats():
+    """Sunucunun desteklediği paket formatları."""
+    return [FORMAT_BINARY, FORMAT_MSGPACK] if MSGPACK_AVAILABLE else [FORMAT_BINARY]
+
+
+def _track_id_int(track_id):
+    try:
+        return int(track_id) & 0xFFFFFFFF
+    except (TypeError, ValueError):
+        return hash(track_id) & 0xFFFFFFFF
+
+
+def extract_pose_tracks(fall_detector, track_list, width, height):
+    """
+    FallDetector durumundan istemciye gönderilecek track listesini çıkarır.
+
+    Args:
+        fall_detector: FallDetector (person_tracks / fall_alerts kaynağı)
+        track_list: get_detection_visualization() track listesi (frame piksel koordinatı)
+        width, height: Orijinal frame boyutu
+
+    Returns:
+        list: [{'track_id', 'bbox', 'confidence', 'keypoints', 'keypoint_confs',
+                'falling', 'fall_confidence'}]
+    """
+    person_tracks = getattr(fall_detector, 'person_tracks', {}) or {}
+    fall_alerts = getattr(fall_detector, 'fall_alerts', {}) or {}
+    frame_size = getattr(fall_detector, 'frame_size', None) or width
+
+    # Keypoint'ler model giriş boyutunda (frame_size × frame_size) tutulur
+    scale = np.array([width / frame_size, height / frame_size], dtype=np.float32)
+
+    tracks = []
+    for track in track_list or []:
+        track_id = track.get('track_id')
+        person = person_tracks.get(track_id)
+
+        keypoints = None
+        keypoint_confs = None
+        if person is not None and person.latest_keypoints is not None:
+            kp = np.asarray(person.latest_keypoints, dtype=np.float32)
+            if kp.shape[0] >= NUM_KEYPOINTS:
+                keypoints = kp[:NUM_KEYPOINTS, :2] * scale
+                if person.latest_keypoint_confs is not None:
+                    keypoint_confs = np.asarray(person.latest_keypoint_confs, dtype=np.float32)[:NUM_KEYPOINTS]
+
+        alert = fall_alerts.get(track_id)
+        tracks.append({
+            'track_id': track_id,
+            'bbox': track.get('bbox', [0, 0, 0, 0]),
+            'confidence': float(track.get('confidence') or 0.0),
+            'keypoints': keypoints,
+            'keypoint_confs': keypoint_confs,
+            'falling': alert is not None,
+            'fall_confidence': float(alert.get('max_confidence', 0.0)) if alert else 0.0,
+        })
+    return tracks
+
+
+def build_pose_packet(seq, capture_time, width, height, tracks, fall=None, keyframe=None):
+    """Format bağımsız paket sözlüğü (encode_packet girdisi)."""
+    return {
+        'seq': seq,
+        'capture_time': capture_time or 0.0,
+        'width': width,
+        'height': height,
+        'tracks': tracks,
+        'fall': fall,            # (confidence, track_id) veya None
+        'keyframe': keyframe,    # JPEG byte'ları veya None
+    }
+
+
+def _quantize_points(points, width, height):
+    """Piksel koordinatlarını [0, 32767] int16 aralığına indirger."""
+    extent = np.array([max(width, 1), max(height, 1)], dtype=np.float32)
+    normalized = np.clip(np.asarray(points, dtype=np.float32) / extent, 0.0, 1.0)
+    return np.round(normalized * QUANT_MAX).astype(np.int16)
+
+
+def _quantize_conf(values):
+    return np.round(np.clip(np.asarray(values, dtype=np.float32), 0.0, 1.0) * 255).astype(np.uint8)
+
+
+def _quantized_track(track, width, height):
+    x1, y1, x2, y2 = track['bbox']
+    box = _quantize_points([[x1, y1], [x2, y2]], width, height).reshape(-1)
+
+    flags = TRACK_FLAG_FALLING if track['falling'] else 0
+    if track['keypoints'] is not None:
+        flags |= TRACK_FLAG_KEYPOINTS
+        keypoints = _quantize_points(track['keypoints'], width, height).reshape(-1)
+        confs = (_quantize_conf(track['keypoint_confs']) if track['keypoint_confs'] is not None
+                 else np.full(NUM_KEYPOINTS, 255, dtype=np.uint8))
+    else:
+        keypoints = np.zeros(NUM_KEYPOINTS * 2, dtype=np.int16)
+        confs = np.zeros(NUM_KEYPOINTS, dtype=np.uint8)
+
+    return {
+        'id': _track_id_int(track['track_id']),
+        'box': box,
+        'conf': int(_quantize_conf(track['confidence'])),
+        'fall_conf': int(_quantize_conf(track['fall_confidence'])),
+        'flags': flags,
+        'kp': keypoints,
+        'kp_conf': confs,
+    }
+
+
+def encode_binary(packet):
+    width, height = packet['width'], packet['height']
+    tracks = packet['tracks'][:255]
+
+    flags = FLAG_FALL if packet['fall'] or any(t['falling'] for t in tracks) else 0
+    if packet['keyframe']:
+        flags |= FLAG_KEYFRAME
+
+    parts = [_HEADER.pack(PACKET_MAGIC, PACKET_VERSION, flags, packet['seq'] & 0xFFFFFFFF,
+                          float(packet['capture_time']), width, height, len(tracks))]
+    for track in tracks:
+        q = _quantized_track(track, width, height)
+        parts.append(_TRACK.pack(q['id'], *q['box'].tolist(), q['conf'], q['fall_conf'], q['flags'],
+                                 *q['kp'].tolist(), *q['kp_conf'].tolist()))
+    if packet['keyframe']:
+        parts.append(struct.pack("<I", len(packet['keyframe'])))
+        parts.append(packet['keyframe'])
+    return b"".join(parts)
+
+
+def encode_msgpack(packet):
+    if not MSGPACK_AVAILABLE:
+        raise RuntimeError("msgpack yüklü değil")
+    width, height = packet['width'], packet['height']
+    tracks = []
+    for track in packet['tracks']:
+        q = _quantized_track(track, width, height)
+        tracks.append({
+            'id': q['id'],
+            'box': q['box'].tolist(),
+            'conf': q['conf'],
+            'fall_conf': q['fall_conf'],
+            'flags': q['flags'],
+            # int16 dizisi ham byte olarak (little-endian) - msgpack bin
+            'kp': q['kp'].astype('<i2').tobytes() if q['flags'] & TRACK_FLAG_KEYPOINTS else None,
+            'kp_conf': q['kp_conf'].tobytes() if q['flags'] & TRACK_FLAG_KEYPOINTS else None,
+        })
+    payload = {
+        'v': PACKET_VERSION,
+        'seq': packet['seq'],
+        't': packet['capture_time'],
+        'w': width,
+        'h': height,
+        'fall': bool(packet['fall']) or any(t['falling'] for t in packet['tracks']),
+        'tracks': tracks,
+    }
+    if packet['keyframe']:
+        payload['jpeg'] = packet['keyframe']
+    return msgpack.packb(payload, use_bin_type=True)
+
+
+def encode_packet(packet, fmt=FORMAT_BINARY):
+    """Paketi istenen formatta byte'lara çevirir."""
+    if fmt == FORMAT_MSGPACK:
+        return encode_msgpack(packet)
+    return encode_binary(packet)
+
+
+def encode_keyframe(frame):
+    """Düşük çözünürlüklü JPEG keyframe (istemci arka planı için)."""
+    try:
+        width = POSE_STREAM_CONFIG.get('keyframe_width', 320)
+        h, w = frame.shape[:2]
+        if w > width:
+            frame = cv2.resize(frame, (width, int(h * width / w)), interpolation=cv2.INTER_AREA)
+        return get_jpeg_encoder().encode(frame, quality=POSE_STREAM_CONFIG.get('keyframe_quality', 50))
+    except Exception as e:
+        logging.debug(f"Keyframe encode hatası: {e}")
+        return None
@@ -0,0 +1,206 @@
+# =======================================================================================
+# === PROGRAM AÇIKLAMASI ===
+# Dosya Adı: stream_overlay.py (ÖNCEDEN ÇİZİLMİŞ OVERLAY SPRITE'LARI)
+# Konum: pc/core/stream_overlay.py
+# Açıklama:
+# Stream overlay'inin statik katmanları (header şeridi, kamera adı, POSE/DETECT
+# rozetleri) kamera + genişlik + rozet kombinasyonu başına bir kez BGR + alfa sprite olarak
+# çizilir ve her frame'de yalnızca ilgili bölgeye (ROI) kopyalanır/karıştırılır.
+# Zaman damgası saniyede en fazla bir kez çizilir ve tüm kameralar/istemciler
+# tarafından paylaşılır. Düşme uyarısı tam frame kopyası + addWeighted yerine sadece
+# üst şeritte alfa karıştırma yapar.
+# =======================================================================================
+
+import threading
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+HEADER_HEIGHT = 36     # cv2.rectangle((0, 0), (w, 35)) satır 35'i de doldurur
+ALERT_HEIGHT = 81      # (w, 80) köşesi dahil
+ALERT_ALPHA = 0.7
+MAX_ALERT_SPRITES = 64
+
+
+class Sprite:
+    """
+    BGR + alfa sprite - karıştırma için önceden hesaplanmış çarpımlar.
+
+    Tamamen opak sprite'lar doğrudan kopyalanır, ikili alfalı (metin) olanlar maske ile
+    kopyalanır; kısmi alfalı olanlarda premultiplied BGR + ters alfa ile tamsayı
+    karıştırma yapılır.
+
+    Not: Alfa ayrı tek kanallı düzlemde metin kapsaması olarak çizilir; OpenCV'nin
+    antialias'lı kenarları da karıştırmaya dahil olur (orijinal çizimle ±2 seviye).
+    """
+
+    __slots__ = ('bgr', 'opaque', 'premultiplied', 'inverse_alpha', 'mask', 'height', 'width')
+
+    def __init__(self, bgr, alpha=None):
+        self.height, self.width = bgr.shape[:2]
+        self.bgr = np.ascontiguousarray(bgr)
+        if alpha is None:
+            alpha = np.full((self.height, self.width), 255, dtype=np.uint8)
+        alpha = alpha.reshape(self.height, self.width, 1)
+        self.opaque = bool(np.all(alpha == 255))
+        # İkili alfa (metin) için maske ile doğrudan kopya yeterli
+        binary = bool(np.all((alpha == 0) | (alpha == 255)))
+        self.mask = (alpha[:, :, 0] == 255) if binary and not self.opaque else None
+        if not self.opaque and self.mask is None:
+            self.premultiplied = self.bgr.astype(np.uint16) * alpha.astype(np.uint16)
+            self.inverse_alpha = (255 - alpha).astype(np.uint16)
+        else:
+            self.premultiplied = None
+            self.inverse_alpha = None
+
+    def composite(self, frame, x, y):
+        """Sprite'ı frame üzerinde (x, y) sol üst köşesine yerleştirir (yerinde)."""
+        fh, fw = frame.shape[:2]
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(fw, x + self.width), min(fh, y + self.height)
+        if x0 >= x1 or y0 >= y1:
+            return frame
+
+        sx0, sy0 = x0 - x, y0 - y
+        sx1, sy1 = sx0 + (x1 - x0), sy0 + (y1 - y0)
+        roi = frame[y0:y1, x0:x1]
+
+        if self.opaque:
+            roi[:] = self.bgr[sy0:sy1, sx0:sx1]
+        elif self.mask is not None:
+            mask = self.mask[sy0:sy1, sx0:sx1]
+            roi[mask] = self.bgr[sy0:sy1, sx0:sx1][mask]
+        else:
+            blended = (self.premultiplied[sy0:sy1, sx0:sx1] +
+                       roi.astype(np.uint16) * self.inverse_alpha[sy0:sy1, sx0:sx1]) // 255
+            roi[:] = blended.astype(np.uint8)
+        return frame
+
+
+class OverlayRenderer:
+    """Stream overlay sprite cache'i - tüm broadcaster'lar tarafından paylaşılır."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._header_sprites = {}      # (camera_id, width, pose, detect) -> Sprite
+        self._alert_sprites = {}       # (width, track_id, conf_text) -> Sprite
+        self._timestamp = (None, None)  # (saniye metni, Sprite)
+
+    # ----- Sprite üretimi -----
+
+    def _render_header(self, camera_id, width, pose_enabled, detection_enabled):
+        canvas = np.zeros((HEADER_HEIGHT, width, 3), dtype=np.uint8)  # Siyah, opak şerit
+
+        camera_name = camera_id.replace('_', ' ').title()
+        cv2.putText(canvas, camera_name, (10, 25), FONT, 0.7, (255, 255, 255), 2)
+
+        x_offset = 200
+        if pose_enabled:
+            cv2.rectangle(canvas, (x_offset, 5), (x_offset + 60, 30), (0, 255, 255), -1)
+            cv2.putText(canvas, "POSE", (x_offset + 10, 22), FONT, 0.5, (0, 0, 0), 1)
+            x_offset += 70
+
+        if detection_enabled:
+            cv2.rectangle(canvas, (x_offset, 5), (x_offset + 80, 30), (0, 255, 0), -1)
+            cv2.putText(canvas, "DETECT", (x_offset + 10, 22), FONT, 0.5, (0, 0, 0), 1)
+
+        return Sprite(canvas)
+
+    def _render_text(self, text, scale, thickness, color):
+        """
+        Şeffaf arka planlı metin sprite'ı.
+
+        Returns:
+            tuple: (sprite, origin_x, origin_y) - putText orijininin sprite içindeki konumu
+        """
+        (tw, th), baseline = cv2.getTextSize(text, FONT, scale, thickness)
+        pad = thickness + 1
+        shape = (th + baseline + 2 * pad, tw + 2 * pad)
+        alpha = np.zeros(shape, dtype=np.uint8)
+        cv2.putText(alpha, text, (pad, pad + th), FONT, scale, 255, thickness)
+        canvas = np.zeros(shape + (3,), dtype=np.uint8)
+        canvas[:] = color
+        return Sprite(canvas, alpha), pad, pad + th
+
+    def _render_alert(self, width, track_id, confidence_text):
+        # Metin kapsaması (antialias kenarlar dahil) - beyaz metin yarı saydam kırmızı şeridin üstünde
+        coverage = np.zeros((ALERT_HEIGHT, width), dtype=np.uint8)
+        cv2.putText(coverage, "FALL DETECTED!", (width // 2 - 150, 30), FONT, 1.2, 255, 3)
+        cv2.putText(coverage, f"ID: {track_id} | Confidence: {confidence_text}",
+                    (width // 2 - 120, 60), FONT, 0.7, 255, 2)
+        text = coverage.astype(np.float32)[:, :, None] / 255.0
+
+        # "over" birleşimi: metin (beyaz, t) + şerit (kırmızı, ALERT_ALPHA)
+        band = np.array([0, 0, 255], dtype=np.float32)
+        alpha = text + (1.0 - text) * ALERT_ALPHA
+        color = (text * 255.0 + (1.0 - text) * ALERT_ALPHA * band) / alpha
+        return Sprite(np.round(color).astype(np.uint8), np.round(alpha[:, :, 0] * 255).astype(np.uint8))
+
+    # ----- Erişim -----
+
+    def header_sprite(self, camera_id, width, pose_enabled, detection_enabled):
+        key = (camera_id, width, bool(pose_enabled), bool(detection_enabled))
+        sprite = self._header_sprites.get(key)
+        if sprite is None:
+            sprite = self._render_header(camera_id, width, pose_enabled, detection_enabled)
+            with self._lock:
+                self._header_sprites[key] = sprite
+        return sprite
+
+    def timestamp_sprite(self):
+        """Geçerli saniyenin zaman damgası - saniyede en fazla bir kez çizilir."""
+        text = datetime.now().strftime("%H:%M:%S")
+        cached_text, cached = self._timestamp
+        if cached_text == text:
+            return cached
+        rendered = self._render_text(text, 0.5, 1, (255, 255, 255))
+        # Tek atamayla değiştirilir - okuyan thread'ler kilitsiz tutarlı tuple görür
+        self._timestamp = (text, rendered)
+        return rendered
+
+    def alert_sprite(self, width, track_id, confidence):
+        confidence_text = f"{confidence:.3f}"
+        key = (width, track_id, confidence_text)
+        sprite = self._alert_sprites.get(key)
+        if sprite is None:
+            sprite = self._render_alert(width, track_id, confidence_text)
+            with self._lock:
+                if len(self._alert_sprites) >= MAX_ALERT_SPRITES:
+                    self._alert_sprites.clear()
+                self._alert_sprites[key] = sprite
+        return sprite
+
+    # ----- Kompozisyon -----
+
+    def draw_stream_overlay(self, frame, camera_id, pose_enabled, detection_enabled):
+        """Header + zaman damgası (yerinde)."""
+        h, w = frame.shape[:2]
+        self.header_sprite(camera_id, w, pose_enabled, detection_enabled).composite(frame, 0, 0)
+
+        sprite, origin_x, origin_y = self.timestamp_sprite()
+        # Orijinal yerleşim: putText(ts, (w - tw - 10, h - 10))
+        text_width = sprite.width - 2 * origin_x
+        sprite.composite(frame, w - text_width - 10 - origin_x, h - 10 - origin_y)
+        return frame
+
+    def draw_fall_alert(self, frame, confidence, track_id):
+        """Düşme uyarı şeridi - sadece üst ALERT_HEIGHT satırında karıştırma (yerinde)."""
+        w = frame.shape[1]
+        self.alert_sprite(w, track_id, confidence).composite(frame, 0, 0)
+        return frame
+
+
+_renderer = None
+_renderer_lock = threading.Lock()
+
+
+def get_overlay_renderer():
+    """Global overlay renderer (sprite cache paylaşımı için)."""
+    global _renderer
+    if _renderer is None:
+        with _renderer_lock:
+            if _renderer is None:
+                _renderer = OverlayRenderer()
+    return _renderer
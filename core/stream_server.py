@@ -10,10 +10,13 @@ import logging
 import cv2
 import time
 import json
+import sys
 import threading
+import itertools
+import base64
 from datetime import datetime, timedelta
 from threading import Thread, Lock, Event
-from collections import defaultdict, deque
+from collections import defaultdict, deque, OrderedDict
 from functools import wraps
 import numpy as np
 
@@ -54,9 +57,23 @@ except:
     REDIS_AVAILABLE = False
     logging.warning("Redis cache kullanılamıyor, memory cache kullanılacak")
 
-from core.camera import Camera
+from core.camera_sources import create_camera
+from core.camera_supervisor import AVAILABLE_STATES, get_camera_supervisor
+from utils.latency_tracer import get_latency_tracer
+from utils.metrics import get_metrics_registry
+from utils.jpeg_encoder import get_jpeg_encoder
 from core.fall_detection import FallDetector
-from config.settings import CAMERA_CONFIGS, FRAME_WIDTH, FRAME_HEIGHT
+from core.adaptive_quality import AdaptiveQualityController, AUTO_QUALITY, MOBILE_EQUIVALENTS
+from core.stream_overlay import get_overlay_renderer
+from core.alert_bus import get_alert_bus
+from core.h264_stream import (AV_AVAILABLE, H264SegmentEncoder, SegmentRing, bitrate_for,
+                              FMP4_MIMETYPE, HLS_MIMETYPE, SEGMENT_MIMETYPE)
+from core.pose_stream import (extract_pose_tracks, build_pose_packet, encode_packet, encode_keyframe,
+                              available_formats, FORMAT_BINARY)
+from config.settings import (CAMERA_CONFIGS, VIDEO_SOURCE_CONFIGS, FRAME_WIDTH, FRAME_HEIGHT,
+                             MOBILE_API_CONFIG, POSE_STREAM_CONFIG, SNAPSHOT_CONFIG,
+                             STREAM_CACHE_CONFIG, H264_STREAM_CONFIG, ALERT_BUS_CONFIG,
+                             ASYNC_STREAM_CONFIG)
 
 # Flask app konfigürasyonu
 app = Flask(__name__)
@@ -101,13 +118,61 @@ if LIMITER_AVAILABLE:
 else:
     limiter = None
 
-class StreamCache:
-    """Basitleştirilmiş cache sistemi."""
+class _CacheShard:
+    """Tek shard: LRU sıralı OrderedDict + kendi kilidi + byte bütçesi."""
     
-    def __init__(self):
-        self.memory_cache = {}
-        self.cache_stats = defaultdict(int)
+    __slots__ = ('entries', 'lock', 'bytes', 'max_bytes')
+    
+    def __init__(self, max_bytes):
+        self.entries = OrderedDict()   # key -> (data, expires, size) - en eski başta
         self.lock = Lock()
+        self.bytes = 0
+        self.max_bytes = max_bytes
+
+class StreamCache:
+    """
+    Byte bütçeli LRU + TTL cache - ULTRA OPTIMIZE.
+    
+    - Anahtarlar hash ile shard'lara dağıtılır; her shard'ın kendi kilidi vardır
+    - LRU tahliyesi O(1) (OrderedDict.popitem)
+    - Süresi dolan kayıtlar okunmasa da arka plan taramasıyla silinir
+    - Encode edilmiş frame'ler (bytes) ve API yanıtları (JSON uyumlu) saklanabilir
+    """
+    
+    def __init__(self, max_bytes=None, shards=None, default_ttl=None, sweep_interval=None):
+        self.max_bytes = max_bytes or STREAM_CACHE_CONFIG.get('max_bytes', 64 * 1024 * 1024)
+        shard_count = max(1, shards or STREAM_CACHE_CONFIG.get('shards', 8))
+        self.default_ttl = default_ttl or STREAM_CACHE_CONFIG.get('default_ttl', 300)
+        self.sweep_interval = sweep_interval or STREAM_CACHE_CONFIG.get('sweep_interval', 5.0)
+        
+        self._shards = [_CacheShard(self.max_bytes // shard_count) for _ in range(shard_count)]
+        self._stats = defaultdict(int)
+        self._stats_lock = Lock()
+        
+        self._stop_event = Event()
+        self._sweeper = Thread(target=self._sweep_loop, daemon=True, name="StreamCacheSweeper")
+        self._sweeper.start()
+    
+    def _shard(self, key):
+        return self._shards[hash(key) % len(self._shards)]
+    
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self._stats[name] += amount
+    
+    @staticmethod
+    def _estimate_size(data):
+        """Kaydın yaklaşık bellek maliyeti (byte)."""
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            return len(data)
+        if isinstance(data, str):
+            return len(data)
+        if isinstance(data, np.ndarray):
+            return data.nbytes
+        try:
+            return len(json.dumps(data, default=str))
+        except Exception:
+            return sys.getsizeof(data)
     
     def get(self, key):
         """Cache'den veri al."""
@@ -115,38 +180,136 @@ class StreamCache:
             try:
                 data = redis_client.get(f"stream:{key}")
                 if data:
-                    self.cache_stats['redis_hits'] += 1
+                    self._count('redis_hits')
                     return json.loads(data)
             except:
                 pass
         
-        with self.lock:
-            if key in self.memory_cache:
-                entry = self.memory_cache[key]
-                if entry['expires'] > time.time():
-                    self.cache_stats['memory_hits'] += 1
-                    return entry['data']
+        shard = self._shard(key)
+        now = time.time()
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is not None:
+                data, expires, size = entry
+                if expires > now:
+                    shard.entries.move_to_end(key)   # LRU: en son kullanılan sona
+                    hit = True
                 else:
-                    del self.memory_cache[key]
+                    del shard.entries[key]
+                    shard.bytes -= size
+                    hit = False
+            else:
+                hit = False
         
-        self.cache_stats['misses'] += 1
+        if hit:
+            self._count('memory_hits')
+            return data
+        if entry is not None:
+            self._count('expired')
+        self._count('misses')
         return None
     
-    def set(self, key, data, ttl=300):
+    def set(self, key, data, ttl=None):
         """Cache'e veri kaydet."""
-        if REDIS_AVAILABLE:
+        ttl = ttl or self.default_ttl
+        is_binary = isinstance(data, (bytes, bytearray, memoryview, np.ndarray))
+        
+        if REDIS_AVAILABLE and not is_binary:
             try:
                 redis_client.setex(f"stream:{key}", ttl, json.dumps(data))
-                self.cache_stats['redis_sets'] += 1
+                self._count('redis_sets')
             except:
                 pass
         
-        with self.lock:
-            self.memory_cache[key] = {
-                'data': data,
-                'expires': time.time() + ttl
-            }
-            self.cache_stats['memory_sets'] += 1
+        size = self._estimate_size(data)
+        shard = self._shard(key)
+        if size > shard.max_bytes:
+            # Tek başına shard bütçesini aşan kayıt saklanmaz
+            self._count('rejected_oversize')
+            return False
+        
+        evictions = 0
+        evicted_bytes = 0
+        with shard.lock:
+            old = shard.entries.pop(key, None)
+            if old is not None:
+                shard.bytes -= old[2]
+            shard.entries[key] = (data, time.time() + ttl, size)
+            shard.bytes += size
+            
+            # Bütçe aşıldıysa en eski kayıtları at - O(1) / kayıt
+            while shard.bytes > shard.max_bytes and shard.entries:
+                _, (_, _, evicted_size) = shard.entries.popitem(last=False)
+                shard.bytes -= evicted_size
+                evictions += 1
+                evicted_bytes += evicted_size
+        
+        with self._stats_lock:
+            self._stats['memory_sets'] += 1
+            if evictions:
+                self._stats['evictions'] += evictions
+                self._stats['evicted_bytes'] += evicted_bytes
+        return True
+    
+    def get_or_set(self, key, factory, ttl=None):
+        """Cache'de yoksa factory() ile üret ve kaydet."""
+        data = self.get(key)
+        if data is None:
+            data = factory()
+            if data is not None:
+                self.set(key, data, ttl)
+        return data
+    
+    def delete(self, key):
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.pop(key, None)
+            if entry is not None:
+                shard.bytes -= entry[2]
+    
+    def _sweep_loop(self):
+        """Süresi dolan kayıtları periyodik temizle (okunmayan anahtarlar da dahil)."""
+        while not self._stop_event.wait(self.sweep_interval):
+            try:
+                self.sweep_expired()
+            except Exception as e:
+                logging.debug(f"StreamCache tarama hatası: {e}")
+    
+    def sweep_expired(self):
+        """Tüm shard'larda süresi dolanları sil; silinen kayıt sayısını döndür."""
+        now = time.time()
+        removed = 0
+        for shard in self._shards:
+            with shard.lock:
+                expired = [k for k, (_, expires, _) in shard.entries.items() if expires <= now]
+                for k in expired:
+                    shard.bytes -= shard.entries.pop(k)[2]
+            removed += len(expired)
+        if removed:
+            self._count('expired', removed)
+        return removed
+    
+    @property
+    def cache_stats(self):
+        """Hit/miss/tahliye ve byte metrikleri."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        entries = 0
+        used = 0
+        for shard in self._shards:
+            with shard.lock:
+                entries += len(shard.entries)
+                used += shard.bytes
+        hits = stats.get('memory_hits', 0) + stats.get('redis_hits', 0)
+        lookups = hits + stats.get('misses', 0)
+        stats.update({
+            'entries': entries,
+            'bytes': used,
+            'max_bytes': self.max_bytes,
+            'shards': len(self._shards),
+            'hit_ratio': round(hits / lookups, 3) if lookups else 0.0,
+        })
+        return stats
     
     def clear(self):
         """Cache'i temizle."""
@@ -157,40 +320,572 @@ class StreamCache:
             except:
                 pass
         
-        with self.lock:
-            self.memory_cache.clear()
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+                shard.bytes = 0
+    
+    def close(self):
+        self._stop_event.set()
 
 class StreamAnalytics:
-    """Basitleştirilmiş stream analytics."""
+    """
+    Stream analytics - ULTRA OPTIMIZE: thread başına sayaçlar.
+    
+    record_event global kilit almaz; sayaçlar MetricsRegistry'nin thread yerel
+    akümülatörlerine yazılır ve arka planda periyodik olarak birleştirilir.
+    """
+    
+    EVENTS_METRIC = 'guard_stream_events_total'
     
     def __init__(self):
-        self.metrics = defaultdict(lambda: defaultdict(int))
-        self.realtime_data = defaultdict(lambda: deque(maxlen=100))
+        self.registry = get_metrics_registry()
         self.start_time = time.time()
-        self.lock = Lock()
+        
+        self.registry.describe(self.EVENTS_METRIC, 'counter', "Stream sunucusu olay sayaçları")
+        self.registry.describe('guard_stream_frame_send_seconds', 'histogram',
+                               "Chunk'ın istemci socket'ine yazılma süresi")
+        self.registry.describe('guard_broadcaster_inference_seconds', 'histogram',
+                               "Broadcaster frame başına AI süresi")
+        self.registry.describe('guard_broadcaster_encode_seconds', 'histogram',
+                               "Broadcaster varyant başına JPEG encode süresi")
+        self.registry.describe('guard_broadcaster_h264_encode_seconds', 'histogram',
+                               "Broadcaster varyant başına H.264 encode süresi")
     
     def record_event(self, event_type, camera_id=None, **kwargs):
-        """Event kaydet."""
-        with self.lock:
-            timestamp = time.time()
+        """Event kaydet (kilitsiz)."""
+        self.registry.inc(self.EVENTS_METRIC, (('camera', camera_id or ''), ('event', event_type)))
+    
+    def observe(self, metric, value, camera_id=None):
+        """Histogram gözlemi (süreler saniye cinsinden)."""
+        self.registry.observe(metric, value, (('camera', camera_id or ''),))
+    
+    def get_metrics(self, camera_id=None):
+        """Metrikleri al (son birleştirme anındaki değerler)."""
+        cameras = defaultdict(dict)
+        global_metrics = defaultdict(int)
+        for (_, labels), value in self.registry.get_counters(self.EVENTS_METRIC).items():
+            label_map = dict(labels)
+            event = label_map.get('event')
+            global_metrics[event] += value
+            if label_map.get('camera'):
+                cameras[label_map['camera']][event] = value
+        
+        if camera_id:
+            return dict(cameras.get(camera_id, {}))
+        
+        rates = defaultdict(float)
+        for (_, labels), value in self.registry.get_rates(self.EVENTS_METRIC).items():
+            rates[dict(labels).get('event')] += value
+        
+        return {
+            'global': dict(global_metrics),
+            'cameras': dict(cameras),
+            'rates_per_second': {event: round(rate, 2) for event, rate in rates.items()},
+            'uptime': time.time() - self.start_time
+        }
+
+class CameraBroadcaster:
+    """
+    Kamera başına tek üretici (producer) - ULTRA OPTIMIZE.
+    
+    AI inference her frame için bir kez, JPEG encode her (mod, kalite) çifti için bir kez
+    yapılır; üretilen byte'lar tüm abone istemcilere dağıtılır. Ek izleyicinin CPU maliyeti
+    neredeyse sıfırdır. İstemciler her zaman en son frame'i alır (latest-frame-wins).
+    """
+    
+    MODE_RAW = 'raw'
+    MODE_POSE = 'pose'
+    MODE_DETECTION = 'detection'
+    MODE_META = 'meta'                    # JPEG yerine pose metadata paketi
+    MODE_H264 = 'h264'                    # H.264 fMP4 segmentleri (kalite alanı 'mod:profil')
+    
+    def __init__(self, server, camera_id, idle_timeout=5.0):
+        self.server = server
+        self.camera_id = camera_id
+        self.idle_timeout = idle_timeout      # Abone kalmayınca producer'ın kapanma süresi
+        
+        self.condition = threading.Condition()
+        self.subscribers = {}                 # token -> (mode, quality)
+        self.callbacks = {}                   # token -> callback(seq, chunk)
+        self.latest = {}                      # (mode, quality) -> (seq, chunk)
+        self.latest_jpeg = {}                 # (mode, quality) -> (seq, jpeg, capture_time) - snapshot
+        self._snapshot_tokens = {}            # (mode, quality) -> [token, expires] - HLS keep_warm
+        self.h264_encoders = {}               # (MODE_H264, 'mod:profil') -> H264SegmentEncoder
+        self.segment_rings = {}               # (MODE_H264, 'mod:profil') -> SegmentRing
+        self._h264_sequence = {}              # Aynı anahtar -> (next_seq, init sayısı) - halka silinse de kalır
+        self._h264_failed = set()             # Encoder'ı açılamayan varyantlar (abonelik bitene kadar)
+        self.epoch = int(time.time())         # ETag'lerin yeniden başlatmalar arası çakışmaması için
+        self.seq = 0
+        self._token_counter = 0
+        
+        self.running = False
+        self.thread = None
+        self.fps = 0.0
+        self.stats = defaultdict(int)
+        self._last_keyframe = 0.0
+    
+    @classmethod
+    def mode_for(cls, include_pose, include_detection):
+        """Route parametrelerinden yayın modunu belirle."""
+        if include_detection:
+            return cls.MODE_DETECTION
+        if include_pose:
+            return cls.MODE_POSE
+        return cls.MODE_RAW
+    
+    @classmethod
+    def meta_variant(cls, fmt, keyframes):
+        """Pose metadata aboneliği için (mod, kalite) anahtarı - kalite alanı 'format:kf|nokf'."""
+        return cls.MODE_META, f"{fmt}:{'kf' if keyframes else 'nokf'}"
+    
+    @classmethod
+    def h264_variant(cls, mode, quality):
+        """H.264 aboneliği için (mod, kalite) anahtarı - kalite alanı 'mod:profil'."""
+        return cls.MODE_H264, f"{mode}:{quality}"
+    
+    def subscribe(self, mode, quality, callback=None):
+        """
+        Abone ekle, gerekirse producer thread'ini başlat. Abonelik token'ı döndürür.
+        
+        Args:
+            callback: Opsiyonel callback(seq, chunk) - her yeni chunk'ta producer thread'inden
+                      çağrılır (asyncio mailbox'ları için push modeli)
+        """
+        with self.condition:
+            self._token_counter += 1
+            token = self._token_counter
+            self.subscribers[token] = (mode, quality)
+            if callback is not None:
+                self.callbacks[token] = callback
+            if not self.running:
+                self.running = True
+                self.thread = Thread(target=self._producer_loop, daemon=True,
+                                     name=f"Broadcaster-{self.camera_id}")
+                self.thread.start()
+        return token
+    
+    def update_subscription(self, token, mode, quality):
+        """Aboneliğin (mod, kalite) çiftini değiştir - adaptif kalite geçişi."""
+        with self.condition:
+            if token in self.subscribers:
+                self.subscribers[token] = (mode, quality)
+    
+    def unsubscribe(self, token):
+        """Abone çıkar - producer idle_timeout sonunda kendiliğinden kapanır."""
+        with self.condition:
+            self.subscribers.pop(token, None)
+            self.callbacks.pop(token, None)
+    
+    def wait_for_chunk(self, mode, quality, last_seq, timeout=1.0):
+        """
+        last_seq'ten yeni bir chunk gelene kadar bekler.
+        
+        Returns:
+            tuple: (seq, chunk) veya zaman aşımında None
+        """
+        key = (mode, quality)
+        deadline = time.time() + timeout
+        with self.condition:
+            while True:
+                entry = self.latest.get(key)
+                if entry is not None and entry[0] > last_seq:
+                    return entry
+                remaining = deadline - time.time()
+                if remaining <= 0 or not self.running:
+                    return None
+                self.condition.wait(remaining)
+    
+    def get_snapshot(self, mode, quality, timeout=None):
+        """
+        Varyantın en son encode edilmiş JPEG'i.
+        
+        Varyant zaten yayında ise (stream veya HLS aboneliği) ek inference/encode yapılmaz
+        ve abonelik uzatılmaz. Soğuk cache'te tek seferlik abonelik açılır, bir frame
+        üretilince hemen bırakılır; yoklayan dashboard'lar varyantı sürekli üretimde tutmaz.
+        
+        Returns:
+            tuple: (seq, jpeg, capture_time) veya None
+        """
+        key = (mode, quality)
+        timeout = timeout if timeout is not None else SNAPSHOT_CONFIG.get('cold_timeout', 2.0)
+        
+        with self.condition:
+            entry = self.latest_jpeg.get(key)
+            warm = self.running and entry is not None and key in set(self.subscribers.values())
+            if not warm:
+                token = self.subscribe(mode, quality)
+        
+        if warm:
+            self.stats['snapshot_hits'] += 1
+            return entry
+        
+        self.stats['snapshot_misses'] += 1
+        try:
+            self.wait_for_chunk(mode, quality, entry[0] if entry else 0, timeout)
+            with self.condition:
+                return self.latest_jpeg.get(key, entry)
+        finally:
+            self.unsubscribe(token)
+    
+    def keep_warm(self, mode, quality, linger):
+        """
+        Varyantı istemci bağlantısı olmadan linger süresi boyunca üretimde tutar
+        (HLS gibi istek/yanıt tabanlı tüketiciler için).
+        
+        Returns:
+            bool: Varyant zaten yayında ise True
+        """
+        key = (mode, quality)
+        with self.condition:
+            active = self.running and key in set(self.subscribers.values())
+            lingering = self._snapshot_tokens.get(key)
+            if lingering is not None:
+                lingering[1] = max(lingering[1], time.time() + linger)
+            elif not active:
+                token = self.subscribe(mode, quality)
+                self._snapshot_tokens[key] = [token, time.time() + linger]
+        return active
+    
+    def get_segment_ring(self, quality):
+        """H.264 varyantının segment halkası (producer encoder'ı ilk frame'de bağlar)."""
+        key = (self.MODE_H264, quality)
+        with self.condition:
+            ring = self.segment_rings.get(key)
+            if ring is None or ring.closed:
+                if ring is not None:
+                    self._retire_segment_ring(key)
+                # Yeni encoder = yeni init: seq kaldığı yerden devam eder, önceki init'ler
+                # süreksizlik sayılır
+                next_seq, inits = self._h264_sequence.get(key, (0, 0))
+                ring = SegmentRing(start_seq=next_seq, discontinuity_sequence=inits)
+                self.segment_rings[key] = ring
+            return ring
+    
+    def _retire_segment_ring(self, key):
+        """Halkayı bırak, seq sayacını sakla (condition tutulurken çağrılır)."""
+        ring = self.segment_rings.pop(key, None)
+        if ring is not None:
+            inits = ring.discontinuity_sequence + (ring.init_segment is not None)
+            self._h264_sequence[key] = (ring.next_seq, inits)
+    
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.subscribers.clear()
+            self.callbacks.clear()
+            self._snapshot_tokens.clear()
+            self.condition.notify_all()
+    
+    def get_stats(self):
+        with self.condition:
+            subscriber_count = len(self.subscribers)
+            variants = sorted(f"{mode}/{quality}" for mode, quality in set(self.subscribers.values()))
+            h264 = {quality: encoder.get_stats() for (_, quality), encoder in self.h264_encoders.items()}
+        stats = {
+            'running': self.running,
+            'subscribers': subscriber_count,
+            'variants': variants,
+            'fps': round(self.fps, 1),
+            **self.stats
+        }
+        if h264:
+            stats['h264'] = h264
+        return stats
+    
+    def _producer_loop(self):
+        server = self.server
+        camera = server.cameras[self.camera_id]['camera']
+        idle_since = None
+        frame_count = 0
+        last_fps_time = time.time()
+        
+        logging.info(f"📡 Broadcaster başlatıldı: {self.camera_id}")
+        
+        while server.is_running:
+            loop_start = time.time()
+            
+            with self.condition:
+                if not self.running:
+                    break
+                # Süresi dolan keep_warm aboneliklerini bırak
+                for key, (token, expires) in list(self._snapshot_tokens.items()):
+                    if loop_start > expires:
+                        self.subscribers.pop(token, None)
+                        del self._snapshot_tokens[key]
+                variants = set(self.subscribers.values())
+                if not variants:
+                    idle_since = idle_since or loop_start
+                    if loop_start - idle_since >= self.idle_timeout:
+                        self.running = False
+                        self.latest.clear()
+                        break
+                else:
+                    idle_since = None
             
-            if camera_id:
-                self.metrics[camera_id][event_type] += 1
-                self.realtime_data[f"{camera_id}_{event_type}"].append(timestamp)
+            if not variants:
+                time.sleep(0.1)
+                continue
             
-            self.metrics['global'][event_type] += 1
-            self.realtime_data[f"global_{event_type}"].append(timestamp)
+            try:
+                # Kamera down/recovering - AI çalıştırmadan bekle (istemciler durum frame'i gösterir)
+                if not server.supervisor.wait_until_available(self.camera_id, timeout=0.5):
+                    continue
+                
+                if hasattr(camera, 'get_frame_with_timestamp'):
+                    frame, capture_time = camera.get_frame_with_timestamp()
+                else:
+                    frame, capture_time = camera.get_frame(), None
+                if frame is None:
+                    time.sleep(0.1)
+                    continue
+                
+                modes = {quality.split(':', 1)[0] if mode == self.MODE_H264 else mode
+                         for mode, quality in variants}
+                bases, analysis = self._render_modes(frame, capture_time, modes)
+                
+                # Her (mod, kalite) için tek encode
+                chunks = {}
+                jpegs = {}
+                meta_variants = []
+                for mode, quality in variants:
+                    if mode == self.MODE_META:
+                        meta_variants.append(quality)
+                        continue
+                    if mode == self.MODE_H264:
+                        self._encode_h264_variant(bases, quality, capture_time)
+                        continue
+                    jpeg = self._encode_variant(bases[mode], mode, quality)
+                    if jpeg:
+                        jpegs[(mode, quality)] = jpeg
+                        chunks[(mode, quality)] = self.multipart_chunk(jpeg)
+                
+                if meta_variants:
+                    chunks.update(self._encode_meta_variants(frame, capture_time, analysis,
+                                                             meta_variants, self.seq + 1))
+                
+                with self.condition:
+                    self.seq += 1
+                    for key, chunk in chunks.items():
+                        self.latest[key] = (self.seq, chunk)
+                    for key, jpeg in jpegs.items():
+                        self.latest_jpeg[key] = (self.seq, jpeg, capture_time)
+                    # Abonesi kalmayan varyantları bırak
+                    for key in [k for k in self.latest if k not in variants]:
+                        del self.latest[key]
+                    for key in [k for k in self.latest_jpeg if k not in variants]:
+                        del self.latest_jpeg[key]
+                    # H.264 temizliği güncel abonelere göre - döngü başından sonra abone olan
+                    # istemcinin halkası silinmesin
+                    subscribed = set(self.subscribers.values())
+                    stale_encoders = [self.h264_encoders.pop(k) for k in list(self.h264_encoders)
+                                      if k not in subscribed]
+                    for key in [k for k in self.segment_rings if k not in subscribed]:
+                        self._retire_segment_ring(key)
+                    self._h264_failed &= subscribed
+                    seq = self.seq
+                    pushes = [(callback, chunks.get(self.subscribers.get(token)))
+                              for token, callback in self.callbacks.items()]
+                    self.condition.notify_all()
+                
+                for encoder in stale_encoders:
+                    encoder.close()
+                
+                # Push aboneleri (kilit dışında)
+                for callback, chunk in pushes:
+                    if chunk is None:
+                        continue
+                    try:
+                        callback(seq, chunk)
+                    except Exception as e:
+                        logging.debug(f"Broadcaster callback hatası: {e}")
+                
+                self.stats['frames_produced'] += 1
+                frame_count += 1
+                now = time.time()
+                if now - last_fps_time >= 1.0:
+                    self.fps = frame_count / (now - last_fps_time)
+                    frame_count = 0
+                    last_fps_time = now
+                
+                # En yüksek FPS'li abonenin hızında üret
+                target_fps = max(self._variant_fps(mode, quality) for mode, quality in variants)
+                sleep_time = (1.0 / target_fps) - (time.time() - loop_start)
+                if sleep_time > 0:
+                    time.sleep(sleep_time)
+            
+            except Exception as e:
+                logging.error(f"Broadcaster {self.camera_id} hatası: {str(e)}")
+                time.sleep(0.1)
+        
+        with self.condition:
+            self.running = False
+            encoders = list(self.h264_encoders.values())
+            self.h264_encoders.clear()
+            for key in list(self.segment_rings):
+                self._retire_segment_ring(key)
+            self.condition.notify_all()
+        for encoder in encoders:
+            encoder.close()
+        logging.info(f"📡 Broadcaster durdu: {self.camera_id}")
     
-    def get_metrics(self, camera_id=None):
-        """Metrikleri al."""
-        with self.lock:
-            if camera_id:
-                return dict(self.metrics[camera_id])
-            return {
-                'global': dict(self.metrics['global']),
-                'cameras': {k: dict(v) for k, v in self.metrics.items() if k != 'global'},
-                'uptime': time.time() - self.start_time
-            }
+    def _render_modes(self, frame, capture_time, modes):
+        """
+        Frame başına tek AI geçişi; her mod için temel frame'i hazırla.
+        
+        Returns:
+            tuple: (bases, analysis) - analysis: {'tracks': [...], 'fall': (confidence, track_id) | None}
+        """
+        server = self.server
+        bases = {self.MODE_RAW: frame}
+        analysis = {'tracks': [], 'fall': None}
+        
+        if not (modes - {self.MODE_RAW}):
+            return bases, analysis
+        
+        annotated_frame = frame
+        if server.fall_detector:
+            try:
+                inference_start = time.perf_counter()
+                annotated_frame, tracks = server.fall_detector.get_detection_visualization(frame)
+                analysis['tracks'] = tracks
+                self.stats['inference_runs'] += 1
+                
+                if self.MODE_DETECTION in modes or self.MODE_META in modes:
+                    is_fall, confidence, track_id = server.fall_detector.detect_fall(frame, tracks)
+                    
+                    if is_fall and confidence > 0.6:
+                        analysis['fall'] = (confidence, track_id)
+                        trace = get_latency_tracer().new_trace(self.camera_id, capture_time)
+                        server._handle_fall_detection(self.camera_id, confidence, track_id, trace=trace,
+                                                      frame=frame, capture_time=capture_time)
+                        # Pose modu temiz annotated frame'i kullanıyorsa (veya detector ham
+                        # frame'i döndürdüyse) kopya gerekir; aksi halde yerinde çiz
+                        shared = self.MODE_POSE in modes or annotated_frame is frame
+                        alert_frame = annotated_frame.copy() if shared else annotated_frame
+                        server._add_fall_alert_overlay(alert_frame, confidence, track_id)
+                        bases[self.MODE_DETECTION] = alert_frame
+                
+                server.analytics.observe('guard_broadcaster_inference_seconds',
+                                         time.perf_counter() - inference_start, self.camera_id)
+            
+            except Exception as e:
+                logging.error(f"AI işleme hatası: {str(e)}")
+                annotated_frame = frame
+        
+        bases[self.MODE_POSE] = annotated_frame
+        bases.setdefault(self.MODE_DETECTION, annotated_frame)
+        return bases, analysis
+    
+    def _encode_meta_variants(self, frame, capture_time, analysis, meta_variants, seq):
+        """Pose metadata paketini her (format, keyframe) varyantı için bir kez encode eder."""
+        h, w = frame.shape[:2]
+        tracks = extract_pose_tracks(self.server.fall_detector, analysis['tracks'], w, h)
+        
+        keyframe = None
+        now = time.time()
+        if any(q.endswith(':kf') for q in meta_variants) and \
+                now - self._last_keyframe >= POSE_STREAM_CONFIG.get('keyframe_interval', 2.0):
+            keyframe = encode_keyframe(frame)
+            self._last_keyframe = now
+        
+        chunks = {}
+        for quality in meta_variants:
+            fmt, kf = quality.split(':', 1)
+            packet = build_pose_packet(seq, capture_time, w, h, tracks, fall=analysis['fall'],
+                                       keyframe=keyframe if kf == 'kf' else None)
+            try:
+                chunks[(self.MODE_META, quality)] = encode_packet(packet, fmt)
+                self.stats['meta_packets'] += 1
+            except Exception as e:
+                logging.debug(f"Pose paketi encode hatası ({fmt}): {e}")
+        return chunks
+    
+    def _variant_fps(self, mode, quality):
+        """Varyantın hedef FPS'i."""
+        if mode == self.MODE_META:
+            return POSE_STREAM_CONFIG.get('fps', 15)
+        if mode == self.MODE_H264:
+            quality = quality.split(':', 1)[1]
+        return self.server.quality_profiles[quality]['fps']
+    
+    def _encode_h264_variant(self, bases, variant, capture_time):
+        """Varyant frame'ini kameranın paylaşılan H.264 encoder'ına besler."""
+        mode, quality = variant.split(':', 1)
+        key = (self.MODE_H264, variant)
+        if key in self._h264_failed:
+            return
+        output = self._prepare_variant(bases[mode], mode, quality)
+        h, w = output.shape[:2]
+        if h % 2 or w % 2:
+            # yuv420p çift boyut ister
+            h, w = h - h % 2, w - w % 2
+            output = np.ascontiguousarray(output[:h, :w])
+        
+        encoder = self.h264_encoders.get(key)
+        if encoder is not None and (encoder.width, encoder.height) != (w, h):
+            # Çözünürlük değişti (ultra profil + kamera yeniden başlatma) - yeni init segmenti
+            encoder.close()
+            encoder = None
+        if encoder is None:
+            profile = self.server.quality_profiles[quality]
+            try:
+                encoder = H264SegmentEncoder(w, h, profile['fps'], bitrate_for(quality, profile),
+                                             self.get_segment_ring(variant))
+            except Exception as e:
+                logging.error(f"H.264 encoder başlatılamadı ({self.camera_id}/{variant}): {e}")
+                # Bekleyen istemciler beklemeyi bıraksın; abonelik bitene kadar tekrar denenmez
+                self._h264_failed.add(key)
+                self.get_segment_ring(variant).close()
+                return
+            with self.condition:
+                self.h264_encoders[key] = encoder
+        
+        try:
+            elapsed = encoder.encode(output, capture_time)
+            self.stats['h264_frames'] += 1
+            self.server.analytics.observe('guard_broadcaster_h264_encode_seconds', elapsed, self.camera_id)
+        except Exception as e:
+            logging.debug(f"H.264 encode hatası ({self.camera_id}/{variant}): {e}")
+    
+    def _prepare_variant(self, base_frame, mode, quality):
+        """Resize + overlay; encode edilecek frame'i döndürür."""
+        server = self.server
+        profile = server.quality_profiles[quality]
+        
+        # Temel frame modlar arasında paylaşıldığı için kopya üzerinde çalış
+        if quality != 'ultra':
+            output = cv2.resize(base_frame, (profile['width'], profile['height']),
+                                interpolation=cv2.INTER_LINEAR)
+        else:
+            output = base_frame.copy()
+        
+        server._add_stream_overlay(output, self.camera_id, self.fps,
+                                   mode != self.MODE_RAW, mode == self.MODE_DETECTION, quality)
+        return output
+    
+    def _encode_variant(self, base_frame, mode, quality):
+        """Resize + overlay + JPEG encode; JPEG byte'larını döndürür."""
+        server = self.server
+        profile = server.quality_profiles[quality]
+        output = self._prepare_variant(base_frame, mode, quality)
+        
+        encode_start = time.perf_counter()
+        jpeg = server.jpeg_encoder.encode(output, quality=profile['quality'])
+        if jpeg is None:
+            return None
+        self.stats['encodes'] += 1
+        server.analytics.observe('guard_broadcaster_encode_seconds',
+                                 time.perf_counter() - encode_start, self.camera_id)
+        return jpeg
+    
+    @staticmethod
+    def multipart_chunk(frame_bytes):
+        """JPEG byte'larını MJPEG multipart parçasına sarar."""
+        return (b'--frame\r\n'
+                b'Content-Type: image/jpeg\r\n'
+                b'Content-Length: ' + str(len(frame_bytes)).encode() + b'\r\n\r\n' +
+                frame_bytes + b'\r\n')
 
 class EnhancedStreamServer:
     """Gelişmiş video stream sunucusu."""
@@ -202,6 +897,13 @@ class EnhancedStreamServer:
         self.fall_detector = None
         self.cache = StreamCache()
         self.analytics = StreamAnalytics()
+        self.overlay_renderer = get_overlay_renderer()
+        self.jpeg_encoder = get_jpeg_encoder()
+        
+        # Düşme uyarıları - olay başına tek uyarı, Socket.IO kendi kuyruğundan yayınlar
+        self.alert_bus = get_alert_bus()
+        self.socketio_alerts = (self.alert_bus.subscribe('socketio', handler=self._emit_fall_alert)
+                                if socketio else None)
         
         # Konfigürasyon
         self.config = {
@@ -216,12 +918,18 @@ class EnhancedStreamServer:
         # Stream yönetimi
         self.active_streams = {}
         self.stream_locks = defaultdict(Lock)
+        self.broadcasters = {}   # camera_id -> CameraBroadcaster (paylaşılan producer)
         self.quality_profiles = {
             'low': {'width': 320, 'height': 240, 'fps': 15, 'quality': 60},
             'medium': {'width': 640, 'height': 480, 'fps': 25, 'quality': 75},
             'high': {'width': 1280, 'height': 720, 'fps': 30, 'quality': 85},
             'ultra': {'width': 1920, 'height': 1080, 'fps': 30, 'quality': 95}
         }
+        # Mobil profiller adaptif kalite basamaklarında kullanılır
+        self.quality_profiles.update(MOBILE_API_CONFIG.get('quality_profiles', {}))
+        self.stream_clients = {}   # client_id -> AdaptiveQualityController
+        self.pose_subscriptions = defaultdict(list)   # WebSocket sid -> [(camera_id, token)]
+        self._client_counter = itertools.count(1)
         
         # Model yönetimi
         self.available_models = {
@@ -232,6 +940,10 @@ class EnhancedStreamServer:
         }
         self.current_model = 'yolo11l'
         
+        # Kamera supervisor - sağlık durumu yayını
+        self.supervisor = get_camera_supervisor()
+        self.supervisor.subscribe(self._on_camera_state_change)
+        
         # Health monitoring
         self.health_status = {
             'overall': 'healthy',
@@ -241,16 +953,75 @@ class EnhancedStreamServer:
         }
         
         self._initialize_components()
+        self.analytics.registry.register_collector(self._collect_metrics)
+    
+    def _collect_metrics(self):
+        """Scrape anında kamera / detector / stream gauge'ları (Prometheus collector)."""
+        samples = []
+        
+        # Kameralar
+        states = self.supervisor.get_states()
+        for camera_id, info in self.cameras.items():
+            state = states.get(camera_id, {}).get('state', info.get('status', 'unknown'))
+            samples.append(('guard_camera_up', {'camera': camera_id},
+                            1 if state in ('healthy', 'degraded') else 0, 'gauge',
+                            "Kamera frame üretiyor mu (healthy/degraded)"))
+        for camera_id, info in self.cameras.items():
+            samples.append(('guard_camera_restarts_total', {'camera': camera_id},
+                            states.get(camera_id, {}).get('total_restarts', info.get('restart_count', 0)),
+                            'counter', "Supervisor yeniden başlatma sayısı"))
+        for camera_id, info in self.cameras.items():
+            camera = info['camera']
+            if hasattr(camera, 'get_performance_stats') and getattr(camera, 'is_running', False):
+                try:
+                    samples.append(('guard_camera_fps', {'camera': camera_id},
+                                    camera.get_performance_stats().get('actual_fps'), 'gauge',
+                                    "Kamera capture FPS"))
+                except Exception:
+                    pass
+        
+        # Stream'ler
+        for camera_id, info in self.cameras.items():
+            samples.append(('guard_stream_active_clients', {'camera': camera_id},
+                            info['active_streams'], 'gauge', "Aktif stream istemcisi"))
+        for camera_id, broadcaster in list(self.broadcasters.items()):
+            samples.append(('guard_broadcaster_fps', {'camera': camera_id},
+                            round(broadcaster.fps, 2), 'gauge', "Broadcaster üretim FPS"))
+        for camera_id, broadcaster in list(self.broadcasters.items()):
+            samples.append(('guard_broadcaster_encodes_total', {'camera': camera_id},
+                            broadcaster.stats.get('encodes', 0), 'counter', "Broadcaster JPEG encode sayısı"))
+        cache_stats = self.cache.cache_stats
+        samples.append(('guard_stream_cache_bytes', {}, cache_stats.get('bytes', 0), 'gauge',
+                        "StreamCache kullanılan byte"))
+        samples.append(('guard_stream_cache_evictions_total', {}, cache_stats.get('evictions', 0), 'counter',
+                        "StreamCache LRU tahliyeleri"))
+        
+        # Detector
+        detector = self.fall_detector
+        if detector is not None and hasattr(detector, 'detection_stats'):
+            stats = detector.detection_stats
+            samples.append(('guard_detector_detections_total', {}, stats.get('total_detections', 0),
+                            'counter', "Doğrulanmış insan tespiti sayısı"))
+            samples.append(('guard_detector_falls_total', {}, stats.get('fall_detections', 0),
+                            'counter', "Düşme algılama sayısı"))
+            times = list(stats.get('processing_times', []))
+            if times:
+                samples.append(('guard_detector_processing_seconds_avg', {}, round(sum(times) / len(times), 6),
+                                'gauge', "Son detection işlem süresi ortalaması"))
+            samples.append(('guard_detector_active_tracks', {}, len(getattr(detector, 'person_tracks', {})),
+                            'gauge', "Aktif takip edilen kişi"))
+        return samples
     
     def _initialize_components(self):
         """Sistem bileşenlerini başlat."""
         try:
             # Kameraları başlat
-            for config in CAMERA_CONFIGS:
+            for config in CAMERA_CONFIGS + VIDEO_SOURCE_CONFIGS:
                 camera_id = f"camera_{config['index']}"
                 logging.info(f"Stream Server: Kamera başlatılıyor - {config['name']}")
                 
-                camera = Camera(camera_index=config['index'], name=config['name'])
+                # Yerel kamera veya dosya/ağ akışı kaynağı
+                camera = create_camera(config)
                 self.cameras[camera_id] = {
                     'camera': camera,
                     'config': config,
@@ -258,6 +1029,7 @@ class EnhancedStreamServer:
                     'total_frames': 0,
                     'last_access': time.time(),
                     'status': 'initializing',
+                    'state': None,          # Supervisor durumu (healthy/degraded/down...) - rapor gelene kadar None
                     'errors': deque(maxlen=10),
                     'restart_count': 0
                 }
@@ -297,7 +1069,12 @@ class EnhancedStreamServer:
             self.health_status['ai_model'] = 'error'
     
     def _generate_error_frame(self, message):
-        """Hata frame'i oluştur."""
+        """Hata frame'i oluştur (aynı mesaj için encode edilmiş frame cache'ten)."""
+        cache_key = f"error_frame:{message}"
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         frame = np.zeros((480, 640, 3), dtype=np.uint8)
         
         # Hata mesajını çiz
@@ -309,46 +1086,24 @@ class EnhancedStreamServer:
             y_pos = y_start + i * 40
             cv2.putText(frame, line, (50, y_pos), font, 0.8, (0, 0, 255), 2)
         
-        ret, buffer = cv2.imencode('.jpg', frame)
-        if ret:
-            frame_bytes = buffer.tobytes()
-            return (b'--frame\r\n'
-                   b'Content-Type: image/jpeg\r\n'
-                   b'Content-Length: ' + str(len(frame_bytes)).encode() + b'\r\n\r\n' +
-                   frame_bytes + b'\r\n')
+        jpeg = self.jpeg_encoder.encode(frame)
+        if jpeg:
+            chunk = CameraBroadcaster.multipart_chunk(jpeg)
+            self.cache.set(cache_key, chunk, ttl=60)
+            return chunk
         return b''
     
     def _add_stream_overlay(self, frame, camera_id, fps, pose_enabled, detection_enabled, quality):
-        """Stream overlay ekle."""
-        h, w = frame.shape[:2]
-        
-        # Header background
-        cv2.rectangle(frame, (0, 0), (w, 35), (0, 0, 0), -1)
-        
-        # Camera info
-        camera_name = camera_id.replace('_', ' ').title()
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        cv2.putText(frame, camera_name, (10, 25), font, 0.7, (255, 255, 255), 2)
-        
-        # AI status badges
-        x_offset = 200
-        if pose_enabled:
-            cv2.rectangle(frame, (x_offset, 5), (x_offset + 60, 30), (0, 255, 255), -1)
-            cv2.putText(frame, "POSE", (x_offset + 10, 22), font, 0.5, (0, 0, 0), 1)
-            x_offset += 70
-        
-        if detection_enabled:
-            cv2.rectangle(frame, (x_offset, 5), (x_offset + 80, 30), (0, 255, 0), -1)
-            cv2.putText(frame, "DETECT", (x_offset + 10, 22), font, 0.5, (0, 0, 0), 1)
+        """
+        Stream overlay ekle.
         
-        # Timestamp
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        timestamp_size = cv2.getTextSize(timestamp, font, 0.5, 1)[0]
-        cv2.putText(frame, timestamp, (w - timestamp_size[0] - 10, h - 10), 
-                   font, 0.5, (255, 255, 255), 1)
+        ULTRA OPTIMIZE: Header/rozetler kamera + genişlik başına önceden çizilmiş sprite'tan
+        kopyalanır, zaman damgası saniyede bir çizilip tüm istemcilerle paylaşılır.
+        """
+        self.overlay_renderer.draw_stream_overlay(frame, camera_id, pose_enabled, detection_enabled)
     
     def generate_frames(self, camera_id, quality='medium', include_pose=True, 
-                       include_detection=True, client_id=None):
+                       include_detection=True, client_id=None, mobile=False):
         """
         Video akışı üretir.
         
@@ -358,6 +1113,7 @@ class EnhancedStreamServer:
             include_pose (bool): Pose visualization dahil et
             include_detection (bool): Fall detection dahil et
             client_id (str): İstemci kimliği
+            mobile (bool): Mobil istemci (mobil profil basamakları kullanılır)
         """
         if camera_id not in self.cameras:
             logging.error(f"Stream Server: Geçersiz kamera ID: {camera_id}")
@@ -365,110 +1121,81 @@ class EnhancedStreamServer:
             return
         
         camera_info = self.cameras[camera_id]
-        camera = camera_info['camera']
         
-        # Kalite profili
-        profile = self.quality_profiles.get(quality, self.quality_profiles['medium'])
+        # Kalite profili ('auto' veya profil adı) - adaptif kontrolcü başlangıç profilini seçer
+        if quality not in self.quality_profiles and quality != AUTO_QUALITY:
+            quality = 'medium'
+        
+        # Kamerayı başlat
+        start_error = self.ensure_camera_started(camera_id)
+        if start_error:
+            yield self._generate_error_frame(start_error)
+            return
         
         # Stream tracking
         camera_info['active_streams'] += 1
         self.analytics.record_event('stream_start', camera_id)
         
-        # Kamerayı başlat
-        if not camera.is_running:
-            try:
-                if not camera.start():
-                    yield self._generate_error_frame(f"Kamera {camera_id} başlatılamadı")
-                    return
-            except Exception as e:
-                yield self._generate_error_frame(f"Kamera başlatma hatası: {str(e)}")
-                return
+        client_id = client_id or f"{camera_id}#{next(self._client_counter)}"
+        controller = AdaptiveQualityController(client_id, camera_id, quality,
+                                               self.quality_profiles, mobile=mobile)
+        quality = controller.quality
+        self.stream_clients[client_id] = controller
         
         logging.info(f"Stream başlatıldı: {camera_id} (Quality: {quality}, Client: {client_id})")
         
+        # ULTRA OPTIMIZE: Kamera başına paylaşılan producer - istemci sadece hazır byte'ları alır
+        broadcaster = self.get_broadcaster(camera_id)
+        mode = CameraBroadcaster.mode_for(include_pose, include_detection)
+        token = broadcaster.subscribe(mode, quality)
+        
         try:
-            frame_count = 0
-            last_fps_time = time.time()
-            fps = 0
-            
-            target_fps = profile['fps']
-            frame_interval = 1.0 / target_fps
+            last_seq = 0
+            frame_interval = 1.0 / controller.profile['fps']
             
             while self.is_running:
                 loop_start = time.time()
                 
                 try:
-                    # Frame al
-                    frame = camera.get_frame()
-                    if frame is None:
-                        yield self._generate_error_frame("Kamera bağlantısı yok")
-                        time.sleep(0.1)
+                    # Kamera down/recovering - durum frame'i gönder
+                    if not self.supervisor.wait_until_available(camera_id, timeout=0.5):
+                        state = self.supervisor.get_state(camera_id)
+                        yield self._generate_error_frame(f"Kamera {camera_id}: {state}")
                         continue
                     
-                    # AI işleme
-                    processed_frame = frame.copy()
-                    
-                    if self.fall_detector and (include_pose or include_detection):
-                        try:
-                            # YOLOv11 işleme
-                            annotated_frame, tracks = self.fall_detector.get_detection_visualization(frame)
-                            
-                            if include_pose:
-                                processed_frame = annotated_frame
-                            
-                            # Fall detection
-                            if include_detection:
-                                is_fall, confidence, track_id = self.fall_detector.detect_fall(frame, tracks)
-                                
-                                if is_fall and confidence > 0.6:
-                                    self._handle_fall_detection(camera_id, confidence, track_id)
-                                    self._add_fall_alert_overlay(processed_frame, confidence, track_id)
-                        
-                        except Exception as e:
-                            logging.error(f"AI işleme hatası: {str(e)}")
-                            processed_frame = frame
-                    
-                    # Kalite ayarlarını uygula
-                    if quality != 'ultra':
-                        processed_frame = cv2.resize(processed_frame, 
-                                                    (profile['width'], profile['height']), 
-                                                    interpolation=cv2.INTER_LINEAR)
-                    
-                    # Stream overlay ekle
-                    self._add_stream_overlay(processed_frame, camera_id, fps, 
-                                           include_pose, include_detection, quality)
-                    
-                    # Encode
-                    encode_params = [cv2.IMWRITE_JPEG_QUALITY, profile['quality']]
-                    ret, buffer = cv2.imencode('.jpg', processed_frame, encode_params)
-                    
-                    if not ret:
-                        yield self._generate_error_frame("Frame encode hatası")
+                    entry = broadcaster.wait_for_chunk(mode, quality, last_seq, timeout=1.0)
+                    if entry is None:
+                        if not broadcaster.running:
+                            # Producer idle timeout ile kapandıysa yeniden abone ol
+                            broadcaster.unsubscribe(token)
+                            token = broadcaster.subscribe(mode, quality)
                         continue
                     
-                    frame_bytes = buffer.tobytes()
+                    last_seq, chunk = entry
                     
-                    # MJPEG stream formatı
-                    yield (b'--frame\r\n'
-                           b'Content-Type: image/jpeg\r\n'
-                           b'Content-Length: ' + str(len(frame_bytes)).encode() + b'\r\n\r\n' +
-                           frame_bytes + b'\r\n')
+                    # yield, WSGI sunucusu chunk'ı socket'e yazana kadar döner -
+                    # bu süre istemcinin send buffer backlog'unu gösterir
+                    send_start = time.perf_counter()
+                    yield chunk
+                    send_time = time.perf_counter() - send_start
                     
                     # İstatistikler
-                    frame_count += 1
                     camera_info['total_frames'] += 1
                     camera_info['last_access'] = time.time()
                     self.analytics.record_event('frame_served', camera_id)
+                    self.analytics.observe('guard_stream_frame_send_seconds', send_time, camera_id)
                     
-                    # FPS hesaplama
-                    if time.time() - last_fps_time >= 1.0:
-                        fps = frame_count / (time.time() - last_fps_time)
-                        frame_count = 0
-                        last_fps_time = time.time()
+                    # Adaptif kalite - tıkanıklıkta profil düşür, rahatlayınca yükselt
+                    new_quality = controller.record_frame(len(chunk), send_time, broadcaster.fps)
+                    if new_quality:
+                        logging.info(f"Stream kalitesi değişti: {client_id} {quality} → {new_quality} "
+                                     f"({controller.last_metrics['throughput_kbps']:.0f} kbps)")
+                        quality = new_quality
+                        broadcaster.update_subscription(token, mode, quality)
+                        frame_interval = 1.0 / controller.profile['fps']
                     
-                    # Frame rate kontrolü
-                    elapsed = time.time() - loop_start
-                    sleep_time = max(0, frame_interval - elapsed)
+                    # İstemci profili daha düşük FPS istiyorsa ara frame'leri atla
+                    sleep_time = frame_interval - (time.time() - loop_start)
                     if sleep_time > 0:
                         time.sleep(sleep_time)
                         
@@ -483,43 +1210,277 @@ class EnhancedStreamServer:
             logging.error(f"Stream hatası: {str(e)}")
         finally:
             # Cleanup
+            broadcaster.unsubscribe(token)
+            self.stream_clients.pop(client_id, None)
             camera_info['active_streams'] -= 1
             self.analytics.record_event('stream_end', camera_id)
             logging.info(f"Stream sonlandı: {camera_id}")
     
-    def _handle_fall_detection(self, camera_id, confidence, track_id):
-        """Düşme algılama işleme."""
-        event_data = {
-            'camera_id': camera_id,
-            'confidence': confidence,
-            'track_id': track_id,
-            'timestamp': time.time()
-        }
+    def _pose_variant(self, fmt, keyframes):
+        """İstemci format isteğini doğrula ve metadata varyant anahtarını döndür."""
+        if fmt not in available_formats():
+            fmt = POSE_STREAM_CONFIG.get('default_format', FORMAT_BINARY)
+            if fmt not in available_formats():
+                fmt = FORMAT_BINARY
+        return CameraBroadcaster.meta_variant(fmt, keyframes)
+    
+    def generate_pose_events(self, camera_id, fmt=FORMAT_BINARY, keyframes=False):
+        """
+        Pose metadata SSE akışı - her olay base64 kodlu paket.
         
-        # Analytics kaydet
-        self.analytics.record_event('fall_detected', camera_id)
+        Args:
+            camera_id (str): Kamera ID'si
+            fmt (str): 'binary' veya 'msgpack'
+            keyframes (bool): Düşük frekanslı JPEG keyframe ekle
+        """
+        camera_info = self.cameras[camera_id]
+        mode, quality = self._pose_variant(fmt, keyframes)
+        broadcaster = self.get_broadcaster(camera_id)
+        token = broadcaster.subscribe(mode, quality)
+        camera_info['active_streams'] += 1
+        self.analytics.record_event('pose_stream_start', camera_id)
+        
+        try:
+            yield f"event: hello\ndata: {json.dumps({'camera_id': camera_id, 'variant': quality})}\n\n"
+            last_seq = 0
+            while self.is_running:
+                entry = broadcaster.wait_for_chunk(mode, quality, last_seq, timeout=1.0)
+                if entry is None:
+                    if not broadcaster.running:
+                        broadcaster.unsubscribe(token)
+                        token = broadcaster.subscribe(mode, quality)
+                    # Bağlantıyı canlı tut
+                    yield ": keepalive\n\n"
+                    continue
+                last_seq, packet = entry
+                yield f"event: pose\nid: {last_seq}\ndata: {base64.b64encode(packet).decode()}\n\n"
+                self.analytics.record_event('pose_packet_served', camera_id)
+        except GeneratorExit:
+            pass
+        finally:
+            broadcaster.unsubscribe(token)
+            camera_info['active_streams'] -= 1
+            self.analytics.record_event('pose_stream_end', camera_id)
+    
+    def subscribe_pose_socket(self, sid, camera_id, fmt=FORMAT_BINARY, keyframes=False):
+        """WebSocket istemcisini pose paketlerine abone eder (binary Socket.IO mesajı)."""
+        mode, quality = self._pose_variant(fmt, keyframes)
+        broadcaster = self.get_broadcaster(camera_id)
+        
+        def push(seq, packet):
+            socketio.emit('pose', packet, to=sid, namespace='/pose')
+        
+        token = broadcaster.subscribe(mode, quality, callback=push)
+        self.pose_subscriptions[sid].append((camera_id, token))
+        return quality
+    
+    def unsubscribe_pose_socket(self, sid, camera_id=None):
+        """WebSocket istemcisinin pose aboneliklerini kaldırır (camera_id None ise hepsi)."""
+        remaining = []
+        for sub_camera_id, token in self.pose_subscriptions.pop(sid, []):
+            if camera_id is None or sub_camera_id == camera_id:
+                self.get_broadcaster(sub_camera_id).unsubscribe(token)
+            else:
+                remaining.append((sub_camera_id, token))
+        if remaining:
+            self.pose_subscriptions[sid] = remaining
+    
+    def h264_unavailable_reason(self):
+        """H.264 kullanılamıyorsa nedeni, kullanılabiliyorsa None."""
+        if not AV_AVAILABLE:
+            return "PyAV yüklü değil (pip install av)"
+        if not H264_STREAM_CONFIG.get('enabled', True):
+            return "H.264 stream devre dışı"
+        return None
+    
+    def _h264_variant(self, mode, quality):
+        """Mod/profil isteğini doğrula ve H.264 varyant anahtarını döndür."""
+        if quality not in self.quality_profiles:
+            quality = H264_STREAM_CONFIG.get('default_quality', 'mobile_medium')
+        if mode not in (CameraBroadcaster.MODE_RAW, CameraBroadcaster.MODE_POSE,
+                        CameraBroadcaster.MODE_DETECTION):
+            mode = CameraBroadcaster.MODE_RAW
+        return CameraBroadcaster.h264_variant(mode, quality)
+    
+    def generate_h264_stream(self, camera_id, quality, include_pose=False, include_detection=False):
+        """
+        Progressive fragmented MP4 akışı: init segmenti + canlı media segmentleri.
+        
+        Encoder kamera/varyant başına bir kez çalışır; istemci sadece halkadaki
+        segment byte'larını alır. Geride kalan istemci eski segmentleri atlar.
+        """
+        camera_info = self.cameras[camera_id]
+        mode, variant = self._h264_variant(CameraBroadcaster.mode_for(include_pose, include_detection),
+                                           quality)
+        broadcaster = self.get_broadcaster(camera_id)
+        token = broadcaster.subscribe(mode, variant)
+        camera_info['active_streams'] += 1
+        self.analytics.record_event('h264_stream_start', camera_id)
+        
+        try:
+            ring = broadcaster.get_segment_ring(variant)
+            init_segment = ring.wait_for_init(H264_STREAM_CONFIG.get('init_timeout', 5.0))
+            if init_segment is None:
+                logging.warning(f"H.264 init segmenti hazır değil: {camera_id}/{variant}")
+                return
+            yield init_segment
+            
+            # En son tamamlanan segmentten başla (her segment keyframe ile başlar)
+            next_seq = max(ring.next_seq - 1, ring.start_seq)
+            while self.is_running:
+                entry = ring.wait_for(next_seq, timeout=1.0)
+                if entry is None:
+                    if ring.closed:
+                        # Encoder yeniden başladı (yeni init) - istemci yeniden bağlanır
+                        break
+                    continue
+                seq, _, data = entry
+                if seq > next_seq:
+                    self.analytics.record_event('h264_segment_skipped', camera_id)
+                next_seq = seq + 1
+                yield data
+                self.analytics.record_event('h264_segment_served', camera_id)
+        except GeneratorExit:
+            pass
+        finally:
+            broadcaster.unsubscribe(token)
+            camera_info['active_streams'] -= 1
+            self.analytics.record_event('h264_stream_end', camera_id)
+    
+    def _hls_ring(self, camera_id, mode, quality):
+        """HLS isteği için varyantı sıcak tut ve segment halkasını döndür."""
+        mode, variant = self._h264_variant(mode, quality)
+        broadcaster = self.get_broadcaster(camera_id)
+        broadcaster.keep_warm(mode, variant, H264_STREAM_CONFIG.get('hls_linger', 15.0))
+        return broadcaster.get_segment_ring(variant)
+    
+    def hls_playlist(self, camera_id, mode, quality, msn=None):
+        """
+        HLS media playlist. msn verilirse (LL-HLS _HLS_msn) o segment hazır olana kadar
+        bloklar; böylece istemci yoklama yerine segment üretilir üretilmez yanıt alır.
+        """
+        ring = self._hls_ring(camera_id, mode, quality)
+        if msn is not None:
+            ring.wait_for(msn, H264_STREAM_CONFIG.get('hls_block_timeout', 3.0))
+        elif not ring.segments:
+            ring.wait_for(ring.start_seq, H264_STREAM_CONFIG.get('init_timeout', 5.0))
+        self.analytics.record_event('hls_playlist_served', camera_id)
+        return ring.render_playlist(H264_STREAM_CONFIG.get('segment_duration', 1.0))
+    
+    def hls_segment(self, camera_id, mode, quality, seq=None):
+        """HLS segment byte'ları (seq None ise init segmenti); halkada yoksa None."""
+        ring = self._hls_ring(camera_id, mode, quality)
+        if seq is None:
+            return ring.wait_for_init(H264_STREAM_CONFIG.get('init_timeout', 5.0))
+        entry = ring.get(seq)
+        if entry is None:
+            return None
+        self.analytics.record_event('hls_segment_served', camera_id)
+        return entry[2]
+    
+    def ensure_camera_started(self, camera_id):
+        """
+        Kamera çalışmıyorsa başlatır ve supervisor'a kaydeder.
+        
+        Returns:
+            str: Hata mesajı veya başarılıysa None
+        """
+        camera_info = self.cameras[camera_id]
+        camera = camera_info['camera']
+        with self.stream_locks[camera_id]:
+            if camera.is_running:
+                return None
+            try:
+                if not camera.start():
+                    return f"Kamera {camera_id} başlatılamadı"
+                # Uygulama zaten izlemiyorsa supervisor'a kaydet
+                if not self.supervisor.is_registered(camera_id):
+                    self.supervisor.register(camera)
+                    camera_info['supervised'] = True
+            except Exception as e:
+                return f"Kamera başlatma hatası: {str(e)}"
+        return None
+    
+    def get_broadcaster(self, camera_id):
+        """Kamera için paylaşılan producer'ı al (yoksa oluştur)."""
+        with self.stream_locks['broadcasters']:
+            broadcaster = self.broadcasters.get(camera_id)
+            if broadcaster is None:
+                broadcaster = CameraBroadcaster(self, camera_id)
+                self.broadcasters[camera_id] = broadcaster
+            return broadcaster
+    
+    def _on_camera_state_change(self, camera_id, old_state, new_state, info):
+        """Supervisor durum değişikliği - health kaydı ve WebSocket yayını."""
+        self.health_status['cameras'][camera_id] = info
+        if camera_id in self.cameras:
+            # 'status' başlatma sonucudur (ready/error); supervisor durumu ayrı tutulur
+            self.cameras[camera_id]['state'] = new_state
+            if new_state == 'recovering':
+                self.cameras[camera_id]['restart_count'] += 1
+        
+        self.analytics.record_event('camera_state', camera_id, state=new_state)
         
-        # WebSocket bildirimi (eğer mevcut ise)
         if socketio:
-            socketio.emit('fall_alert', event_data, namespace='/alerts')
+            try:
+                socketio.emit('camera_state', {**info, 'previous_state': old_state},
+                              namespace='/alerts')
+            except Exception as e:
+                logging.debug(f"camera_state yayın hatası: {e}")
+    
+    @staticmethod
+    def is_camera_available(camera_info):
+        """Kamera hazır mı (başlatma başarılı ve supervisor çalışmaz demiyor)."""
+        state = camera_info.get('state')
+        return camera_info['status'] == 'ready' and (state is None or state in AVAILABLE_STATES)
+    
+    def _handle_fall_detection(self, camera_id, confidence, track_id, trace=None, frame=None,
+                               capture_time=None):
+        """
+        Düşme algılama işleme.
         
-        logging.warning(f"DÜŞME ALGILANDI: {camera_id}, ID: {track_id}, Güven: {confidence:.3f}")
+        DÜZELTME: Socket.IO'ya doğrudan emit yerine alert bus'a yayınlanır; aynı düşme
+        olayının sonraki frame'leri bus tarafından bastırılır.
+        """
+        alert = self.alert_bus.publish(camera_id, confidence, track_id, frame=frame, source='stream',
+                                       trace=trace, detected_at=capture_time)
+        if alert is not None:
+            self.analytics.record_event('fall_detected', camera_id)
+        return alert
     
-    def _add_fall_alert_overlay(self, frame, confidence, track_id):
-        """Düşme uyarısı overlay ekle."""
-        h, w = frame.shape[:2]
+    def _emit_fall_alert(self, alert):
+        """Socket.IO abonesi - /alerts namespace'ine olay başına bir yayın."""
+        socketio.emit('fall_alert', alert.to_dict(), namespace='/alerts')
+        get_latency_tracer().record_span(alert.trace, 'notification.socketio', alert.published_at)
+    
+    def generate_alert_events(self):
+        """Düşme uyarıları SSE akışı - istemci başına sınırlı kuyruklu abonelik."""
+        subscription = self.alert_bus.subscribe('sse')
+        keepalive = ALERT_BUS_CONFIG.get('sse_keepalive', 15.0)
+        self.analytics.record_event('alert_stream_start')
         
-        # Kırmızı uyarı arka plan
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (0, 0), (w, 80), (0, 0, 255), -1)
-        cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
+        try:
+            yield f"event: hello\ndata: {json.dumps({'timestamp': time.time()})}\n\n"
+            while self.is_running:
+                alert = subscription.get(timeout=keepalive)
+                if alert is None:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: fall_alert\nid: {alert.id}\ndata: {json.dumps(alert.to_dict())}\n\n"
+        except GeneratorExit:
+            pass
+        finally:
+            subscription.close()
+            self.analytics.record_event('alert_stream_end')
+    
+    def _add_fall_alert_overlay(self, frame, confidence, track_id):
+        """
+        Düşme uyarısı overlay ekle.
         
-        # Uyarı metni
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        cv2.putText(frame, "FALL DETECTED!", (w//2 - 150, 30), 
-                   font, 1.2, (255, 255, 255), 3)
-        cv2.putText(frame, f"ID: {track_id} | Confidence: {confidence:.3f}", 
-                   (w//2 - 120, 60), font, 0.7, (255, 255, 255), 2)
+        ULTRA OPTIMIZE: Tam frame kopyası + addWeighted yerine sadece üst 80 satırda
+        önceden çizilmiş yarı saydam şerit karıştırılır.
+        """
+        self.overlay_renderer.draw_fall_alert(frame, confidence, track_id)
 
 
 # Global server instance
@@ -625,7 +1586,7 @@ def video_feed(camera_id):
     """Basit video feed."""
     server = get_stream_server()
     return Response(
-        server.generate_frames(camera_id, quality='medium', 
+        server.generate_frames(camera_id, quality=request.args.get('quality', 'medium'), 
                              include_pose=False, include_detection=False),
         mimetype='multipart/x-mixed-replace; boundary=frame'
     )
@@ -635,7 +1596,7 @@ def video_feed_pose(camera_id):
     """Pose video feed."""
     server = get_stream_server()
     return Response(
-        server.generate_frames(camera_id, quality='medium', 
+        server.generate_frames(camera_id, quality=request.args.get('quality', 'medium'), 
                              include_pose=True, include_detection=False),
         mimetype='multipart/x-mixed-replace; boundary=frame'
     )
@@ -645,7 +1606,7 @@ def video_feed_detection(camera_id):
     """Detection video feed."""
     server = get_stream_server()
     return Response(
-        server.generate_frames(camera_id, quality='medium', 
+        server.generate_frames(camera_id, quality=request.args.get('quality', 'medium'), 
                              include_pose=True, include_detection=True),
         mimetype='multipart/x-mixed-replace; boundary=frame'
     )
@@ -672,7 +1633,8 @@ def health_check():
         health_data['cameras'][camera_id] = {
             'status': camera_info['status'],
             'is_running': is_running,
-            'active_streams': camera_info['active_streams']
+            'active_streams': camera_info['active_streams'],
+            'health': server.supervisor.get_states().get(camera_id)
         }
         
         if is_running:
@@ -680,6 +1642,94 @@ def health_check():
     
     return jsonify(health_data)
 
+@app.route('/api/latency')
+def get_latency():
+    """Glass-to-alert latency yüzdelikleri (aşama ve kanal bazlı)."""
+    tracer = get_latency_tracer()
+    trace_id = request.args.get('trace_id')
+    if trace_id:
+        return jsonify({"trace_id": trace_id, "spans": tracer.get_spans(trace_id=trace_id)})
+    # Özet binlerce span'i sıralar - yoklayan dashboard'lar için kısa süreli cache
+    summary = get_stream_server().cache.get_or_set('api:latency_summary', tracer.get_summary, ttl=1)
+    return jsonify(summary)
+
+@app.route('/api/cameras/<camera_id>/snapshot')
+def camera_snapshot(camera_id):
+    """
+    Son encode edilmiş JPEG (?quality=low|medium|high|ultra|mobile_*&mode=raw|pose|detection).
+    ETag/If-None-Match desteklenir - frame değişmediyse 304.
+    """
+    server = get_stream_server()
+    if camera_id not in server.cameras:
+        return jsonify({"error": f"Kamera {camera_id} bulunamadı"}), 404
+    
+    quality = request.args.get('quality', 'medium')
+    if quality not in server.quality_profiles:
+        return jsonify({"error": f"Geçersiz kalite: {quality}",
+                        "available": list(server.quality_profiles.keys())}), 400
+    
+    mode = request.args.get('mode', SNAPSHOT_CONFIG.get('default_mode', CameraBroadcaster.MODE_RAW))
+    if mode not in (CameraBroadcaster.MODE_RAW, CameraBroadcaster.MODE_POSE, CameraBroadcaster.MODE_DETECTION):
+        return jsonify({"error": f"Geçersiz mod: {mode}"}), 400
+    
+    start_error = server.ensure_camera_started(camera_id)
+    if start_error:
+        return jsonify({"error": start_error}), 503
+    
+    broadcaster = server.get_broadcaster(camera_id)
+    entry = broadcaster.get_snapshot(mode, quality)
+    if entry is None:
+        return jsonify({"error": "Snapshot henüz hazır değil",
+                        "state": server.supervisor.get_state(camera_id)}), 503
+    
+    seq, jpeg, capture_time = entry
+    response = Response(jpeg, mimetype='image/jpeg')
+    response.set_etag(f"{camera_id}.{mode}.{quality}.{broadcaster.epoch}.{seq}")
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['Access-Control-Allow-Origin'] = '*'
+    if capture_time:
+        response.headers['X-Capture-Time'] = f"{capture_time:.3f}"
+    # If-None-Match eşleşirse gövdesiz 304 döner
+    return response.make_conditional(request)
+
+@app.route('/api/cameras/<camera_id>/pose_stream')
+def pose_stream(camera_id):
+    """Pose metadata SSE akışı (?format=binary|msgpack&keyframes=1)."""
+    server = get_stream_server()
+    if camera_id not in server.cameras:
+        return jsonify({"error": f"Kamera {camera_id} bulunamadı"}), 404
+    
+    start_error = server.ensure_camera_started(camera_id)
+    if start_error:
+        return jsonify({"error": start_error}), 503
+    
+    fmt = request.args.get('format', POSE_STREAM_CONFIG.get('default_format', FORMAT_BINARY))
+    keyframes = request.args.get('keyframes', '0').lower() in ('1', 'true', 'yes')
+    
+    response = Response(server.generate_pose_events(camera_id, fmt, keyframes),
+                        mimetype='text/event-stream')
+    response.headers['Access-Control-Allow-Origin'] = '*'
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/api/alerts/stream')
+def alert_stream():
+    """Düşme uyarıları SSE akışı (olay başına tek 'fall_alert' olayı)."""
+    server = get_stream_server()
+    response = Response(server.generate_alert_events(), mimetype='text/event-stream')
+    response.headers['Access-Control-Allow-Origin'] = '*'
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Prometheus text exposition - kamera, detector, stream ve bildirim metrikleri."""
+    get_stream_server()  # Collector'ların kayıtlı olduğundan emin ol
+    return Response(get_metrics_registry().render_prometheus(),
+                    mimetype='text/plain; version=0.0.4; charset=utf-8')
+
 @app.route('/api/stats')
 def get_stats():
     """İstatistikler."""
@@ -690,9 +1740,19 @@ def get_stats():
     return jsonify({
         "metrics": metrics,
         "cache_stats": server.cache.cache_stats,
+        "latency": get_latency_tracer().get_summary(),
+        "alerts": server.alert_bus.get_stats(),
+        "broadcasters": {
+            camera_id: broadcaster.get_stats()
+            for camera_id, broadcaster in list(server.broadcasters.items())
+        },
         "active_streams": {
             camera_id: info['active_streams'] 
             for camera_id, info in server.cameras.items()
+        },
+        "clients": {
+            client_id: controller.get_stats()
+            for client_id, controller in list(server.stream_clients.items())
         }
     })
 
@@ -712,6 +1772,35 @@ if SOCKETIO_AVAILABLE:
         })
         
         logging.info(f"Alerts client connected: {client_id}")
+    
+    @socketio.on('subscribe', namespace='/pose')
+    def handle_pose_subscribe(data):
+        """Pose metadata aboneliği: {camera_id, format, keyframes}."""
+        server = get_stream_server()
+        data = data or {}
+        camera_id = data.get('camera_id')
+        if camera_id not in server.cameras:
+            emit('error', {'message': f"Kamera {camera_id} bulunamadı"})
+            return
+        
+        start_error = server.ensure_camera_started(camera_id)
+        if start_error:
+            emit('error', {'message': start_error})
+            return
+        
+        variant = server.subscribe_pose_socket(request.sid, camera_id,
+                                               data.get('format', FORMAT_BINARY),
+                                               bool(data.get('keyframes', False)))
+        emit('subscribed', {'camera_id': camera_id, 'variant': variant,
+                            'formats': available_formats()})
+    
+    @socketio.on('unsubscribe', namespace='/pose')
+    def handle_pose_unsubscribe(data):
+        get_stream_server().unsubscribe_pose_socket(request.sid, (data or {}).get('camera_id'))
+    
+    @socketio.on('disconnect', namespace='/pose')
+    def handle_pose_disconnect():
+        get_stream_server().unsubscribe_pose_socket(request.sid)
 
 # ================================ ERROR HANDLERS ================================
 
@@ -725,12 +1814,28 @@ def internal_error(error):
 
 # ================================ MAIN FUNCTIONS ================================
 
+def _start_async_stream(server):
+    """ASYNC_STREAM_CONFIG['enabled'] ise ASGI MJPEG sunucusunu ayrı portta başlat (uvicorn.Server)."""
+    if not ASYNC_STREAM_CONFIG.get('enabled', False):
+        return None
+    try:
+        from core.async_stream_server import start_async_stream_server_thread
+        return start_async_stream_server_thread(server)[1]
+    except Exception as e:
+        logging.error(f"Async Stream Server başlatılamadı: {e}")
+        return None
+
 def run_stream_server(host='0.0.0.0', port=5000, debug=False):
     """Stream server'ı çalıştır."""
+    async_stream = None
     try:
         global stream_server
+        if stream_server is not None and stream_server.socketio_alerts:
+            # Önceki instance'ın aboneliği kalırsa uyarılar iki kez yayınlanır
+            stream_server.socketio_alerts.close()
         stream_server = EnhancedStreamServer()
         stream_server.is_running = True
+        async_stream = _start_async_stream(stream_server)
         
         logging.info("=" * 60)
         logging.info("🚀 Guard AI Stream Server başlatılıyor...")
@@ -751,10 +1856,18 @@ def run_stream_server(host='0.0.0.0', port=5000, debug=False):
         raise
     finally:
         # Cleanup
+        if async_stream is not None:
+            async_stream.should_exit = True
         if stream_server:
             stream_server.is_running = False
+            if stream_server.socketio_alerts:
+                stream_server.socketio_alerts.close()
+            for broadcaster in stream_server.broadcasters.values():
+                broadcaster.stop()
             for camera_info in stream_server.cameras.values():
                 try:
+                    if camera_info.get('supervised'):
+                        stream_server.supervisor.unregister(camera_info['camera'])
                     if hasattr(camera_info['camera'], 'stop'):
                         camera_info['camera'].stop()
                 except:
@@ -787,21 +1900,26 @@ if __name__ == "__main__":
 def mobile_get_cameras():
     """Mobil için kamera listesi."""
     server = get_stream_server()
+    h264_ready = server.h264_unavailable_reason() is None
+    hls_quality = H264_STREAM_CONFIG.get('default_quality', 'mobile_medium')
     
     cameras = []
     for camera_id, camera_info in server.cameras.items():
         # Kamera durumunu kontrol et
-        is_available = camera_info['status'] == 'ready'
+        is_available = server.is_camera_available(camera_info)
         
         cameras.append({
             "id": camera_id,
             "name": camera_info['config']['name'],
             "index": camera_info['config']['index'],
             "status": camera_info['status'],
+            "state": camera_info.get('state'),
             "available": is_available,
             "stream_url": f"/mobile/stream/{camera_id}",
             "pose_stream_url": f"/mobile/stream/{camera_id}/pose",
-            "detection_stream_url": f"/mobile/stream/{camera_id}/detection"
+            "detection_stream_url": f"/mobile/stream/{camera_id}/detection",
+            "h264_stream_url": f"/mobile/stream/{camera_id}?format=h264" if h264_ready else None,
+            "hls_url": f"/mobile/hls/{camera_id}/raw/{hls_quality}/index.m3u8" if h264_ready else None
         })
     
     return jsonify({
@@ -839,6 +1957,9 @@ def mobile_server_info():
             "stream": "/mobile/stream/{camera_id}",
             "pose_stream": "/mobile/stream/{camera_id}/pose",
             "detection_stream": "/mobile/stream/{camera_id}/detection",
+            "h264_stream": "/mobile/stream/{camera_id}?format=h264",
+            "hls": "/mobile/hls/{camera_id}/{mode}/{quality}/index.m3u8",
+            "alerts": "/api/alerts/stream",
             "health": "/api/mobile/health"
         }
     })
@@ -856,7 +1977,7 @@ def mobile_health_check():
     for camera_id, camera_info in server.cameras.items():
         camera = camera_info['camera']
         is_running = hasattr(camera, 'is_running') and camera.is_running
-        is_ready = camera_info['status'] == 'ready'
+        is_ready = server.is_camera_available(camera_info)
         
         if is_running:
             active_cameras += 1
@@ -866,6 +1987,7 @@ def mobile_health_check():
         camera_status[camera_id] = {
             'name': camera_info['config']['name'],
             'status': camera_info['status'],
+            'state': camera_info.get('state'),
             'running': is_running,
             'ready': is_ready,
             'active_streams': camera_info['active_streams']
@@ -894,14 +2016,41 @@ def mobile_health_check():
     })
 
 # MOBİL VİDEO STREAM ENDPOİNTLERİ
+def _h264_stream_response(camera_id, quality, include_pose, include_detection):
+    """?format=h264 - MJPEG yerine progressive fMP4 yanıtı."""
+    server = get_stream_server()
+    reason = server.h264_unavailable_reason()
+    if reason:
+        return jsonify({"error": reason}), 501
+    if camera_id not in server.cameras:
+        return jsonify({"error": f"Kamera {camera_id} bulunamadı"}), 404
+    
+    start_error = server.ensure_camera_started(camera_id)
+    if start_error:
+        return jsonify({"error": start_error}), 503
+    
+    # Masaüstü profil adı mobil karşılığına çevrilir (MJPEG mobil basamaklarıyla aynı)
+    quality = MOBILE_EQUIVALENTS.get(quality, quality)
+    
+    response = Response(server.generate_h264_stream(camera_id, quality, include_pose, include_detection),
+                        mimetype=FMP4_MIMETYPE)
+    response.headers['Access-Control-Allow-Origin'] = '*'
+    response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
 @app.route('/mobile/stream/<camera_id>')
 def mobile_video_feed(camera_id):
-    """Mobil için temel video stream."""
+    """Mobil için temel video stream (?format=h264 ile fMP4)."""
     server = get_stream_server()
     
     # CORS headers ekle
+    quality = request.args.get('quality', 'medium')
+    if request.args.get('format') == 'h264':
+        return _h264_stream_response(camera_id, quality, False, False)
+    
     def generate_with_cors():
-        for chunk in server.generate_frames(camera_id, quality='medium', 
+        for chunk in server.generate_frames(camera_id, quality=quality, mobile=True,
                                            include_pose=False, include_detection=False):
             yield chunk
     
@@ -916,11 +2065,15 @@ def mobile_video_feed(camera_id):
 
 @app.route('/mobile/stream/<camera_id>/pose')
 def mobile_video_feed_pose(camera_id):
-    """Mobil için pose detection stream."""
+    """Mobil için pose detection stream (?format=h264 ile fMP4)."""
     server = get_stream_server()
     
+    quality = request.args.get('quality', 'medium')
+    if request.args.get('format') == 'h264':
+        return _h264_stream_response(camera_id, quality, True, False)
+    
     def generate_with_cors():
-        for chunk in server.generate_frames(camera_id, quality='medium', 
+        for chunk in server.generate_frames(camera_id, quality=quality, mobile=True,
                                            include_pose=True, include_detection=False):
             yield chunk
     
@@ -935,11 +2088,15 @@ def mobile_video_feed_pose(camera_id):
 
 @app.route('/mobile/stream/<camera_id>/detection')
 def mobile_video_feed_detection(camera_id):
-    """Mobil için full detection stream."""
+    """Mobil için full detection stream (?format=h264 ile fMP4)."""
     server = get_stream_server()
     
+    quality = request.args.get('quality', 'high')
+    if request.args.get('format') == 'h264':
+        return _h264_stream_response(camera_id, quality, True, True)
+    
     def generate_with_cors():
-        for chunk in server.generate_frames(camera_id, quality='high', 
+        for chunk in server.generate_frames(camera_id, quality=quality, mobile=True,
                                            include_pose=True, include_detection=True):
             yield chunk
     
@@ -952,14 +2109,73 @@ def mobile_video_feed_detection(camera_id):
     
     return response
 
+# MOBİL HLS (H.264 fMP4 segmentleri)
+def _hls_precheck(camera_id, mode, quality):
+    """HLS route'ları için ortak doğrulama - hata yanıtı veya None."""
+    server = get_stream_server()
+    reason = server.h264_unavailable_reason()
+    if reason:
+        return jsonify({"error": reason}), 501
+    if camera_id not in server.cameras:
+        return jsonify({"error": f"Kamera {camera_id} bulunamadı"}), 404
+    if quality not in server.quality_profiles:
+        return jsonify({"error": f"Geçersiz kalite: {quality}"}), 400
+    if mode not in (CameraBroadcaster.MODE_RAW, CameraBroadcaster.MODE_POSE, CameraBroadcaster.MODE_DETECTION):
+        return jsonify({"error": f"Geçersiz mod: {mode}"}), 400
+    start_error = server.ensure_camera_started(camera_id)
+    if start_error:
+        return jsonify({"error": start_error}), 503
+    return None
+
+def _hls_response(body, mimetype, cache_control):
+    response = Response(body, mimetype=mimetype)
+    response.headers['Access-Control-Allow-Origin'] = '*'
+    response.headers['Cache-Control'] = cache_control
+    return response
+
+@app.route('/mobile/hls/<camera_id>/<mode>/<quality>/index.m3u8')
+def mobile_hls_playlist(camera_id, mode, quality):
+    """HLS playlist (?_HLS_msn=N ile bloklayan yenileme)."""
+    error = _hls_precheck(camera_id, mode, quality)
+    if error:
+        return error
+    msn = request.args.get('_HLS_msn', type=int)
+    playlist = get_stream_server().hls_playlist(camera_id, mode, quality, msn)
+    return _hls_response(playlist, HLS_MIMETYPE, 'no-cache')
+
+@app.route('/mobile/hls/<camera_id>/<mode>/<quality>/init.mp4')
+def mobile_hls_init(camera_id, mode, quality):
+    """HLS init segmenti (EXT-X-MAP)."""
+    error = _hls_precheck(camera_id, mode, quality)
+    if error:
+        return error
+    data = get_stream_server().hls_segment(camera_id, mode, quality)
+    if data is None:
+        return jsonify({"error": "Init segmenti henüz hazır değil"}), 503
+    return _hls_response(data, 'video/mp4', 'no-cache')
+
+@app.route('/mobile/hls/<camera_id>/<mode>/<quality>/seg<int:seq>.m4s')
+def mobile_hls_segment(camera_id, mode, quality, seq):
+    """HLS media segmenti - segmentler değişmez, istemci cache'leyebilir."""
+    error = _hls_precheck(camera_id, mode, quality)
+    if error:
+        return error
+    data = get_stream_server().hls_segment(camera_id, mode, quality, seq)
+    if data is None:
+        return jsonify({"error": f"Segment {seq} halkada yok"}), 404
+    return _hls_response(data, SEGMENT_MIMETYPE, 'max-age=60')
+
 # MOBİL FALL ALERT ENDPOİNTLERİ
 @app.route('/api/mobile/alerts/recent')
 def mobile_recent_alerts():
     """Mobil için son uyarılar."""
     server = get_stream_server()
     
-    # Son 24 saatteki uyarılar (örnek)
-    alerts = []
+    # Son 24 saatte alert bus'a yayınlanan uyarılar (olay başına bir kayıt)
+    # Geçersiz limit varsayılana düşer; 1..geçmiş boyutu aralığına sıkıştırılır
+    limit = request.args.get('limit', 50, type=int)
+    limit = min(max(limit, 1), server.alert_bus.history_size)
+    alerts = server.alert_bus.recent(limit=limit, since=time.time() - 24 * 3600)
     
     return jsonify({
         "success": True,
@@ -997,6 +2213,12 @@ def mobile_stream_quality_options(camera_id):
                 "resolution": "1280x720",
                 "fps": 30,
                 "url": f"/mobile/stream/{camera_id}?quality=high"
+            },
+            "auto": {
+                "name": "Otomatik (Adaptif)",
+                "resolution": "adaptive",
+                "fps": None,
+                "url": f"/mobile/stream/{camera_id}?quality=auto"
             }
         }
     })
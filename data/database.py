@@ -29,9 +29,12 @@
 # === TEMEL FONKSİYONLAR ===
 # - __init__: Firebase Admin SDK'yı başlatır, Firestore bağlantısını kurar
 # - get_fall_events: Belirli bir kullanıcının düşme olaylarını çeker
+# - get_fall_events_page: Olayları (timestamp, id) cursor'ı ile sayfa sayfa çeker
+# - get_event_stats: Önceden hesaplanmış özetlerden (event_rollups.py) O(1) istatistik
 # - create_new_user: Yeni kullanıcı oluşturur ve varsayılan ayarları atar
 # - save_user_settings: Kullanıcı ayarlarını yerel ve/veya uzak veritabanında günceller
 # - delete_fall_event: Belirli bir düşme olayını siler
+# - delete_fall_events: Çok sayıda olayı ≤500 yazmalık batch'lerle siler (özetler gün başına tek yazma)
 # - test_connection: Firestore bağlantısını test eder
 
 # === VERİ DEPOLAMA MEKANİZMALARI ===
@@ -78,6 +81,15 @@
 # - fall_events: Düşme olayları koleksiyonu
 # - settings: Kullanıcı ayarları alt koleksiyonu
 
+# === SAYFALAMA ===
+# - Sıra: timestamp azalan, eşitlikte belge ID'si azalan (kararlı sıra)
+# - Firestore: start_after((timestamp, id)) - offset yok, sayfa maliyeti geçmiş boyutundan bağımsız
+# - Yerel depo: (timestamp, id) sıralı indeks üzerinde bisect ile aynı cursor semantiği
+# - Tarih / kamera / olay tipi filtreleri sorguda, güven filtresi tarama sırasında uygulanır
+#   (Firestore tek alanda aralık filtresine izin verdiği için)
+# - Gerekli bileşik indeks: user_id ASC, [camera_id ASC], timestamp DESC, __name__ DESC
+# - API için cursor encode_page_token / decode_page_token ile opak token'a çevrilir
+
 # === ÇEVRİMDIŞI DESTEK ===
 # - Eğer internet yoksa yerel JSON dosyasına yazma yapılır
 # - İnternet tekrar bağlandığında yerel veriler Firestore'a senkronize edilir
@@ -110,6 +122,67 @@ import time
 import uuid
 import os
 import json
+import base64
+import bisect
+import threading
+
+from data.event_rollups import (ROLLUP_VERSION, event_dimensions, empty_totals, apply_local,
+                                firestore_updates, firestore_batch_updates, week_day_keys, summarize)
+
+FIRESTORE_BATCH_LIMIT = 500   # Firestore'un tek batch'teki en fazla yazma sayısı
+
+
+def event_sort_time(event):
+    """Olayın sıralama zamanı (float) - sayı, sayısal metin, ISO metin veya datetime olabilir."""
+    value = event.get("timestamp", event.get("created_at", 0))
+    try:
+        if hasattr(value, 'timestamp'):
+            return value.timestamp()
+        if isinstance(value, str):
+            try:
+                return float(value)
+            except ValueError:
+                return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def encode_page_token(cursor):
+    """(timestamp, id) cursor'ını URL güvenli opak token'a çevirir (son sayfada None)."""
+    if cursor is None:
+        return None
+    timestamp, event_id = cursor
+    if isinstance(timestamp, datetime):
+        payload = {"dt": timestamp.isoformat(), "id": event_id}
+    else:
+        payload = {"t": timestamp, "id": event_id}
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_page_token(token):
+    """
+    Opak token'ı cursor'a çevirir.
+
+    Raises:
+        ValueError: Token bozuksa
+    """
+    if not token:
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+        timestamp = datetime.fromisoformat(payload["dt"]) if "dt" in payload else payload["t"]
+        event_id = payload["id"]
+    except Exception as e:
+        raise ValueError(f"Geçersiz sayfa token'ı: {e}")
+    # bool int'in alt sınıfı - zaman olarak kabul edilmez
+    if isinstance(timestamp, bool) or not isinstance(timestamp, (int, float, datetime)):
+        raise ValueError(f"Geçersiz sayfa token'ı: zaman alanı hatalı ({timestamp!r})")
+    if not isinstance(event_id, str):
+        raise ValueError(f"Geçersiz sayfa token'ı: id alanı hatalı ({event_id!r})")
+    return timestamp, event_id
+
 
 class FirestoreManager:
     """Firestore veritabanı işlemlerini yöneten sınıf."""
@@ -122,6 +195,9 @@ class FirestoreManager:
         self._memory_storage = {
             "users": {}
         }  # Memory storage başta tanımlanıyor
+        self._local_event_indexes = {}  # user_id -> (kaynak liste, uzunluk, anahtarlar, olaylar)
+        self._backfilling = set()       # Özetleri arka planda yeniden hesaplanan kullanıcılar
+        self._backfill_lock = threading.Lock()
         
         try:
             self.db = db or firestore.client()
@@ -321,18 +397,24 @@ class FirestoreManager:
                 if user_id not in self._memory_storage["users"]:
                     self._memory_storage["users"][user_id] = {"id": user_id}
                 
+                # Özetler mevcut olaylardan kurulduktan sonra yeni olay eklenir
+                rollups = self._local_rollups(user_id)
                 for collection_name in ["events", "fall_events"]:
                     if collection_name not in self._memory_storage["users"][user_id]:
                         self._memory_storage["users"][user_id][collection_name] = []
                     self._memory_storage["users"][user_id][collection_name].append(cleaned_data)
+                apply_local(rollups, event_dimensions(cleaned_data, event_sort_time(cleaned_data)), 1)
                 
                 self._save_local_data()
                 logging.info(f"Düşme olayı yerel depoya kaydedildi: {event_id}")
                 return True
             
-            # Firestore'a /fall_events/{eventId} yoluna kaydet
+            # Firestore'a /fall_events/{eventId} yoluna kaydet - özet artışlarıyla aynı batch'te
             doc_ref = self.db.collection("fall_events").document(event_id)
-            doc_ref.set(cleaned_data)
+            batch = self.db.batch()
+            batch.set(doc_ref, cleaned_data)
+            self._add_rollup_updates(batch, user_id, cleaned_data, 1)
+            batch.commit()
             logging.info(f"Düşme olayı Firestore'a kaydedildi: /fall_events/{event_id}")
             return True
             
@@ -340,53 +422,145 @@ class FirestoreManager:
             logging.error(f"Düşme olayı kaydedilirken hata: {str(e)}")
             return False
 
-    def get_fall_events(self, user_id, limit=50):
+    def get_fall_events(self, user_id, limit=50, **filters):
         """
-        Kullanıcının düşme olaylarını getirir.
+        Kullanıcının en yeni düşme olaylarını getirir (ilk sayfa).
         Firestore'da /fall_events/'ten, yerel depoda /users/{user_id}/events ve /users/{user_id}/fall_events'ten çeker.
+
+        Args:
+            filters: get_fall_events_page filtreleri (start_time, end_time, min_confidence, camera_id, event_type)
+        """
+        events, _ = self.get_fall_events_page(user_id, page_size=limit, **filters)
+        return events
+
+    def get_fall_events_page(self, user_id, page_size=50, cursor=None, start_time=None, end_time=None,
+                             min_confidence=None, camera_id=None, event_type=None, max_scan=500):
+        """
+        Kullanıcının düşme olaylarını (timestamp, id) azalan sırasında sayfa sayfa getirir.
+
+        Args:
+            user_id (str): Kullanıcı ID
+            page_size (int): Sayfadaki en fazla olay sayısı
+            cursor (tuple): Önceki sayfanın next_cursor değeri - (timestamp, id); None ise ilk sayfa
+            start_time (float): Bu zamandan (dahil) yeni olaylar
+            end_time (float): Bu zamandan (dahil) eski olaylar
+            min_confidence (float): En düşük güven (0-1)
+            camera_id (str): Sadece bu kameranın olayları
+            event_type (str): Sadece bu tipteki olaylar
+            max_scan (int): Güven filtresinde bir sayfa için taranacak en fazla belge
+
+        Returns:
+            tuple: (events, next_cursor) - son sayfada next_cursor None
         """
         if not user_id:
-            logging.warning("get_fall_events: user_id boş")
-            return []
-            
-        logging.info(f"Düşme olayları getiriliyor - Kullanıcı: {user_id}, Limit: {limit}")
+            logging.warning("get_fall_events_page: user_id boş")
+            return [], None
+        
+        page_size = max(1, int(page_size))
+        logging.info(f"Düşme olayları getiriliyor - Kullanıcı: {user_id}, Sayfa: {page_size}, "
+                     f"Cursor: {'var' if cursor else 'yok'}")
         
         if not self.is_available:
-            if user_id not in self._memory_storage["users"]:
-                logging.warning(f"Kullanıcı bellekte bulunamadı: {user_id}")
-                return []
-            
-            events = self._memory_storage["users"][user_id].get("events", [])
-            if not events:
-                events = self._memory_storage["users"][user_id].get("fall_events", [])
-            
-            sorted_events = sorted(
-                events, 
-                key=lambda e: e.get("timestamp", e.get("created_at", 0)), 
-                reverse=True
-            )
-            logging.info(f"Yerel depodan {len(sorted_events[:limit])} düşme olayı getirildi")
-            return sorted_events[:limit]
-            
+            return self._get_local_events_page(user_id, page_size, cursor, start_time, end_time,
+                                               min_confidence, camera_id, event_type)
+        
         try:
-            query = self.db.collection("fall_events")\
-                .where("user_id", "==", user_id)\
-                .order_by("timestamp", direction=firestore.Query.DESCENDING)\
-                .limit(limit)
-            
+            query = self.db.collection("fall_events").where("user_id", "==", user_id)
+            if camera_id:
+                query = query.where("camera_id", "==", camera_id)
+            if event_type:
+                query = query.where("event_type", "==", event_type)
+            if start_time is not None:
+                query = query.where("timestamp", ">=", start_time)
+            if end_time is not None:
+                query = query.where("timestamp", "<=", end_time)
+            query = query.order_by("timestamp", direction=firestore.Query.DESCENDING)\
+                .order_by(firestore.FieldPath.document_id(), direction=firestore.Query.DESCENDING)
+            
+            # Güven filtresi yoksa page_size + 1 belge sonraki sayfanın varlığını gösterir
+            batch_size = page_size + 1 if min_confidence is None else page_size * 2
             events = []
-            for doc in query.stream():
-                event_data = doc.to_dict()
-                if "id" not in event_data:
-                    event_data["id"] = doc.id
-                events.append(event_data)
-            
-            logging.info(f"Firestore'dan {len(events)} düşme olayı getirildi")
-            return events
+            scanned = 0
+            last_key = cursor
+            while True:
+                batch_query = query.limit(batch_size)
+                if last_key is not None:
+                    batch_query = batch_query.start_after(list(last_key))
+                docs = list(batch_query.stream())
+                
+                for doc in docs:
+                    if len(events) == page_size:
+                        return events, last_key  # Sayfa doldu, en az bir belge daha var
+                    event_data = doc.to_dict()
+                    if "id" not in event_data:
+                        event_data["id"] = doc.id
+                    last_key = (event_data.get("timestamp"), doc.id)
+                    scanned += 1
+                    if min_confidence is None or float(event_data.get("confidence", 0)) >= min_confidence:
+                        events.append(event_data)
+                
+                if len(docs) < batch_size:
+                    logging.info(f"Firestore'dan {len(events)} düşme olayı getirildi (son sayfa)")
+                    return events, None
+                if scanned >= max_scan:
+                    # Tarama bütçesi doldu - kalan filtreleme sonraki sayfada devam eder
+                    return events, last_key
             
         except Exception as e:
             logging.error(f"Düşme olayları getirilirken hata: {str(e)}")
-            return []
+            return [], None
+
+    def _local_event_index(self, user_id):
+        """Yerel olayların (zaman, id) artan sıralı indeksi - liste değişince yeniden kurulur."""
+        user = self._memory_storage["users"].get(user_id)
+        if not user:
+            return [], []
+        source = user.get("events") or user.get("fall_events") or []
+        
+        cached = self._local_event_indexes.get(user_id)
+        if cached is not None and cached[0] is source and cached[1] == len(source):
+            return cached[2], cached[3]
+        
+        entries = sorted((((event_sort_time(e), str(e.get("id", ""))), e) for e in source),
+                         key=lambda entry: entry[0])
+        keys = [key for key, _ in entries]
+        events = [event for _, event in entries]
+        self._local_event_indexes[user_id] = (source, len(source), keys, events)
+        return keys, events
+
+    def _get_local_events_page(self, user_id, page_size, cursor, start_time, end_time,
+                               min_confidence, camera_id, event_type):
+        """Yerel depo sayfalaması - Firestore ile aynı (timestamp, id) cursor semantiği."""
+        if user_id not in self._memory_storage["users"]:
+            logging.warning(f"Kullanıcı bellekte bulunamadı: {user_id}")
+            return [], None
+        
+        keys, events = self._local_event_index(user_id)
+        
+        # Azalan sırada gezilir: üst sınır cursor / end_time, alt sınır start_time
+        upper = len(keys)
+        if cursor is not None:
+            upper = bisect.bisect_left(keys, (event_sort_time({"timestamp": cursor[0]}), str(cursor[1])))
+        if end_time is not None:
+            upper = min(upper, bisect.bisect_right(keys, (float(end_time), chr(0x10FFFF))))
+        lower = 0 if start_time is None else bisect.bisect_left(keys, (float(start_time), ""))
+        
+        page = []
+        index = upper - 1
+        while index >= lower and len(page) < page_size:
+            event = events[index]
+            index -= 1
+            if camera_id and event.get("camera_id") != camera_id:
+                continue
+            if event_type and event.get("event_type") != event_type:
+                continue
+            if min_confidence is not None and float(event.get("confidence", 0)) < min_confidence:
+                continue
+            page.append(event)
+        
+        next_cursor = keys[index + 1] if index >= lower else None
+        logging.info(f"Yerel depodan {len(page)} düşme olayı getirildi")
+        return page, next_cursor
     
     def create_new_user(self, user_id, user_data):
         """Yeni kullanıcı oluşturur."""
@@ -507,6 +681,12 @@ class FirestoreManager:
         # Yerel depolamadan sil
         try:
             if user_id in self._memory_storage["users"]:
+                user = self._memory_storage["users"][user_id]
+                rollups = self._local_rollups(user_id)
+                source = user.get("events") or user.get("fall_events") or []
+                removed = next((e for e in source if e.get("id") == event_id), None)
+                if removed is not None:
+                    apply_local(rollups, event_dimensions(removed, event_sort_time(removed)), -1)
                 for collection_name in ["events", "fall_events"]:
                     if collection_name in self._memory_storage["users"][user_id]:
                         events = self._memory_storage["users"][user_id][collection_name]
@@ -523,13 +703,240 @@ class FirestoreManager:
             
         try:
             doc_ref = self.db.collection("fall_events").document(event_id)
-            doc_ref.delete()
+            snapshot = doc_ref.get()
+            batch = self.db.batch()
+            batch.delete(doc_ref)
+            if snapshot.exists:
+                event_data = snapshot.to_dict()
+                if event_data.get("user_id") not in (None, user_id):
+                    # Toplu silmeyle aynı kural: başka kullanıcının olayı silinmez / özetinden düşülmez
+                    logging.warning(f"delete_fall_event: {event_id} başka kullanıcıya ait, atlandı")
+                    return False
+                # Özetlerden düşmek için olayın zamanı / güveni / kamerası gerekir
+                self._add_rollup_updates(batch, user_id, event_data, -1)
+            batch.commit()
             logging.info(f"Düşme olayı Firestore'dan silindi: /fall_events/{event_id}")
             return True
         except Exception as e:
             logging.error(f"Düşme olayı silinirken hata: {str(e)}")
             return True  # Yerel silme başarılı
 
+    def delete_fall_events(self, user_id, event_ids, progress=None):
+        """
+        Çok sayıda düşme olayını toplu siler.
+
+        Firestore'da olaylar get_all ile tek istekte okunur (özet düşümü için), silmeler ve
+        birleştirilmiş özet güncellemeleri FIRESTORE_BATCH_LIMIT yazmalık batch'lerle yapılır.
+
+        Args:
+            user_id (str): Kullanıcı ID
+            event_ids (list): Silinecek olay ID'leri
+            progress (callable): progress(silinen, toplam) - her batch sonrası
+
+        Returns:
+            list: Silinen olay ID'leri
+        """
+        event_ids = [event_id for event_id in dict.fromkeys(event_ids or []) if event_id]
+        if not user_id or not event_ids:
+            logging.error("delete_fall_events: user_id veya event_ids boş")
+            return []
+        
+        deleted = []
+        
+        # Yerel depolamadan tek geçişte sil
+        try:
+            user = self._memory_storage["users"].get(user_id)
+            if user:
+                wanted = set(event_ids)
+                rollups = self._local_rollups(user_id)
+                source = user.get("events") or user.get("fall_events") or []
+                for event in source:
+                    if event.get("id") in wanted:
+                        apply_local(rollups, event_dimensions(event, event_sort_time(event)), -1)
+                        deleted.append(event.get("id"))
+                for collection_name in ["events", "fall_events"]:
+                    if collection_name in user:
+                        user[collection_name] = [e for e in user[collection_name] if e.get("id") not in wanted]
+                self._save_local_data()
+                logging.info(f"{len(deleted)} düşme olayı yerel depodan silindi")
+        except Exception as e:
+            logging.error(f"Yerel toplu olay silme hatası: {e}")
+        
+        if not self.is_available:
+            if progress:
+                progress(len(event_ids), len(event_ids))
+            return deleted
+        
+        local_deleted, deleted = deleted, []
+        done = 0
+        try:
+            collection = self.db.collection("fall_events")
+            for start in range(0, len(event_ids), FIRESTORE_BATCH_LIMIT):
+                refs = [collection.document(event_id) for event_id in event_ids[start:start + FIRESTORE_BATCH_LIMIT]]
+                snapshots = [snapshot for snapshot in self.db.get_all(refs) if snapshot.exists]
+                
+                # Batch: silmeler + 1 totals + gün başına 1 özet yazması ≤ FIRESTORE_BATCH_LIMIT
+                group, days = [], set()
+                for snapshot in snapshots:
+                    event_data = snapshot.to_dict()
+                    if event_data.get("user_id") not in (None, user_id):
+                        logging.warning(f"delete_fall_events: {snapshot.id} başka kullanıcıya ait, atlandı")
+                        continue
+                    dims = event_dimensions(event_data, event_sort_time(event_data))
+                    if len(group) + 2 + len(days | {dims["day"]}) > FIRESTORE_BATCH_LIMIT:
+                        deleted.extend(self._commit_delete_group(user_id, group))
+                        group, days = [], set()
+                    group.append((snapshot.reference, dims))
+                    days.add(dims["day"])
+                deleted.extend(self._commit_delete_group(user_id, group))
+                
+                done += len(refs)
+                if progress:
+                    progress(done, len(event_ids))
+            
+            logging.info(f"{len(deleted)} düşme olayı Firestore'dan toplu silindi")
+        except Exception as e:
+            logging.error(f"Toplu olay silme hatası: {str(e)}")
+        return list(dict.fromkeys(local_deleted + deleted))
+
+    def _commit_delete_group(self, user_id, group):
+        """(ref, dims) grubunu silmeler + birleştirilmiş özet düşümüyle tek batch'te yazar."""
+        if not group:
+            return []
+        batch = self.db.batch()
+        for ref, _ in group:
+            batch.delete(ref)
+        totals_update, day_updates = firestore_batch_updates([dims for _, dims in group], -1, firestore.Increment)
+        totals_ref = self._rollup_ref(user_id)
+        batch.set(totals_ref, totals_update, merge=True)
+        for day_key, day_update in day_updates.items():
+            batch.set(totals_ref.collection("days").document(day_key), day_update, merge=True)
+        batch.commit()
+        return [ref.id for ref, _ in group]
+
+    # ----- İstatistik özetleri -----
+
+    def _rollup_ref(self, user_id):
+        return self.db.collection("event_rollups").document(user_id)
+
+    def _add_rollup_updates(self, batch, user_id, event_data, sign):
+        """Olayın özet artışlarını (+1 / -1) Firestore batch'ine ekler."""
+        dims = event_dimensions(event_data, event_sort_time(event_data))
+        totals_update, day_update = firestore_updates(dims, sign, firestore.Increment)
+        totals_ref = self._rollup_ref(user_id)
+        batch.set(totals_ref, totals_update, merge=True)
+        batch.set(totals_ref.collection("days").document(dims["day"]), day_update, merge=True)
+
+    def _local_rollups(self, user_id):
+        """Yerel özetler - yoksa veya sürüm eskiyse mevcut olaylardan bir kez kurulur."""
+        user = self._memory_storage["users"].setdefault(user_id, {"id": user_id})
+        rollups = user.get("rollups")
+        if not rollups or rollups.get("totals", {}).get("version") != ROLLUP_VERSION:
+            rollups = {"totals": empty_totals(), "days": {}}
+            for event in user.get("events") or user.get("fall_events") or []:
+                apply_local(rollups, event_dimensions(event, event_sort_time(event)), 1)
+            user["rollups"] = rollups
+        return rollups
+
+    def rebuild_event_rollups(self, user_id):
+        """
+        Kullanıcının Firestore özetlerini tüm olaylardan yeniden hesaplar (tek seferlik
+        geçiş veya onarım için - normal akışta özetler artımlı güncellenir).
+
+        Tarama ve yazma tek transaction'dadır: transaction totals belgesini okur, artımlı
+        kayıt/silme batch'leri de her zaman totals belgesine yazdığından tarama sırasında
+        gelen bir Increment ya taramadan önce (sayılır, üzerine yazılır) ya da yazmadan sonra
+        uygulanır - kaybolmaz, iki kez sayılmaz. Transaction başına yazma sınırı nedeniyle
+        en yeni FIRESTORE_BATCH_LIMIT - 1 gün transaction'da, daha eskileri ardından yazılır
+        (eski günlere yalnızca eski olay silmeleri dokunur).
+
+        Returns:
+            dict: Yazılan totals özeti
+        """
+        totals_ref = self._rollup_ref(user_id)
+        query = self.db.collection("fall_events").where("user_id", "==", user_id)
+
+        @firestore.transactional
+        def rebuild(transaction):
+            list(self.db.get_all([totals_ref], transaction=transaction))  # Artımlı yazmalarla çakışma noktası
+            rollups = {"totals": empty_totals(), "days": {}}
+            for doc in query.stream(transaction=transaction):
+                event_data = doc.to_dict()
+                apply_local(rollups, event_dimensions(event_data, event_sort_time(event_data)), 1)
+            totals = dict(rollups["totals"], backfilled=True)
+            days = sorted(rollups["days"].items(), reverse=True)
+            transaction.set(totals_ref, totals)
+            for day_key, day in days[:FIRESTORE_BATCH_LIMIT - 1]:
+                transaction.set(totals_ref.collection("days").document(day_key), day)
+            return totals, days[FIRESTORE_BATCH_LIMIT - 1:]
+
+        totals, older_days = rebuild(self.db.transaction())
+        for start in range(0, len(older_days), FIRESTORE_BATCH_LIMIT):
+            batch = self.db.batch()
+            for day_key, day in older_days[start:start + FIRESTORE_BATCH_LIMIT]:
+                batch.set(totals_ref.collection("days").document(day_key), day)
+            batch.commit()
+
+        logging.info(f"Olay özetleri yeniden hesaplandı: {user_id} ({totals['total']} olay)")
+        return totals
+
+    def _start_rollup_backfill(self, user_id):
+        """Özetleri arka planda bir kez yeniden hesaplar (istek yolunu bloklamaz)."""
+        with self._backfill_lock:
+            if user_id in self._backfilling:
+                return
+            self._backfilling.add(user_id)
+
+        def run():
+            try:
+                self.rebuild_event_rollups(user_id)
+            except Exception as e:
+                logging.error(f"Olay özetleri yeniden hesaplanamadı ({user_id}): {e}")
+            finally:
+                with self._backfill_lock:
+                    self._backfilling.discard(user_id)
+
+        threading.Thread(target=run, daemon=True, name=f"rollup-backfill-{user_id}").start()
+
+    def get_event_stats(self, user_id):
+        """
+        Kullanıcının olay istatistikleri (toplam, yüksek güven, bugün, bu hafta, ortalama,
+        kamera başına) - olay listesi taranmaz, özetlerden okunur.
+
+        Özetler henüz geriye dönük hesaplanmadıysa hesaplama arka planda başlatılır; o
+        sırada artımlı özetler (varsa) döndürülür.
+
+        Returns:
+            dict: event_rollups.summarize çıktısı
+        """
+        if not user_id:
+            logging.warning("get_event_stats: user_id boş")
+            return summarize(None, {})
+        
+        day_keys = week_day_keys()
+        
+        if not self.is_available:
+            if user_id not in self._memory_storage["users"]:
+                return summarize(None, {})
+            rollups = self._local_rollups(user_id)
+            days = {key: rollups["days"][key] for key in day_keys if key in rollups["days"]}
+            return summarize(rollups["totals"], days)
+        
+        try:
+            totals_ref = self._rollup_ref(user_id)
+            snapshot = totals_ref.get()
+            totals = snapshot.to_dict() if snapshot.exists else None
+            if not totals or not totals.get("backfilled"):
+                # Özetlerden önce kaydedilmiş olaylar - bir kez tam sayım (arka planda)
+                self._start_rollup_backfill(user_id)
+            
+            day_refs = [totals_ref.collection("days").document(key) for key in day_keys]
+            days = {doc.id: doc.to_dict() for doc in self.db.get_all(day_refs) if doc.exists}
+            return summarize(totals, days)
+        except Exception as e:
+            logging.error(f"Olay istatistikleri alınırken hata: {str(e)}")
+            return summarize(None, {})
+
     def test_connection(self):
         """Veritabanı bağlantısını test eder."""
         if not self.is_available:
@@ -0,0 +1,191 @@
+# =======================================================================================
+# === PROGRAM AÇIKLAMASI ===
+# Dosya Adı: event_export.py (DÜŞME OLAYLARINI AKIŞLA DIŞA AKTARMA)
+# Konum: guard_pc_app/data/event_export.py
+# Açıklama:
+# Olaylar NDJSON (satır başına bir JSON) veya CSV olarak, isteğe bağlı görüntüleriyle
+# birlikte zip olarak dışa aktarılır. Tüm geçmiş belleğe alınmaz:
+# - iter_user_events: get_fall_events_page ile sayfa sayfa okur (cursor)
+# - iter_ndjson / iter_csv: her olayı tek satıra çevirir (API StreamingResponse da kullanır)
+# - export_events: satırları dosyaya akıtır; zip'te görüntüler gelir gelmez yazılır
+#   (olay satırları geçici dosyada biriktirilir, en sonda zip'e eklenir)
+
+# === ZIP DÜZENİ ===
+# - events.ndjson veya events.csv : olay kayıtları (image_file alanı zip içindeki yol)
+# - images/<olay_id>.jpg          : olay görüntüleri (zaten sıkıştırılmış - ZIP_STORED)
+# =======================================================================================
+
+import csv
+import io
+import json
+import logging
+import os
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from config.settings import BULK_OPERATIONS_CONFIG
+
+EXPORT_FORMATS = ("ndjson", "csv")
+CSV_FIELDS = ("id", "timestamp", "confidence", "camera_id", "event_type", "detection_method",
+              "image_url", "notes", "image_file")
+
+
+def _json_default(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def _timestamp_iso(value):
+    """Olay zamanı ISO metin olarak (sayı, sayısal metin, ISO metin veya datetime)."""
+    try:
+        if hasattr(value, "isoformat"):
+            return value.isoformat()
+        return datetime.fromtimestamp(float(value)).isoformat()
+    except (TypeError, ValueError, OSError):
+        return str(value) if value is not None else ""
+
+
+def iter_user_events(db_manager, user_id, page_size=None, **filters):
+    """
+    Kullanıcının olaylarını (filtreli) sayfa sayfa okuyup tek tek verir (yeniden eskiye).
+    Bellekte en fazla bir sayfa bulunur.
+    """
+    page_size = page_size or BULK_OPERATIONS_CONFIG.get("export_page_size", 200)
+    cursor = None
+    while True:
+        events, cursor = db_manager.get_fall_events_page(user_id, page_size=page_size, cursor=cursor, **filters)
+        yield from events
+        if cursor is None:
+            return
+
+
+def ndjson_line(event):
+    return json.dumps(event, ensure_ascii=False, default=_json_default) + "\n"
+
+
+def iter_ndjson(events):
+    for event in events:
+        yield ndjson_line(event)
+
+
+def iter_csv(events):
+    """Başlık + olay satırları (CSV_FIELDS sütunları, zaman ISO)."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    yield buffer.getvalue()
+    for event in events:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(dict(event, timestamp=_timestamp_iso(event.get("timestamp"))))
+        yield buffer.getvalue()
+
+
+def export_events(events, path, fmt="ndjson", image_loader=None, total=None, progress=None,
+                  cancelled=None):
+    """
+    Olayları dosyaya akışla yazar.
+
+    Args:
+        events (iterable): Olaylar (liste veya iter_user_events üreteci)
+        path (str): Hedef dosya; image_loader verilirse zip olarak yazılır
+        fmt (str): "ndjson" veya "csv"
+        image_loader (callable): event -> JPEG byte'ları veya None (verilirse görüntüler zip'e eklenir)
+        total (int): Biliniyorsa toplam olay (ilerleme için, yoksa None)
+        progress (callable): progress(yazılan, total)
+        cancelled (threading.Event): Set edilirse yarım dosya silinir ve durulur
+
+    Returns:
+        dict: events, images, cancelled
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Desteklenmeyen format: {fmt}")
+    lines = iter_csv if fmt == "csv" else iter_ndjson
+    result = {"events": 0, "images": 0, "cancelled": False}
+
+    def counted(source):
+        for event in source:
+            if cancelled is not None and cancelled.is_set():
+                result["cancelled"] = True
+                return
+            yield event
+            result["events"] += 1
+            if progress and (result["events"] % 50 == 0):
+                progress(result["events"], total)
+
+    try:
+        if image_loader is None:
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                for line in lines(counted(events)):
+                    f.write(line)
+        else:
+            _export_zip(events, path, fmt, lines, counted, image_loader, result)
+    except BaseException:
+        _remove_quietly(path)
+        raise
+
+    if result["cancelled"]:
+        _remove_quietly(path)
+    elif progress:
+        progress(result["events"], total)
+    return result
+
+
+def _export_zip(events, path, fmt, lines, counted, image_loader, result):
+    """Görüntüler paralel indirilir; aynı anda en fazla workers*2 görüntü bellekte tutulur."""
+    workers = BULK_OPERATIONS_CONFIG.get("export_image_workers", 4)
+    window = workers * 2
+
+    with tempfile.TemporaryFile(mode="w+", encoding="utf-8", newline="") as records, \
+            zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive, \
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix="export-image") as executor:
+
+        def write_chunk(chunk):
+            images = executor.map(_safe_loader(image_loader), chunk)
+            for event, data in zip(chunk, images):
+                if data:
+                    name = f"images/{event.get('id')}.jpg"
+                    archive.writestr(zipfile.ZipInfo(name, date_time=datetime.now().timetuple()[:6]),
+                                     data, compress_type=zipfile.ZIP_STORED)
+                    event = dict(event, image_file=name)
+                    result["images"] += 1
+                yield event
+
+        def with_images(source):
+            chunk = []
+            for event in source:
+                chunk.append(event)
+                if len(chunk) >= window:
+                    yield from write_chunk(chunk)
+                    chunk = []
+            if chunk:
+                yield from write_chunk(chunk)
+
+        for line in lines(with_images(counted(events))):
+            records.write(line)
+
+        if not result["cancelled"]:
+            records.seek(0)
+            with archive.open(f"events.{fmt}", "w") as entry:
+                for line in records:
+                    entry.write(line.encode("utf-8"))
+
+
+def _safe_loader(image_loader):
+    def load(event):
+        try:
+            return image_loader(event)
+        except Exception as e:
+            logging.warning(f"Dışa aktarma görüntüsü alınamadı ({event.get('id')}): {e}")
+            return None
+    return load
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
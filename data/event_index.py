@@ -0,0 +1,324 @@
+# =======================================================================================
+# === PROGRAM AÇIKLAMASI ===
+# Dosya Adı: event_index.py (GEÇMİŞ OLAYLARI İÇİN BELLEK İÇİ ARAMA İNDEKSİ)
+# Konum: guard_pc_app/data/event_index.py
+# Açıklama:
+# Geçmiş ekranındaki arama ve filtreler her tuşta olay listesini baştan taramaz. İndeks bir
+# kez kurulur, yeni sayfalar/olaylar geldikçe artımlı güncellenir:
+# - Token indeksi: kamera id, olay id, algılama yöntemi, notlar (+ tarih ve saatin tüm
+#   sonekleri, güven yüzdesi) → olay id kümeleri. Sorgu terimleri sıralı sözlükte bisect ile ÖNEK eşleşir ("cam" →
+#   camera_0, camera_1 ...); birden fazla terim VE ile birleşir.
+# - Sıralı diziler: (zaman, id) ve (güven, id) anahtarları; aralık sorguları bisect ile.
+# Sorgu en seçici kriterle (token kümesi / zaman aralığı / güven aralığı) başlar, diğerleri
+# olay başına O(1) kontrolle uygulanır. Sonuçlar yeniden eskiye sıralıdır (sayfalamayla aynı).
+
+# === KULLANIM ===
+# index = EventSearchIndex(time_key=lambda e: e["timestamp"])
+# index.build(events); index.add_many(yeni_sayfa); index.remove(event_id)
+# index.search("camera_1 yolo", start_time=..., min_confidence=0.8)
+# =======================================================================================
+
+import re
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+
+_ID_MAX = "\U0010ffff"                     # Aralığın üst ucundaki tüm id'lerden büyük
+_SPLIT = re.compile(r"[\s,;/|()\[\]{}\"']+")
+_PARTS = re.compile(r"[^\w]+|_")
+INDEXED_FIELDS = ("id", "camera_id", "detection_method", "notes")
+BULK_THRESHOLD = 32                        # Bu boyuttan büyük eklemelerde diziler bir kez sıralanır
+
+
+def tokenize(text):
+    """
+    Metni arama token'larına ayırır (küçük harf).
+
+    Tam parçalar korunur ("camera_0", "18.10.2026", "14:05") ve alt parçalar da eklenir
+    ("camera", "0", "18", "10", "2026"); böylece hem tam hem parça aramaları eşleşir.
+    """
+    tokens = set()
+    for chunk in _SPLIT.split(str(text).lower()):
+        chunk = chunk.strip(".:-%!?")
+        if not chunk:
+            continue
+        tokens.add(chunk)
+        tokens.update(part for part in _PARTS.split(chunk) if part)
+    return tokens
+
+
+def query_terms(text):
+    """Sorgu metninin terimleri (önek olarak eşleşir, alt parçalara bölünmez)."""
+    return [term for term in (chunk.strip(".:-!?") for chunk in _SPLIT.split(str(text).lower())) if term]
+
+
+class EventSearchIndex:
+    """Token + sıralı zaman/güven indeksleri (thread güvenli, artımlı)."""
+
+    def __init__(self, time_key):
+        """
+        Args:
+            time_key (callable): event -> Unix zamanı (float)
+        """
+        self.time_key = time_key
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}       # id -> (zaman, güven, event, tokens)
+            self._postings = {}      # token -> {id}
+            self._vocabulary = []    # Sıralı token listesi (önek aramaları için)
+            self._time_keys = []     # Sıralı (zaman, id)
+            self._conf_keys = []     # Sıralı (güven, id)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, event_id):
+        return event_id in self._entries
+
+    def get(self, event_id):
+        """ID ile olay (yoksa None)."""
+        entry = self._entries.get(event_id)
+        return entry[2] if entry is not None else None
+
+    # ----- Güncelleme -----
+
+    def build(self, events):
+        """İndeksi verilen olaylarla baştan kurar."""
+        self.clear()
+        self.add_many(events)
+
+    def add_many(self, events):
+        """Olayları ekler; daha önce eklenmiş id'ler güncellenir. Eklenen sayıyı döndürür."""
+        batch = {self._event_id(event): event for event in events}
+        with self._lock:
+            replaced = [event_id for event_id in batch if event_id in self._entries]
+            for event_id in replaced:
+                self._remove(event_id)
+            if len(batch) < BULK_THRESHOLD:
+                for event in batch.values():
+                    self._add(event)
+            else:
+                # Toplu ekleme (ilk kurulum, büyük sayfalar): sona ekle, bir kez sırala
+                vocabulary_size = len(self._vocabulary)
+                for event_id, event in batch.items():
+                    self._add(event, event_id=event_id, bulk=True)
+                if len(self._vocabulary) > vocabulary_size:
+                    self._vocabulary.sort()
+                self._time_keys.sort()
+                self._conf_keys.sort()
+        return len(batch) - len(replaced)
+
+    def add(self, event):
+        with self._lock:
+            return self._add(event)
+
+    def remove(self, event_id):
+        """Olayı indeksten çıkarır (yoksa False)."""
+        with self._lock:
+            return self._remove(event_id)
+
+    def _add(self, event, event_id=None, bulk=False):
+        event_id = event_id or self._event_id(event)
+        replaced = event_id in self._entries
+        if replaced:
+            self._remove(event_id)
+
+        event_time = float(self.time_key(event) or 0.0)
+        confidence = float(event.get("confidence", 0) or 0)
+        tokens = self._event_tokens(event, event_time, confidence)
+        self._entries[event_id] = (event_time, confidence, event, tokens)
+
+        for token in tokens:
+            ids = self._postings.get(token)
+            if ids is None:
+                self._postings[token] = {event_id}
+                if bulk:
+                    self._vocabulary.append(token)
+                else:
+                    insort(self._vocabulary, token)
+            else:
+                ids.add(event_id)
+        if bulk:
+            self._time_keys.append((event_time, event_id))
+            self._conf_keys.append((confidence, event_id))
+        else:
+            insort(self._time_keys, (event_time, event_id))
+            insort(self._conf_keys, (confidence, event_id))
+        return 0 if replaced else 1
+
+    def _remove(self, event_id):
+        entry = self._entries.pop(event_id, None)
+        if entry is None:
+            return False
+        event_time, confidence, _, tokens = entry
+
+        for token in tokens:
+            ids = self._postings.get(token)
+            if ids is None:
+                continue
+            ids.discard(event_id)
+            if not ids:
+                del self._postings[token]
+                position = bisect_left(self._vocabulary, token)
+                if position < len(self._vocabulary) and self._vocabulary[position] == token:
+                    del self._vocabulary[position]
+        self._delete_key(self._time_keys, (event_time, event_id))
+        self._delete_key(self._conf_keys, (confidence, event_id))
+        return True
+
+    @staticmethod
+    def _delete_key(keys, key):
+        position = bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            del keys[position]
+
+    @staticmethod
+    def _event_id(event):
+        return str(event.get("id") or f"_obj{id(event)}")
+
+    @staticmethod
+    def _event_tokens(event, event_time, confidence):
+        tokens = set()
+        for field in INDEXED_FIELDS:
+            value = event.get(field)
+            if value:
+                tokens |= tokenize(value)
+        # Eski arama kutusunun davranışı: tarih, saat ve güven yüzdesiyle de bulunabilsin.
+        # Eski kutu "%d.%m.%Y %H:%M:%S" metninde alt dize arıyordu; tarih ve saatin tüm
+        # sonekleri indekslenir, önek eşleşmesiyle birlikte alt dize araması korunur
+        # ("10.2026" → ay.yıl, "05:30" → dakika:saniye)
+        if event_time > 0:
+            moment = datetime.fromtimestamp(event_time)
+            for text in (moment.strftime("%d.%m.%Y"), moment.strftime("%H:%M:%S")):
+                tokens.update(text[i:] for i in range(len(text)) if text[i] not in ".:")
+        tokens.add(f"{confidence * 100:.1f}%".lower())
+        tokens.add(f"{confidence * 100:.1f}")
+        return tokens
+
+    # ----- Sorgu -----
+
+    def match_ids(self, text):
+        """
+        Arama metniyle eşleşen olay id'leri.
+
+        Returns:
+            set: Eşleşen id'ler; metin boşsa None (tümü)
+        """
+        terms = query_terms(text)
+        if not terms:
+            return None
+        with self._lock:
+            return self._match_terms(terms)
+
+    def _match_terms(self, terms):
+        result = None
+        # Kısa terimler çok token'a yayılır - önce en uzun (en seçici) terimle başla
+        for term in sorted(terms, key=len, reverse=True):
+            start = bisect_left(self._vocabulary, term)
+            end = bisect_left(self._vocabulary, term + _ID_MAX)
+            matched = set()
+            for token in self._vocabulary[start:end]:
+                matched |= self._postings[token]
+            result = matched if result is None else result & matched
+            if not result:
+                return set()
+        return result
+
+    def filter(self, events, text):
+        """Verilen olaylardan arama metniyle eşleşenler (sıra korunur) - yeni sayfalar için."""
+        ids = self.match_ids(text)
+        if ids is None:
+            return list(events)
+        return [event for event in events if self._event_id(event) in ids]
+
+    def matches(self, event, text):
+        """
+        Tek olay arama metniyle eşleşiyor mu - indekse eklemeden (dışa aktarma gibi
+        indekste olmayan sayfaları akıtan yollar için; eşleşme kuralı search ile aynı).
+        """
+        terms = query_terms(text)
+        if not terms:
+            return True
+        tokens = self._event_tokens(event, float(self.time_key(event) or 0.0),
+                                    float(event.get("confidence", 0) or 0))
+        return all(any(token.startswith(term) for token in tokens) for term in terms)
+
+    def search(self, text="", start_time=None, end_time=None, min_confidence=None,
+               max_confidence=None, limit=None):
+        """
+        Metin + zaman/güven aralığı sorgusu.
+
+        Args:
+            text (str): Arama metni (boş: metin filtresi yok)
+            start_time, end_time (float): Zaman aralığı (dahil)
+            min_confidence, max_confidence (float): Güven aralığı (dahil)
+            limit (int): En fazla sonuç
+
+        Returns:
+            list: Eşleşen olaylar (yeniden eskiye)
+        """
+        terms = query_terms(text)
+        with self._lock:
+            text_ids = self._match_terms(terms) if terms else None
+            if text_ids is not None and not text_ids:
+                return []
+
+            time_lo = bisect_left(self._time_keys, (start_time,)) if start_time is not None else 0
+            time_hi = (bisect_right(self._time_keys, (end_time, _ID_MAX)) if end_time is not None
+                       else len(self._time_keys))
+            conf_filtered = min_confidence is not None or max_confidence is not None
+            conf_lo = bisect_left(self._conf_keys, (min_confidence,)) if min_confidence is not None else 0
+            conf_hi = (bisect_right(self._conf_keys, (max_confidence, _ID_MAX)) if max_confidence is not None
+                       else len(self._conf_keys))
+
+            time_count = max(0, time_hi - time_lo)
+            conf_count = max(0, conf_hi - conf_lo) if conf_filtered else len(self._conf_keys)
+            text_count = len(text_ids) if text_ids is not None else len(self._entries)
+
+            def accept(event_id, check_time, check_conf):
+                event_time, confidence, _, _ = self._entries[event_id]
+                if check_time and ((start_time is not None and event_time < start_time) or
+                                   (end_time is not None and event_time > end_time)):
+                    return False
+                if check_conf and ((min_confidence is not None and confidence < min_confidence) or
+                                   (max_confidence is not None and confidence > max_confidence)):
+                    return False
+                return True
+
+            results = []
+            if time_count <= conf_count and time_count <= text_count:
+                # Zaman aralığı en seçici: sıralı diziden sondan başa (zaten yeniden eskiye)
+                for position in range(time_hi - 1, time_lo - 1, -1):
+                    event_id = self._time_keys[position][1]
+                    if text_ids is not None and event_id not in text_ids:
+                        continue
+                    if conf_filtered and not accept(event_id, False, True):
+                        continue
+                    results.append(self._entries[event_id][2])
+                    if limit is not None and len(results) >= limit:
+                        break
+                return results
+
+            if conf_count <= text_count:
+                candidates = [key[1] for key in self._conf_keys[conf_lo:conf_hi]]
+                if text_ids is not None:
+                    candidates = [event_id for event_id in candidates if event_id in text_ids]
+                candidates = [event_id for event_id in candidates if accept(event_id, True, False)]
+            else:
+                candidates = [event_id for event_id in text_ids if accept(event_id, True, conf_filtered)]
+
+            candidates.sort(key=lambda event_id: (self._entries[event_id][0], event_id), reverse=True)
+            if limit is not None:
+                candidates = candidates[:limit]
+            return [self._entries[event_id][2] for event_id in candidates]
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "events": len(self._entries),
+                "tokens": len(self._vocabulary),
+                "postings": sum(len(ids) for ids in self._postings.values()),
+            }
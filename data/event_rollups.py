@@ -0,0 +1,196 @@
+# =======================================================================================
+# === PROGRAM AÇIKLAMASI ===
+# Dosya Adı: event_rollups.py (DÜŞME OLAYI İSTATİSTİK ÖZETLERİ)
+# Konum: guard_pc_app/data/event_rollups.py
+# Açıklama:
+# Kullanıcı başına önceden hesaplanmış olay özetleri. Her save_fall_event / delete_fall_event
+# özetleri artımlı olarak (+1 / -1) günceller; istatistik kartları ve API toplamları,
+# ortalamaları ve kamera başına sayıları olay listesini taramadan okur.
+
+# === ÖZET YAPISI ===
+# totals : {total, confidence_sum, high_confidence, cameras: {kamera: n}, last_event_at, version,
+#           backfilled (Firestore: mevcut olaylardan bir kez yeniden hesaplandı)}
+# gün    : {date, count, confidence_sum, high_confidence, hours: {"HH": n}, cameras: {kamera: n}}
+# - Firestore: event_rollups/{user_id} (totals) + event_rollups/{user_id}/days/{YYYY-MM-DD}
+# - Yerel depo: users/{user_id}/rollups = {"totals": {...}, "days": {"YYYY-MM-DD": {...}}}
+# - Gün ve saat anahtarları yerel saate göredir ("Bugün" / "Bu Hafta" kartlarıyla aynı)
+# - last_event_at son KAYDEDİLEN olayın zamanıdır (silmede geri alınmaz)
+# =======================================================================================
+
+from datetime import datetime, timedelta
+
+ROLLUP_VERSION = 1
+HIGH_CONFIDENCE_THRESHOLD = 0.8   # Geçmiş ekranındaki "Yüksek Risk" eşiği
+
+
+def event_dimensions(event, event_time):
+    """
+    Olayın özetlere katkısı.
+
+    Args:
+        event (dict): Olay verisi
+        event_time (float): Olayın Unix zamanı (database.event_sort_time)
+
+    Returns:
+        dict: day, hour, camera, confidence, high
+    """
+    moment = datetime.fromtimestamp(event_time)
+    confidence = float(event.get("confidence", 0) or 0)
+    return {
+        "day": moment.strftime("%Y-%m-%d"),
+        "hour": moment.strftime("%H"),
+        "camera": str(event.get("camera_id") or "unknown"),
+        "confidence": confidence,
+        "high": 1 if confidence >= HIGH_CONFIDENCE_THRESHOLD else 0,
+        "time": event_time,
+    }
+
+
+def empty_totals():
+    return {"total": 0, "confidence_sum": 0.0, "high_confidence": 0, "cameras": {},
+            "last_event_at": None, "version": ROLLUP_VERSION}
+
+
+def empty_day(day):
+    return {"date": day, "count": 0, "confidence_sum": 0.0, "high_confidence": 0,
+            "hours": {}, "cameras": {}}
+
+
+def _bump(mapping, key, sign):
+    value = mapping.get(key, 0) + sign
+    if value > 0:
+        mapping[key] = value
+    else:
+        mapping.pop(key, None)
+
+
+def apply_local(rollups, dims, sign):
+    """Yerel özet sözlüğünü (+1 / -1) yerinde günceller."""
+    totals = rollups.setdefault("totals", empty_totals())
+    totals["total"] = max(0, totals["total"] + sign)
+    totals["confidence_sum"] = max(0.0, totals["confidence_sum"] + sign * dims["confidence"])
+    totals["high_confidence"] = max(0, totals["high_confidence"] + sign * dims["high"])
+    _bump(totals["cameras"], dims["camera"], sign)
+    if sign > 0 and (totals["last_event_at"] is None or dims["time"] > totals["last_event_at"]):
+        totals["last_event_at"] = dims["time"]
+
+    days = rollups.setdefault("days", {})
+    day = days.setdefault(dims["day"], empty_day(dims["day"]))
+    day["count"] = max(0, day["count"] + sign)
+    day["confidence_sum"] = max(0.0, day["confidence_sum"] + sign * dims["confidence"])
+    day["high_confidence"] = max(0, day["high_confidence"] + sign * dims["high"])
+    _bump(day["hours"], dims["hour"], sign)
+    _bump(day["cameras"], dims["camera"], sign)
+    if day["count"] == 0:
+        days.pop(dims["day"], None)
+
+
+def firestore_updates(dims, sign, increment):
+    """
+    Firestore set(..., merge=True) için artımlı güncellemeler.
+
+    Args:
+        increment: firestore.Increment sınıfı
+
+    Returns:
+        tuple: (totals_update, day_update)
+    """
+    totals = {
+        "total": increment(sign),
+        "confidence_sum": increment(sign * dims["confidence"]),
+        "high_confidence": increment(sign * dims["high"]),
+        "cameras": {dims["camera"]: increment(sign)},
+    }
+    if sign > 0:
+        totals["last_event_at"] = dims["time"]
+    day = {
+        "date": dims["day"],
+        "count": increment(sign),
+        "confidence_sum": increment(sign * dims["confidence"]),
+        "high_confidence": increment(sign * dims["high"]),
+        "hours": {dims["hour"]: increment(sign)},
+        "cameras": {dims["camera"]: increment(sign)},
+    }
+    return totals, day
+
+
+def firestore_batch_updates(dims_list, sign, increment):
+    """
+    Birden fazla olayın artışlarını tek totals + gün başına tek güncellemede birleştirir
+    (toplu silmede batch yazma sayısı olay sayısıyla değil gün sayısıyla büyür).
+
+    Returns:
+        tuple: (totals_update, {gün: day_update})
+    """
+    totals = {"total": 0, "confidence_sum": 0.0, "high_confidence": 0, "cameras": {}}
+    days = {}
+    last_event_at = None
+    for dims in dims_list:
+        totals["total"] += 1
+        totals["confidence_sum"] += dims["confidence"]
+        totals["high_confidence"] += dims["high"]
+        totals["cameras"][dims["camera"]] = totals["cameras"].get(dims["camera"], 0) + 1
+        day = days.setdefault(dims["day"], {"count": 0, "confidence_sum": 0.0, "high_confidence": 0,
+                                            "hours": {}, "cameras": {}})
+        day["count"] += 1
+        day["confidence_sum"] += dims["confidence"]
+        day["high_confidence"] += dims["high"]
+        day["hours"][dims["hour"]] = day["hours"].get(dims["hour"], 0) + 1
+        day["cameras"][dims["camera"]] = day["cameras"].get(dims["camera"], 0) + 1
+        last_event_at = dims["time"] if last_event_at is None else max(last_event_at, dims["time"])
+
+    def signed(mapping):
+        return {key: increment(sign * value) for key, value in mapping.items()}
+
+    totals_update = {
+        "total": increment(sign * totals["total"]),
+        "confidence_sum": increment(sign * totals["confidence_sum"]),
+        "high_confidence": increment(sign * totals["high_confidence"]),
+        "cameras": signed(totals["cameras"]),
+    }
+    if sign > 0 and last_event_at is not None:
+        totals_update["last_event_at"] = last_event_at
+    day_updates = {
+        key: {
+            "date": key,
+            "count": increment(sign * day["count"]),
+            "confidence_sum": increment(sign * day["confidence_sum"]),
+            "high_confidence": increment(sign * day["high_confidence"]),
+            "hours": signed(day["hours"]),
+            "cameras": signed(day["cameras"]),
+        }
+        for key, day in days.items()
+    }
+    return totals_update, day_updates
+
+
+def week_day_keys(now=None):
+    """Bugünün ve bu haftanın (pazartesiden bugüne) gün anahtarları."""
+    now = now or datetime.now()
+    monday = now - timedelta(days=now.weekday())
+    return [(monday + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(now.weekday() + 1)]
+
+
+def summarize(totals, days, now=None):
+    """
+    Özetlerden istatistik kartı / API sözlüğü.
+
+    Args:
+        totals (dict): Toplam özeti (yoksa None)
+        days (dict): Bu haftanın gün özetleri {"YYYY-MM-DD": {...}}
+    """
+    totals = totals or empty_totals()
+    total = max(0, int(totals.get("total", 0)))
+    today_key = (now or datetime.now()).strftime("%Y-%m-%d")
+    today = days.get(today_key) or {}
+    cameras = {camera: int(count) for camera, count in (totals.get("cameras") or {}).items() if count > 0}
+    return {
+        "total_events": total,
+        "high_confidence": max(0, int(totals.get("high_confidence", 0))),
+        "today_events": max(0, int(today.get("count", 0))),
+        "this_week": max(0, int(sum(day.get("count", 0) for day in days.values()))),
+        "avg_confidence": (totals.get("confidence_sum", 0.0) / total) if total else 0.0,
+        "per_camera": cameras,
+        "today_by_hour": {hour: int(count) for hour, count in (today.get("hours") or {}).items() if count > 0},
+        "last_event_at": totals.get("last_event_at"),
+    }
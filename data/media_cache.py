@@ -0,0 +1,417 @@
+# =======================================================================================
+# === PROGRAM AÇIKLAMASI ===
+# Dosya Adı: media_cache.py (GEÇMİŞ EKRANI GÖRÜNTÜ ÖNBELLEĞİ)
+# Konum: guard_pc_app/data/media_cache.py
+# Açıklama:
+# Geçmiş ekranındaki olay görüntüleri (tam boy + kart thumbnail'ı) için üç katmanlı önbellek:
+#   1. Bellek : decode edilmiş PIL görüntüleri, byte bütçeli LRU
+#   2. Disk   : olay ID'si ile anahtarlanan dosyalar, boyut sınırlı LRU tahliyesi
+#   3. Ağ     : havuzlu (keep-alive) tek requests.Session, yeniden deneme ile
+# Daha önce açılan bir olay bellekten anında, uygulama yeniden açıldığında diskten
+# (çevrimdışı da) gelir. `file://` URL'leri doğrudan diskten okunur, kopyalanmaz.
+
+# === ÖN YÜKLEME (PREFETCH) ===
+# - prefetch(items): listede seçilen olayın komşuları arka planda disk + belleğe alınır
+# - En son istenen önce işlenir; zaten önbellekte olanlar atlanır
+# - Aynı anahtar için eşzamanlı istekler tek indirmede birleştirilir
+
+# === DİSK DÜZENİ ===
+# - <cache_dir>/<sha1(olay_id)>_<varyant>.jpg  (varyant: full / thumb)
+# - Dosya mtime'ı son erişim zamanıdır; açılışta LRU sırası buradan kurulur
+# =======================================================================================
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict, deque
+from io import BytesIO
+
+import requests
+from requests.adapters import HTTPAdapter
+from PIL import Image
+
+from config.settings import HISTORY_MEDIA_CACHE_CONFIG
+
+FULL = 'full'
+THUMB = 'thumb'
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(__file__), "media_cache")
+
+
+def _cache_filename(key, variant):
+    digest = hashlib.sha1(str(key).encode('utf-8')).hexdigest()
+    return f"{digest}_{variant}.jpg"
+
+
+class MediaCache:
+    """Geçmiş ekranı görüntüleri için bellek + disk + havuzlu HTTP önbelleği."""
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, cache_dir=None, disk_max_mb=None, memory_max_mb=None):
+        config = HISTORY_MEDIA_CACHE_CONFIG
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.disk_max_bytes = int((disk_max_mb or config.get('disk_max_mb', 512)) * 1024 * 1024)
+        self.memory_max_bytes = int((memory_max_mb or config.get('memory_max_mb', 128)) * 1024 * 1024)
+        self.timeout = config.get('request_timeout', 10.0)
+        self.thumbnail_quality = config.get('thumbnail_quality', 80)
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()      # (key, varyant) -> (PIL görüntü, byte)
+        self._memory_bytes = 0
+        self._disk = OrderedDict()        # dosya adı -> byte (en eski başta)
+        self._disk_bytes = 0
+        self._inflight = {}               # (key, varyant) -> threading.Event
+
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'local_reads': 0, 'downloads': 0,
+                      'download_bytes': 0, 'errors': 0, 'evicted_files': 0}
+
+        # Havuzlu HTTP oturumu - Firebase Storage bağlantıları yeniden kullanılır
+        pool_size = config.get('pool_size', 8)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                              max_retries=config.get('retries', 2))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        # Ön yükleme kuyruğu
+        self._prefetch_condition = threading.Condition()
+        self._prefetch_queue = deque(maxlen=config.get('prefetch_queue_size', 64))
+        self._prefetch_workers = []
+
+        self._load_disk_index()
+
+    # ----- Disk indeksi -----
+
+    def _load_disk_index(self):
+        """Disk önbelleğini tarar; mtime sırası LRU sırası olur."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            entries = []
+            for entry in os.scandir(self.cache_dir):
+                if not entry.is_file():
+                    continue
+                if entry.name.endswith('.tmp'):
+                    # Yarım kalmış yazma
+                    os.remove(entry.path)
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name, stat.st_size))
+            for _, name, size in sorted(entries):
+                self._disk[name] = size
+                self._disk_bytes += size
+            self._evict_disk()
+            logging.info(f"Görüntü önbelleği: {len(self._disk)} dosya, {self._disk_bytes / 1048576:.1f} MB")
+        except Exception as e:
+            logging.error(f"Görüntü önbelleği dizini okunamadı: {e}")
+
+    def _filename(self, key, variant):
+        return _cache_filename(key, variant)
+
+    def _disk_read(self, key, variant):
+        name = self._filename(key, variant)
+        with self._lock:
+            if name not in self._disk:
+                return None
+            self._disk.move_to_end(name)
+        path = os.path.join(self.cache_dir, name)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path, None)  # Erişim zamanı - yeniden açılışta LRU sırası korunur
+            return data
+        except OSError:
+            with self._lock:
+                size = self._disk.pop(name, None)
+                if size is not None:
+                    self._disk_bytes -= size
+            return None
+
+    def _disk_write(self, key, variant, data):
+        name = self._filename(key, variant)
+        path = os.path.join(self.cache_dir, name)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)  # Atomik - okuyucu yarım dosya görmez
+        except OSError as e:
+            logging.warning(f"Görüntü önbelleğe yazılamadı: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            previous = self._disk.pop(name, 0)
+            self._disk[name] = len(data)
+            self._disk_bytes += len(data) - previous
+        self._evict_disk()
+
+    def _evict_disk(self):
+        """Disk bütçesi aşılırsa en uzun süredir kullanılmayan dosyaları sil."""
+        victims = []
+        with self._lock:
+            while self._disk_bytes > self.disk_max_bytes and len(self._disk) > 1:
+                name, size = self._disk.popitem(last=False)
+                self._disk_bytes -= size
+                victims.append(name)
+            self.stats['evicted_files'] += len(victims)
+        for name in victims:
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass
+
+    # ----- Bellek LRU -----
+
+    def _memory_get(self, key, variant):
+        with self._lock:
+            entry = self._memory.get((key, variant))
+            if entry is None:
+                return None
+            self._memory.move_to_end((key, variant))
+            self.stats['memory_hits'] += 1
+            return entry[0]
+
+    def _memory_put(self, key, variant, image):
+        size = image.width * image.height * len(image.getbands())
+        with self._lock:
+            previous = self._memory.pop((key, variant), None)
+            if previous is not None:
+                self._memory_bytes -= previous[1]
+            self._memory[(key, variant)] = (image, size)
+            self._memory_bytes += size
+            while self._memory_bytes > self.memory_max_bytes and len(self._memory) > 1:
+                _, (_, evicted_size) = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted_size
+
+    # ----- Kaynak okuma -----
+
+    def _read_local(self, url):
+        """file:// URL'sini doğrudan oku (storage.py'nin ürettiği yol formatı)."""
+        path = url[len('file://'):]
+        if os.name == 'nt' and path.startswith('/') and path[2:3] == ':':
+            path = path[1:]
+        with open(path, 'rb') as f:
+            data = f.read()
+        self.stats['local_reads'] += 1
+        return data
+
+    def _download(self, url):
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        self.stats['downloads'] += 1
+        self.stats['download_bytes'] += len(response.content)
+        return response.content
+
+    def _source_bytes(self, key, url):
+        """Tam boy görüntü byte'ları: yerel dosya > disk önbelleği > ağ."""
+        if url.startswith('file://'):
+            return self._read_local(url)
+        data = self._disk_read(key, FULL)
+        if data is not None:
+            self.stats['disk_hits'] += 1
+            return data
+        data = self._download(url)
+        self._disk_write(key, FULL, data)
+        return data
+
+    @staticmethod
+    def _decode(data, size=None):
+        image = Image.open(BytesIO(data))
+        if size:
+            image.draft('RGB', size)  # JPEG'de küçültülmüş decode
+        image = image.convert('RGB')
+        if size:
+            image.thumbnail(size, Image.LANCZOS)
+        return image
+
+    def _load(self, key, url, variant, size):
+        if variant == FULL:
+            image = self._decode(self._source_bytes(key, url))
+        else:
+            data = None if url.startswith('file://') else self._disk_read(key, THUMB)
+            if data is not None:
+                self.stats['disk_hits'] += 1
+                image = self._decode(data)
+            else:
+                image = self._decode(self._source_bytes(key, url), size)
+                if not url.startswith('file://'):
+                    buffer = BytesIO()
+                    image.save(buffer, format='JPEG', quality=self.thumbnail_quality)
+                    self._disk_write(key, THUMB, buffer.getvalue())
+        self._memory_put(key, variant, image)
+        return image
+
+    def _get(self, key, url, variant, size=None):
+        image = self._memory_get(key, variant)
+        if image is not None:
+            return image
+
+        # Aynı görüntü için eşzamanlı istekler tek yüklemede birleşir
+        with self._lock:
+            waiter = self._inflight.get((key, variant))
+            if waiter is None:
+                self._inflight[(key, variant)] = threading.Event()
+        if waiter is not None:
+            waiter.wait(self.timeout * 2)
+            return self._memory_get(key, variant)
+
+        try:
+            return self._load(key, url, variant, size)
+        except Exception as e:
+            self.stats['errors'] += 1
+            logging.debug(f"Görüntü yüklenemedi ({key}): {e}")
+            return None
+        finally:
+            with self._lock:
+                self._inflight.pop((key, variant)).set()
+
+    # ----- Genel API -----
+
+    def peek(self, key, variant=FULL):
+        """Sadece bellek - Tk thread'inden bloklamadan çağrılabilir."""
+        return self._memory_get(key, variant)
+
+    def get_image(self, key, url):
+        """
+        Tam boy görüntü (bloklayabilir - worker thread'den çağrılmalı).
+
+        Args:
+            key (str): Olay ID'si (imzalı URL değişse de önbellek geçerli kalır)
+            url (str): https:// veya file:// URL
+
+        Returns:
+            PIL.Image: RGB görüntü (paylaşılır - değiştirmeden önce copy()) veya hata durumunda None
+        """
+        if not key or not url:
+            return None
+        return self._get(key, url, FULL)
+
+    def get_thumbnail(self, key, url, size):
+        """Kart thumbnail'ı; diskte ayrı küçük JPEG olarak saklanır."""
+        if not key or not url:
+            return None
+        return self._get(key, url, THUMB, size)
+
+    def get_bytes(self, key, url):
+        """
+        Görüntünün orijinal byte'ları (decode edilmeden, ör. dışa aktarma için).
+        Disk önbelleğinden veya ağdan gelir; indirilen görüntü diske de yazılır.
+
+        Returns:
+            bytes: JPEG verisi veya hata durumunda None
+        """
+        if not key or not url:
+            return None
+        try:
+            return self._source_bytes(key, url)
+        except Exception as e:
+            logging.warning(f"Görüntü byte'ları alınamadı ({key}): {e}")
+            return None
+
+    def evict(self, key):
+        """
+        Olayın tam boy ve thumbnail görüntülerini bellekten ve diskten siler (olay silinince).
+        Kuyrukta bekleyen ön yüklemesi de düşülür.
+        """
+        if not key:
+            return
+        victims = []
+        with self._lock:
+            for variant in (FULL, THUMB):
+                entry = self._memory.pop((key, variant), None)
+                if entry is not None:
+                    self._memory_bytes -= entry[1]
+                name = self._filename(key, variant)
+                size = self._disk.pop(name, None)
+                if size is not None:
+                    self._disk_bytes -= size
+                    victims.append(name)
+        with self._prefetch_condition:
+            pending = [item for item in self._prefetch_queue if item[0] != key]
+            if len(pending) != len(self._prefetch_queue):
+                self._prefetch_queue.clear()
+                self._prefetch_queue.extend(pending)
+        for name in victims:
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass
+
+    def is_cached(self, key):
+        with self._lock:
+            return (key, FULL) in self._memory or self._filename(key, FULL) in self._disk
+
+    def prefetch(self, items):
+        """
+        Olayları arka planda önbelleğe al.
+
+        Args:
+            items: (key, url) listesi - öncelik sırasına göre (ilk eleman en önce)
+        """
+        with self._prefetch_condition:
+            for key, url in reversed(list(items)):
+                if key and url and not url.startswith('file://') and not self.is_cached(key):
+                    self._prefetch_queue.append((key, url))
+            self._prefetch_condition.notify_all()
+
+        if not self._prefetch_workers:
+            for i in range(max(1, HISTORY_MEDIA_CACHE_CONFIG.get('prefetch_workers', 2))):
+                worker = threading.Thread(target=self._prefetch_loop, name=f"media-prefetch-{i}", daemon=True)
+                worker.start()
+                self._prefetch_workers.append(worker)
+
+    def _prefetch_loop(self):
+        while True:
+            with self._prefetch_condition:
+                while not self._prefetch_queue:
+                    self._prefetch_condition.wait()
+                key, url = self._prefetch_queue.pop()  # LIFO - en son istenen önce
+            if not self.is_cached(key):
+                self.get_image(key, url)
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                **self.stats,
+                'memory_items': len(self._memory),
+                'memory_mb': round(self._memory_bytes / 1048576, 2),
+                'disk_files': len(self._disk),
+                'disk_mb': round(self._disk_bytes / 1048576, 2),
+            }
+
+
+def get_media_cache():
+    """Global geçmiş görüntü önbelleği."""
+    return MediaCache.get_instance()
+
+
+def evict_cached_media(keys):
+    """
+    Silinen olayların önbellek görüntülerini temizler. Önbellek bu süreçte açılmışsa
+    onun evict'i kullanılır; açılmamışsa (ör. API süreci) MediaCache başlatılmadan
+    (prefetch thread'i, HTTP oturumu, disk taraması olmadan) dosyalar doğrudan silinir.
+    """
+    cache = MediaCache._instance
+    for key in keys:
+        if not key:
+            continue
+        if cache is not None:
+            cache.evict(key)
+            continue
+        for variant in (FULL, THUMB):
+            try:
+                os.remove(os.path.join(DEFAULT_CACHE_DIR, _cache_filename(key, variant)))
+            except OSError:
+                pass
@@ -33,6 +33,7 @@
 # - download_screenshot: Görüntüyü indirip OpenCV formatında döner
 # - list_all_screenshots: Kullanıcının tüm ekran görüntülerini listeler
 # - delete_screenshot: Belirli bir ekran görüntüsünü siler
+# - delete_screenshots: Çok sayıda görüntüyü paralel siler (görüntü başına tek istek)
 # - test_connection: Firebase Storage bağlantısını test eder
 
 # === VERİ DEPOLAMA MEKANİZMALARI ===
@@ -87,7 +88,12 @@ import uuid
 import tempfile
 import time
 import io
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
+from google.api_core.exceptions import NotFound
+
+from utils.jpeg_encoder import get_jpeg_encoder
+from config.settings import JPEG_ENCODER_CONFIG, BULK_OPERATIONS_CONFIG
 
 class StorageManager:
     """Firebase Storage işlemlerini yöneten sınıf."""
@@ -123,35 +129,34 @@ class StorageManager:
             str: Yüklenen dosyanın URL'i veya None
         """
         try:
-            # DÜZELTME: Farklı image formatlarını destekle
-            if hasattr(image_data, 'save'):
-                # PIL Image
-                img = image_data
-            elif hasattr(image_data, 'shape'):
-                # DÜZELTME: NumPy array desteği eklendi
-                import numpy as np
-                if len(image_data.shape) == 3:
-                    # BGR to RGB conversion (OpenCV format)
-                    image_rgb = cv2.cvtColor(image_data, cv2.COLOR_BGR2RGB)
-                    img = Image.fromarray(image_rgb.astype(np.uint8))
-                else:
-                    img = Image.fromarray(image_data.astype(np.uint8))
-                logging.debug(f"NumPy array converted to PIL Image: {image_data.shape}")
-            elif isinstance(image_data, bytes):
-                # Bytes ise PIL Image'a çevir
-                img = Image.open(io.BytesIO(image_data))
-            else:
-                logging.error(f"Desteklenmeyen image_data türü: {type(image_data)}")
-                return None
-            
             # Görüntüyü optimize et (max 1280x720)
             max_size = (1280, 720)
-            img.thumbnail(max_size, Image.Resampling.LANCZOS)
             
-            # JPEG olarak kaydet (kalite: 75)
-            img_bytes = io.BytesIO()
-            img.save(img_bytes, format='JPEG', quality=75, optimize=True)
-            img_bytes = img_bytes.getvalue()
+            if hasattr(image_data, 'shape'):
+                # ULTRA OPTIMIZE: NumPy (BGR) frame PIL'e çevrilmeden ortak encoder ile sıkıştırılır
+                img_bytes = self._encode_array(image_data, max_size)
+                if img_bytes is None:
+                    logging.error("Ekran görüntüsü JPEG'e çevrilemedi")
+                    return None
+            else:
+                # DÜZELTME: Farklı image formatlarını destekle
+                if hasattr(image_data, 'save'):
+                    # PIL Image
+                    img = image_data
+                elif isinstance(image_data, bytes):
+                    # Bytes ise PIL Image'a çevir
+                    img = Image.open(io.BytesIO(image_data))
+                else:
+                    logging.error(f"Desteklenmeyen image_data türü: {type(image_data)}")
+                    return None
+                
+                img.thumbnail(max_size, Image.Resampling.LANCZOS)
+                
+                # JPEG olarak kaydet
+                img_bytes = io.BytesIO()
+                img.save(img_bytes, format='JPEG', quality=JPEG_ENCODER_CONFIG.get('screenshot_quality', 75),
+                         optimize=True)
+                img_bytes = img_bytes.getvalue()
             
             # Dosya boyutunu logla
             size_mb = len(img_bytes) / (1024 * 1024)
@@ -177,6 +182,21 @@ class StorageManager:
             logging.error(f"Screenshot upload hatası: {str(e)}")
             return None
     
+    def _encode_array(self, image_data, max_size):
+        """
+        NumPy frame'i (BGR veya gri) boyut sınırına küçültüp JPEG byte'larına çevirir.
+        
+        Returns:
+            bytes: JPEG verisi veya None
+        """
+        frame = np.ascontiguousarray(image_data.astype(np.uint8, copy=False))
+        h, w = frame.shape[:2]
+        scale = min(max_size[0] / w, max_size[1] / h, 1.0)
+        if scale < 1.0:
+            frame = cv2.resize(frame, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
+        logging.debug(f"NumPy array JPEG'e çevriliyor: {image_data.shape} -> {frame.shape}")
+        return get_jpeg_encoder().encode(frame, quality=JPEG_ENCODER_CONFIG.get('screenshot_quality', 75))
+    
     def _upload_local(self, img_bytes, user_id, filename):
         """Yerel depolamaya kaydet."""
         try:
@@ -283,6 +303,58 @@ class StorageManager:
             logging.error(f"Ekran görüntüsü silinirken hata oluştu: {str(e)}")
             return False
     
+    def delete_screenshots(self, user_id, event_ids, max_workers=None, progress=None):
+        """Çok sayıda ekran görüntüsünü paralel siler.
+        
+        delete_screenshot'tan farklı olarak önce exists() sorgulanmaz; silme isteği doğrudan
+        gönderilir ve bulunamayan görüntü (404) silinmiş sayılır.
+        
+        Args:
+            user_id (str): Kullanıcı ID'si
+            event_ids (list): Olay ID'leri
+            max_workers (int): Paralel silme sayısı
+            progress (callable): progress(tamamlanan, toplam)
+            
+        Returns:
+            int: Başarıyla silinen (veya zaten olmayan) görüntü sayısı
+        """
+        event_ids = [event_id for event_id in event_ids or [] if event_id]
+        if not user_id or not event_ids:
+            return 0
+        workers = max_workers or BULK_OPERATIONS_CONFIG.get('storage_delete_workers', 8)
+        
+        succeeded = 0
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="screenshot-delete") as executor:
+            for done, ok in enumerate(executor.map(lambda event_id: self._delete_screenshot_fast(user_id, event_id),
+                                                   event_ids), 1):
+                succeeded += ok
+                if progress:
+                    progress(done, len(event_ids))
+        logging.info(f"{succeeded}/{len(event_ids)} ekran görüntüsü silindi: {user_id}")
+        return succeeded
+    
+    def _delete_screenshot_fast(self, user_id, event_id):
+        success = True
+        try:
+            local_path = os.path.join(self.local_storage_dir, user_id, f"{event_id}.jpg")
+            if os.path.exists(local_path):
+                os.remove(local_path)
+        except Exception as e:
+            logging.error(f"Yerel silme hatası: {e}")
+            success = False
+        
+        if not self.is_available:
+            return success
+        
+        try:
+            self.bucket.blob(f"fall_events/{user_id}/{event_id}.jpg").delete()
+        except NotFound:
+            pass
+        except Exception as e:
+            logging.error(f"Firebase silme hatası ({event_id}): {e}")
+            success = False
+        return success
+    
     def get_screenshot_url(self, user_id, event_id):
         """Ekran görüntüsünün URL'sini döndürür.
         
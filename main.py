@@ -460,107 +460,33 @@ def check_enhanced_dependencies():
 
 
 def safe_camera_validation():
-    """DÜZELTME: Windows uyumlu güvenli kamera doğrulama - SIGALRM sorunu çözüldü"""
-    logging.info("📹 Windows uyumlu kamera doğrulaması başlatılıyor...")
+    """
+    DÜZELTME: Windows uyumlu güvenli kamera doğrulama - SIGALRM sorunu çözüldü
+    ULTRA OPTIMIZE: Tüm kameralar paralel probe edilir, sonuç envanter önbelleğine yazılır
+    (kamera doğrulama ve API bu önbellekten okur) ve arka planda periyodik yenilenir.
+    """
+    logging.info("📹 Paralel kamera doğrulaması başlatılıyor...")
     
     try:
-        import cv2
-        import threading
-        from config.settings import CAMERA_CONFIGS
+        from core.camera_inventory import get_camera_inventory
         
-        validated_cameras = []
+        inventory = get_camera_inventory()
+        probe_start = time.time()
+        entries = inventory.probe_all()
+        validated_cameras = inventory.get_available_configs()
         
-        def test_camera_with_timeout(camera_index, camera_name, result_dict, timeout=3):
-            """Thread içinde kamera testi - Windows uyumlu timeout"""
-            cap = None
-            try:
-                logging.info(f"🔍 Kamera {camera_index} ({camera_name}) test ediliyor...")
-                
-                # Kamerayı aç - Enhanced parametler ile
-                cap = cv2.VideoCapture(camera_index)
-                
-                # YOLOv11 için ZORUNLU 640x640 kare format - mehrere denemeler
-                for attempt in range(3):
-                    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-                    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 640)
-                    cap.set(cv2.CAP_PROP_FPS, 30)  # Daha yüksek FPS
-                    
-                    # Doğrulama
-                    actual_w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                    actual_h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                    
-                    if actual_w == 640 and actual_h == 640:
-                        logging.info(f"✅ Kamera {camera_index} test: PERFECT 640x640")
-                        break
-                    else:
-                        logging.warning(f"⚠️ Kamera {camera_index} test deneme {attempt+1}: {actual_w}x{actual_h}")
-                        time.sleep(0.1)
-                else:
-                    logging.warning(f"⚠️ Kamera {camera_index} test: Native {actual_w}x{actual_h} kullanacak")
-                
-                if cap.isOpened():
-                    # Frame test et - birkaç frame dene
-                    for attempt in range(3):
-                        ret, frame = cap.read()
-                        if ret and frame is not None and frame.shape[0] > 0:
-                            logging.info(f"✅ Kamera {camera_index} çalışıyor: {frame.shape}")
-                            result_dict['success'] = True
-                            result_dict['frame_shape'] = frame.shape
-                            break
-                        time.sleep(0.1)  # Kısa bekleme
-                    else:
-                        logging.warning(f"⚠️ Kamera {camera_index} açık ama frame alamadı")
-                        result_dict['success'] = False
-                        result_dict['error'] = "Frame alınamadı"
-                else:
-                    logging.warning(f"⚠️ Kamera {camera_index} açılamadı")
-                    result_dict['success'] = False
-                    result_dict['error'] = "Kamera açılamadı"
-                
-            except Exception as e:
-                logging.warning(f"⚠️ Kamera {camera_index} test hatası: {e}")
-                result_dict['success'] = False
-                result_dict['error'] = str(e)
-            finally:
-                # Güvenli cleanup
-                try:
-                    if cap is not None:
-                        cap.release()
-                except:
-                    pass
-        
-        # Her kamera için test
-        for config in CAMERA_CONFIGS:
-            camera_index = config['index']
-            camera_name = config['name']
-            
-            # Windows uyumlu timeout sistemi
-            result_dict = {'success': False, 'error': None}
-            
-            # Thread oluştur
-            test_thread = threading.Thread(
-                target=test_camera_with_timeout, 
-                args=(camera_index, camera_name, result_dict, 3),
-                daemon=True
-            )
-            
-            # Thread'i başlat
-            test_thread.start()
-            
-            # 3 saniye bekle
-            test_thread.join(timeout=3.0)
-            
-            # Thread hala çalışıyorsa timeout olmuş demektir
-            if test_thread.is_alive():
-                logging.warning(f"⚠️ Kamera {camera_index} test timeout - atlandı")
-                # Thread'i bırak, daemon olduğu için kendini temizler
+        for camera_id, entry in entries.items():
+            if entry.get('available'):
+                logging.info(f"✅ {camera_id} validated: {entry.get('backend_name')} "
+                             f"{entry.get('resolution')} @ {entry.get('fps', 0):.0f} FPS")
             else:
-                # Test tamamlandı, sonucu kontrol et
-                if result_dict['success']:
-                    validated_cameras.append(config)
-                    logging.info(f"✅ Kamera {camera_index} validated")
+                logging.warning(f"⚠️ {camera_id} doğrulanamadı: {entry.get('error')}")
+        
+        logging.info(f"📊 Kamera doğrulama sonucu: {len(validated_cameras)}/{len(inventory.configs)} başarılı "
+                     f"({time.time() - probe_start:.1f}s)")
         
-        logging.info(f"📊 Kamera doğrulama sonucu: {len(validated_cameras)}/{len(CAMERA_CONFIGS)} başarılı")
+        # Envanteri arka planda güncel tut
+        inventory.start_background_refresh()
         
         # En az bir kamera olmalı - ama zorlamıyoruz
         if not validated_cameras:
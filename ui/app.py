@@ -26,7 +26,6 @@
 # - threading: Arka plan işlemleri (algılama döngüsü, indirmeler)
 # - logging: Sistemde oluşan tüm hatalar ve işlem kayıtları
 # - datetime / time: Zaman damgası ve performans ölçümü
-# - uuid: Olay ID'leri üretmek için
 # - psutil: Bellek kullanımı izleme
 
 # === SINIFLAR ===
@@ -45,7 +44,8 @@
 # - start_enhanced_detection: Kamerayı başlatır ve düşme algılamaya başlar
 # - stop_enhanced_detection: Kamerayı ve algılamayı durdurur
 # - _enhanced_detection_loop: Her kamera için çalışan gerçek zamanlı algılama döngüsü
-# - _handle_enhanced_fall_detection: Düşme algılandığında bildirim gönderir, veritabanına kaydeder
+# - _handle_enhanced_fall_detection: Düşme algısını alert bus'a yayınlar (olay başına tek uyarı)
+# - _on_alert_dashboard / _on_alert_persist: Bus aboneleri - dashboard, kayıt ve bildirim
 # - show_login / show_register / show_dashboard / show_settings / show_history: UI geçiş fonksiyonları
 # - switch_ai_model: AI modelini değiştirme
 # - logout: Kullanıcının çıkış yapması
@@ -108,7 +108,6 @@ import os
 import sys
 import traceback
 from typing import Optional, Dict, Any
-import uuid
 import cv2
 import numpy as np
 from datetime import datetime, timedelta
@@ -123,14 +122,18 @@ from ui.history import HistoryFrame
 # Configuration
 from config.firebase_config import FIREBASE_CONFIG
 
-from config.settings import THEME_LIGHT, THEME_DARK, DEFAULT_THEME, CAMERA_CONFIGS
+from config.settings import (THEME_LIGHT, THEME_DARK, DEFAULT_THEME, CAMERA_CONFIGS, VIDEO_SOURCE_CONFIGS,
+                             DASHBOARD_GRID_CONFIG)
 # Services
 from utils.auth import FirebaseAuth
 from data.database import FirestoreManager
 from data.storage import StorageManager
-from core.camera import Camera
+from core.camera_sources import create_camera
+from core.camera_supervisor import get_camera_supervisor
+from utils.latency_tracer import get_latency_tracer
 from core.fall_detection import FallDetector
 from core.notification import NotificationManager
+from core.alert_bus import get_alert_bus
 from core.stream_server import run_api_server_in_thread
 
 class GuardApp:
@@ -168,10 +171,12 @@ class GuardApp:
             'last_activity': None
         }
         
-        # Fall event processing lock - aynı anda birden fazla event işlenmesini önler
-        self.fall_event_lock = threading.Lock()
-        self.last_fall_event_time = 0
-        self.min_fall_event_interval = 5.0  # 5 saniye
+        # Düşme uyarıları - olay başına tek uyarı; dashboard ve kayıt/bildirim ayrı kuyruklardan
+        self.alert_bus = get_alert_bus()
+        self.alert_subscriptions = [
+            self.alert_bus.subscribe('dashboard', handler=self._on_alert_dashboard),
+            self.alert_bus.subscribe('fall_events', handler=self._on_alert_persist),
+        ]
 
         # Stiller
         self._setup_enhanced_styles()
@@ -182,6 +187,16 @@ class GuardApp:
         # gelişmiş düşme algılama sistemi
         self._setup_advanced_fall_detection()
 
+        # Glass-to-alert latency tracing
+        self.latency_tracer = get_latency_tracer()
+        
+        # Dashboard ızgarası için kamera başına son thumbnail zamanı (tile hız sınırı)
+        self._thumbnail_times = {}
+
+        # Kamera supervisor - sağlık durumları ve backoff ile yeniden başlatma
+        self.camera_supervisor = get_camera_supervisor()
+        self._unsubscribe_camera_states = self.camera_supervisor.subscribe(self._on_camera_state_change)
+
         # Enhanced API sunucusu
         self.api_thread = run_api_server_in_thread()
 
@@ -276,9 +291,10 @@ class GuardApp:
             
             # Enhanced kamera yönetimi
             self.cameras = []
-            for config in CAMERA_CONFIGS:
+            for config in CAMERA_CONFIGS + VIDEO_SOURCE_CONFIGS:
                 try:
-                    camera = Camera(camera_index=config['index'], name=config['name'])
+                    # Yerel kamera veya dosya/ağ akışı kaynağı
+                    camera = create_camera(config)
                     
                     # Enhanced camera validation
                     if hasattr(camera, '_validate_camera_with_fallback') and camera._validate_camera_with_fallback():
@@ -552,7 +568,8 @@ class GuardApp:
             self.content_frame,
             self.current_user,
             self.db_manager,
-            self.show_dashboard
+            self.show_dashboard,
+            storage_manager=self.get_storage_manager()
         )
         self.history_frame.pack(fill=tk.BOTH, expand=True)
         logging.info("📜 Enhanced Geçmiş ekranı gösterildi")
@@ -654,6 +671,7 @@ class GuardApp:
                         # DÜZELTME: Doğal ayarlarla başlat
                         if camera.start():
                             camera_start_count += 1
+                            self.camera_supervisor.register(camera)
                             logging.info(f"✅ Kamera {camera.camera_index} başlatıldı - doğal kalite")
                             
                             # DÜZELTME: Kısa test
@@ -739,6 +757,7 @@ class GuardApp:
                     'ai_process_interval': 10,  # Her 10. frame'de AI (daha az yük)
                     'max_errors': 25,
                     'min_detection_interval': 2.5,  # 2.5 saniye ara
+                    'fall_confidence_threshold': 0.5,  # Alarm ve ızgara vurgusu aynı eşik
                     'ai_enabled': self.system_state['ai_model_loaded']
                 }
                 
@@ -753,6 +772,7 @@ class GuardApp:
                 }
                 
                 frame_counter = 0
+                fall_until = 0.0  # Izgara tile'ı bu zamana kadar düşme vurgulu
                 
                 # FIXED: Model durumu kontrolü
                 if not self.fall_detector or not config['ai_enabled']:
@@ -760,13 +780,20 @@ class GuardApp:
                 
                 while self.system_state['running']:
                     try:
+                        # ULTRA OPTIMIZE: Kamera down/recovering ise AI placeholder'lara CPU harcamaz
+                        if not self.camera_supervisor.wait_until_available(camera_id, timeout=0.5):
+                            continue
+                        
                         # FIXED: Camera status check
                         if not camera or not hasattr(camera, 'is_running') or not camera.is_running:
                             time.sleep(0.5)
                             continue
                         
-                        # stabil frame acquisition
-                        frame = camera.get_frame()
+                        # stabil frame acquisition - yakalanma zamanı ile (latency tracing)
+                        if hasattr(camera, 'get_frame_with_timestamp'):
+                            frame, capture_time = camera.get_frame_with_timestamp()
+                        else:
+                            frame, capture_time = camera.get_frame(), None
                         if frame is None or frame.size == 0:
                             stats['error_count'] += 1
                             if stats['error_count'] % 25 == 0:
@@ -779,6 +806,8 @@ class GuardApp:
                         
                         # FIXED: Stabil AI processing
                         if config['ai_enabled'] and self.fall_detector and (frame_counter % config['ai_process_interval'] == 0):
+                            trace = self.latency_tracer.new_trace(camera_id, capture_time)
+                            detection_start = time.time()
                             try:
                                 #  stabil AI detection
                                 if hasattr(self.fall_detector, 'get_detection_visualization'):
@@ -788,6 +817,7 @@ class GuardApp:
                             except Exception as detection_error:
                                 logging.error(f"❌ {camera_id} AI detection hatası: {detection_error}")
                                 annotated_frame, tracks = frame, []
+                            self.latency_tracer.record_span(trace, 'detection', detection_start)
                             
                             # FIXED: Update detection count
                             if tracks:
@@ -796,6 +826,7 @@ class GuardApp:
                                 self.system_state['last_activity'] = time.time()
                             
                             #  stabil Fall Detection
+                            fall_start = time.time()
                             try:
                                 if hasattr(self.fall_detector, 'detect_fall'):
                                     is_fall, confidence, track_id = self.fall_detector.detect_fall(frame, tracks)
@@ -804,6 +835,7 @@ class GuardApp:
                             except Exception as fall_error:
                                 logging.error(f"❌ {camera_id} fall detection hatası: {fall_error}")
                                 is_fall, confidence, track_id = False, 0.0, None
+                            self.latency_tracer.record_span(trace, 'detect_fall', fall_start)
                             
                             # FIXED: Dashboard'a annotated frame'i gönder - HER FRAME'DE
                             if hasattr(self, 'dashboard_frame') and self.dashboard_frame:
@@ -816,7 +848,10 @@ class GuardApp:
                             
                             #  stabil fall event processing
                             current_time = time.time()
-                            if (is_fall and confidence > 0.5 and  # Stabil threshold
+                            if is_fall and confidence > config['fall_confidence_threshold']:
+                                fall_until = current_time + DASHBOARD_GRID_CONFIG.get('fall_highlight_hold', 5.0)
+                            self._publish_dashboard_thumbnail(camera, annotated_frame, current_time < fall_until)
+                            if (is_fall and confidence > config['fall_confidence_threshold'] and  # Stabil threshold
                                 (current_time - stats['last_detection_time']) > config['min_detection_interval']):
                                 
                                 stats['last_detection_time'] = current_time
@@ -828,18 +863,15 @@ class GuardApp:
                                 logging.info(f"   📍 Track ID: {track_id}")
                                 logging.info(f"   📊 Confidence: {confidence:.4f}")
                                 
-                                # FIXED: Thread-safe UI çağrısı
-                                def handle_fall():
-                                    try:
-                                        result = self._handle_enhanced_fall_detection(
-                                            annotated_frame, confidence, camera_id, track_id, None
-                                        )
-                                        logging.info(f"🎯 stabil fall handling result: {result}")
-                                    except Exception as handle_error:
-                                        logging.error(f"❌ Fall handling hatası: {handle_error}")
-                                
-                                # FIXED: UI thread'de çalıştır
-                                self.root.after(0, handle_fall)
+                                # Alert bus'a yayınla - UI ve kayıt/bildirim abonelerde (bloklamaz)
+                                result = self._handle_enhanced_fall_detection(
+                                    annotated_frame, confidence, camera_id, track_id, None, trace=trace
+                                )
+                                logging.info(f"🎯 stabil fall handling result: {result}")
+                        
+                        elif not (config['ai_enabled'] and self.fall_detector):
+                            # AI yokken ızgara ham frame'lerden beslenir
+                            self._publish_dashboard_thumbnail(camera, frame, False)
                         
                         # FIXED: Performance stats - daha az sıklıkla
                         if stats['frame_count'] % 300 == 0:  # 300 frame'de bir
@@ -871,6 +903,46 @@ class GuardApp:
             finally:
                 logging.info(f"🧹 {camera_id} ultra stabil detection thread temizlendi")
 
+    def _publish_dashboard_thumbnail(self, camera, frame, fall_active):
+        """
+        ULTRA OPTIMIZE: Dashboard ızgarası için thumbnail'ı algılama thread'inde üretir.
+        Tk thread'i sadece hazır RGB diziyi paste() eder. Odaktaki kamera her frame'de,
+        diğerleri tile_fps sınırıyla güncellenir; ızgara kapalıyken hiçbir şey yapılmaz.
+        """
+        dashboard = getattr(self, 'dashboard_frame', None)
+        if not dashboard or frame is None or not dashboard.thumbnails_wanted():
+            return
+        try:
+            now = time.time()
+            if not dashboard.is_focused_camera(camera):
+                min_interval = 1.0 / max(1, DASHBOARD_GRID_CONFIG.get('tile_fps', 5))
+                if now - self._thumbnail_times.get(camera.camera_index, 0.0) < min_interval:
+                    return
+            self._thumbnail_times[camera.camera_index] = now
+            
+            tile_width, tile_height = dashboard.thumbnail_size
+            h, w = frame.shape[:2]
+            scale = min(tile_width / w, tile_height / h)
+            size = (max(1, int(w * scale)), max(1, int(h * scale)))
+            thumbnail = cv2.cvtColor(cv2.resize(frame, size, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2RGB)
+            dashboard.update_camera_thumbnail(camera.camera_index, thumbnail, fall_active)
+        except Exception as e:
+            logging.debug(f"Dashboard thumbnail hatası: {e}")
+
+    def _on_camera_state_change(self, camera_id, old_state, new_state, info):
+        """Supervisor durum değişikliği - dashboard'a UI thread'inde aktarılır."""
+        def update_dashboard():
+            try:
+                if hasattr(self, "dashboard_frame") and self.dashboard_frame:
+                    self.dashboard_frame.update_camera_health(camera_id, new_state, info)
+            except Exception as e:
+                logging.debug(f"Kamera durum UI güncelleme hatası: {e}")
+        
+        try:
+            self.root.after(0, update_dashboard)
+        except Exception as e:
+            logging.debug(f"Kamera durum callback hatası: {e}")
+
     def _log_ultra_stable_performance_stats(self, camera_id: str, stats: Dict):
             """Ultra stabil performans istatistiklerini logla."""
             try:
@@ -935,10 +1007,11 @@ class GuardApp:
             
             self.detection_threads.clear()
 
-            # Kameraları durdur
+            # Kameraları durdur - önce supervisor'dan çıkar (yeniden başlatmasın)
             stopped_cameras = 0
             for camera in self.cameras:
                 try:
+                    self.camera_supervisor.unregister(camera)
                     if hasattr(camera, 'is_running') and camera.is_running:
                         camera.stop()
                         stopped_cameras += 1
@@ -947,6 +1020,9 @@ class GuardApp:
                     logging.error(f"❌ Kamera {camera.camera_index} durdurma hatası: {str(e)}")
 
             self.system_state['cameras_active'] = 0
+            
+            # Glass-to-alert latency özeti
+            self.latency_tracer.log_summary()
 
             # Dashboard güncelle
             if hasattr(self, "dashboard_frame") and self.dashboard_frame:
@@ -974,6 +1050,7 @@ class GuardApp:
                 'target_fps': 30,
                 'max_errors': 15,
                 'min_detection_interval': 2.0,  # DÜZELTME: 3 -> 2 saniye
+                'fall_confidence_threshold': 0.8,  # DÜZELTME: 1.5 -> 0.8 (dengeli eşik) - alarm ve ızgara vurgusu
                 'performance_log_interval': 150,
                 'ai_enabled': self.system_state['ai_model_loaded']
             }
@@ -990,6 +1067,7 @@ class GuardApp:
             }
             
             frame_duration = 1.0 / config['target_fps']
+            fall_until = 0.0  # Izgara tile'ı bu zamana kadar düşme vurgulu
             
             # Model durumu kontrolü
             if not self.fall_detector or not config['ai_enabled']:
@@ -999,13 +1077,20 @@ class GuardApp:
                 loop_start = time.time()
                 
                 try:
+                    # Kamera down/recovering ise AI işleme bekler
+                    if not self.camera_supervisor.wait_until_available(camera_id, timeout=0.5):
+                        continue
+                    
                     # Camera status check
                     if not camera or not hasattr(camera, 'is_running') or not camera.is_running:
                         time.sleep(0.5)
                         continue
                     
-                    # Frame acquisition
-                    frame = camera.get_frame()
+                    # Frame acquisition - yakalanma zamanı ile (latency tracing)
+                    if hasattr(camera, 'get_frame_with_timestamp'):
+                        frame, capture_time = camera.get_frame_with_timestamp()
+                    else:
+                        frame, capture_time = camera.get_frame(), None
                     if frame is None or frame.size == 0:
                         stats['error_count'] += 1
                         if stats['error_count'] % 10 == 0:
@@ -1017,6 +1102,8 @@ class GuardApp:
                     processing_start = time.time()
                     
                     if config['ai_enabled'] and self.fall_detector:
+                        trace = self.latency_tracer.new_trace(camera_id, capture_time)
+                        detection_start = time.time()
                         # Enhanced AI Detection
                         try:
                             if hasattr(self.fall_detector, 'get_enhanced_detection_visualization'):
@@ -1026,6 +1113,7 @@ class GuardApp:
                         except Exception as detection_error:
                             logging.error(f"❌ {camera_id} AI detection hatası: {detection_error}")
                             annotated_frame, tracks = frame, []
+                        self.latency_tracer.record_span(trace, 'detection', detection_start)
                         
                         # Update detection count
                         if tracks:
@@ -1034,6 +1122,7 @@ class GuardApp:
                             self.system_state['last_activity'] = time.time()
                         
                         # DÜZELTME: Enhanced Fall Detection - daha düşük threshold
+                        fall_start = time.time()
                         try:
                             if hasattr(self.fall_detector, 'detect_enhanced_fall'):
                                 fall_result = self.fall_detector.detect_enhanced_fall(frame, tracks)
@@ -1045,10 +1134,11 @@ class GuardApp:
                         except Exception as fall_error:
                             logging.error(f"❌ {camera_id} fall detection hatası: {fall_error}")
                             is_fall, confidence, track_id, analysis_result = False, 0.0, None, None
+                        self.latency_tracer.record_span(trace, 'detect_fall', fall_start)
                         
                         # DÜZELTME: DENGELI Fall event processing - güvenilir ama algılayabilen
                         current_time = time.time()
-                        if (is_fall and confidence > 0.8 and  # DÜZELTME: 1.5 -> 0.8 (dengeli eşik)
+                        if (is_fall and confidence > config['fall_confidence_threshold'] and
                             (current_time - stats['last_detection_time']) > config['min_detection_interval']):
                             
                             # DÜZELTME: Ek doğrulama - track validation
@@ -1067,29 +1157,28 @@ class GuardApp:
                                     logging.info(f"   🤸 Keypoint Quality: {analysis_result.keypoint_quality:.3f}")
                                     logging.info(f"   ⚠️ Risk Factors: {len(analysis_result.risk_factors)}")
                                 
-                                # DÜZELTME: Thread-safe UI çağrısı
-                                def handle_fall():
-                                    try:
-                                        result = self._handle_enhanced_fall_detection(
-                                            annotated_frame, confidence, camera_id, track_id, analysis_result
-                                        )
-                                        logging.info(f"🎯 stabil fall handling result: {result}")
-                                    except Exception as handle_error:
-                                        logging.error(f"❌ Fall handling hatası: {handle_error}")
-                                        logging.error(f"📍 Traceback: {traceback.format_exc()}")
-                                
-                                # UI thread'de çalıştır
-                                self.root.after(0, handle_fall)
+                                # Alert bus'a yayınla - UI ve kayıt/bildirim abonelerde (bloklamaz)
+                                result = self._handle_enhanced_fall_detection(
+                                    annotated_frame, confidence, camera_id, track_id, analysis_result,
+                                    trace=trace
+                                )
+                                logging.info(f"🎯 stabil fall handling result: {result}")
                             else:
                                 logging.debug(f"❌ Track validation failed for ID: {track_id}, confidence: {confidence:.3f}")
                         elif is_fall and confidence <= 1.5:
                             logging.debug(f"❌ Düşük confidence reddedildi: {confidence:.3f} <= 1.5")
                     
+                        # Izgara vurgusu alarmla aynı eşikte - alarm çalmayan tile kırmızı olmaz
+                        if is_fall and confidence > config['fall_confidence_threshold']:
+                            fall_until = current_time + DASHBOARD_GRID_CONFIG.get('fall_highlight_hold', 5.0)
+                    
                     else:
                         # Basic detection mode (AI olmadan)
                         annotated_frame = frame
                         logging.debug(f"{camera_id}: Basic mode - AI disabled")
                     
+                    self._publish_dashboard_thumbnail(camera, annotated_frame, time.time() < fall_until)
+                    
                     # Processing time
                     processing_time = time.time() - processing_start
                     stats['total_processing_time'] += processing_time
@@ -1172,62 +1261,45 @@ class GuardApp:
         logging.info(f"   ❌ Final Error Count: {stats['error_count']}")
 
     def _handle_enhanced_fall_detection(self, screenshot: np.ndarray, confidence: float, 
-                                      camera_id: str, track_id: int, analysis_result=None):
-        """
-        DÜZELTME: Enhanced düşme algılama event handler - Performance Optimized Version
-        Sistem donmasını önleyen asenkron işlem mantığı.
+                                      camera_id: str, track_id: int, analysis_result=None, trace=None):
         """
-        # DÜZELTME: Performance optimized fall event handling
-        current_time = time.time()
-        
-        # DÜZELTME: Çok sık düşme olaylarını önle (2 saniye minimum)
-        if (current_time - self.last_fall_event_time) < 2.0:  # 3 -> 2 saniye (daha hızlı tepki)
-            logging.info(f"⏳ Fall event rate limited: {current_time - self.last_fall_event_time:.1f}s < 2.0s")
-            return {'event_saved': False, 'notification_sent': False, 'image_uploaded': False}
-        
-        # DÜZELTME: Instant non-blocking processing - asla beklemez
-        if not self.fall_event_lock.acquire(blocking=False):
-            logging.warning("🔒 Fall event processing busy, immediate background processing...")
-            # DÜZELTME: Hızlı background processing
-            threading.Thread(target=self._lightweight_fall_processing, 
-                           args=(screenshot.copy() if screenshot is not None else None, 
-                                confidence, camera_id, track_id, analysis_result),
-                           daemon=True).start()
-            return {'event_saved': False, 'notification_sent': False, 'image_uploaded': False}
+        DÜZELTME: Düşme algısını alert bus'a yayınlar - hiç beklemez.
+        Aynı düşme olayının tekrarları bus tarafından bastırılır; dashboard güncellemesi ve
+        storage/DB/bildirim işlemleri bus abonelerinde (_on_alert_dashboard,
+        _on_alert_persist) kendi kuyruklarından yapılır.
         
+        Args:
+            trace: Latency trace bağlamı (frame yakalanma zamanı) - storage/DB/bildirim boyunca taşınır
+        """
         try:
-            self.last_fall_event_time = current_time
-            
-            # DÜZELTME: Minimal logging - performans için
-            logging.warning(f"🚨 FALL DETECTION: {camera_id}, conf={confidence:.3f}, id={track_id}")
-            
-            event_id = str(uuid.uuid4())
-            
-            # DÜZELTME: Asenkron processing - hızlı return
-            # Screenshot'u kopyalayıp background'da işle
-            screenshot_copy = screenshot.copy() if screenshot is not None else None
-            
-            # DÜZELTME: Hızlı response - tüm heavy operations background'da
-            threading.Thread(target=self._async_fall_event_processing, 
-                           args=(screenshot_copy, confidence, camera_id, track_id, 
-                                analysis_result, event_id),
-                           daemon=True).start()
-            
-            # DÜZELTME: Instant UI update - donmayı önler
-            self._instant_ui_update(event_id, confidence, camera_id, track_id)
-            
-            logging.info(f"🎯 FALL EVENT QUEUED: {event_id} (async processing)")
-            
+            alert = self.alert_bus.publish(camera_id, confidence, track_id, frame=screenshot,
+                                           source='desktop', trace=trace,
+                                           context={'analysis_result': analysis_result})
+            if alert is None:
+                logging.debug(f"⏳ {camera_id} aynı düşme olayı - uyarı bastırıldı")
+                return {'event_saved': False, 'notification_sent': False, 'image_uploaded': False}
+            
+            logging.info(f"🎯 FALL EVENT QUEUED: {alert.id} (alert bus)")
             return {'event_saved': True, 'notification_sent': True, 'image_uploaded': True}
 
         except Exception as e:
             logging.error(f"💥 Fall detection handler error: {str(e)}")
             return {'event_saved': False, 'notification_sent': False, 'image_uploaded': False}
-        finally:
-            # Lock'u hemen release et
-            self.fall_event_lock.release()
 
-    def _async_fall_event_processing(self, screenshot, confidence, camera_id, track_id, analysis_result, event_id):
+    def _on_alert_dashboard(self, alert):
+        """Alert bus abonesi - dashboard'a anında uyarı (UI thread'ine aktarılır)."""
+        self._instant_ui_update(alert.id, alert.confidence, alert.camera_id, alert.track_id)
+
+    def _on_alert_persist(self, alert):
+        """Alert bus abonesi - storage, veritabanı ve bildirimler (kendi worker thread'inde)."""
+        if not self.current_user:
+            logging.debug(f"Oturum yok - uyarı kaydedilmedi: {alert.id}")
+            return
+        self._async_fall_event_processing(alert.frame, alert.confidence, alert.camera_id, alert.track_id,
+                                          alert.context.get('analysis_result'), alert.id, alert.trace)
+
+    def _async_fall_event_processing(self, screenshot, confidence, camera_id, track_id, analysis_result, event_id,
+                                     trace=None):
         """DÜZELTME: Asenkron fall event processing - UI thread'i bloklamaz."""
         try:
             logging.info(f"🔄 Async processing started: {event_id}")
@@ -1244,9 +1316,11 @@ class GuardApp:
                     else:
                         screenshot_rgb = enhanced_screenshot
                     
+                    upload_start = time.time()
                     image_url = self.storage_manager.upload_screenshot(
                         screenshot_rgb, self.current_user["localId"], event_id
                     )
+                    self.latency_tracer.record_span(trace, 'storage_upload', upload_start)
                     logging.info(f"✅ Async storage upload: {event_id}")
                 except Exception as storage_error:
                     logging.error(f"❌ Async storage error: {storage_error}")
@@ -1275,7 +1349,8 @@ class GuardApp:
             
             # Database save - background'da
             try:
-                save_result = self.db_manager.save_fall_event(event_data)
+                with self.latency_tracer.span(trace, 'db_write'):
+                    save_result = self.db_manager.save_fall_event(event_data)
                 logging.info(f"✅ Async database save: {event_id} -> {save_result}")
             except Exception as db_error:
                 logging.error(f"❌ Async database error: {db_error}")
@@ -1289,6 +1364,7 @@ class GuardApp:
                     
                     notification_data = event_data.copy()
                     notification_data['test'] = False
+                    notification_data['_trace'] = trace  # Kanal span'leri için (DB'ye yazılmaz)
                     
                     notification_result = self.notification_manager.send_notifications(
                         notification_data, enhanced_screenshot
@@ -1327,82 +1403,6 @@ class GuardApp:
         except Exception as e:
             logging.error(f"❌ Instant UI update error: {e}")
 
-    def _delayed_fall_processing(self, screenshot, confidence, camera_id, track_id, analysis_result):
-        """DÜZELTME: Gecikmeli düşme olayı işleme - sistem donmasını önler."""
-        try:
-            # 1 saniye bekle - sistem stabilize olsun
-            time.sleep(1.0)
-            
-            # Lock mevcut mu kontrol et
-            if self.fall_event_lock.acquire(blocking=True, timeout=5.0):
-                try:
-                    logging.info(f"🔄 Delayed fall processing started: {camera_id}")
-                    result = self._handle_enhanced_fall_detection(
-                        screenshot, confidence, camera_id, track_id, analysis_result
-                    )
-                    logging.info(f"🔄 Delayed fall processing completed: {result}")
-                finally:
-                    self.fall_event_lock.release()
-            else:
-                logging.warning("⚠️ Delayed fall processing timeout - skipping")
-                
-        except Exception as e:
-            logging.error(f"💥 Delayed fall processing error: {e}")
-    
-    def _lightweight_fall_processing(self, screenshot, confidence, camera_id, track_id, analysis_result):
-        """DÜZELTME: Hafif düşme olayı işleme - sistem donmasını önler."""
-        try:
-            # Öncelik sırasına göre hızlı işlem
-            logging.info(f"⚡ Lightweight fall processing started: {camera_id}")
-            
-            # 1. Hızlı bildirim gönder (UI donmaması için)
-            event_id = str(uuid.uuid4())
-            
-            # 2. Minimal event data
-            minimal_event_data = {
-                "id": event_id,
-                "user_id": self.current_user["localId"] if self.current_user else "unknown",
-                "timestamp": time.time(),
-                "confidence": float(confidence),
-                "camera_id": camera_id,
-                "track_id": track_id,
-                "processing_mode": "lightweight"
-            }
-            
-            # 3. Dashboard hızlı güncelle
-            if hasattr(self, "dashboard_frame") and self.dashboard_frame:
-                def quick_dashboard_update():
-                    try:
-                        if (hasattr(self.dashboard_frame, 'winfo_exists') and 
-                            self.dashboard_frame.winfo_exists()):
-                            self.dashboard_frame.update_fall_detection(
-                                screenshot, confidence, minimal_event_data
-                            )
-                            logging.info(f"⚡ Quick dashboard update: {event_id}")
-                    except Exception as e:
-                        logging.error(f"❌ Quick dashboard update error: {e}")
-                
-                self.root.after(0, quick_dashboard_update)
-            
-            # 4. Arka planda tam işleme
-            time.sleep(0.5)  # Kısa gecikme ile tam işleme
-            
-            if self.fall_event_lock.acquire(blocking=True, timeout=2.0):
-                try:
-                    logging.info(f"🔄 Full processing started for: {event_id}")
-                    # Tam işleme yap
-                    result = self._handle_enhanced_fall_detection(
-                        screenshot, confidence, camera_id, track_id, analysis_result
-                    )
-                    logging.info(f"✅ Lightweight processing completed: {result}")
-                finally:
-                    self.fall_event_lock.release()
-            else:
-                logging.warning(f"⏰ Full processing timeout for: {event_id}")
-                
-        except Exception as e:
-            logging.error(f"💥 Lightweight fall processing error: {e}")
-    
     def _add_minimal_fall_info(self, screenshot, fall_info):
         """DÜZELTME: Screenshot'a minimal düşme bilgisi ekler - performans optimized."""
         try:
@@ -1768,10 +1768,20 @@ class GuardApp:
             # Kameraları durdur
             for camera in self.cameras:
                 try:
+                    self.camera_supervisor.unregister(camera)
                     camera.stop()
                 except:
                     pass
             
+            try:
+                self._unsubscribe_camera_states()
+                self.camera_supervisor.shutdown()
+            except Exception:
+                pass
+            
+            for subscription in self.alert_subscriptions:
+                subscription.close()
+            
             # Enhanced cleanup
             if hasattr(self, 'fall_detector') and self.fall_detector:
                 try:
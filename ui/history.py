@@ -8,6 +8,21 @@
 # - 🧹 Widget temizliği iyileştirildi (`_on_destroy` ve `_clear_canvas_bindings` metodları).
 # - 🌈 Glassmorphism efekti için hex renkler korundu.
 # - 📜 Boş olay listesi için güvenli işleme eklendi.
+# - 🎴 Sanal kart listesi: sadece görünür satırlardaki kartlar canvas'ta bulunur, kaydırırken
+#   geri dönüştürülür; thumbnail'lar kart görünür olunca arka planda yüklenir (10.000+ olay).
+# - 🌈 Gradient arka planlar satır satır çizgi yerine önbellekteki hazır görüntüden çizilir.
+# - 💾 Görüntüler data/media_cache.py üzerinden yüklenir (bellek + disk LRU, havuzlu HTTP);
+#   seçilen olayın komşuları arka planda ön yüklenir, açılmış olaylar çevrimdışı da açılır.
+# - 📄 Olaylar cursor tabanlı sayfalarla yüklenir (sonsuz kaydırma); tarih ve güven filtreleri
+#   sunucu tarafında uygulanır, arama yüklenen sayfalar üzerinde çalışır.
+# - 📊 İstatistik kartları yüklenen olaylardan değil, veritabanındaki önceden hesaplanmış
+#   özetlerden okunur (get_event_stats) - tüm geçmiş için doğru toplamlar.
+# - 🔎 Arama yüklenen olayları taramaz: data/event_index.py'deki token + sıralı zaman/güven
+#   indeksi sayfalar geldikçe artımlı güncellenir, arama kutusu yazmayı bırakınca sorgular.
+#   Tüm sonuçlar yüklüyken daraltan tarih/güven filtreleri sunucuya gitmeden indeksten gelir.
+# - ☑️ Çoklu seçim (kartta Ctrl+tık, listede Ctrl/Shift+tık): seçilenler toplu silinir
+#   (≤500 yazmalık Firestore batch'leri + paralel görüntü silme) veya NDJSON/CSV/zip olarak
+#   dışa aktarılır (data/event_export.py, akışla). İşlemler thread'de, ilerleme çubuğu Tk'yi bloklamaz.
 # 🔗 Bağımlılıklar:
 # - Firebase (auth, firestore, storage)
 # - Python kütüphaneleri: tkinter, PIL, requests, matplotlib, numpy
@@ -18,8 +33,6 @@ from tkinter import ttk, messagebox, filedialog
 import logging
 import datetime
 from PIL import Image, ImageTk, ImageEnhance, ImageFilter, ImageDraw
-import requests
-from io import BytesIO
 import threading
 import time
 import sys
@@ -32,11 +45,44 @@ from firebase_admin import auth
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
+from collections import OrderedDict, deque
+
+from config.settings import HISTORY_VIEW_CONFIG, HISTORY_MEDIA_CACHE_CONFIG
+from data.media_cache import get_media_cache
+from data.event_index import EventSearchIndex
+from data.event_export import export_events, iter_user_events
+
+# 🎴 Kart geometrisi (kart içi item yerleşimi bu boyuta göre sabittir)
+CARD_WIDTH = 220
+CARD_HEIGHT = 280
+CARD_PADDING = 8
+CARD_COLUMN_WIDTH = CARD_WIDTH + 2 * CARD_PADDING
+CARD_ROW_HEIGHT = CARD_HEIGHT + 2 * CARD_PADDING
+THUMBNAIL_SIZE = (190, 90)
+
+# 📋 Liste görünümünde çoklu seçim yapan değiştirici tuşlar
+TREE_MULTI_SELECT_MODIFIERS = 0x0001 | 0x0004  # Tk event.state: Shift | Control
+
+
+class _CardSlot:
+    """🎴 Sanal kart görünümünde geri dönüştürülen tek kart (canvas item grubu)"""
+
+    __slots__ = ('tag', 'x', 'y', 'index', 'event', 'thumb_key', 'items')
+
+    def __init__(self, tag):
+        self.tag = tag
+        self.x = 0  # Item grubunun canvas üzerindeki sol üst köşesi
+        self.y = 0
+        self.index = None  # Bağlı olduğu filtered_events indeksi (gizliyse None)
+        self.event = None
+        self.thumb_key = None
+        self.items = {}
+
 
 class HistoryFrame(ttk.Frame):
     """🚀 Ultra Modern & Premium Geçmiş Olaylar Ekranı"""
 
-    def __init__(self, parent, user, db_manager, back_fn):
+    def __init__(self, parent, user, db_manager, back_fn, storage_manager=None):
         # Ana frame'i başlat
         super().__init__(parent, style="MainFrame.TFrame")
         
@@ -44,15 +90,47 @@ class HistoryFrame(ttk.Frame):
         self.user = user  # Kullanıcı bilgileri
         self.db_manager = db_manager  # Firestore veritabanı yöneticisi
         self.back_fn = back_fn  # Geri dönüş fonksiyonu
+        self.storage_manager = storage_manager  # Ekran görüntüsü silme için (opsiyonel)
         self.events = []  # Tüm olaylar listesi
         self.filtered_events = []  # Filtrelenmiş olaylar listesi
-        self.image_cache = {}  # Görüntü önbelleği
+        self.next_cursor = None  # Sonraki sayfanın cursor'ı (None: son sayfa)
+        self.loading_page = False  # Sayfa isteği sürüyor
+        self.server_filters = {}  # Sunucu tarafı filtreler (start_time, min_confidence)
+        self._load_generation = 0  # Filtre değişince eski sayfa yanıtlarını yok saymak için
+        self._filter_after_id = None  # Güven filtresi debounce zamanlayıcısı
+        self._search_after_id = None  # Arama kutusu debounce zamanlayıcısı
+        self.search_index = EventSearchIndex(  # Yüklenen olayların arama indeksi
+            time_key=lambda event: self._safe_timestamp_convert(event.get("timestamp", 0)))
+        self.selected_ids = set()  # ☑️ Çoklu seçimdeki olay ID'leri
+        self.bulk_running = False  # Toplu silme / dışa aktarma sürüyor
+        self._bulk_cancel = threading.Event()  # Dışa aktarmayı iptal
+        self.image_cache = OrderedDict()  # Kart thumbnail önbelleği (LRU, PhotoImage)
         self.current_image = None  # Şu anda görüntülenen görüntü
+        self.media_cache = get_media_cache()  # Bellek + disk görüntü önbelleği
+        self._viewer_event_id = None  # Viewer'da gösterilmesi beklenen olay
         self.animation_speed = 200  # Animasyon hızı (ms)
         self.glassmorphism_enabled = True  # Glassmorphism efekti açık
         self.canvas_widgets = []  # Canvas widget'larını takip etmek için
         self.stats_canvas = None  # İstatistik canvas'ını saklamak için
         
+        # 🎴 Sanal kart görünümü
+        self.card_canvas = None  # Kart görünümünün tek canvas'ı
+        self.card_slots = []  # Geri dönüştürülen kart havuzu (sadece görünür kadar)
+        self._card_columns = 1
+        self._card_render_pending = False
+        self._gradient_cache = OrderedDict()  # (w, h, renk1, renk2) -> PhotoImage
+        
+        # 🖼️ Thumbnail yükleyici (worker thread'ler Tk'ye dokunmaz, sonuçlar Tk thread'inde uygulanır)
+        self._thumb_lock = threading.Condition()
+        self._thumb_requests = deque()  # (key, url) - en son istenen önce işlenir
+        self._thumb_results = deque()  # (key, PIL görüntü veya None)
+        self._thumb_pending = set()  # Kuyrukta veya yükleniyor
+        self._thumb_failed = set()  # Yüklenemeyen anahtarlar (tekrar denenmez)
+        self._thumb_wanted = set()  # Şu an bağlı kartların anahtarları
+        self._thumb_workers = []
+        self._thumb_poll_pending = False
+        self._thumb_stop = False
+        
         # 🎨 Tema sistemi (glass renkleri hex formatına çevrildi)
         self.themes = {
             "midnight": {
@@ -363,6 +441,29 @@ class HistoryFrame(ttk.Frame):
                                  command=self._apply_confidence_filter)
         self.conf_scale.pack(side=tk.LEFT, padx=5)
         
+        # ☑️ Toplu işlemler
+        bulk_frame = ttk.Frame(inner_control, style="Glass.TFrame")
+        bulk_frame.pack(side=tk.LEFT, padx=15)
+        
+        for icon, command in (("☑️", self._toggle_select_all),
+                              ("🗑️", self._delete_selected),
+                              ("📤", self._export_events)):
+            btn = tk.Button(bulk_frame, text=icon, font=("Segoe UI", 11),
+                          bg=self.colors['secondary'], fg=self.colors['text'],
+                          relief=tk.FLAT, width=3, command=command)
+            btn.pack(side=tk.LEFT, padx=2)
+            btn.bind("<Enter>", lambda e, b=btn: self._button_hover_effect(b, True))
+            btn.bind("<Leave>", lambda e, b=btn: self._button_hover_effect(b, False))
+        
+        self.selection_label = tk.Label(bulk_frame, text="", font=("Segoe UI", 9),
+                                       bg=self.colors['secondary'], fg=self.colors['text_secondary'])
+        self.selection_label.pack(side=tk.LEFT, padx=5)
+        
+        self.bulk_progress = ttk.Progressbar(bulk_frame, orient=tk.HORIZONTAL, length=120, mode="determinate")
+        self.bulk_cancel_button = tk.Button(bulk_frame, text="✖", font=("Segoe UI", 9),
+                                          bg=self.colors['secondary'], fg=self.colors['text'],
+                                          relief=tk.FLAT, command=self._bulk_cancel.set)
+        
         view_frame = ttk.Frame(inner_control, style="Glass.TFrame")
         view_frame.pack(side=tk.RIGHT, padx=10)
         
@@ -488,21 +589,40 @@ class HistoryFrame(ttk.Frame):
         self.fade_step = 0.0
 
     def _create_gradient_background(self, canvas, color1, color2):
-        """🌈 Gradient arka plan oluşturur"""
+        """🌈 Gradient arka plan oluşturur (önceden çizilmiş tek görüntü)"""
         canvas.delete("gradient")
         width = canvas.winfo_reqwidth() or 800
         height = canvas.winfo_reqheight() or 70
         
+        photo = self._get_gradient_image(width, height, color1, color2)
+        canvas.create_image(0, 0, anchor="nw", image=photo, tags="gradient")
+        canvas.tag_lower("gradient")
+
+    def _get_gradient_image(self, width, height, color1, color2):
+        """🌈 Dikey gradient'i bir kez PIL ile çizip PhotoImage olarak önbellekler"""
+        key = (width, height, color1, color2)
+        photo = self._gradient_cache.get(key)
+        if photo is not None:
+            self._gradient_cache.move_to_end(key)
+            return photo
+        
         r1, g1, b1 = self._hex_to_rgb(color1)
         r2, g2, b2 = self._hex_to_rgb(color2)
         
-        for i in range(height):
-            ratio = i / height
-            r = int(r1 * (1 - ratio) + r2 * ratio)
-            g = int(g1 * (1 - ratio) + g2 * ratio)
-            b = int(b1 * (1 - ratio) + b2 * ratio)
-            color = f"#{r:02x}{g:02x}{b:02x}"
-            canvas.create_line(0, i, width, i, fill=color, tags="gradient")
+        # 1 piksel genişliğinde sütun hesaplanır, yatayda kopyalanarak genişletilir
+        column = Image.new("RGB", (1, height))
+        column.putdata([
+            (int(r1 * (1 - i / height) + r2 * i / height),
+             int(g1 * (1 - i / height) + g2 * i / height),
+             int(b1 * (1 - i / height) + b2 * i / height))
+            for i in range(height)
+        ])
+        photo = ImageTk.PhotoImage(column.resize((width, height), Image.NEAREST))
+        
+        if len(self._gradient_cache) >= HISTORY_VIEW_CONFIG.get('gradient_cache_size', 16):
+            self._gradient_cache.popitem(last=False)
+        self._gradient_cache[key] = photo
+        return photo
 
     def _create_gradient_text(self, canvas, text, color1, color2):
         """✨ Gradient metin efekti oluşturur"""
@@ -612,6 +732,10 @@ class HistoryFrame(ttk.Frame):
 
     def _update_events_display(self):
         """📋 Olayları görünüm moduna göre güncelle"""
+        if self.selected_ids:
+            # Filtre dışında kalan olaylar toplu işlemlere gizlice dahil olmasın
+            self.selected_ids &= {str(event.get("id")) for event in self.filtered_events}
+            self._update_selection_label()
         self._clear_canvas_bindings()
         for child in self.events_container.winfo_children():
             child.destroy()
@@ -624,99 +748,240 @@ class HistoryFrame(ttk.Frame):
             self._create_timeline_view()
 
     def _create_card_view(self):
-        """🎴 Kart görünümü oluştur"""
+        """🎴 Sanal kart görünümü - sadece görünür satırlardaki kartlar canvas'ta bulunur"""
         canvas = tk.Canvas(self.events_container, bg=self.colors['secondary'], highlightthickness=0)
         scrollbar = ttk.Scrollbar(self.events_container, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas, style="Glass.TFrame")
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
         
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
+        def on_yscroll(first, last):
+            scrollbar.set(first, last)
+            self._schedule_card_render()
         
+        canvas.configure(yscrollcommand=on_yscroll)
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
-        row, col = 0, 0
-        for i, event in enumerate(self.filtered_events):
-            card = self._create_event_card(scrollable_frame, event, row, col)
-            
-            col += 1
-            if col >= 3:
-                col = 0
-                row += 1
-        
+        canvas.bind("<Configure>", lambda e: self._layout_card_view())
         canvas.bind("<MouseWheel>", lambda e: canvas.yview_scroll(int(-1*(e.delta/120)), "units"))
+        
+        self.card_canvas = canvas
+        self.card_slots = []
+        self._card_columns = 0
         self.canvas_widgets.append(canvas)
         self.events_container.canvas = canvas  # Geçici çözüm
+        self._layout_card_view()
 
-    def _create_event_card(self, parent, event, row, col):
-        """🎴 Olay kartı oluştur"""
-        card_frame = ttk.Frame(parent, style="Glass.TFrame")
-        card_frame.grid(row=row, column=col, padx=8, pady=8, sticky="ew")
-        
-        card_canvas = tk.Canvas(card_frame, width=220, height=280, highlightthickness=0,
-                              bg=self.colors['secondary'])
-        card_canvas.pack(fill=tk.BOTH, expand=True)
-        
-        self._draw_rounded_rect(card_canvas, 5, 5, 215, 275, 12, self.colors['secondary'])
-        
-        timestamp = self._safe_timestamp_convert(event.get("timestamp", 0))
-        dt = datetime.datetime.fromtimestamp(timestamp)
-        confidence = float(event.get("confidence", 0.0))
+    def _layout_card_view(self):
+        """🎴 Sütun sayısını ve sanal kaydırma alanını günceller"""
+        canvas = self.card_canvas
+        if canvas is None:
+            return
         
-        date_str = dt.strftime("%d.%m.%Y")
-        time_str = dt.strftime("%H:%M:%S")
+        try:
+            width = max(canvas.winfo_width(), CARD_COLUMN_WIDTH)
+            columns = max(1, min(HISTORY_VIEW_CONFIG.get('max_columns', 3), width // CARD_COLUMN_WIDTH))
+            if columns != self._card_columns:
+                # Yerleşim değişti - tüm kartlar yeniden konumlandırılır
+                self._card_columns = columns
+                for slot in self.card_slots:
+                    slot.index = None
+            
+            rows = math.ceil(len(self.filtered_events) / columns)
+            canvas.configure(scrollregion=(0, 0, columns * CARD_COLUMN_WIDTH, max(1, rows * CARD_ROW_HEIGHT)))
+            
+            canvas.delete("empty")
+            if not self.filtered_events:
+                canvas.create_text(width // 2, 100, text="Henüz olay kaydedilmemiş",
+                                   font=("Segoe UI", 12), fill=self.colors['text_secondary'], tags="empty")
+        except tk.TclError:
+            return
         
-        card_canvas.create_text(110, 25, text=date_str, font=("Segoe UI", 11, "bold"),
-                              fill=self.colors['text'], anchor="center")
-        card_canvas.create_text(110, 45, text=time_str, font=("Segoe UI", 9),
-                              fill=self.colors['text_secondary'], anchor="center")
+        self._render_visible_cards()
+
+    def _schedule_card_render(self):
+        """🎴 Kaydırma olaylarını tek render'da birleştir"""
+        if self.card_canvas is not None and not self._card_render_pending:
+            self._card_render_pending = True
+            self.after_idle(self._render_visible_cards)
+
+    def _render_visible_cards(self):
+        """🎴 Görünür satırları havuzdaki kartlara bağlar (kaydırmada geri dönüşüm)"""
+        self._card_render_pending = False
+        canvas = self.card_canvas
+        if canvas is None or not self._card_columns:
+            return
         
-        conf_color = self._get_confidence_color(confidence)
-        conf_text = f"{confidence*100:.1f}%"
+        try:
+            top = canvas.canvasy(0)
+            height = max(canvas.winfo_height(), CARD_ROW_HEIGHT)
+        except tk.TclError:
+            return
         
-        self._draw_circular_progress(card_canvas, 110, 90, 25, confidence, conf_color)
-        card_canvas.create_text(110, 90, text=conf_text, font=("Segoe UI", 9, "bold"),
-                              fill=self.colors['text'], anchor="center")
+        columns = self._card_columns
+        overscan = HISTORY_VIEW_CONFIG.get('overscan_rows', 1)
+        first_row = max(0, int(top // CARD_ROW_HEIGHT) - overscan)
+        last_row = int((top + height) // CARD_ROW_HEIGHT) + overscan
+        first = min(len(self.filtered_events), first_row * columns)
+        last = min(len(self.filtered_events), (last_row + 1) * columns)
+        
+        # Hâlâ görünür olan kartlar yerinde kalır, çıkanlar yeni satırlara taşınır
+        bound = {}
+        free = []
+        for slot in self.card_slots:
+            if (slot.index is not None and first <= slot.index < last
+                    and slot.event is self.filtered_events[slot.index]):
+                bound[slot.index] = slot
+            else:
+                free.append(slot)
         
-        thumb_rect = card_canvas.create_rectangle(15, 130, 205, 220,
-                                                fill=self.colors['primary'],
-                                                outline=conf_color, width=2)
+        for index in range(first, last):
+            if index in bound:
+                continue
+            if free:
+                slot = free.pop()
+            else:
+                slot = self._create_card_slot(len(self.card_slots))
+                self.card_slots.append(slot)
+            self._bind_card_slot(slot, index, self.filtered_events[index])
+            bound[index] = slot
+        
+        for slot in free:
+            if slot.index is not None or slot.event is not None:
+                canvas.itemconfigure(slot.tag, state="hidden")
+                slot.index = None
+                slot.event = None
+                slot.thumb_key = None
+        
+        self._thumb_wanted = {slot.thumb_key for slot in bound.values() if slot.thumb_key}
+        
+        # 📄 Sonsuz kaydırma - listenin sonuna yaklaşınca sonraki sayfa
+        if last >= len(self.filtered_events) - columns * HISTORY_VIEW_CONFIG.get('load_more_rows', 2):
+            self._maybe_load_more()
+
+    def _card_position(self, index):
+        """🎴 Kart indeksinin canvas üzerindeki sol üst köşesi"""
+        row, col = divmod(index, self._card_columns)
+        return col * CARD_COLUMN_WIDTH + CARD_PADDING, row * CARD_ROW_HEIGHT + CARD_PADDING
+
+    def _create_card_slot(self, number):
+        """🎴 Havuz için kart item grubu oluşturur (bir kez, sonra sadece güncellenir)"""
+        canvas = self.card_canvas
+        slot = _CardSlot(f"card{number}")
+        body_tags = (slot.tag, f"{slot.tag}_body")
+        items = slot.items
+        
+        items['bg'] = canvas.create_rectangle(5, 5, CARD_WIDTH - 5, CARD_HEIGHT - 5,
+                                              fill=self.colors['secondary'], outline=self.colors['secondary'],
+                                              tags=body_tags)
+        items['date'] = canvas.create_text(110, 25, text="", font=("Segoe UI", 11, "bold"),
+                                           fill=self.colors['text'], anchor="center", tags=body_tags)
+        items['time'] = canvas.create_text(110, 45, text="", font=("Segoe UI", 9),
+                                           fill=self.colors['text_secondary'], anchor="center", tags=body_tags)
+        
+        # ⭕ Dairesel güven göstergesi
+        canvas.create_oval(85, 65, 135, 115, outline=self.colors['text_secondary'], width=2, fill="",
+                           tags=body_tags)
+        items['arc'] = canvas.create_arc(85, 65, 135, 115, start=90, extent=0, outline=self.colors['accent'],
+                                         width=3, style='arc', tags=body_tags)
+        items['confidence'] = canvas.create_text(110, 90, text="", font=("Segoe UI", 9, "bold"),
+                                                 fill=self.colors['text'], anchor="center", tags=body_tags)
+        
+        # 🖼️ Thumbnail alanı
+        items['thumb_frame'] = canvas.create_rectangle(15, 130, 205, 220, fill=self.colors['primary'],
+                                                       outline=self.colors['accent'], width=2, tags=body_tags)
+        items['thumb'] = canvas.create_image(110, 175, anchor="center", tags=body_tags)
+        items['thumb_text'] = canvas.create_text(110, 175, text="", font=("Segoe UI", 10),
+                                                 fill=self.colors['text_secondary'], anchor="center",
+                                                 tags=body_tags)
+        
+        canvas.tag_bind(f"{slot.tag}_body", "<Button-1>",
+                        lambda e: self._on_card_action(slot, self._select_event))
+        canvas.tag_bind(f"{slot.tag}_body", "<Control-Button-1>",
+                        lambda e: self._on_card_action(slot, self._toggle_event_selection))
+        
+        # 🔘 Kart butonları
+        for x, icon, command in ((45, "👁️", self._view_event),
+                                 (110, "💾", self._save_event),
+                                 (175, "🗑️", self._delete_event)):
+            button_tag = f"{slot.tag}_btn{x}"
+            canvas.create_oval(x-12, 228, x+12, 252, fill=self.colors['accent'], outline="",
+                               tags=(slot.tag, button_tag))
+            canvas.create_text(x, 240, text=icon, font=("Segoe UI", 10), fill=self.colors['text'],
+                               tags=(slot.tag, button_tag))
+            canvas.tag_bind(button_tag, "<Button-1>",
+                            lambda e, c=command: self._on_card_action(slot, c))
+        
+        canvas.itemconfigure(slot.tag, state="hidden")
+        return slot
+
+    def _on_card_action(self, slot, command):
+        """🔘 Kart tıklaması - kartın o an bağlı olduğu olayla çalışır"""
+        if slot.event is not None:
+            command(slot.event)
+
+    def _bind_card_slot(self, slot, index, event):
+        """🎴 Havuzdaki kartı yeni olaya bağlar (item'lar taşınır ve güncellenir)"""
+        canvas = self.card_canvas
+        x, y = self._card_position(index)
+        if (x, y) != (slot.x, slot.y):
+            canvas.move(slot.tag, x - slot.x, y - slot.y)
+            slot.x, slot.y = x, y
+        slot.index = index
+        
+        if slot.event is not event:
+            slot.event = event
+            items = slot.items
+            
+            timestamp = self._safe_timestamp_convert(event.get("timestamp", 0))
+            dt = datetime.datetime.fromtimestamp(timestamp)
+            confidence = float(event.get("confidence", 0.0))
+            conf_color = self._get_confidence_color(confidence)
+            
+            canvas.itemconfigure(items['date'], text=dt.strftime("%d.%m.%Y"))
+            canvas.itemconfigure(items['time'], text=dt.strftime("%H:%M:%S"))
+            canvas.itemconfigure(items['arc'], extent=-int(360 * confidence), outline=conf_color)
+            canvas.itemconfigure(items['confidence'], text=f"{confidence*100:.1f}%")
+            canvas.itemconfigure(items['thumb_frame'], outline=conf_color)
+            self._show_card_thumbnail(slot)
+        
+        self._paint_card_selection(slot)
+        canvas.itemconfigure(slot.tag, state="normal")
+
+    def _paint_card_selection(self, slot):
+        """☑️ Seçili kartın çerçevesini vurgula"""
+        selected = slot.event is not None and str(slot.event.get("id")) in self.selected_ids
+        self.card_canvas.itemconfigure(slot.items['bg'],
+                                       outline=self.colors['accent'] if selected else self.colors['secondary'],
+                                       width=3 if selected else 1)
+
+    def _thumbnail_key(self, event):
+        """🖼️ Thumbnail önbellek anahtarı"""
+        return event.get("id") or event.get("image_url")
+
+    def _show_card_thumbnail(self, slot):
+        """🖼️ Kartın thumbnail'ını önbellekten göster veya arka planda yükle"""
+        canvas = self.card_canvas
+        items = slot.items
+        image_url = slot.event.get("image_url")
+        key = self._thumbnail_key(slot.event) if image_url else None
+        slot.thumb_key = key
+        
+        photo = self.image_cache.get(key) if key else None
+        if photo is not None:
+            self.image_cache.move_to_end(key)
+            canvas.itemconfigure(items['thumb'], image=photo)
+            canvas.itemconfigure(items['thumb_text'], text="")
+            return
         
-        image_url = event.get("image_url")
-        if image_url:
-            self._load_thumbnail(card_canvas, image_url, 15, 130, 190, 90)
+        canvas.itemconfigure(items['thumb'], image="")
+        if not image_url:
+            text = "📷\nGörüntü Yok"
+        elif key in self._thumb_failed:
+            text = "📷\nGörüntü\nYüklenemedi"
         else:
-            card_canvas.create_text(110, 175, text="📷\nGörüntü Yok",
-                                  font=("Segoe UI", 10), fill=self.colors['text_secondary'],
-                                  anchor="center")
-        
-        btn_y = 240
-        self._create_card_button(card_canvas, 45, btn_y, "👁️", lambda: self._view_event(event))
-        self._create_card_button(card_canvas, 110, btn_y, "💾", lambda: self._save_event(event))
-        self._create_card_button(card_canvas, 175, btn_y, "🗑️", lambda: self._delete_event(event))
-        
-        card_canvas.bind("<Button-1>", lambda e: self._select_event(event))
-        
-        return card_frame
-
-    def _draw_rounded_rect(self, canvas, x1, y1, x2, y2, radius, color):
-        """🔘 Yuvarlatılmış dikdörtgen çizer"""
-        canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline=color)
-
-    def _draw_circular_progress(self, canvas, x, y, radius, progress, color):
-        """⭕ Dairesel progress çizer"""
-        canvas.create_oval(x-radius, y-radius, x+radius, y+radius,
-                         outline=self.colors['text_secondary'], width=2, fill="")
-        
-        extent = int(360 * progress)
-        canvas.create_arc(x-radius, y-radius, x+radius, y+radius,
-                        start=90, extent=-extent, outline=color, width=3,
-                        style='arc')
+            text = "🖼️\nYükleniyor..."
+            self._thumb_wanted.add(key)  # Worker'ın bayat istek kontrolünden önce işaretle
+            self._request_thumbnail(key, image_url)
+        canvas.itemconfigure(items['thumb_text'], text=text)
 
     def _get_confidence_color(self, confidence):
         """🎨 Güven seviyesine göre renk döndürür"""
@@ -727,16 +992,6 @@ class HistoryFrame(ttk.Frame):
         else:
             return self.colors['success']
 
-    def _create_card_button(self, canvas, x, y, icon, command):
-        """🔘 Kart butonu oluştur"""
-        btn_bg = canvas.create_oval(x-12, y-12, x+12, y+12,
-                                  fill=self.colors['accent'], outline="")
-        btn_text = canvas.create_text(x, y, text=icon, font=("Segoe UI", 10),
-                                    fill=self.colors['text'])
-        
-        canvas.tag_bind(btn_bg, "<Button-1>", lambda e: command())
-        canvas.tag_bind(btn_text, "<Button-1>", lambda e: command())
-
     def _create_list_view(self):
         """📋 Liste görünümü oluştur"""
         self._clear_canvas_bindings()
@@ -760,27 +1015,46 @@ class HistoryFrame(ttk.Frame):
             self.tree.column(col, width=100, anchor="center")
         
         scrollbar = ttk.Scrollbar(self.events_container, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        
+        def on_yscroll(first, last):
+            scrollbar.set(first, last)
+            if float(last) >= 0.9:
+                self._maybe_load_more()  # 📄 Sonsuz kaydırma
+        
+        self.tree.configure(yscrollcommand=on_yscroll)
         
         self.tree.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
-        for event in self.filtered_events:
+        self._insert_tree_rows(self.filtered_events)
+        if self.selected_ids:
+            self.tree.selection_set([iid for iid in self.selected_ids if self.tree.exists(iid)])
+        
+        # Düz tık / ok tuşu sadece önizler; çoklu seçimi Ctrl/Shift+tık oluşturur
+        self.tree.bind("<Button-1>", self._on_tree_click)
+        self.tree.bind("<Up>", lambda e: self._on_tree_key(e, -1))
+        self.tree.bind("<Down>", lambda e: self._on_tree_key(e, 1))
+        self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
+        self.events_container.canvas = None  # Liste görünümünde canvas yok
+
+    def _insert_tree_rows(self, events):
+        """📋 Olayları liste görünümünün sonuna ekle"""
+        for event in events:
             timestamp = self._safe_timestamp_convert(event.get("timestamp", 0))
             dt = datetime.datetime.fromtimestamp(timestamp)
             confidence = float(event.get("confidence", 0.0))
             
             status = "🔴 Yüksek" if confidence >= 0.8 else "🟡 Orta" if confidence >= 0.6 else "🟢 Düşük"
             
-            self.tree.insert("", "end", values=(
+            event_id = str(event.get("id"))
+            if self.tree.exists(event_id):
+                continue
+            self.tree.insert("", "end", iid=event_id, values=(
                 dt.strftime("%d.%m.%Y"),
                 dt.strftime("%H:%M:%S"),
                 f"{confidence*100:.1f}%",
                 status
             ))
-        
-        self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
-        self.events_container.canvas = None  # Liste görünümünde canvas yok
 
     def _safe_timestamp_convert(self, timestamp_value):
         """DÜZELTME: Güvenli timestamp dönüştürme - DatetimeWithNanoseconds desteği"""
@@ -840,33 +1114,41 @@ class HistoryFrame(ttk.Frame):
         self.events_container.canvas = canvas  # Geçici çözüm
 
     def _on_search_change(self, event):
-        """🔍 Arama değişikliği"""
-        search_term = self.search_var.get().lower()
-        self._filter_events(search_term)
+        """🔍 Arama değişikliği (yazmayı bırakınca indeks sorgulanır)"""
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(
+            HISTORY_VIEW_CONFIG.get('search_debounce_ms', 150),
+            self._run_pending_search)
+
+    def _run_pending_search(self):
+        """🔍 Debounce sonrası arama - terim değişmediyse sorgu atılmaz"""
+        self._search_after_id = None
+        search_term = self.search_var.get().strip().lower()
+        if search_term != self.current_search:
+            self._filter_events(search_term)
+
+    def _local_range_filters(self):
+        """🔎 Aktif tarih/güven filtreleri (indeks aralık sorgusu için)"""
+        return {key: self.server_filters[key] for key in ("start_time", "min_confidence")
+                if key in self.server_filters}
 
     def _filter_events(self, search_term=""):
-        """🔍 Olayları filtrele"""
-        if not search_term:
-            self.filtered_events = self.events.copy()
-        else:
-            self.filtered_events = []
-            for event in self.events:
-                timestamp = self._safe_timestamp_convert(event.get("timestamp", 0))
-                dt = datetime.datetime.fromtimestamp(timestamp)
-                
-                searchable_text = f"{dt.strftime('%d.%m.%Y %H:%M:%S')} {event.get('confidence', 0)*100:.1f}%"
-                if search_term in searchable_text.lower():
-                    self.filtered_events.append(event)
+        """🔍 Yüklenen olayları indeksten filtrele"""
+        self.current_search = search_term
+        self.filtered_events = self.search_index.search(search_term, **self._local_range_filters())
         
         self._update_events_display()
 
     def _advanced_search(self, event=None):
-        """🔍 Gelişmiş arama fonksiyonu"""
-        search_term = self.search_var.get().strip().lower()
-        self._filter_events(search_term)
+        """🔍 Gelişmiş arama fonksiyonu (Enter - beklemeden)"""
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+            self._search_after_id = None
+        self._filter_events(self.search_var.get().strip().lower())
 
     def _apply_date_filter(self, selected_period):
-        """📅 Tarih filtresi uygula"""
+        """📅 Tarih filtresi uygula (sunucuda; tüm sonuçlar yüklüyse daraltma indeksten)"""
         now = datetime.datetime.now()
         
         if selected_period == "Bugün":
@@ -879,64 +1161,138 @@ class HistoryFrame(ttk.Frame):
         elif selected_period == "Son 3 Ay":
             start_date = now - datetime.timedelta(days=90)
         else:
-            self.filtered_events = self.events.copy()
-            self._update_events_display()
-            return
+            start_date = None
         
-        start_timestamp = start_date.timestamp()
-        self.filtered_events = [
-            event for event in self.events
-            if self._safe_timestamp_convert(event.get("timestamp", 0)) >= start_timestamp
-        ]
-        self._update_events_display()
+        self._set_server_filter("start_time", start_date.timestamp() if start_date else None)
 
     def _apply_confidence_filter(self, value):
-        """🎯 Güven filtresi uygula"""
+        """🎯 Güven filtresi uygula (kaydırıcı durunca; sunucuda veya indeksten)"""
+        if self._filter_after_id is not None:
+            self.after_cancel(self._filter_after_id)
         min_confidence = float(value) / 100
-        self.filtered_events = [
-            event for event in self.events
-            if float(event.get("confidence", 0)) >= min_confidence
-        ]
-        self._update_events_display()
+        self._filter_after_id = self.after(
+            HISTORY_VIEW_CONFIG.get('filter_debounce_ms', 300),
+            lambda: self._set_server_filter("min_confidence", min_confidence if min_confidence > 0 else None))
+
+    def _set_server_filter(self, key, value):
+        """📄 Sunucu filtresini güncelle - değiştiyse olayları ilk sayfadan yeniden yükle"""
+        self._filter_after_id = None
+        previous = self.server_filters.get(key)
+        if previous == value:
+            return
+        # Tüm sonuçlar zaten yüklüyse daraltan filtre (alt sınır yükseldi) indeksten uygulanır
+        narrowing = value is not None and (previous is None or value > previous)
+        if value is None:
+            self.server_filters.pop(key, None)
+        else:
+            self.server_filters[key] = value
+        if narrowing and self.next_cursor is None and not self.loading_page and self.events:
+            self.filtered_events = self.search_index.search(self.current_search,
+                                                            **self._local_range_filters())
+            self._update_events_display()
+            return
+        self._reload_events()
 
     def _load_events_with_stats(self):
         """📊 Olayları istatistiklerle birlikte yükle"""
-        threading.Thread(target=self._load_events_thread, daemon=True).start()
+        self._reload_events()
+
+    def _reload_events(self):
+        """📄 İlk sayfadan yükle - önceki isteklerin yanıtları yok sayılır"""
+        self._load_generation += 1
+        self.next_cursor = None
+        self.loading_page = True
+        threading.Thread(target=self._load_events_thread, args=(self._load_generation, None), daemon=True).start()
+
+    def _maybe_load_more(self):
+        """📄 Sonraki sayfa varsa ve istek sürmüyorsa yükle"""
+        if self.next_cursor is None or self.loading_page:
+            return
+        self.loading_page = True
+        threading.Thread(target=self._load_events_thread,
+                         args=(self._load_generation, self.next_cursor), daemon=True).start()
 
-    def _load_events_thread(self):
-        """📊 Olayları yükleyen thread"""
+    def _load_events_thread(self, generation, cursor):
+        """📊 Bir olay sayfasını (ilk sayfada istatistiklerle birlikte) yükleyen thread"""
         try:
-            events = self.db_manager.get_fall_events(self.user["localId"], limit=100)
-            self.events = events
-            self.filtered_events = events
-            
-            self._calculate_statistics()
-            self.after(0, self._update_ui_after_load)
+            events, next_cursor = self.db_manager.get_fall_events_page(
+                self.user["localId"],
+                page_size=HISTORY_VIEW_CONFIG.get('page_size', 60),
+                cursor=cursor,
+                **self.server_filters
+            )
+            stats = self._fetch_statistics() if cursor is None else None
+            self.after(0, lambda: self._on_page_loaded(generation, cursor, events, next_cursor, stats))
             
         except Exception as e:
             logging.error(f"Events loading error: {e}")
             error_msg = f"Olaylar yüklenemedi: {str(e)}"
-            self.after(0, lambda msg=error_msg: messagebox.showerror("Hata", msg))
+            self.after(0, lambda msg=error_msg: self._on_page_failed(generation, msg))
+
+    def _on_page_loaded(self, generation, cursor, events, next_cursor, stats=None):
+        """📄 Yüklenen sayfayı listeye ekle (Tk thread'i)"""
+        if generation != self._load_generation:
+            return  # Bu arada filtre değişti
+        self.loading_page = False
+        self.next_cursor = next_cursor
+        
+        if cursor is None:
+            self.events = list(events)
+            self.search_index.build(self.events)
+            self.filtered_events = self.search_index.search(self.current_search,
+                                                            **self._local_range_filters())
+            if stats is not None:
+                self.stats = stats
+            self._update_ui_after_load()
+            new_events = self.filtered_events
+        else:
+            self.events.extend(events)
+            self.search_index.add_many(events)
+            new_events = self.search_index.filter(events, self.current_search)
+            self.filtered_events.extend(new_events)
+            
+            if self.view_mode == "cards" and self.card_canvas is not None:
+                self._layout_card_view()
+            elif self.view_mode == "list" and hasattr(self, 'tree'):
+                self._insert_tree_rows(new_events)
+            else:
+                self._update_events_display()
+        
+        # 📄 Tarama bütçesi dolup boş sayfa geldiyse liste kaydırılamaz (yscroll tetiklenmez) -
+        # kart görünümündeki gibi sonraki sayfa hemen istenir
+        if self.view_mode == "list" and not new_events and next_cursor:
+            self._maybe_load_more()
 
-    def _calculate_statistics(self):
-        """📊 İstatistikleri hesapla"""
-        if not self.events:
+    def _on_page_failed(self, generation, message):
+        """📄 Sayfa yüklenemedi"""
+        if generation != self._load_generation:
             return
-        
-        now = datetime.datetime.now()
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
-        week_start = (now - datetime.timedelta(days=now.weekday())).replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
-        
-        self.stats = {
-            "total_events": len(self.events),
-            "high_confidence": len([e for e in self.events if float(e.get("confidence", 0)) >= 0.8]),
-            "today_events": len([e for e in self.events if self._safe_timestamp_convert(e.get("timestamp", 0)) >= today_start]),
-            "this_week": len([e for e in self.events if self._safe_timestamp_convert(e.get("timestamp", 0)) >= week_start]),
-            "avg_confidence": sum(float(e.get("confidence", 0)) for e in self.events) / len(self.events) if self.events else 0.0
-        }
+        self.loading_page = False
+        messagebox.showerror("Hata", message)
 
-    def _update_ui_after_load(self):
-        """📊 Yükleme sonrası UI güncelle"""
+    def _fetch_statistics(self):
+        """📊 Tüm geçmişin istatistikleri (veritabanı özetlerinden, worker thread'de)"""
+        try:
+            return self.db_manager.get_event_stats(self.user["localId"])
+        except Exception as e:
+            logging.error(f"İstatistikler alınamadı: {e}")
+            return None
+
+    def _refresh_statistics(self):
+        """📊 İstatistik kartlarını arka planda yenile (ör. silme sonrası)"""
+        def worker():
+            stats = self._fetch_statistics()
+            if stats is not None:
+                self.after(0, lambda: self._apply_statistics(stats))
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _apply_statistics(self, stats):
+        """📊 Yeni istatistikleri kartlara uygula"""
+        self.stats = stats
+        self._update_stats_cards()
+
+    def _update_stats_cards(self):
+        """📊 İstatistik kartlarının değerlerini güncelle"""
         stats_data = [
             ("total_events", str(self.stats["total_events"])),
             ("high_confidence", str(self.stats["high_confidence"])),
@@ -950,6 +1306,10 @@ class HistoryFrame(ttk.Frame):
                 if i < len(self.stats_cards):
                     card = self.stats_cards[i]
                     self.stats_canvas.itemconfig(card["value"], text=value)
+
+    def _update_ui_after_load(self):
+        """📊 Yükleme sonrası UI güncelle"""
+        self._update_stats_cards()
         
         # Olay listesi boşsa, uygun bir mesaj göster
         if not self.filtered_events and hasattr(self.events_container, 'canvas') and self.events_container.canvas:
@@ -1062,39 +1422,255 @@ class HistoryFrame(ttk.Frame):
         pass  # Henüz implemente edilmedi
 
     def _delete_event(self, event):
-        """🗑️ Olayı sil"""
+        """🗑️ Olayı sil (toplu silmeyle aynı yol, arka planda)"""
+        if self.bulk_running:
+            return
         result = messagebox.askyesno("Onay", "Bu olayı silmek istediğinizden emin misiniz?")
         if result:
-            try:
-                self.db_manager.delete_fall_event(self.user["localId"], event.get("id"))
-                self.events.remove(event)
-                self.filtered_events.remove(event)
-                self._update_events_display()
-                messagebox.showinfo("Başarılı", "Olay silindi")
-            except Exception as e:
-                messagebox.showerror("Hata", f"Silme hatası: {e}")
+            self._start_bulk_delete([str(event.get("id"))])
+
+    # ☑️ Çoklu seçim ve toplu işlemler
+
+    def _toggle_event_selection(self, event):
+        """☑️ Olayı seçime ekle / çıkar (kartta Ctrl+tık)"""
+        event_id = str(event.get("id"))
+        if event_id in self.selected_ids:
+            self.selected_ids.discard(event_id)
+        else:
+            self.selected_ids.add(event_id)
+        self._update_selection_label()
+        for slot in self.card_slots:
+            if slot.event is event:
+                self._paint_card_selection(slot)
+
+    def _toggle_select_all(self):
+        """☑️ Yüklenen (filtrelenmiş) tüm olayları seç / seçimi temizle"""
+        if self.selected_ids:
+            self.selected_ids = set()
+        else:
+            self.selected_ids = {str(event.get("id")) for event in self.filtered_events}
+        self._update_selection_label()
+        if self.view_mode == "list" and hasattr(self, 'tree'):
+            self.tree.selection_set([iid for iid in self.selected_ids if self.tree.exists(iid)])
+        elif self.card_canvas is not None:
+            for slot in self.card_slots:
+                if slot.index is not None:
+                    self._paint_card_selection(slot)
+
+    def _update_selection_label(self):
+        """☑️ Seçim sayısını göster"""
+        if hasattr(self, 'selection_label') and not self.bulk_running:
+            count = len(self.selected_ids)
+            self.selection_label.config(text=f"{count} seçili" if count else "")
+
+    def _post_to_ui(self, callback):
+        """🧵 Worker thread'den Tk thread'ine iş gönder (frame kapandıysa yok say)"""
+        try:
+            self.after(0, callback)
+        except (RuntimeError, tk.TclError):
+            pass
+
+    def _begin_bulk(self, text, cancellable=False):
+        """⏳ İlerleme çubuğunu göster"""
+        self.bulk_running = True
+        self._bulk_cancel.clear()
+        self.bulk_progress.config(mode="determinate", value=0, maximum=100)
+        self.bulk_progress.pack(side=tk.LEFT, padx=5)
+        if cancellable:
+            self.bulk_cancel_button.pack(side=tk.LEFT, padx=2)
+        self.selection_label.config(text=text)
+
+    def _set_bulk_progress(self, text, done, total):
+        """⏳ İlerleme (toplam bilinmiyorsa belirsiz mod)"""
+        if not self.bulk_running:
+            return
+        if total:
+            self.bulk_progress.config(mode="determinate", maximum=total, value=min(done, total))
+            self.selection_label.config(text=f"{text} {done}/{total}")
+        else:
+            if str(self.bulk_progress.cget("mode")) != "indeterminate":
+                self.bulk_progress.config(mode="indeterminate")
+            self.bulk_progress.step(5)
+            self.selection_label.config(text=f"{text} {done}")
+
+    def _end_bulk(self):
+        """⏳ İlerleme çubuğunu gizle"""
+        self.bulk_running = False
+        self.bulk_progress.pack_forget()
+        self.bulk_cancel_button.pack_forget()
+        self._update_selection_label()
+
+    def _delete_selected(self):
+        """🗑️ Seçili olayları toplu sil"""
+        if self.bulk_running:
+            return
+        if not self.selected_ids:
+            messagebox.showinfo("Bilgi", "Silmek için olay seçin (kartta Ctrl+tık, listede Ctrl/Shift+tık)")
+            return
+        count = len(self.selected_ids)
+        if messagebox.askyesno("Onay", f"{count} olay ve görüntüleri silinecek. Emin misiniz?"):
+            self._start_bulk_delete(list(self.selected_ids))
+
+    def _start_bulk_delete(self, event_ids):
+        """🗑️ Toplu silmeyi arka planda başlat"""
+        self._begin_bulk("Siliniyor...")
+        threading.Thread(target=self._bulk_delete_thread, args=(event_ids,), daemon=True).start()
+
+    def _bulk_delete_thread(self, event_ids):
+        """🗑️ Olaylar batch'lerle, görüntüler paralel silinir (Tk'ye dokunmaz)"""
+        user_id = self.user["localId"]
+        try:
+            deleted = self.db_manager.delete_fall_events(
+                user_id, event_ids,
+                progress=lambda done, total: self._post_to_ui(
+                    lambda: self._set_bulk_progress("Olaylar", done, total)))
+            images_deleted = 0
+            if deleted and self.storage_manager is not None:
+                images_deleted = self.storage_manager.delete_screenshots(
+                    user_id, deleted,
+                    progress=lambda done, total: self._post_to_ui(
+                        lambda: self._set_bulk_progress("Görüntüler", done, total)))
+            # Silinen olayların önbellekteki tam boy + thumbnail dosyaları da gitsin
+            for event_id in deleted:
+                self.media_cache.evict(event_id)
+            stats = self._fetch_statistics()
+            self._post_to_ui(lambda: self._on_bulk_delete_done(deleted, images_deleted, len(event_ids), stats))
+        except Exception as e:
+            logging.error(f"Toplu silme hatası: {e}")
+            error_msg = f"Silme hatası: {e}"
+            self._post_to_ui(lambda msg=error_msg: self._on_bulk_failed(msg))
+
+    def _on_bulk_delete_done(self, deleted, images_deleted, requested, stats):
+        """🗑️ Silinen olayları listelerden ve indeksten çıkar (Tk thread'i)"""
+        self._end_bulk()
+        removed = set(deleted)
+        self.events = [event for event in self.events if str(event.get("id")) not in removed]
+        self.filtered_events = [event for event in self.filtered_events if str(event.get("id")) not in removed]
+        for event_id in removed:
+            self.search_index.remove(event_id)
+            self.image_cache.pop(event_id, None)
+        self.selected_ids -= removed
+        self._update_events_display()
+        if stats is not None:
+            self._apply_statistics(stats)
+        
+        if len(removed) == requested:
+            messagebox.showinfo("Başarılı", "Olay silindi" if requested == 1
+                                else f"{len(removed)} olay silindi ({images_deleted} görüntü)")
+        else:
+            messagebox.showwarning("Uyarı", f"{requested} olaydan {len(removed)} tanesi silinebildi")
+
+    def _on_bulk_failed(self, message):
+        """⏳ Toplu işlem hatası"""
+        self._end_bulk()
+        messagebox.showerror("Hata", message)
+
+    def _export_events(self):
+        """📤 Seçili olayları (seçim yoksa filtre + aramayla eşleşen tüm olayları) dışa aktar"""
+        if self.bulk_running:
+            return
+        path = filedialog.asksaveasfilename(
+            title="Olayları Dışa Aktar",
+            defaultextension=".ndjson",
+            filetypes=[("NDJSON", "*.ndjson"), ("CSV", "*.csv"), ("Zip (görüntülerle)", "*.zip")])
+        if not path:
+            return
+        
+        extension = os.path.splitext(path)[1].lower()
+        fmt = "csv" if extension == ".csv" else "ndjson"
+        image_loader = None
+        if extension == ".zip":
+            image_loader = lambda event: (self.media_cache.get_bytes(self._thumbnail_key(event), event["image_url"])
+                                          if event.get("image_url") else None)
+        
+        if self.selected_ids:
+            # Seçilenler zaten yüklü - görüntülenen sırayla
+            events = [event for event in self.filtered_events if str(event.get("id")) in self.selected_ids]
+            total = len(events)
+        else:
+            # Tüm geçmiş: sayfa sayfa okunur, belleğe alınmaz; arama kutusu da uygulanır
+            events = iter_user_events(self.db_manager, self.user["localId"], **self.server_filters)
+            search = self.current_search
+            if search:
+                events = (event for event in events if self.search_index.matches(event, search))
+            total = None if (self.server_filters or search) else self.stats.get("total_events") or None
+        
+        self._begin_bulk("Dışa aktarılıyor...", cancellable=True)
+        threading.Thread(target=self._export_thread, args=(events, path, fmt, image_loader, total),
+                         daemon=True).start()
+
+    def _export_thread(self, events, path, fmt, image_loader, total):
+        """📤 Dışa aktarma (Tk'ye dokunmaz)"""
+        try:
+            result = export_events(
+                events, path, fmt=fmt, image_loader=image_loader, total=total,
+                progress=lambda done, count: self._post_to_ui(
+                    lambda: self._set_bulk_progress("Dışa aktarılıyor", done, count)),
+                cancelled=self._bulk_cancel)
+            self._post_to_ui(lambda: self._on_export_done(path, result))
+        except Exception as e:
+            logging.error(f"Dışa aktarma hatası: {e}")
+            error_msg = f"Dışa aktarma hatası: {e}"
+            self._post_to_ui(lambda msg=error_msg: self._on_bulk_failed(msg))
+
+    def _on_export_done(self, path, result):
+        """📤 Dışa aktarma bitti (Tk thread'i)"""
+        self._end_bulk()
+        if result["cancelled"]:
+            messagebox.showinfo("Bilgi", "Dışa aktarma iptal edildi")
+            return
+        detail = f"{result['events']} olay"
+        if result["images"]:
+            detail += f", {result['images']} görüntü"
+        messagebox.showinfo("Başarılı", f"{detail} dışa aktarıldı:\n{path}")
 
     def _select_event(self, event):
         """📋 Olay seç"""
         image_url = event.get("image_url")
         if image_url:
-            threading.Thread(target=self._load_image_for_viewer, args=(image_url,), daemon=True).start()
+            key = self._thumbnail_key(event)
+            self._viewer_event_id = key
+            cached = self.media_cache.peek(key)
+            if cached is not None:
+                # Daha önce açılmış olay - bellekten anında
+                self.current_image = cached
+                self._update_image_display()
+            else:
+                threading.Thread(target=self._load_image_for_viewer, args=(key, image_url), daemon=True).start()
+            self._prefetch_neighbors(event)
         
         self._update_event_metadata(event)
 
-    def _load_image_for_viewer(self, url):
-        """🖼️ Viewer için görüntü yükle"""
+    def _load_image_for_viewer(self, key, url):
+        """🖼️ Viewer için görüntü yükle (önbellek → disk → ağ)"""
+        image = self.media_cache.get_image(key, url)
+        if image is None:
+            logging.error(f"Image loading error: {url}")
+            return
+        self.after(0, lambda: self._show_viewer_image(key, image))
+
+    def _show_viewer_image(self, key, image):
+        """🖼️ Yüklenen görüntüyü hâlâ seçili olay ise göster"""
+        if key != self._viewer_event_id:
+            return  # Bu arada başka olay seçildi
+        self.current_image = image
+        self._update_image_display()
+
+    def _prefetch_neighbors(self, event):
+        """💾 Listede seçilen olayın komşularını arka planda önbelleğe al"""
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            
-            img_data = BytesIO(response.content)
-            self.current_image = Image.open(img_data)
-            
-            self.after(0, self._update_image_display)
-            
-        except Exception as e:
-            logging.error(f"Image loading error: {e}")
+            index = self.filtered_events.index(event)
+        except ValueError:
+            return
+        
+        count = HISTORY_MEDIA_CACHE_CONFIG.get('prefetch_neighbors', 3)
+        items = []
+        for offset in range(1, count + 1):
+            for neighbor in (index + offset, index - offset):
+                if 0 <= neighbor < len(self.filtered_events):
+                    neighbor_event = self.filtered_events[neighbor]
+                    items.append((self._thumbnail_key(neighbor_event), neighbor_event.get("image_url")))
+        self.media_cache.prefetch(items)
 
     def _update_event_metadata(self, event):
         """📊 Olay metadata'sını güncelle"""
@@ -1113,22 +1689,51 @@ class HistoryFrame(ttk.Frame):
         self.metadata_text.delete(1.0, tk.END)
         self.metadata_text.insert(1.0, metadata)
 
+    def _on_tree_click(self, event):
+        """📋 Düz tık: satırı önizle, çoklu seçime dokunma (kartlardaki <Button-1> gibi)"""
+        if event.state & TREE_MULTI_SELECT_MODIFIERS:
+            return None  # Ctrl/Shift+tık: Treeview seçimi değiştirir → _on_tree_select
+        if self.tree.identify_region(event.x, event.y) not in ("cell", "tree"):
+            return None  # Başlık / ayraç: varsayılan davranış
+        item = self.tree.identify_row(event.y)
+        self.tree.focus_set()
+        if item:
+            self._preview_tree_item(item)
+        return "break"
+
+    def _on_tree_key(self, event, step):
+        """📋 Ok tuşları odağı taşır ve önizler (Shift+ok seçimi genişletir)"""
+        if event.state & TREE_MULTI_SELECT_MODIFIERS:
+            return None
+        focused = self.tree.focus()
+        if focused:
+            item = self.tree.next(focused) if step > 0 else self.tree.prev(focused)
+        else:
+            children = self.tree.get_children()
+            item = children[0] if children else ""
+        if item:
+            self._preview_tree_item(item)
+        return "break"
+
+    def _preview_tree_item(self, item):
+        """📋 Satırı odakla ve önizle (satır iid'si olay ID'sidir)"""
+        self.tree.focus(item)
+        self.tree.see(item)
+        evt = self.search_index.get(item)
+        if evt is not None:
+            self._select_event(evt)
+
     def _on_tree_select(self, event):
-        """📋 Treeview'da bir öğe seçildiğinde çağrılır"""
+        """📋 Treeview seçimi değişti (yalnızca Ctrl/Shift+tık, Shift+ok veya tümünü seç)"""
         selected_items = self.tree.selection()
-        if selected_items:
-            item = selected_items[0]
-            values = self.tree.item(item, "values")
-            timestamp_str = f"{values[0]} {values[1]}"  # Örn: "01.01.2025 12:00:00"
-            try:
-                timestamp = datetime.datetime.strptime(timestamp_str, "%d.%m.%Y %H:%M:%S").timestamp()
-                confidence = float(values[2].strip("%")) / 100  # Örn: "95.0%" -> 0.95
-                for evt in self.filtered_events:
-                    if abs(self._safe_timestamp_convert(evt.get("timestamp", 0)) - timestamp) < 1 and abs(float(evt.get("confidence", 0)) - confidence) < 0.01:
-                        self._select_event(evt)
-                        break
-            except (ValueError, IndexError) as e:
-                logging.error(f"Treeview seçimi işlenirken hata: {e}")
+        self.selected_ids = set(selected_items)
+        self._update_selection_label()
+        
+        # Önizleme: odaktaki (son tıklanan) satır seçime eklendiyse
+        focused = self.tree.focus()
+        evt = self.search_index.get(focused) if focused in selected_items else None
+        if evt is not None:
+            self._select_event(evt)
 
     def _on_configure(self, event):
         """📐 Boyut değişikliği"""
@@ -1137,7 +1742,20 @@ class HistoryFrame(ttk.Frame):
     def _on_destroy(self, event=None):
         """🗑️ Widget yok edilmesi"""
         self._clear_canvas_bindings()
+        with self._thumb_lock:
+            self._thumb_stop = True
+            self._thumb_requests.clear()
+            self._thumb_lock.notify_all()
+        self._bulk_cancel.set()
+        for after_id in (self._search_after_id, self._filter_after_id):
+            if after_id is not None:
+                try:
+                    self.after_cancel(after_id)
+                except tk.TclError:
+                    pass
+        self.search_index.clear()
         self.image_cache.clear()
+        self._gradient_cache.clear()
         self.current_image = None
         if self.stats_canvas:
             self.stats_canvas = None
@@ -1151,50 +1769,80 @@ class HistoryFrame(ttk.Frame):
             except:
                 pass
         self.canvas_widgets.clear()
-
-    def _load_thumbnail(self, canvas, url, x, y, w, h):
-        """🖼️ Thumbnail yükle"""
-        try:
-            canvas.create_text(x + w//2, y + h//2, text="🖼️\nYükleniyor...",
-                             font=("Segoe UI", 9), fill=self.colors['text_secondary'])
-            threading.Thread(target=self._async_load_thumbnail, args=(canvas, url, x, y, w, h), daemon=True).start()
-        except Exception as e:
-            logging.error(f"Thumbnail yükleme hatası: {e}")
-            self._show_thumbnail_placeholder(canvas, x, y, w, h)
-    
-    def _show_thumbnail_placeholder(self, canvas, x, y, w, h):
-        """DÜZELTME: Thumbnail placeholder göster."""
-        try:
-            def show_placeholder():
-                try:
-                    canvas.delete(f"thumb_{x}_{y}")
-                    canvas.create_rectangle(x, y, x+w, y+h, 
-                                          fill=self.colors.get('bg_secondary', '#f0f0f0'),
-                                          outline=self.colors.get('text_secondary', 'gray'))
-                    canvas.create_text(x + w//2, y + h//2, text="📷\nGörüntü\nYüklenemedi",
-                                     font=("Segoe UI", 8), 
-                                     fill=self.colors.get('text_secondary', 'gray'),
-                                     anchor="center", tags=f"thumb_{x}_{y}")
-                except Exception as e:
-                    logging.debug(f"Placeholder gösterme hatası: {e}")
+        self.card_canvas = None
+        self.card_slots = []
+        self._thumb_wanted = set()
+
+    def _request_thumbnail(self, key, url):
+        """🖼️ Görünür kartın thumbnail'ını yükleme kuyruğuna ekle"""
+        with self._thumb_lock:
+            if key in self._thumb_pending:
+                return
+            self._thumb_pending.add(key)
+            self._thumb_requests.append((key, url))
+            self._thumb_lock.notify()
+        
+        if not self._thumb_workers:
+            for i in range(max(1, HISTORY_VIEW_CONFIG.get('thumbnail_workers', 2))):
+                worker = threading.Thread(target=self._thumbnail_worker, name=f"history-thumb-{i}", daemon=True)
+                worker.start()
+                self._thumb_workers.append(worker)
+        
+        if not self._thumb_poll_pending:
+            self._thumb_poll_pending = True
+            self.after(50, self._apply_thumbnail_results)
+
+    def _thumbnail_worker(self):
+        """🖼️ Thumbnail'ları indirip küçültür - Tk nesnelerine dokunmaz"""
+        while True:
+            with self._thumb_lock:
+                while not self._thumb_requests and not self._thumb_stop:
+                    self._thumb_lock.wait()
+                if self._thumb_stop:
+                    return
+                key, url = self._thumb_requests.pop()  # LIFO - en son görünür olan önce
+                if key not in self._thumb_wanted:
+                    # Kart yüklenmeden görünümden çıktı - tekrar görünürse yeniden istenir
+                    self._thumb_pending.discard(key)
+                    continue
             
-            self.after(0, show_placeholder)
-        except Exception as e:
-            logging.error(f"Thumbnail placeholder error: {e}")
-
-    def _async_load_thumbnail(self, canvas, url, x, y, w, h):
-        """🖼️ DÜZELTME: Thumbnail'ı asenkron olarak yükle - local file desteği"""
-        try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            img_data = BytesIO(response.content)
-            img = Image.open(img_data)
-            img.thumbnail((w, h), Image.LANCZOS)
-            photo = ImageTk.PhotoImage(img)
-            self.after(0, lambda: canvas.create_image(x + w//2, y + h//2, image=photo, anchor="center"))
-            canvas.image = photo  # Referansı tut
-        except Exception as e:
-            logging.error(f"Async thumbnail yükleme hatası: {e}")
+            image = self.media_cache.get_thumbnail(key, url, THUMBNAIL_SIZE)
+            
+            with self._thumb_lock:
+                self._thumb_results.append((key, image))
+
+    def _apply_thumbnail_results(self):
+        """🖼️ Yüklenen thumbnail'ları Tk thread'inde PhotoImage'a çevirip kartlara uygula"""
+        self._thumb_poll_pending = False
+        with self._thumb_lock:
+            results = list(self._thumb_results)
+            self._thumb_results.clear()
+            for key, _ in results:
+                self._thumb_pending.discard(key)
+            pending = bool(self._thumb_pending)
+        
+        cache_size = HISTORY_VIEW_CONFIG.get('thumbnail_cache_size', 300)
+        for key, image in results:
+            if image is None:
+                self._thumb_failed.add(key)
+                continue
+            self.image_cache[key] = ImageTk.PhotoImage(image)
+            self.image_cache.move_to_end(key)
+            while len(self.image_cache) > cache_size:
+                self.image_cache.popitem(last=False)
+        
+        if results and self.card_canvas is not None:
+            loaded = {key for key, _ in results}
+            try:
+                for slot in self.card_slots:
+                    if slot.thumb_key in loaded:
+                        self._show_card_thumbnail(slot)
+            except tk.TclError:
+                pass
+        
+        if pending and not self._thumb_stop:
+            self._thumb_poll_pending = True
+            self.after(50, self._apply_thumbnail_results)
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -1205,20 +1853,44 @@ if __name__ == "__main__":
     user = {"localId": "test_user", "email": "test@example.com"}
     
     class MockDB:
-        def get_fall_events(self, user_id, limit=50):
-            events = []
-            for i in range(20):
-                events.append({
-                    "id": f"event_{i}",
-                    "timestamp": time.time() - (i * 3600),
-                    "confidence": 0.5 + (i % 5) * 0.1,
-                    "camera_id": f"camera_{i % 3}",
-                    "image_url": f"https://example.com/image_{i}.jpg"
-                })
-            return events
+        def __init__(self):
+            now = time.time()
+            self.events = [{
+                "id": f"event_{i:05d}",
+                "timestamp": now - (i * 3600),
+                "confidence": 0.5 + (i % 5) * 0.1,
+                "camera_id": f"camera_{i % 3}",
+                "image_url": f"https://example.com/image_{i}.jpg"
+            } for i in range(10000)]
+        
+        def get_fall_events_page(self, user_id, page_size=50, cursor=None, start_time=None,
+                                 min_confidence=None, **filters):
+            start = 0 if cursor is None else int(cursor[1].split("_")[1]) + 1
+            page = []
+            for event in self.events[start:]:
+                if start_time is not None and event["timestamp"] < start_time:
+                    break
+                if min_confidence is not None and event["confidence"] < min_confidence:
+                    continue
+                page.append(event)
+                if len(page) == page_size:
+                    return page, (event["timestamp"], event["id"])
+            return page, None
+        
+        def get_event_stats(self, user_id):
+            high = sum(1 for event in self.events if event["confidence"] >= 0.8)
+            return {"total_events": len(self.events), "high_confidence": high, "today_events": 24,
+                    "this_week": 168, "avg_confidence": 0.7, "per_camera": {}}
         
         def delete_fall_event(self, user_id, event_id):
             pass
+        
+        def delete_fall_events(self, user_id, event_ids, progress=None):
+            wanted = set(event_ids)
+            self.events = [event for event in self.events if event["id"] not in wanted]
+            if progress:
+                progress(len(event_ids), len(event_ids))
+            return list(event_ids)
     
     history_frame = HistoryFrame(root, user, MockDB(), lambda: root.quit())
     history_frame.pack(fill=tk.BOTH, expand=True)
@@ -0,0 +1,77 @@
+# =======================================================================================
+# === PROGRAM AÇIKLAMASI ===
+# Dosya Adı: frame_slot.py (TEK ÜRETİCİ / TEK TÜKETİCİ FRAME SLOTU)
+# Konum: pc/utils/frame_slot.py
+# Açıklama:
+# Algılama thread'inin ürettiği annotated frame'i UI thread'ine kopyalamadan devreder.
+# Slot yalnızca en son frame'i tutar; yenisi yayınlandığında eskisine olan referans
+# hemen bırakılır (bellek en fazla bir frame). Yayın ve okuma tek bir tuple atamasıdır;
+# CPython'da atomik olduğu için kilit gerekmez.
+
+# === SAHİPLİK KURALI ===
+# - Üretici publish() ettiği diziyi bir daha DEĞİŞTİRMEZ (her frame yeni dizi olmalı)
+# - Tüketici diziyi salt okunur kullanır (resize/cvtColor gibi yeni buffer üreten işlemler)
+# =======================================================================================
+
+import time
+
+
+class FrameSlot:
+    """En son frame'i tutan kilitsiz SPSC slotu (latest-frame-wins)."""
+
+    __slots__ = ('_entry', 'published', 'consumed', 'overwritten', '_last_consumed_seq')
+
+    def __init__(self):
+        self._entry = (0, None, 0.0)     # (seq, frame, yayın zamanı)
+        self.published = 0
+        self.consumed = 0
+        self.overwritten = 0             # Tüketici görmeden üzerine yazılan frame'ler
+        self._last_consumed_seq = 0
+
+    def publish(self, frame):
+        """Üretici: frame'in sahipliğini slota devreder (kopya yok)."""
+        seq = self._entry[0] + 1
+        if self._entry[1] is not None and self._entry[0] != self._last_consumed_seq:
+            self.overwritten += 1
+        # Tek atama - önceki frame'e olan referans burada bırakılır
+        self._entry = (seq, frame, time.time())
+        self.published += 1
+        return seq
+
+    def peek(self, last_seq=None):
+        """
+        Tüketici: en son frame'i al (slotta kalır).
+
+        Args:
+            last_seq: Tüketicinin son gördüğü seq - aynıysa frame döndürülmez
+
+        Returns:
+            tuple: (seq, frame, age_seconds); frame yoksa veya değişmediyse (seq, None, 0.0)
+        """
+        seq, frame, published_at = self._entry
+        if frame is None or seq == last_seq:
+            return seq, None, 0.0
+        if seq != self._last_consumed_seq:
+            self._last_consumed_seq = seq
+            self.consumed += 1
+        return seq, frame, time.time() - published_at
+
+    @property
+    def seq(self):
+        return self._entry[0]
+
+    @property
+    def has_frame(self):
+        return self._entry[1] is not None
+
+    def clear(self):
+        """Frame'i bırak (ör. kamera değişince) - seq korunur."""
+        self._entry = (self._entry[0] + 1, None, 0.0)
+
+    def get_stats(self):
+        return {
+            'seq': self._entry[0],
+            'published': self.published,
+            'consumed': self.consumed,
+            'overwritten': self.overwritten,
+        }
@@ -0,0 +1,162 @@
+# =======================================================================================
+# === PROGRAM AÇIKLAMASI ===
+# Dosya Adı: h264_benchmark.py (H.264 SEGMENT vs MJPEG KARŞILAŞTIRMASI)
+# Konum: pc/utils/h264_benchmark.py
+# Açıklama:
+# Aynı frame dizisini mobil profil(ler)de MJPEG (JpegEncoder) ve H.264 (H264SegmentEncoder)
+# ile encode eder; bant genişliği (Mbit/s), frame başına CPU süresi ve görüntü kalitesi
+# (kaynakla PSNR) raporlanır. H.264 birkaç bit hızında denenir ve MJPEG'in PSNR'ına
+# ulaşan en düşük bit hızı "aynı algılanan kalite" karşılaştırması olarak seçilir.
+
+# === KULLANIM ===
+# python -m utils.h264_benchmark                          # Sentetik hareketli sahne
+# python -m utils.h264_benchmark --video kayit.mp4 --seconds 20
+# python -m utils.h264_benchmark --profiles mobile_medium mobile_high --scales 0.5 1 2
+# =======================================================================================
+
+import argparse
+import io
+import time
+
+import cv2
+import numpy as np
+
+from config.settings import MOBILE_API_CONFIG
+from core.h264_stream import AV_AVAILABLE, H264SegmentEncoder, SegmentRing, bitrate_for
+from utils.jpeg_encoder import get_jpeg_encoder
+
+if AV_AVAILABLE:
+    import av
+
+
+def synthetic_frames(width, height, count, seed=0):
+    """Sabit dokulu arka plan + hareket eden kişiler + hafif sensör gürültüsü."""
+    rng = np.random.default_rng(seed)
+    background = cv2.GaussianBlur(rng.integers(40, 200, (height, width, 3), dtype=np.uint8), (0, 0), 3)
+    movers = [(rng.uniform(0, width), rng.uniform(0, height), rng.uniform(-4, 4), rng.uniform(-2, 2),
+               tuple(int(c) for c in rng.integers(0, 255, 3))) for _ in range(4)]
+    for i in range(count):
+        frame = background.copy()
+        for x, y, vx, vy, color in movers:
+            cx, cy = int((x + vx * i) % width), int((y + vy * i) % height)
+            cv2.rectangle(frame, (cx, cy), (cx + width // 10, cy + height // 4), color, -1)
+        noise = rng.integers(-3, 4, frame.shape, dtype=np.int16)
+        yield np.clip(frame.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+
+def video_frames(path, width, height, count):
+    cap = cv2.VideoCapture(path)
+    try:
+        for _ in range(count):
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+    finally:
+        cap.release()
+
+
+def _psnr(reference, decoded):
+    mse = np.mean((reference.astype(np.float32) - decoded.astype(np.float32)) ** 2)
+    return 99.0 if mse == 0 else 10 * np.log10(255.0 ** 2 / mse)
+
+
+def bench_mjpeg(frames, quality, fps):
+    encoder = get_jpeg_encoder()
+    total_bytes, cpu, psnr = 0, 0.0, []
+    for frame in frames:
+        cpu_start = time.process_time()
+        jpeg = encoder.encode(frame, quality=quality)
+        cpu += time.process_time() - cpu_start
+        total_bytes += len(jpeg)
+        psnr.append(_psnr(frame, cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR)))
+    duration = len(frames) / fps
+    return {'mbps': total_bytes * 8 / duration / 1e6, 'cpu_ms': cpu / len(frames) * 1000,
+            'psnr': float(np.mean(psnr))}
+
+
+def bench_h264(frames, fps, bitrate):
+    h, w = frames[0].shape[:2]
+    ring = SegmentRing(capacity=1 << 20)
+    encoder = H264SegmentEncoder(w, h, fps, bitrate, ring)
+    cpu = 0.0
+    for i, frame in enumerate(frames):
+        cpu_start = time.process_time()
+        encoder.encode(frame, i / fps)
+        cpu += time.process_time() - cpu_start
+    cpu_start = time.process_time()
+    encoder.close()
+    cpu += time.process_time() - cpu_start
+
+    stream = (ring.init_segment or b"") + b"".join(data for _, _, data in ring.segments)
+    decoded = [f.to_ndarray(format='bgr24') for f in av.open(io.BytesIO(stream)).decode(video=0)]
+    psnr = [_psnr(src, dec) for src, dec in zip(frames, decoded)]
+    duration = len(frames) / fps
+    return {'mbps': len(stream) * 8 / duration / 1e6, 'cpu_ms': cpu / len(frames) * 1000,
+            'psnr': float(np.mean(psnr)) if psnr else 0.0, 'segments': len(ring.segments)}
+
+
+def run_benchmark(profile_names, seconds, scales, video=None):
+    profiles = MOBILE_API_CONFIG.get('quality_profiles', {})
+    results = []
+    for name in profile_names:
+        profile = profiles[name]
+        fps, count = profile['fps'], int(profile['fps'] * seconds)
+        source = (video_frames(video, profile['width'], profile['height'], count) if video
+                  else synthetic_frames(profile['width'], profile['height'], count))
+        frames = list(source)
+        if not frames:
+            continue
+
+        mjpeg = bench_mjpeg(frames, profile['quality'], fps)
+        rows = []
+        for scale in scales:
+            bitrate = int(bitrate_for(name, profile) * scale)
+            rows.append((bitrate, bench_h264(frames, fps, bitrate)))
+        results.append((name, profile, mjpeg, rows))
+    return results
+
+
+def print_report(results):
+    print("=" * 95)
+    print(f"{'profil':<26}{'yol':<22}{'Mbit/s':>9}{'CPU ms/frame':>14}{'PSNR dB':>10}")
+    print("-" * 95)
+    for name, profile, mjpeg, rows in results:
+        label = f"{name} {profile['width']}x{profile['height']}@{profile['fps']}"
+        print(f"{label:<26}{'MJPEG q' + str(profile['quality']):<22}{mjpeg['mbps']:>9.2f}"
+              f"{mjpeg['cpu_ms']:>14.2f}{mjpeg['psnr']:>10.2f}")
+        for bitrate, h264 in rows:
+            print(f"{'':<26}{'H.264 ' + str(bitrate // 1000) + ' kbps':<22}{h264['mbps']:>9.2f}"
+                  f"{h264['cpu_ms']:>14.2f}{h264['psnr']:>10.2f}")
+
+        # Aynı algılanan kalite: MJPEG PSNR'ına ulaşan en düşük bit hızı
+        matching = [(bitrate, h264) for bitrate, h264 in rows if h264['psnr'] >= mjpeg['psnr']]
+        if matching:
+            bitrate, h264 = min(matching, key=lambda row: row[0])
+            print(f"{'':<26}→ eşit kalite: H.264 {bitrate // 1000} kbps, bant genişliği "
+                  f"x{mjpeg['mbps'] / h264['mbps']:.1f} daha düşük, CPU x{h264['cpu_ms'] / mjpeg['cpu_ms']:.1f}")
+        else:
+            print(f"{'':<26}→ denenen bit hızlarında MJPEG PSNR'ına ulaşılamadı (--scales artırın)")
+        print("-" * 95)
+    print("Not: Sunucuda H.264 encode kamera/varyant başına bir kez yapılır; izleyici başına "
+          "maliyet sadece bant genişliğidir.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Guard AI H.264 segment vs MJPEG karşılaştırması")
+    parser.add_argument('--profiles', nargs='+', default=['mobile_medium'],
+                        choices=sorted(MOBILE_API_CONFIG.get('quality_profiles', {})))
+    parser.add_argument('--seconds', type=float, default=10.0, help="Test dizisi süresi (s)")
+    parser.add_argument('--scales', nargs='+', type=float, default=[0.5, 1.0, 2.0],
+                        help="Konfigürasyondaki bit hızının çarpanları")
+    parser.add_argument('--video', help="Sentetik sahne yerine video dosyası")
+    args = parser.parse_args()
+
+    if not AV_AVAILABLE:
+        raise SystemExit("PyAV yüklü değil (pip install av)")
+
+    print_report(run_benchmark(args.profiles, args.seconds, args.scales, args.video))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# =======================================================================================
+# === PROGRAM AÇIKLAMASI ===
+# Dosya Adı: jpeg_benchmark.py (JPEG ENCODER KARŞILAŞTIRMASI)
+# Konum: pc/utils/jpeg_benchmark.py
+# Açıklama:
+# Her stream kalite profili için (çözünürlük + JPEG kalitesi) mevcut encoder
+# backend'lerini (OpenCV, TurboJPEG) ve chroma subsampling modlarını karşılaştırır:
+# encode süresi (ms), saniyedeki encode sayısı ve ortalama çıktı boyutu (KB).
+# TurboJPEG varsa I420 (YUV) girişten encode da ölçülür.
+
+# === KULLANIM ===
+# python -m utils.jpeg_benchmark                       # Sentetik test görüntüsü
+# python -m utils.jpeg_benchmark --image kare.jpg      # Gerçek görüntü
+# python -m utils.jpeg_benchmark --camera 0 --iterations 200
+# =======================================================================================
+
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from config.settings import MOBILE_API_CONFIG
+from utils.jpeg_encoder import JpegEncoder, TURBOJPEG_AVAILABLE, BACKEND_OPENCV, BACKEND_TURBOJPEG
+
+# EnhancedStreamServer.quality_profiles ile aynı masaüstü profilleri
+DESKTOP_PROFILES = {
+    'low': {'width': 320, 'height': 240, 'quality': 60},
+    'medium': {'width': 640, 'height': 480, 'quality': 75},
+    'high': {'width': 1280, 'height': 720, 'quality': 85},
+    'ultra': {'width': 1920, 'height': 1080, 'quality': 95},
+}
+
+
+def synthetic_frame(width=1920, height=1080, seed=0):
+    """Kamera görüntüsüne benzeyen (gradyan + doku + gürültü) test frame'i."""
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 1, width, dtype=np.float32)
+    y = np.linspace(0, 1, height, dtype=np.float32)[:, None]
+    frame = np.empty((height, width, 3), dtype=np.float32)
+    frame[:, :, 0] = 80 + 100 * x
+    frame[:, :, 1] = 60 + 120 * y
+    frame[:, :, 2] = 90 + 60 * np.sin(8 * x) * np.cos(6 * y)
+    for _ in range(25):
+        cx, cy = int(rng.integers(0, width)), int(rng.integers(0, height))
+        color = tuple(int(c) for c in rng.integers(0, 255, 3))
+        cv2.rectangle(frame, (cx, cy), (cx + int(rng.integers(20, 300)), cy + int(rng.integers(20, 300))),
+                      color, -1)
+    frame += rng.normal(0, 6, frame.shape).astype(np.float32)
+    return np.clip(frame, 0, 255).astype(np.uint8)
+
+
+def load_frame(args):
+    if args.image:
+        frame = cv2.imread(args.image)
+        if frame is None:
+            raise SystemExit(f"Görüntü okunamadı: {args.image}")
+        return frame
+    if args.camera is not None:
+        cap = cv2.VideoCapture(args.camera)
+        try:
+            for _ in range(5):  # Otomatik pozlama otursun
+                ret, frame = cap.read()
+            if not ret:
+                raise SystemExit(f"Kameradan frame alınamadı: {args.camera}")
+            return frame
+        finally:
+            cap.release()
+    return synthetic_frame()
+
+
+def _time_encode(fn, iterations):
+    sizes = []
+    fn()  # Isınma (buffer tahsisi, tablo kurulumu)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        sizes.append(len(fn()))
+    elapsed = time.perf_counter() - start
+    return elapsed / iterations, sum(sizes) / len(sizes)
+
+
+def run_benchmark(frame, iterations, subsamplings, include_mobile=True):
+    profiles = dict(DESKTOP_PROFILES)
+    if include_mobile:
+        profiles.update(MOBILE_API_CONFIG.get('quality_profiles', {}))
+
+    backends = [BACKEND_OPENCV] + ([BACKEND_TURBOJPEG] if TURBOJPEG_AVAILABLE else [])
+    encoders = {}
+    for backend in backends:
+        for subsampling in subsamplings:
+            encoder = JpegEncoder(backend=backend, subsampling=subsampling)
+            if encoder.backend == backend:
+                encoders[(backend, subsampling)] = encoder
+
+    rows = []
+    for name, profile in profiles.items():
+        resized = cv2.resize(frame, (profile['width'], profile['height']), interpolation=cv2.INTER_AREA)
+        quality = profile['quality']
+        for (backend, subsampling), encoder in encoders.items():
+            per_frame, size = _time_encode(lambda: encoder.encode_view(resized, quality), iterations)
+            rows.append((name, f"{profile['width']}x{profile['height']}", quality, backend, subsampling,
+                         per_frame, size))
+
+            if backend == BACKEND_TURBOJPEG and subsampling == "420":
+                yuv = cv2.cvtColor(resized, cv2.COLOR_BGR2YUV_I420)
+                per_frame, size = _time_encode(
+                    lambda: encoder.encode_yuv(yuv, profile['width'], profile['height'], quality), iterations)
+                rows.append((name, f"{profile['width']}x{profile['height']}", quality, f"{backend}-yuv",
+                             subsampling, per_frame, size))
+    return rows
+
+
+def print_report(rows):
+    print("=" * 86)
+    print(f"{'profil':<14}{'çözünürlük':<12}{'kalite':>7}  {'backend':<16}{'örnekleme':<11}"
+          f"{'ms/frame':>9}{'frame/s':>10}{'KB':>8}")
+    print("-" * 86)
+    baseline = {}
+    for name, resolution, quality, backend, subsampling, per_frame, size in rows:
+        baseline.setdefault(name, per_frame)
+        speedup = baseline[name] / per_frame if per_frame else 0.0
+        print(f"{name:<14}{resolution:<12}{quality:>7}  {backend:<16}{subsampling:<11}"
+              f"{per_frame * 1000:>9.2f}{1.0 / per_frame:>10.0f}{size / 1024:>8.1f}  x{speedup:.2f}")
+    print("=" * 86)
+    if not TURBOJPEG_AVAILABLE:
+        print("Not: PyTurboJPEG yüklü değil - sadece OpenCV ölçüldü (pip install PyTurboJPEG)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Guard AI JPEG encoder karşılaştırması")
+    parser.add_argument('--image', help="Test görüntüsü (varsayılan: sentetik 1080p)")
+    parser.add_argument('--camera', type=int, help="Test frame'ini bu kamera indeksinden al")
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--subsampling', nargs='+', default=['420', '444'],
+                        choices=['444', '422', '420'])
+    parser.add_argument('--desktop-only', action='store_true', help="Mobil profilleri atla")
+    args = parser.parse_args()
+
+    frame = load_frame(args)
+    rows = run_benchmark(frame, args.iterations, args.subsampling, include_mobile=not args.desktop_only)
+    print_report(rows)
+
+
+if __name__ == "__main__":
+    main()
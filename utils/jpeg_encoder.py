@@ -0,0 +1,184 @@
+# =======================================================================================
+# === PROGRAM AÇIKLAMASI ===
+# Dosya Adı: jpeg_encoder.py (TAKILABİLİR JPEG ENCODER)
+# Konum: pc/utils/jpeg_encoder.py
+# Açıklama:
+# Stream, e-posta/Telegram ekleri, API MJPEG ve Storage screenshot yüklemesi için ortak
+# JPEG encoder. libjpeg-turbo (PyTurboJPEG) yüklüyse onu kullanır; chroma subsampling
+# kontrolü, thread başına yeniden kullanılan çıktı buffer'ı ve capture'dan gelen I420
+# (YUV) frame'leri BGR'ye çevirmeden doğrudan encode etme desteği sağlar.
+# Yüklü değilse aynı arayüzle OpenCV (cv2.imencode) kullanılır.
+
+# === BACKEND SEÇİMİ (JPEG_ENCODER_CONFIG['backend']) ===
+# - auto      : TurboJPEG varsa onu, yoksa OpenCV
+# - turbojpeg : TurboJPEG zorunlu (yoksa uyarı + OpenCV)
+# - opencv    : Her zaman OpenCV
+# =======================================================================================
+
+import threading
+import logging
+
+import cv2
+import numpy as np
+
+try:
+    from turbojpeg import TurboJPEG, TJSAMP_444, TJSAMP_422, TJSAMP_420, TJSAMP_GRAY, TJPF_BGR, TJPF_GRAY, \
+        TJFLAG_FASTDCT
+    TURBOJPEG_AVAILABLE = True
+except ImportError:
+    TURBOJPEG_AVAILABLE = False
+
+from config.settings import JPEG_ENCODER_CONFIG
+
+BACKEND_TURBOJPEG = "turbojpeg"
+BACKEND_OPENCV = "opencv"
+
+SUBSAMPLING_MODES = ("444", "422", "420", "gray")
+
+if TURBOJPEG_AVAILABLE:
+    _TURBO_SUBSAMPLING = {"444": TJSAMP_444, "422": TJSAMP_422, "420": TJSAMP_420, "gray": TJSAMP_GRAY}
+
+# OpenCV >= 4.5.5 sampling factor desteği (eski sürümlerde libjpeg varsayılanı 4:2:0)
+_CV_SAMPLING_PARAM = getattr(cv2, 'IMWRITE_JPEG_SAMPLING_FACTOR', None)
+_CV_SUBSAMPLING = {
+    "444": getattr(cv2, 'IMWRITE_JPEG_SAMPLING_FACTOR_444', None),
+    "422": getattr(cv2, 'IMWRITE_JPEG_SAMPLING_FACTOR_422', None),
+    "420": getattr(cv2, 'IMWRITE_JPEG_SAMPLING_FACTOR_420', None),
+}
+
+
+class JpegEncoder:
+    """
+    Backend bağımsız JPEG encoder.
+
+    encode()       → bytes (cache/snapshot gibi saklanan çıktılar için)
+    encode_view()  → memoryview; thread başına buffer, aynı thread'de bir sonraki
+                     çağrıya kadar geçerli (doğrudan socket'e yazılan çıktılar için)
+    encode_yuv()   → I420 düzlemsel frame'den encode (renk dönüşümü atlanır)
+    """
+
+    def __init__(self, backend=None, subsampling=None, fast_dct=None, library_path=None):
+        cfg = JPEG_ENCODER_CONFIG
+        requested = backend or cfg.get('backend', 'auto')
+        self.subsampling = subsampling or cfg.get('subsampling', '420')
+        self.fast_dct = cfg.get('fast_dct', True) if fast_dct is None else fast_dct
+        self.default_quality = cfg.get('default_quality', 85)
+        self.initial_buffer = cfg.get('initial_buffer_size', 512 * 1024)
+        self._local = threading.local()
+        self._turbo = None
+
+        if self.subsampling not in SUBSAMPLING_MODES:
+            logging.warning(f"Geçersiz JPEG subsampling '{self.subsampling}', 420 kullanılıyor")
+            self.subsampling = "420"
+
+        if requested in ("auto", BACKEND_TURBOJPEG) and TURBOJPEG_AVAILABLE:
+            try:
+                lib = library_path or cfg.get('library_path')
+                self._turbo = TurboJPEG(lib) if lib else TurboJPEG()
+            except Exception as e:
+                logging.warning(f"TurboJPEG yüklenemedi, OpenCV kullanılacak: {e}")
+        elif requested == BACKEND_TURBOJPEG:
+            logging.warning("TurboJPEG istendi ancak PyTurboJPEG yüklü değil, OpenCV kullanılacak")
+
+        self.backend = BACKEND_TURBOJPEG if self._turbo is not None else BACKEND_OPENCV
+        logging.info(f"JPEG encoder: {self.backend} (subsampling {self.subsampling})")
+
+    # ----- Yardımcılar -----
+
+    def _flags(self):
+        return TJFLAG_FASTDCT if self.fast_dct else 0
+
+    def _buffer(self, min_size):
+        """Thread başına yeniden kullanılan çıktı buffer'ı."""
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None or len(buffer) < min_size:
+            buffer = bytearray(max(min_size, self.initial_buffer))
+            self._local.buffer = buffer
+        return buffer
+
+    def _cv_params(self, quality, subsampling):
+        params = [cv2.IMWRITE_JPEG_QUALITY, int(quality)]
+        sampling = _CV_SUBSAMPLING.get(subsampling)
+        if _CV_SAMPLING_PARAM is not None and sampling is not None:
+            params += [_CV_SAMPLING_PARAM, sampling]
+        return params
+
+    # ----- Encode -----
+
+    def encode_view(self, frame, quality=None, subsampling=None):
+        """
+        BGR frame'i encode eder.
+
+        Returns:
+            memoryview | None: TurboJPEG'de thread buffer'ı üzerinde görünüm
+        """
+        quality = quality or self.default_quality
+        subsampling = subsampling or self.subsampling
+        try:
+            if self._turbo is not None:
+                pixel_format = TJPF_BGR
+                if frame.ndim == 2:
+                    pixel_format, subsampling = TJPF_GRAY, "gray"
+                h, w = frame.shape[:2]
+                # En kötü durum sınırı (libjpeg-turbo tjBufSize yaklaşımı)
+                buffer = self._buffer(w * h * 3 + 2048)
+                buffer, size = self._turbo.encode(np.ascontiguousarray(frame), quality=quality,
+                                                  pixel_format=pixel_format,
+                                                  jpeg_subsample=_TURBO_SUBSAMPLING[subsampling],
+                                                  flags=self._flags(), dst=buffer)
+                self._local.buffer = buffer
+                return memoryview(buffer)[:size]
+
+            ret, encoded = cv2.imencode('.jpg', frame, self._cv_params(quality, subsampling))
+            return memoryview(encoded.reshape(-1)) if ret else None
+        except Exception as e:
+            logging.debug(f"JPEG encode hatası ({self.backend}): {e}")
+            return None
+
+    def encode(self, frame, quality=None, subsampling=None):
+        """BGR frame'i encode eder; bağımsız bytes döndürür (hata durumunda None)."""
+        view = self.encode_view(frame, quality, subsampling)
+        return view.tobytes() if view is not None else None
+
+    def encode_yuv(self, yuv, width, height, quality=None, subsampling="420"):
+        """
+        I420 düzlemsel frame'i (height * 3 / 2 satır, tek kanal) encode eder.
+
+        TurboJPEG'de renk dönüşümü ve yeniden örnekleme yapılmaz; OpenCV'de önce BGR'ye
+        çevrilir.
+        """
+        quality = quality or self.default_quality
+        try:
+            if self._turbo is not None:
+                return self._turbo.encode_from_yuv(np.ascontiguousarray(yuv), height, width,
+                                                   quality=quality,
+                                                   jpeg_subsample=_TURBO_SUBSAMPLING[subsampling],
+                                                   flags=self._flags())
+            bgr = cv2.cvtColor(yuv.reshape(height * 3 // 2, width), cv2.COLOR_YUV2BGR_I420)
+            return self.encode(bgr, quality, subsampling)
+        except Exception as e:
+            logging.debug(f"YUV JPEG encode hatası ({self.backend}): {e}")
+            return None
+
+    def get_info(self):
+        return {
+            'backend': self.backend,
+            'turbojpeg_available': TURBOJPEG_AVAILABLE,
+            'subsampling': self.subsampling,
+            'fast_dct': self.fast_dct,
+            'opencv_subsampling_control': _CV_SAMPLING_PARAM is not None,
+        }
+
+
+_encoder = None
+_encoder_lock = threading.Lock()
+
+
+def get_jpeg_encoder():
+    """Global JPEG encoder (konfigürasyondaki backend ile)."""
+    global _encoder
+    if _encoder is None:
+        with _encoder_lock:
+            if _encoder is None:
+                _encoder = JpegEncoder()
+    return _encoder
@@ -0,0 +1,206 @@
+# =======================================================================================
+# === PROGRAM AÇIKLAMASI ===
+# Dosya Adı: latency_tracer.py (GLASS-TO-ALERT LATENCY TRACING)
+# Konum: pc/utils/latency_tracer.py
+# Açıklama:
+# Kameranın frame'i yakaladığı andan (glass) düşme uyarısının kullanıcıya ulaştığı ana
+# (alert) kadar geçen süreyi ölçer. Her aşama (detection, detect_fall, fall handling,
+# storage upload, DB yazma, her bildirim kanalı) bir span olarak aşamanın kendi ring
+# buffer'ına yazılır; aşama ve kanal bazında yüzdelik (p50/p90/p99) özetleri çıkarılır.
+# Her frame'de oluşan detection span'ları nadir uyarı yolu span'larını (storage_upload,
+# db_write, notification.*) halkadan itemez; her aşamanın süreleri ayrıca sıralı pencerede
+# tutulur, özet her istekte yeniden sıralanmaz.
+
+# === SPAN TÜRLERİ ===
+# - stage    : Aşamanın kendi süresi (end - start)
+# - e2e      : Frame yakalanmasından aşama sonuna kadar geçen süre (end - capture_time)
+# =======================================================================================
+
+import math
+import threading
+import logging
+import time
+import uuid
+from bisect import bisect_left, insort
+from collections import deque, defaultdict
+from contextlib import contextmanager
+
+from config.settings import LATENCY_TRACING_CONFIG
+
+
+def _percentile(sorted_values, pct):
+    """Sıralı listeden yüzdelik (nearest-rank)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class LatencyTracer:
+    """Aşama başına span ring buffer'ı + aşama/kanal bazlı yüzdelik özetleri."""
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, max_spans=None):
+        """
+        Args:
+            max_spans (int): Aşama başına tutulan en fazla span
+        """
+        self.enabled = LATENCY_TRACING_CONFIG.get('enabled', True)
+        self.max_spans = max_spans or LATENCY_TRACING_CONFIG.get('max_spans_per_stage', 1000)
+        self.percentiles = LATENCY_TRACING_CONFIG.get('percentiles', (50, 90, 99))
+        self.slow_alert_threshold = LATENCY_TRACING_CONFIG.get('slow_alert_threshold', 10.0)
+
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._spans = {}                      # stage -> deque(span) - aşama başına ring buffer
+        self._durations = defaultdict(list)   # stage -> sıralı aşama süreleri (halkadakiler)
+        self._e2e = defaultdict(list)         # stage -> sıralı glass-to-stage süreleri
+
+    def new_trace(self, camera_id=None, capture_time=None):
+        """
+        Yeni trace bağlamı oluşturur. Bu dict pipeline boyunca taşınır.
+
+        Args:
+            camera_id: Kamera kimliği
+            capture_time: Frame yakalanma zamanı (time.time); yoksa şimdi
+        """
+        return {
+            'trace_id': uuid.uuid4().hex[:16],
+            'camera_id': camera_id,
+            'capture_time': capture_time if capture_time is not None else time.time(),
+        }
+
+    def record_span(self, trace, stage, start, end=None, **attrs):
+        """
+        Span kaydeder.
+
+        Args:
+            trace: new_trace() bağlamı (None ise sadece aşama süresi kaydedilir)
+            stage: Aşama adı (ör. 'detection', 'storage_upload', 'notification.email')
+            start: Aşama başlangıcı (time.time)
+            end: Aşama sonu (time.time, varsayılan şimdi)
+        """
+        if not self.enabled:
+            return
+        end = end if end is not None else time.time()
+        span = {
+            'trace_id': trace.get('trace_id') if trace else None,
+            'camera_id': trace.get('camera_id') if trace else attrs.pop('camera_id', None),
+            'stage': stage,
+            'start': start,
+            'end': end,
+            'duration': max(0.0, end - start),
+            'e2e': (end - trace['capture_time']) if trace and trace.get('capture_time') else None,
+        }
+        if attrs:
+            span['attrs'] = attrs
+        with self._lock:
+            ring = self._spans.get(stage)
+            if ring is None:
+                ring = self._spans[stage] = deque(maxlen=self.max_spans)
+            if len(ring) == ring.maxlen:
+                self._forget(ring[0])
+            ring.append(span)
+            insort(self._durations[stage], span['duration'])
+            if span['e2e'] is not None:
+                insort(self._e2e[stage], span['e2e'])
+
+        if span['e2e'] is not None and stage.startswith('notification.') and span['e2e'] > self.slow_alert_threshold:
+            logging.warning(f"🐢 Glass-to-alert yavaş: {stage} {span['e2e']:.2f}s (trace {span['trace_id']})")
+
+    @contextmanager
+    def span(self, trace, stage, **attrs):
+        """with tracer.span(trace, 'db_write'): ... şeklinde kullanım."""
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.record_span(trace, stage, start, **attrs)
+
+    def _forget(self, span):
+        """Halkadan düşecek span'ı sıralı pencerelerden çıkarır (kilit tutulurken)."""
+        for windows, value in ((self._durations, span['duration']), (self._e2e, span['e2e'])):
+            if value is None:
+                continue
+            values = windows[span['stage']]
+            position = bisect_left(values, value)
+            if position < len(values) and values[position] == value:
+                del values[position]
+
+    def get_spans(self, trace_id=None, limit=None):
+        """Tüm aşamaların span'ları (bitiş zamanına göre sıralı)."""
+        with self._lock:
+            spans = [span for ring in self._spans.values() for span in ring]
+        spans.sort(key=lambda span: span['end'])
+        if trace_id:
+            spans = [s for s in spans if s['trace_id'] == trace_id]
+        return spans[-limit:] if limit else spans
+
+    def _summarize(self, values):
+        """values sıralı olmalı."""
+        summary = {'count': len(values), 'max_ms': values[-1] * 1000 if values else 0.0}
+        for pct in self.percentiles:
+            summary[f"p{pct}_ms"] = _percentile(values, pct) * 1000
+        return summary
+
+    def get_summary(self, since=None):
+        """
+        Aşama ve kanal bazlı latency yüzdelikleri.
+
+        Returns:
+            dict: {'stages': {stage: {...}}, 'glass_to_stage': {stage: {...}}, 'span_count': n}
+        """
+        if since is None:
+            # Sıralı pencerelerden doğrudan (kopya / yeniden sıralama yok)
+            with self._lock:
+                return self._summaries(self._durations, self._e2e)
+
+        durations = defaultdict(list)
+        e2e = defaultdict(list)
+        for span in self.get_spans():
+            if span['end'] < since:
+                continue
+            durations[span['stage']].append(span['duration'])
+            if span['e2e'] is not None:
+                e2e[span['stage']].append(span['e2e'])
+        for values in list(durations.values()) + list(e2e.values()):
+            values.sort()
+        return self._summaries(durations, e2e)
+
+    def _summaries(self, durations, e2e):
+        return {
+            'stages': {stage: self._summarize(values) for stage, values in durations.items() if values},
+            'glass_to_stage': {stage: self._summarize(values) for stage, values in e2e.items() if values},
+            'span_count': sum(len(v) for v in durations.values()),
+        }
+
+    def log_summary(self):
+        """Özet tabloyu loglar."""
+        summary = self.get_summary()
+        if not summary['span_count']:
+            return
+        logging.info("⏱️ Glass-to-alert latency özeti:")
+        for stage, stats in sorted(summary['glass_to_stage'].items()):
+            logging.info(f"   {stage}: p50={stats.get('p50_ms', 0):.0f}ms p90={stats.get('p90_ms', 0):.0f}ms "
+                         f"p99={stats.get('p99_ms', 0):.0f}ms (n={stats['count']})")
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+
+
+def get_latency_tracer():
+    """Global latency tracer."""
+    return LatencyTracer.get_instance()
@@ -0,0 +1,326 @@
+# =======================================================================================
+# === PROGRAM AÇIKLAMASI ===
+# Dosya Adı: metrics.py (THREAD BAŞINA SAYAÇLAR + PROMETHEUS EXPOSITION)
+# Konum: pc/utils/metrics.py
+# Açıklama:
+# Süreç genelinde metrik kaydı. Sıcak yol (frame_served, encode süresi vb.) global kilit
+# almaz: her thread kendi sayaç/histogram akümülatörüne yazar, arka plan thread'i
+# periyodik olarak bunları birleştirip oranları (saniye başına) hesaplar. Scrape anında
+# toplanan gauge'lar (kamera durumu, detector istatistikleri) collector'larla eklenir.
+
+# === METRİK TÜRLERİ ===
+# - counter   : inc(name, labels) - monoton artan, '_total' ile biter
+# - histogram : observe(name, value, labels) - sabit bucket'lar + sum + count
+# - gauge     : register_collector(fn) ile scrape anında üretilir
+# - rate      : '_total' sayaçlar için otomatik '<ad>_per_second' gauge'u
+# =======================================================================================
+
+import threading
+import logging
+import time
+import math
+
+from config.settings import METRICS_CONFIG
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _labels_key(labels):
+    """dict veya çift listesini sıralı, hashlenebilir tuple'a çevirir."""
+    if not labels:
+        return ()
+    items = labels.items() if isinstance(labels, dict) else labels
+    return tuple(sorted((str(k), str(v)) for k, v in items))
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels, extra=None):
+    pairs = list(labels) + (list(extra) if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _ThreadAccumulator:
+    """Tek thread'in sayaçları - yalnız sahibi yazar, birleştirici kopyalayarak okur."""
+
+    __slots__ = ('thread', 'counters', 'histograms')
+
+    def __init__(self, thread):
+        self.thread = thread
+        self.counters = {}       # (name, labels) -> değer
+        self.histograms = {}     # (name, labels) -> [bucket_counts, sum, count]
+
+
+class MetricsRegistry:
+    """Kilitsiz sıcak yol + periyodik birleştirme yapan metrik kaydı."""
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, merge_interval=None):
+        self.merge_interval = merge_interval or METRICS_CONFIG.get('merge_interval', 1.0)
+        self.rate_smoothing = METRICS_CONFIG.get('rate_smoothing', 0.5)
+
+        self._local = threading.local()
+        self._accumulators = []          # Canlı thread akümülatörleri
+        self._retired_counters = {}      # Sonlanan thread'lerden devralınan değerler
+        self._retired_histograms = {}
+        self._registry_lock = threading.Lock()   # Yalnız kayıt/birleştirme için
+
+        self._buckets = {}               # name -> bucket sınırları
+        self._meta = {}                  # name -> (type, help)
+        self._collectors = []
+
+        self._merge_lock = threading.Lock()      # merge() tek seferde bir thread; anlık görüntü tutarlı okunur
+        self._merged_counters = {}
+        self._merged_histograms = {}
+        self._rates = {}
+        self._last_merge = time.time()
+
+        self._stop_event = threading.Event()
+        self._merge_thread = threading.Thread(target=self._merge_loop, daemon=True, name="MetricsMerge")
+        self._merge_thread.start()
+
+    # ----- Tanımlama -----
+
+    def describe(self, name, metric_type, help_text, buckets=None):
+        """Metrik türü/açıklaması (Prometheus HELP/TYPE) ve histogram bucket'ları."""
+        self._meta[name] = (metric_type, help_text)
+        if buckets is not None:
+            self._buckets[name] = tuple(sorted(buckets))
+
+    def register_collector(self, collector):
+        """
+        Scrape anında çağrılır. collector() → [(name, labels, value, type, help), ...]
+        """
+        with self._registry_lock:
+            self._collectors.append(collector)
+
+    # ----- Sıcak yol (kilitsiz) -----
+
+    def _accumulator(self):
+        acc = getattr(self._local, 'acc', None)
+        if acc is None:
+            acc = _ThreadAccumulator(threading.current_thread())
+            self._local.acc = acc
+            with self._registry_lock:
+                self._accumulators.append(acc)
+        return acc
+
+    def inc(self, name, labels=None, amount=1):
+        counters = self._accumulator().counters
+        key = (name, _labels_key(labels))
+        counters[key] = counters.get(key, 0) + amount
+
+    def observe(self, name, value, labels=None):
+        histograms = self._accumulator().histograms
+        key = (name, _labels_key(labels))
+        hist = histograms.get(key)
+        buckets = self._buckets.get(name, DEFAULT_BUCKETS)
+        if hist is None:
+            hist = [[0] * (len(buckets) + 1), 0.0, 0]
+            histograms[key] = hist
+        # Bucket index (son eleman +Inf)
+        index = len(buckets)
+        for i, bound in enumerate(buckets):
+            if value <= bound:
+                index = i
+                break
+        hist[0][index] += 1
+        hist[1] += value
+        hist[2] += 1
+
+    # ----- Birleştirme -----
+
+    @staticmethod
+    def _copy(mapping):
+        """Sahibi yazarken güvenli kopya (boyut değişimi hatasında tekrar dene)."""
+        for _ in range(3):
+            try:
+                return list(mapping.items())
+            except RuntimeError:
+                continue
+        return []
+
+    @staticmethod
+    def _add_hist(target, key, hist):
+        merged = target.get(key)
+        if merged is None:
+            target[key] = [list(hist[0]), hist[1], hist[2]]
+        else:
+            for i, count in enumerate(hist[0]):
+                merged[0][i] += count
+            merged[1] += hist[1]
+            merged[2] += hist[2]
+
+    def merge(self):
+        """Tüm thread akümülatörlerini topla; sonlanan thread'leri devral."""
+        with self._merge_lock:
+            return self._merge()
+
+    def _merge(self):
+        with self._registry_lock:
+            alive = []
+            for acc in self._accumulators:
+                if acc.thread.is_alive():
+                    alive.append(acc)
+                    continue
+                # Thread bitti - değerleri kalıcı toplama aktar
+                for key, value in self._copy(acc.counters):
+                    self._retired_counters[key] = self._retired_counters.get(key, 0) + value
+                for key, hist in self._copy(acc.histograms):
+                    self._add_hist(self._retired_histograms, key, hist)
+            self._accumulators = alive
+
+            counters = dict(self._retired_counters)
+            histograms = {key: [list(h[0]), h[1], h[2]] for key, h in self._retired_histograms.items()}
+            accumulators = list(alive)
+
+        for acc in accumulators:
+            for key, value in self._copy(acc.counters):
+                counters[key] = counters.get(key, 0) + value
+            for key, hist in self._copy(acc.histograms):
+                self._add_hist(histograms, key, hist)
+
+        now = time.time()
+        elapsed = max(now - self._last_merge, 1e-6)
+        previous = self._merged_counters
+        rates = {}
+        for key, value in counters.items():
+            instant = (value - previous.get(key, value)) / elapsed
+            old_rate = self._rates.get(key)
+            rates[key] = instant if old_rate is None else (
+                self.rate_smoothing * instant + (1 - self.rate_smoothing) * old_rate)
+
+        self._merged_counters = counters
+        self._merged_histograms = histograms
+        self._rates = rates
+        self._last_merge = now
+        return counters, histograms
+
+    def _merge_loop(self):
+        while not self._stop_event.wait(self.merge_interval):
+            try:
+                self.merge()
+            except Exception as e:
+                logging.debug(f"Metrik birleştirme hatası: {e}")
+
+    def shutdown(self):
+        self._stop_event.set()
+
+    # ----- Okuma -----
+
+    def get_counters(self, name=None):
+        """Son birleştirilmiş sayaçlar: {(name, labels): değer}."""
+        counters = self._merged_counters
+        if name is None:
+            return dict(counters)
+        return {key: value for key, value in counters.items() if key[0] == name}
+
+    def get_rates(self, name=None):
+        rates = self._rates
+        if name is None:
+            return dict(rates)
+        return {key: value for key, value in rates.items() if key[0] == name}
+
+    def get_histogram_summary(self, name):
+        """{labels: {'count', 'sum', 'avg'}} - JSON API'leri için."""
+        summary = {}
+        for (hist_name, labels), hist in self._merged_histograms.items():
+            if hist_name != name:
+                continue
+            summary[labels] = {'count': hist[2], 'sum': hist[1],
+                               'avg': hist[1] / hist[2] if hist[2] else 0.0}
+        return summary
+
+    def _snapshot(self):
+        """Son birleştirmenin sayaç, histogram ve oranları (birlikte tutarlı)."""
+        with self._merge_lock:
+            return self._merged_counters, self._merged_histograms, self._rates
+
+    def render_prometheus(self):
+        """
+        Prometheus text exposition formatı (0.0.4).
+
+        Arka plan birleştirmesinin son anlık görüntüsünden üretilir; scrape ayrıca
+        birleştirme yapmaz (çok kısa aralıkla hesaplanan oranlar sıçramaz).
+        """
+        counters, histograms, rates = self._snapshot()
+        lines = []
+        described = set()
+
+        def header(name, metric_type, help_text=None):
+            if name in described:
+                return
+            described.add(name)
+            meta_type, meta_help = self._meta.get(name, (metric_type, help_text or name))
+            lines.append(f"# HELP {name} {help_text or meta_help}")
+            lines.append(f"# TYPE {name} {meta_type or metric_type}")
+
+        for name in sorted({key[0] for key in counters}):
+            header(name, 'counter')
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+            if name.endswith('_total'):
+                rate_name = name[:-len('_total')] + '_per_second'
+                header(rate_name, 'gauge', f"{name} saniye başına oranı (birleştirme aralığında)")
+                for (metric, labels), value in sorted(rates.items()):
+                    if metric == name:
+                        lines.append(f"{rate_name}{_format_labels(labels)} {_format_value(round(value, 3))}")
+
+        for name in sorted({key[0] for key in histograms}):
+            header(name, 'histogram')
+            buckets = self._buckets.get(name, DEFAULT_BUCKETS)
+            for (metric, labels), hist in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(list(buckets) + [math.inf], hist[0]):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(labels, [('le', _format_value(float(bound)))])} "
+                                 f"{cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(round(hist[1], 6))}")
+                lines.append(f"{name}_count{_format_labels(labels)} {hist[2]}")
+
+        with self._registry_lock:
+            collectors = list(self._collectors)
+        for collector in collectors:
+            try:
+                samples = collector() or []
+            except Exception as e:
+                logging.debug(f"Metrik collector hatası: {e}")
+                continue
+            for name, labels, value, metric_type, help_text in samples:
+                if value is None:
+                    continue
+                header(name, metric_type, help_text)
+                lines.append(f"{name}{_format_labels(_labels_key(labels))} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+def get_metrics_registry():
+    """Global metrik kaydı."""
+    return MetricsRegistry.get_instance()
@@ -0,0 +1,144 @@
+# =======================================================================================
+# === PROGRAM AÇIKLAMASI ===
+# Dosya Adı: stream_load_test.py (MJPEG STREAM YÜK TESTİ)
+# Konum: pc/utils/stream_load_test.py
+# Açıklama:
+# Stream sunucusuna (Flask veya async) çok sayıda eşzamanlı MJPEG izleyici bağlar ve
+# istemci başına alınan frame sayısı / FPS / bağlantı hatalarını raporlar.
+# Sadece standart kütüphane (asyncio) kullanır. Yavaş istemci simülasyonu ile
+# latest-frame-wins davranışı (yavaş istemci frame atlar, geride kalmaz) doğrulanır.
+
+# === KULLANIM ===
+# python -m core.async_stream_server      (limitler: ASYNC_STREAM_CONFIG)
+# python -m utils.stream_load_test --url http://127.0.0.1:5001/video_feed/camera_0 \
+#        --clients 120 --slow-clients 20 --duration 30
+# =======================================================================================
+
+import argparse
+import asyncio
+import time
+from urllib.parse import urlparse
+
+BOUNDARY = b'--frame'
+
+
+async def _viewer(url, duration, read_delay, result):
+    """Tek MJPEG izleyici - boundary sayarak frame'leri sayar."""
+    parsed = urlparse(url)
+    host = parsed.hostname
+    port = parsed.port or 80
+    path = parsed.path + (f"?{parsed.query}" if parsed.query else "")
+
+    start = time.monotonic()
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError as e:
+        result['error'] = f"bağlantı: {e}"
+        return
+
+    try:
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+        await writer.drain()
+
+        status_line = await reader.readline()
+        parts = status_line.split()
+        result['status'] = int(parts[1]) if len(parts) > 1 else 0
+        if result['status'] != 200:
+            return
+
+        tail = b''
+        first_frame_at = None
+        while time.monotonic() - start < duration:
+            chunk = await reader.read(65536)
+            if not chunk:
+                break
+            result['bytes'] += len(chunk)
+            data = tail + chunk
+            count = data.count(BOUNDARY)
+            if count:
+                result['frames'] += count
+                first_frame_at = first_frame_at or time.monotonic()
+            tail = data[-(len(BOUNDARY) - 1):]
+
+            if read_delay:
+                # Yavaş istemci: TCP alım penceresi dolar, sunucu ara frame'leri düşürmeli
+                await asyncio.sleep(read_delay)
+
+        if first_frame_at:
+            result['ttff'] = first_frame_at - start
+    except Exception as e:
+        result['error'] = str(e)
+    finally:
+        result['elapsed'] = time.monotonic() - start
+        writer.close()
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100.0))]
+
+
+async def run_load_test(url, clients, slow_clients, duration, slow_delay, ramp):
+    results = []
+    tasks = []
+    for i in range(clients):
+        slow = i < slow_clients
+        result = {'slow': slow, 'frames': 0, 'bytes': 0, 'status': None,
+                  'error': None, 'elapsed': 0.0, 'ttff': None}
+        results.append(result)
+        tasks.append(asyncio.create_task(
+            _viewer(url, duration, slow_delay if slow else 0.0, result)))
+        if ramp:
+            await asyncio.sleep(ramp)
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return results
+
+
+def print_report(results):
+    ok = [r for r in results if r['status'] == 200 and not r['error'] and r['frames']]
+    rejected = [r for r in results if r['status'] == 503]
+    failed = [r for r in results if r not in ok and r not in rejected]
+
+    print("=" * 60)
+    print(f"İstemci: {len(results)}  başarılı: {len(ok)}  reddedilen(503): {len(rejected)}  "
+          f"hatalı: {len(failed)}")
+
+    for label, group in (("normal", [r for r in ok if not r['slow']]),
+                         ("yavaş", [r for r in ok if r['slow']])):
+        if not group:
+            continue
+        fps = [r['frames'] / r['elapsed'] for r in group if r['elapsed']]
+        ttff = [r['ttff'] for r in group if r['ttff'] is not None]
+        mbps = sum(r['bytes'] for r in group) * 8 / 1e6 / max(r['elapsed'] for r in group)
+        print(f"[{label}] n={len(group)}  fps p50={_percentile(fps, 50):.1f} "
+              f"p10={_percentile(fps, 10):.1f}  ilk frame p90={_percentile(ttff, 90) * 1000:.0f}ms  "
+              f"toplam {mbps:.1f} Mbit/s")
+
+    errors = {}
+    for r in failed:
+        key = r['error'] or f"HTTP {r['status']}"
+        errors[key] = errors.get(key, 0) + 1
+    for error, count in errors.items():
+        print(f"  hata x{count}: {error}")
+    print("=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Guard AI MJPEG stream yük testi")
+    parser.add_argument('--url', default='http://127.0.0.1:5001/video_feed/camera_0')
+    parser.add_argument('--clients', type=int, default=100)
+    parser.add_argument('--slow-clients', type=int, default=10)
+    parser.add_argument('--slow-delay', type=float, default=0.5, help="Yavaş istemci okuma arası (s)")
+    parser.add_argument('--duration', type=float, default=20.0)
+    parser.add_argument('--ramp', type=float, default=0.01, help="Bağlantılar arası gecikme (s)")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_load_test(args.url, args.clients, args.slow_clients,
+                                        args.duration, args.slow_delay, args.ramp))
+    print_report(results)
+
+
+if __name__ == "__main__":
+    main()